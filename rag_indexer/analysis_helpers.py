@@ -9,7 +9,7 @@ from datetime import datetime
 from utils import save_failed_files_details
 
 
-def analyze_final_results_enhanced(config, db_manager, log_dir, processing_stats):
+def analyze_final_results_enhanced(config, db_manager, log_dir, processing_stats, snapshot=None):
     """
     Enhanced end-to-end analysis with comprehensive reporting
     
@@ -18,6 +18,7 @@ def analyze_final_results_enhanced(config, db_manager, log_dir, processing_stats
         db_manager: Database manager instance
         log_dir: Directory for log files
         processing_stats: Processing statistics from all stages
+        snapshot: Optional DirectorySnapshot from the loading stage
     
     Returns:
         dict: Comprehensive analysis results
@@ -29,7 +30,8 @@ def analyze_final_results_enhanced(config, db_manager, log_dir, processing_stats
     # Perform comprehensive directory vs database comparison
     analysis_results = db_manager.analyze_directory_vs_database(
         config.DOCUMENTS_DIR, 
-        recursive=True
+        recursive=True,
+        snapshot=snapshot
     )
     
     # Extract results
@@ -336,7 +338,7 @@ def create_stats_summary(stats):
     summary.append("📊 PROCESSING STATISTICS:")
     
     for key, value in stats.items():
-        if key in ['rotation_stats', 'quality_analysis_results', 'processing_stages']:
+        if key in ['rotation_stats', 'quality_analysis_results', 'processing_stages', 'dedup_stats']:
             continue  # Handle these separately
         if isinstance(value, float):
             summary.append(f"   {key}: {value:.2f}")
@@ -373,6 +375,22 @@ def create_feature_summaries(stats):
         summary.append(f"   Average content length: {quality_results.get('avg_content_length', 0):.0f} chars")
         summary.append("")
     
+    # Chunk deduplication results
+    if stats.get('dedup_stats'):
+        dedup_stats = stats['dedup_stats']
+        summary.append("♻️ CHUNK DEDUPLICATION:")
+        summary.append(f"   Mode: {dedup_stats.get('mode', 'reuse')}")
+        summary.append(f"   Chunks checked: {dedup_stats.get('total_chunks', 0):,}")
+        summary.append(f"   Unique chunks: {dedup_stats.get('unique_chunks', 0):,}")
+        summary.append(f"   Exact duplicates: {dedup_stats.get('exact_duplicates', 0):,}")
+        summary.append(f"   Near duplicates: {dedup_stats.get('near_duplicates', 0):,}")
+        summary.append(f"   Duplicate rate: {dedup_stats.get('duplicate_rate', 0):.1f}%")
+        if dedup_stats.get('mode') == 'skip':
+            summary.append(f"   Chunks skipped: {dedup_stats.get('skipped_chunks', 0):,}")
+        else:
+            summary.append(f"   Embeddings reused: {stats.get('reused_embeddings', 0):,}")
+        summary.append("")
+    
     return summary
 
 
@@ -477,6 +495,11 @@ def create_enhanced_status_report(status_reporter, stats, final_analysis, batch_
         quality_results = stats['quality_analysis_results']
         enhanced_features["Quality filter success"] = f"{quality_results.get('filter_success_rate', 0):.1f}%"
     
+    if stats.get('dedup_stats'):
+        dedup_stats = stats['dedup_stats']
+        duplicates = dedup_stats.get('exact_duplicates', 0) + dedup_stats.get('near_duplicates', 0)
+        enhanced_features["Duplicate chunks detected"] = f"{duplicates:,} ({dedup_stats.get('duplicate_rate', 0):.1f}%, mode: {dedup_stats.get('mode', 'reuse')})"
+    
     if enhanced_features:
         status_reporter.add_section("✨ Enhanced Features Performance", enhanced_features)
     
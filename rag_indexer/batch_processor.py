@@ -394,6 +394,7 @@ class BatchProcessor:
             'total_embedding_errors': self.batch_stats['total_embedding_errors'],
             'success_rate': (self.batch_stats['total_saved'] / total_nodes * 100) if total_nodes > 0 else 0,
             'avg_speed': self.batch_stats['total_saved'] / total_time if total_time > 0 else 0,
+            'reused_embeddings': self.embedding_processor.stats.get('reused_embeddings', 0),
             # NEW: Safe restart statistics
             'ollama_restarts_attempted': self.batch_stats['ollama_restarts_attempted'],
             'ollama_restarts_successful': self.batch_stats['ollama_restarts_successful'],
@@ -432,6 +433,7 @@ class BatchProcessor:
         print(f"   Records saved: {results['total_saved']}")
         print(f"   Failed chunks: {results['total_failed_chunks']}")
         print(f"   Embedding errors: {results['total_embedding_errors']}")
+        print(f"   Reused embeddings (duplicates): {results.get('reused_embeddings', 0)}")
         print(f"   Success rate: {results['success_rate']:.1f}%")
         print(f"   Average speed: {results['avg_speed']:.2f} chunks/sec")
         print(f"   Records deleted: {deletion_info['records_deleted']}")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chunk deduplication module for RAG Document Indexer
+Detects exact and near-duplicate chunks (MinHash + LSH) before embedding
+so repeated boilerplate is embedded once and either reused or skipped
+"""
+
+import time
+import zlib
+import hashlib
+
+# --- MINHASH IMPORTS ---
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    print("WARNING: numpy not installed - near-duplicate detection disabled. Run: pip install numpy")
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+DEDUP_MODES = ('reuse', 'skip')
+
+
+def normalize_chunk_text(text):
+    """
+    Normalize chunk text for fingerprinting
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        str: Lowercased text with collapsed whitespace
+    """
+    return ' '.join(text.lower().split())
+
+
+def compute_content_hash(normalized_text):
+    """
+    Compute exact-match fingerprint for normalized chunk text
+
+    Args:
+        normalized_text: Normalized chunk text
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    return hashlib.sha256(normalized_text.encode('utf-8')).hexdigest()
+
+
+def choose_lsh_parameters(num_perm, threshold):
+    """
+    Choose LSH band/row split whose detection threshold is closest to the target
+
+    The LSH threshold is (1/bands) ** (1/rows). Candidates are verified with
+    the estimated Jaccard similarity afterwards, so the split is biased
+    slightly below the target threshold to favour recall.
+
+    Args:
+        num_perm: Number of MinHash permutations
+        threshold: Target Jaccard similarity threshold
+
+    Returns:
+        tuple: (bands, rows)
+    """
+    target = max(0.05, threshold - 0.1)
+    best = (num_perm, 1)
+    best_error = float('inf')
+
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands < 1:
+            break
+        lsh_threshold = (1.0 / bands) ** (1.0 / rows)
+        error = abs(lsh_threshold - target)
+        if error < best_error:
+            best_error = error
+            best = (bands, rows)
+
+    return best
+
+
+class ChunkDeduplicator:
+    """Exact and near-duplicate chunk detector using SHA-256 and MinHash/LSH"""
+
+    def __init__(self, mode='reuse', near_duplicates=True, near_threshold=0.9,
+                 num_perm=128, shingle_size=5, seed=42):
+        """
+        Initialize chunk deduplicator
+
+        Args:
+            mode: 'reuse' keeps duplicates and reuses the canonical embedding,
+                  'skip' drops duplicates before embedding
+            near_duplicates: Whether to detect near duplicates with MinHash
+            near_threshold: Minimum estimated Jaccard similarity for near duplicates
+            num_perm: Number of MinHash permutations
+            shingle_size: Number of words per shingle
+            seed: Random seed for MinHash permutations
+        """
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Invalid dedup mode: {mode} (expected one of {', '.join(DEDUP_MODES)})")
+
+        self.mode = mode
+        self.near_duplicates = near_duplicates and NUMPY_AVAILABLE
+        self.near_threshold = near_threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+
+        if self.near_duplicates:
+            rng = np.random.RandomState(seed)
+            # Keep a, b and shingle hashes below 2^32 so a*h + b never overflows uint64
+            self._perm_a = rng.randint(1, MAX_HASH, size=num_perm, dtype=np.uint64)
+            self._perm_b = rng.randint(0, MAX_HASH, size=num_perm, dtype=np.uint64)
+            self.bands, self.rows = choose_lsh_parameters(num_perm, near_threshold)
+        else:
+            self.bands, self.rows = 0, 0
+
+        self.reset()
+
+    def reset(self):
+        """Reset fingerprint indexes and statistics"""
+        self._exact_index = {}  # content_hash -> canonical content_hash
+        self._signatures = {}  # canonical content_hash -> MinHash signature
+        self._lsh_buckets = [{} for _ in range(self.bands)]
+        self.reuse_sources = set()  # canonical hashes whose embedding will be reused
+        self.stats = {
+            'total_chunks': 0,
+            'unique_chunks': 0,
+            'exact_duplicates': 0,
+            'near_duplicates': 0,
+            'skipped_chunks': 0,
+            'reuse_candidates': 0,
+            'processing_time': 0.0
+        }
+
+    def _shingle_hashes(self, normalized_text):
+        """Hash word shingles of normalized text into a uint64 array"""
+        words = normalized_text.split()
+        if len(words) <= self.shingle_size:
+            shingles = {' '.join(words)}
+        else:
+            shingles = {
+                ' '.join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            }
+        return np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+
+    def compute_signature(self, normalized_text):
+        """
+        Compute MinHash signature for normalized text
+
+        Args:
+            normalized_text: Normalized chunk text
+
+        Returns:
+            numpy.ndarray: Signature of num_perm uint64 values
+        """
+        hashes = self._shingle_hashes(normalized_text)
+        permuted = (np.outer(hashes, self._perm_a) + self._perm_b) % MERSENNE_PRIME
+        return (permuted & MAX_HASH).min(axis=0)
+
+    def _band_keys(self, signature):
+        """Yield (band_index, key) pairs for LSH bucketing"""
+        for band in range(self.bands):
+            start = band * self.rows
+            yield band, signature[start:start + self.rows].tobytes()
+
+    def _find_near_duplicate(self, signature):
+        """
+        Find the most similar canonical chunk above the near-duplicate threshold
+
+        Returns:
+            tuple: (canonical_hash, similarity) or (None, 0.0)
+        """
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._lsh_buckets[band].get(key, ()))
+
+        best_hash, best_similarity = None, 0.0
+        for candidate_hash in candidates:
+            similarity = float(np.mean(self._signatures[candidate_hash] == signature))
+            if similarity >= self.near_threshold and similarity > best_similarity:
+                best_hash, best_similarity = candidate_hash, similarity
+
+        return best_hash, best_similarity
+
+    def _register_canonical(self, content_hash, signature):
+        """Add a canonical chunk to the exact and LSH indexes"""
+        self._exact_index[content_hash] = content_hash
+        if signature is not None:
+            self._signatures[content_hash] = signature
+            for band, key in self._band_keys(signature):
+                self._lsh_buckets[band].setdefault(key, []).append(content_hash)
+
+    def deduplicate(self, nodes, show_progress=True):
+        """
+        Detect duplicate chunks, preserving node order
+
+        Every node gets a 'content_hash' metadata field. In 'reuse' mode
+        duplicates are kept and tagged with 'duplicate_of' (the canonical
+        content hash) and 'duplicate_type' so the embedding processor can
+        copy the canonical embedding. In 'skip' mode they are dropped.
+
+        Args:
+            nodes: List of valid nodes
+            show_progress: Whether to show progress updates
+
+        Returns:
+            tuple: (nodes_to_embed, dedup_stats)
+        """
+        start_time = time.time()
+        nodes_to_embed = []
+        total_nodes = len(nodes)
+
+        for i, node in enumerate(nodes):
+            if show_progress and i % 5000 == 0:
+                print(f"  Deduplicating chunks: {i}/{total_nodes}")
+
+            self.stats['total_chunks'] += 1
+            normalized = normalize_chunk_text(node.get_content())
+            content_hash = compute_content_hash(normalized)
+            node.metadata['content_hash'] = content_hash
+
+            duplicate_type = None
+            canonical_hash = self._exact_index.get(content_hash)
+            signature = None
+
+            if canonical_hash is not None:
+                duplicate_type = 'exact'
+                self.stats['exact_duplicates'] += 1
+            elif self.near_duplicates and normalized:
+                signature = self.compute_signature(normalized)
+                canonical_hash, _ = self._find_near_duplicate(signature)
+                if canonical_hash is not None:
+                    duplicate_type = 'near'
+                    self.stats['near_duplicates'] += 1
+
+            if duplicate_type is None:
+                self._register_canonical(content_hash, signature)
+                self.stats['unique_chunks'] += 1
+                nodes_to_embed.append(node)
+            elif self.mode == 'skip':
+                self.stats['skipped_chunks'] += 1
+            else:
+                node.metadata['duplicate_of'] = canonical_hash
+                node.metadata['duplicate_type'] = duplicate_type
+                self.reuse_sources.add(canonical_hash)
+                self.stats['reuse_candidates'] += 1
+                nodes_to_embed.append(node)
+
+        self.stats['processing_time'] += time.time() - start_time
+        return nodes_to_embed, self.get_stats()
+
+    def get_stats(self):
+        """
+        Get deduplication statistics
+
+        Returns:
+            dict: Deduplication statistics
+        """
+        total = self.stats['total_chunks']
+        duplicates = self.stats['exact_duplicates'] + self.stats['near_duplicates']
+        return {
+            **self.stats,
+            'mode': self.mode,
+            'near_duplicate_detection': self.near_duplicates,
+            'near_threshold': self.near_threshold,
+            'lsh_bands': self.bands,
+            'lsh_rows': self.rows,
+            'duplicate_rate': (duplicates / total * 100) if total > 0 else 0
+        }
+
+
+def print_dedup_statistics(dedup_stats):
+    """
+    Print chunk deduplication statistics
+
+    Args:
+        dedup_stats: Statistics from ChunkDeduplicator.get_stats()
+    """
+    print(f"\n♻️ CHUNK DEDUPLICATION STATISTICS:")
+    print(f"   Mode: {dedup_stats['mode']}")
+    print(f"   Chunks checked: {dedup_stats['total_chunks']:,}")
+    print(f"   Unique chunks: {dedup_stats['unique_chunks']:,}")
+    print(f"   Exact duplicates: {dedup_stats['exact_duplicates']:,}")
+    if dedup_stats['near_duplicate_detection']:
+        print(f"   Near duplicates (>= {dedup_stats['near_threshold']:.2f} Jaccard): {dedup_stats['near_duplicates']:,}")
+    else:
+        print(f"   Near duplicates: detection disabled")
+    print(f"   Duplicate rate: {dedup_stats['duplicate_rate']:.1f}%")
+    if dedup_stats['mode'] == 'skip':
+        print(f"   Chunks skipped: {dedup_stats['skipped_chunks']:,}")
+    else:
+        print(f"   Chunks reusing an embedding: {dedup_stats['reuse_candidates']:,}")
+    print(f"   Deduplication time: {dedup_stats['processing_time']:.2f}s")
+
+
+def create_chunk_deduplicator(dedup_settings):
+    """
+    Create a chunk deduplicator from configuration settings
+
+    Args:
+        dedup_settings: Settings from config.get_dedup_settings()
+
+    Returns:
+        ChunkDeduplicator: Configured deduplicator
+    """
+    return ChunkDeduplicator(
+        mode=dedup_settings['mode'],
+        near_duplicates=dedup_settings['near_duplicates'],
+        near_threshold=dedup_settings['near_threshold'],
+        num_perm=dedup_settings['num_perm'],
+        shingle_size=dedup_settings['shingle_size']
+    )
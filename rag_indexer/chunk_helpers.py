@@ -6,13 +6,138 @@ Contains helper functions for chunk creation, filtering, and processing
 """
 
 import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from embedding_processor import create_node_processor
 
 
+# SentenceSplitter fields needed to rebuild an equivalent parser inside a worker process
+SPLITTER_FIELDS = (
+    'chunk_size', 'chunk_overlap', 'separator', 'paragraph_separator',
+    'secondary_chunking_regex', 'include_metadata', 'include_prev_next_rel'
+)
+
+
+def get_splitter_kwargs(node_parser):
+    """
+    Extract constructor arguments for rebuilding the node parser in a worker
+    
+    Args:
+        node_parser: Node parser instance
+    
+    Returns:
+        dict or None: SentenceSplitter kwargs, None if the parser cannot be rebuilt
+    """
+    if type(node_parser).__name__ != 'SentenceSplitter':
+        return None
+    
+    return {field: getattr(node_parser, field) for field in SPLITTER_FIELDS if hasattr(node_parser, field)}
+
+
+def chunk_and_filter_shard(shard_args):
+    """
+    Worker: split, validate and enhance one shard of documents
+    
+    Runs in a separate process. Documents are parsed together so that
+    prev/next relationships between chunks of the same document are kept.
+    
+    Args:
+        shard_args: Tuple of (documents, splitter_kwargs, min_chunk_length, indexed_at)
+    
+    Returns:
+        dict: Shard results with valid nodes, invalid node info and timings
+    """
+    documents, splitter_kwargs, min_chunk_length, indexed_at = shard_args
+    from llama_index.core.node_parser import SentenceSplitter
+    
+    node_parser = SentenceSplitter(**splitter_kwargs)
+    
+    split_start = time.time()
+    nodes = node_parser.get_nodes_from_documents(documents, show_progress=False)
+    split_time = time.time() - split_start
+    
+    filter_start = time.time()
+    node_processor = create_node_processor(min_chunk_length)
+    valid_nodes, invalid_nodes = node_processor.filter_and_enhance_nodes(
+        nodes, show_progress=False, indexed_at=indexed_at
+    )
+    filter_time = time.time() - filter_start
+    
+    return {
+        'valid_nodes': valid_nodes,
+        'invalid_nodes': invalid_nodes,
+        'total_nodes': len(nodes),
+        'split_time': split_time,
+        'filter_time': filter_time
+    }
+
+
+def create_and_filter_chunks_parallel(documents, chunk_settings, splitter_kwargs):
+    """
+    Chunk and filter documents across worker processes
+    
+    Documents are sharded into contiguous ranges and results are merged in
+    shard order, so the final node order matches serial processing.
+    
+    Args:
+        documents: List of documents
+        chunk_settings: Chunk settings from config
+        splitter_kwargs: Arguments for rebuilding the node parser
+    
+    Returns:
+        tuple: (all_nodes_count, valid_nodes, invalid_nodes, chunk_time, filter_time)
+    """
+    shard_size = chunk_settings['chunking_shard_size']
+    shards = [documents[i:i + shard_size] for i in range(0, len(documents), shard_size)]
+    workers = min(chunk_settings['chunking_workers'], len(shards))
+    indexed_at = datetime.now().isoformat()
+    
+    print(f"⚡ Parallel chunking: {len(documents)} documents in {len(shards)} shards across {workers} workers")
+    
+    shard_args = [
+        (shard, splitter_kwargs, chunk_settings['min_chunk_length'], indexed_at)
+        for shard in shards
+    ]
+    
+    start_time = time.time()
+    valid_nodes = []
+    invalid_nodes = []
+    total_nodes = 0
+    split_time_sum = 0.0
+    filter_time_sum = 0.0
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard_num, result in enumerate(executor.map(chunk_and_filter_shard, shard_args), 1):
+            # Shift shard-local node indexes to global positions
+            for invalid_info in result['invalid_nodes']:
+                invalid_info['node_index'] += total_nodes
+            
+            valid_nodes.extend(result['valid_nodes'])
+            invalid_nodes.extend(result['invalid_nodes'])
+            total_nodes += result['total_nodes']
+            split_time_sum += result['split_time']
+            filter_time_sum += result['filter_time']
+            
+            if shard_num % 10 == 0 or shard_num == len(shards):
+                print(f"  Chunked shards: {shard_num}/{len(shards)} ({total_nodes:,} chunks)")
+    
+    # Split wall-clock time between the fused stages using worker-side timings
+    wall_time = time.time() - start_time
+    worker_time = split_time_sum + filter_time_sum
+    split_share = split_time_sum / worker_time if worker_time > 0 else 1.0
+    chunk_time = wall_time * split_share
+    filter_time = wall_time - chunk_time
+    
+    return total_nodes, valid_nodes, invalid_nodes, chunk_time, filter_time
+
+
 def create_and_filter_chunks_enhanced(documents, config, node_parser, progress_tracker):
     """
     Enhanced chunk creation and filtering with quality analysis
     
+    Uses parallel chunking across worker processes when enabled and the
+    document set spans more than one shard, otherwise chunks in-process.
+    
     Args:
         documents: List of documents
         config: Enhanced configuration object
@@ -23,43 +148,66 @@ def create_and_filter_chunks_enhanced(documents, config, node_parser, progress_t
         tuple: (valid_nodes, invalid_nodes, enhanced_node_stats)
     """
     print("\n🧩 Enhanced chunk creation and quality analysis...")
-    chunk_start_time = time.time()
-    
-    try:
-        # Create nodes with enhanced metadata
-        all_nodes = node_parser.get_nodes_from_documents(documents, show_progress=True)
-        progress_tracker.add_checkpoint("Enhanced chunks created", len(all_nodes))
-    except Exception as e:
-        print(f"❌ Failed to parse documents into chunks: {e}")
-        raise
-    
-    chunk_time = time.time() - chunk_start_time
-    print(f"✅ Document chunking completed in {chunk_time:.2f}s")
     
-    # Enhanced node processing with quality analysis
     chunk_settings = config.get_chunk_settings()
     node_processor = create_node_processor(chunk_settings['min_chunk_length'])
     
-    print("🔍 Applying enhanced quality filters...")
-    filter_start_time = time.time()
-    
-    valid_nodes, invalid_nodes = node_processor.filter_and_enhance_nodes(all_nodes, show_progress=True)
-    
-    filter_time = time.time() - filter_start_time
-    print(f"✅ Quality filtering completed in {filter_time:.2f}s")
+    splitter_kwargs = get_splitter_kwargs(node_parser)
+    use_parallel = (
+        chunk_settings.get('parallel_chunking', False) and
+        chunk_settings.get('chunking_workers', 1) > 1 and
+        splitter_kwargs is not None and
+        len(documents) > chunk_settings.get('chunking_shard_size', len(documents))
+    )
+    
+    parallel_result = None
+    if use_parallel:
+        try:
+            parallel_result = create_and_filter_chunks_parallel(documents, chunk_settings, splitter_kwargs)
+        except Exception as e:
+            print(f"⚠️ Parallel chunking failed, falling back to single process: {e}")
+    
+    if parallel_result is not None:
+        total_nodes_created, valid_nodes, invalid_nodes, chunk_time, filter_time = parallel_result
+        progress_tracker.add_checkpoint("Enhanced chunks created", total_nodes_created)
+        print(f"✅ Parallel chunking and quality filtering completed in {chunk_time + filter_time:.2f}s")
+        node_processor.print_invalid_nodes_report(valid_nodes, invalid_nodes)
+    else:
+        chunk_start_time = time.time()
+        
+        try:
+            # Create nodes with enhanced metadata
+            all_nodes = node_parser.get_nodes_from_documents(documents, show_progress=True)
+            progress_tracker.add_checkpoint("Enhanced chunks created", len(all_nodes))
+        except Exception as e:
+            print(f"❌ Failed to parse documents into chunks: {e}")
+            raise
+        
+        chunk_time = time.time() - chunk_start_time
+        print(f"✅ Document chunking completed in {chunk_time:.2f}s")
+        
+        print("🔍 Applying enhanced quality filters...")
+        filter_start_time = time.time()
+        
+        valid_nodes, invalid_nodes = node_processor.filter_and_enhance_nodes(all_nodes, show_progress=True)
+        total_nodes_created = len(all_nodes)
+        
+        filter_time = time.time() - filter_start_time
+        print(f"✅ Quality filtering completed in {filter_time:.2f}s")
     
     # Enhanced statistics
     enhanced_node_stats = node_processor.get_node_statistics(valid_nodes)
     
     # Add filtering statistics
     enhanced_node_stats.update({
-        'total_nodes_created': len(all_nodes),
+        'total_nodes_created': total_nodes_created,
         'valid_nodes': len(valid_nodes),
         'invalid_nodes': len(invalid_nodes),
-        'filter_success_rate': (len(valid_nodes) / len(all_nodes) * 100) if len(all_nodes) > 0 else 0,
+        'filter_success_rate': (len(valid_nodes) / total_nodes_created * 100) if total_nodes_created > 0 else 0,
         'chunk_creation_time': chunk_time,
         'filter_processing_time': filter_time,
-        'total_processing_time': chunk_time + filter_time
+        'total_processing_time': chunk_time + filter_time,
+        'parallel_chunking_used': parallel_result is not None
     })
     
     progress_tracker.add_checkpoint("Enhanced chunks filtered", len(valid_nodes))
@@ -70,6 +218,39 @@ def create_and_filter_chunks_enhanced(documents, config, node_parser, progress_t
     return valid_nodes, invalid_nodes, enhanced_node_stats
 
 
+def deduplicate_chunks_enhanced(valid_nodes, config, embedding_processor, progress_tracker):
+    """
+    Detect exact and near-duplicate chunks before embedding
+    
+    In 'reuse' mode the canonical content hashes are registered with the
+    embedding processor so duplicates copy the canonical embedding instead
+    of calling Ollama. In 'skip' mode duplicates are removed.
+    
+    Args:
+        valid_nodes: List of valid nodes
+        config: Enhanced configuration object
+        embedding_processor: EmbeddingProcessor instance
+        progress_tracker: Progress tracker instance
+    
+    Returns:
+        tuple: (nodes_to_embed, dedup_stats)
+    """
+    from chunk_deduplicator import create_chunk_deduplicator, print_dedup_statistics
+    
+    print("\n♻️ Detecting duplicate chunks before embedding...")
+    
+    deduplicator = create_chunk_deduplicator(config.get_dedup_settings())
+    nodes_to_embed, dedup_stats = deduplicator.deduplicate(valid_nodes, show_progress=True)
+    
+    if deduplicator.mode == 'reuse':
+        embedding_processor.set_reuse_sources(deduplicator.reuse_sources)
+    
+    progress_tracker.add_checkpoint("Duplicate chunks detected", len(nodes_to_embed))
+    print_dedup_statistics(dedup_stats)
+    
+    return nodes_to_embed, dedup_stats
+
+
 def print_enhanced_chunk_statistics(node_stats, invalid_nodes):
     """
     Print comprehensive chunk statistics
@@ -98,6 +279,7 @@ def print_enhanced_chunk_statistics(node_stats, invalid_nodes):
     print(f"   Chunk creation time: {node_stats['chunk_creation_time']:.2f}s")
     print(f"   Quality filtering time: {node_stats['filter_processing_time']:.2f}s")
     print(f"   Total processing time: {node_stats['total_processing_time']:.2f}s")
+    print(f"   Chunking mode: {'parallel' if node_stats.get('parallel_chunking_used') else 'single process'}")
     
     # Show sample of invalid chunk reasons
     if invalid_nodes:
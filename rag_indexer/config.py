@@ -37,6 +37,13 @@ class Config:
         self.CONNECTION_STRING = os.getenv("SUPABASE_CONNECTION_STRING")
         self.TABLE_NAME = os.getenv("TABLE_NAME", "documents")
         
+        # --- DATABASE CONNECTION POOL ---
+        self.DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+        self.DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "5"))
+        self.DB_POOL_MAX_LIFETIME = int(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+        self.DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.DB_POOL_HEALTH_CHECK_IDLE = int(os.getenv("DB_POOL_HEALTH_CHECK_IDLE", "30"))
+        
         # --- EMBEDDING SETTINGS ---
         self.EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
         self.EMBED_DIM = int(os.getenv("EMBED_DIM", "768"))
@@ -47,6 +54,41 @@ class Config:
         self.CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "128"))
         self.MIN_CHUNK_LENGTH = int(os.getenv("MIN_CHUNK_LENGTH", "50"))
         
+        # --- PARALLEL CHUNKING SETTINGS ---
+        self.ENABLE_PARALLEL_CHUNKING = os.getenv("ENABLE_PARALLEL_CHUNKING", "true").lower() == "true"
+        self.CHUNKING_WORKERS = int(os.getenv("CHUNKING_WORKERS", str(os.cpu_count() or 1)))
+        self.CHUNKING_SHARD_SIZE = int(os.getenv("CHUNKING_SHARD_SIZE", "100"))
+        
+        # --- CHUNK DEDUPLICATION SETTINGS ---
+        self.ENABLE_CHUNK_DEDUP = os.getenv("ENABLE_CHUNK_DEDUP", "true").lower() == "true"
+        self.CHUNK_DEDUP_MODE = os.getenv("CHUNK_DEDUP_MODE", "reuse").lower()  # reuse, skip
+        self.CHUNK_DEDUP_NEAR_DUPLICATES = os.getenv("CHUNK_DEDUP_NEAR_DUPLICATES", "true").lower() == "true"
+        self.CHUNK_DEDUP_NEAR_THRESHOLD = float(os.getenv("CHUNK_DEDUP_NEAR_THRESHOLD", "0.9"))
+        self.CHUNK_DEDUP_NUM_PERM = int(os.getenv("CHUNK_DEDUP_NUM_PERM", "128"))
+        self.CHUNK_DEDUP_SHINGLE_SIZE = int(os.getenv("CHUNK_DEDUP_SHINGLE_SIZE", "5"))
+        
+        # --- FILE REGISTRY SETTINGS ---
+        self.ENABLE_FILE_REGISTRY = os.getenv("ENABLE_FILE_REGISTRY", "true").lower() == "true"
+        self.FILE_REGISTRY_PATH = os.getenv("FILE_REGISTRY_PATH", "./file_registry.db")
+        
+        # --- FULL-TEXT SEARCH INDEX SETTINGS ---
+        self.ENABLE_TEXT_SEARCH_INDEX = os.getenv("ENABLE_TEXT_SEARCH_INDEX", "true").lower() == "true"
+        self.TEXT_SEARCH_CONFIG = os.getenv("TEXT_SEARCH_CONFIG", "simple").lower()  # PostgreSQL regconfig
+        self.TEXT_SEARCH_TRIGRAM = os.getenv("TEXT_SEARCH_TRIGRAM", "true").lower() == "true"
+        self.TEXT_SEARCH_BACKFILL_BATCH_SIZE = int(os.getenv("TEXT_SEARCH_BACKFILL_BATCH_SIZE", "1000"))
+        
+        # --- PERSON NAME INDEX SETTINGS ---
+        self.ENABLE_PERSON_NAME_INDEX = os.getenv("ENABLE_PERSON_NAME_INDEX", "true").lower() == "true"
+        self.PERSON_NAME_BACKFILL_BATCH_SIZE = int(os.getenv("PERSON_NAME_BACKFILL_BATCH_SIZE", "1000"))
+        
+        # --- VECTOR (ANN) INDEX SETTINGS ---
+        self.ENABLE_VECTOR_INDEX = os.getenv("ENABLE_VECTOR_INDEX", "true").lower() == "true"
+        self.VECTOR_INDEX_METHOD = os.getenv("VECTOR_INDEX_METHOD", "hnsw").lower()  # hnsw or ivfflat
+        self.HNSW_M = int(os.getenv("HNSW_M", "16"))
+        self.HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+        self.IVFFLAT_LISTS = int(os.getenv("IVFFLAT_LISTS", "0"))  # 0 = derive from row count
+        self.VECTOR_INDEX_MAINTENANCE_WORK_MEM = os.getenv("VECTOR_INDEX_MAINTENANCE_WORK_MEM", "")  # e.g. '1GB'
+        
         # --- BATCH PROCESSING SETTINGS ---
         self.PROCESSING_BATCH_SIZE = int(os.getenv("PROCESSING_BATCH_SIZE", "50"))
         self.EMBEDDING_BATCH_SIZE = int(os.getenv("BATCH_SIZE", "5"))
@@ -134,6 +176,12 @@ class Config:
         self.AUTO_CONVERT_DOC = os.getenv("AUTO_CONVERT_DOC", "true").lower() == "true"
         self.BACKUP_ORIGINAL_DOC = os.getenv("BACKUP_ORIGINAL_DOC", "true").lower() == "true"
         self.DELETE_ORIGINAL_DOC = os.getenv("DELETE_ORIGINAL_DOC", "false").lower() == "true"
+        self.DOC_BACKUP_STRATEGY = os.getenv("DOC_BACKUP_STRATEGY", "auto").lower()  # auto, link, reflink, rename, copy
+        self.DOC_CONVERSION_ENGINE = os.getenv("DOC_CONVERSION_ENGINE", "auto").lower()  # auto, uno, cli, single
+        self.DOC_CONVERSION_WORKERS = int(os.getenv("DOC_CONVERSION_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.DOC_CONVERSION_BATCH_SIZE = int(os.getenv("DOC_CONVERSION_BATCH_SIZE", "50"))
+        self.DOC_CONVERSION_TIMEOUT = int(os.getenv("DOC_CONVERSION_TIMEOUT", "60"))
+        self.DOC_CONVERSION_UNO_PORT = int(os.getenv("DOC_CONVERSION_UNO_PORT", "2002"))
         
         # --- BATCH RESTART SETTINGS ---
         self.BATCH_RESTART_INTERVAL = int(os.getenv("BATCH_RESTART_INTERVAL", "5"))
@@ -145,6 +193,28 @@ class Config:
         if not self.CONNECTION_STRING:
             raise ValueError("SUPABASE_CONNECTION_STRING not found in .env file!")
         
+        # Interpolated into trigger DDL, so only plain identifiers are accepted
+        if not self.TEXT_SEARCH_CONFIG.replace('_', '').isalnum():
+            raise ValueError(f"Invalid TEXT_SEARCH_CONFIG: {self.TEXT_SEARCH_CONFIG}")
+        
+        if self.TEXT_SEARCH_BACKFILL_BATCH_SIZE < 1:
+            raise ValueError("TEXT_SEARCH_BACKFILL_BATCH_SIZE must be at least 1")
+        
+        if self.PERSON_NAME_BACKFILL_BATCH_SIZE < 1:
+            raise ValueError("PERSON_NAME_BACKFILL_BATCH_SIZE must be at least 1")
+        
+        if self.VECTOR_INDEX_METHOD not in ('hnsw', 'ivfflat'):
+            raise ValueError(f"Invalid VECTOR_INDEX_METHOD: {self.VECTOR_INDEX_METHOD} (use hnsw or ivfflat)")
+        
+        if self.HNSW_M < 2 or self.HNSW_EF_CONSTRUCTION < 2 * self.HNSW_M:
+            raise ValueError("HNSW_M must be at least 2 and HNSW_EF_CONSTRUCTION at least 2 * HNSW_M")
+        
+        if self.IVFFLAT_LISTS < 0:
+            raise ValueError("IVFFLAT_LISTS must be 0 (auto) or positive")
+        
+        if self.DB_POOL_MAX_SIZE < 1 or not 0 <= self.DB_POOL_MIN_SIZE <= self.DB_POOL_MAX_SIZE:
+            raise ValueError("DB_POOL_MIN_SIZE must be between 0 and DB_POOL_MAX_SIZE (at least 1)")
+        
         if not os.path.exists(self.DOCUMENTS_DIR):
             raise ValueError(f"Documents directory does not exist: {self.DOCUMENTS_DIR}")
         
@@ -167,6 +237,25 @@ class Config:
         if self.DB_BATCH_SIZE < 1:
             raise ValueError("DB_BATCH_SIZE must be at least 1")
         
+        if self.CHUNKING_WORKERS < 1:
+            raise ValueError("CHUNKING_WORKERS must be at least 1")
+        
+        if self.CHUNKING_SHARD_SIZE < 1:
+            raise ValueError("CHUNKING_SHARD_SIZE must be at least 1")
+        
+        if self.CHUNK_DEDUP_MODE not in ["reuse", "skip"]:
+            print(f"WARNING: Invalid CHUNK_DEDUP_MODE: {self.CHUNK_DEDUP_MODE}, using 'reuse'")
+            self.CHUNK_DEDUP_MODE = "reuse"
+        
+        if self.CHUNK_DEDUP_NEAR_THRESHOLD <= 0 or self.CHUNK_DEDUP_NEAR_THRESHOLD > 1:
+            raise ValueError("CHUNK_DEDUP_NEAR_THRESHOLD must be between 0 and 1")
+        
+        if self.CHUNK_DEDUP_NUM_PERM < 16:
+            raise ValueError("CHUNK_DEDUP_NUM_PERM must be at least 16")
+        
+        if self.CHUNK_DEDUP_SHINGLE_SIZE < 1:
+            raise ValueError("CHUNK_DEDUP_SHINGLE_SIZE must be at least 1")
+        
         # NEW: Validate OCR rotation settings
         if self.OCR_ROTATION_QUALITY_THRESHOLD < 0 or self.OCR_ROTATION_QUALITY_THRESHOLD > 1:
             raise ValueError("OCR_ROTATION_QUALITY_THRESHOLD must be between 0 and 1")
@@ -209,10 +298,24 @@ class Config:
         if self.PDF_MIN_CONTENT_LENGTH < 10:
             print("WARNING: PDF_MIN_CONTENT_LENGTH is very low")
         
+        if self.DOC_CONVERSION_ENGINE not in ["auto", "uno", "cli", "single"]:
+            print(f"WARNING: Invalid DOC_CONVERSION_ENGINE: {self.DOC_CONVERSION_ENGINE}, using 'auto'")
+            self.DOC_CONVERSION_ENGINE = "auto"
+        
+        if self.DOC_CONVERSION_WORKERS < 1:
+            raise ValueError("DOC_CONVERSION_WORKERS must be at least 1")
+        
+        if self.DOC_CONVERSION_BATCH_SIZE < 1:
+            raise ValueError("DOC_CONVERSION_BATCH_SIZE must be at least 1")
+        
         # NEW: Validate backup settings
         if not self.DOC_BACKUP_BASE_NAME:
             raise ValueError("DOC_BACKUP_BASE_NAME cannot be empty")
         
+        if self.DOC_BACKUP_STRATEGY not in ["auto", "link", "reflink", "rename", "copy"]:
+            print(f"WARNING: Invalid DOC_BACKUP_STRATEGY: {self.DOC_BACKUP_STRATEGY}, using 'auto'")
+            self.DOC_BACKUP_STRATEGY = "auto"
+        
         if len(self.BLACKLIST_DIRECTORIES) == 0:
             print("WARNING: No directories in blacklist - all directories will be scanned")
     
@@ -243,16 +346,24 @@ class Config:
         """Print current configuration in a readable format"""
         print("=== ENHANCED RAG INDEXER CONFIGURATION ===")
         print(f"Documents directory: {self.DOCUMENTS_DIR}")
-        print(f"Backup directory: {self.get_backup_directory()}")
+        print(f"Backup directory: {self.get_backup_directory()} (strategy: {self.DOC_BACKUP_STRATEGY})")
         print(f"Blacklisted directories: {', '.join(self.BLACKLIST_DIRECTORIES)}")
         print(f"Embedding model: {self.EMBED_MODEL} (CPU-optimized)")
         print(f"Chunk size: {self.CHUNK_SIZE}, Overlap: {self.CHUNK_OVERLAP}")
+        print(f"Parallel chunking: {'?' if self.ENABLE_PARALLEL_CHUNKING else '?'} ({self.CHUNKING_WORKERS} workers, {self.CHUNKING_SHARD_SIZE} docs per shard)")
         print(f"Vector dimension: {self.EMBED_DIM}")
+        print(f"Chunk deduplication: {'?' if self.ENABLE_CHUNK_DEDUP else '?'} (mode: {self.CHUNK_DEDUP_MODE}, near threshold: {self.CHUNK_DEDUP_NEAR_THRESHOLD})")
+        print(f"File registry: {'?' if self.ENABLE_FILE_REGISTRY else '?'} ({self.FILE_REGISTRY_PATH})")
+        print(f"Text search index: {'?' if self.ENABLE_TEXT_SEARCH_INDEX else '?'} (config: {self.TEXT_SEARCH_CONFIG}, trigram: {'?' if self.TEXT_SEARCH_TRIGRAM else '?'})")
+        print(f"Person name index: {'?' if self.ENABLE_PERSON_NAME_INDEX else '?'}")
+        vector_index_params = f"m={self.HNSW_M}, ef_construction={self.HNSW_EF_CONSTRUCTION}" if self.VECTOR_INDEX_METHOD == 'hnsw' else f"lists={self.IVFFLAT_LISTS or 'auto'}"
+        print(f"Vector index: {'?' if self.ENABLE_VECTOR_INDEX else '?'} ({self.VECTOR_INDEX_METHOD}, {vector_index_params})")
+        print(f"Database pool: {self.DB_POOL_MIN_SIZE}-{self.DB_POOL_MAX_SIZE} connections (max lifetime: {self.DB_POOL_MAX_LIFETIME}s)")
         print(f"Batch processing: {self.PROCESSING_BATCH_SIZE} chunks per batch")
         print(f"Batch restart interval: {self.BATCH_RESTART_INTERVAL} batches")
         print(f"Enhanced features:")
         print(f"  - Advanced document parsing: {'?' if self.ENABLE_ADVANCED_DOC_PARSING else '?'}")
-        print(f"  - Auto .doc conversion: {'?' if self.AUTO_CONVERT_DOC else '?'}")
+        print(f"  - Auto .doc conversion: {'?' if self.AUTO_CONVERT_DOC else '?'} (engine: {self.DOC_CONVERSION_ENGINE}, {self.DOC_CONVERSION_WORKERS} workers)")
         print(f"  - OCR auto-rotation: {'?' if self.OCR_AUTO_ROTATION else '?'}")
         print(f"  - Text quality analysis: {'?' if self.ENABLE_TEXT_QUALITY_ANALYSIS else '?'}")
         print(f"  - Hybrid text+image processing: {'?' if self.HYBRID_TEXT_IMAGE_PROCESSING else '?'}")
@@ -281,7 +392,75 @@ class Config:
         return {
             'chunk_size': self.CHUNK_SIZE,
             'chunk_overlap': self.CHUNK_OVERLAP,
-            'min_chunk_length': self.MIN_CHUNK_LENGTH
+            'min_chunk_length': self.MIN_CHUNK_LENGTH,
+            'parallel_chunking': self.ENABLE_PARALLEL_CHUNKING,
+            'chunking_workers': self.CHUNKING_WORKERS,
+            'chunking_shard_size': self.CHUNKING_SHARD_SIZE
+        }
+    
+    def get_dedup_settings(self):
+        """Return chunk deduplication settings as a dictionary"""
+        return {
+            'enabled': self.ENABLE_CHUNK_DEDUP,
+            'mode': self.CHUNK_DEDUP_MODE,
+            'near_duplicates': self.CHUNK_DEDUP_NEAR_DUPLICATES,
+            'near_threshold': self.CHUNK_DEDUP_NEAR_THRESHOLD,
+            'num_perm': self.CHUNK_DEDUP_NUM_PERM,
+            'shingle_size': self.CHUNK_DEDUP_SHINGLE_SIZE
+        }
+    
+    def get_conversion_settings(self):
+        """Return .doc to .docx conversion engine settings as a dictionary"""
+        return {
+            'engine': self.DOC_CONVERSION_ENGINE,
+            'workers': self.DOC_CONVERSION_WORKERS,
+            'batch_size': self.DOC_CONVERSION_BATCH_SIZE,
+            'timeout': self.DOC_CONVERSION_TIMEOUT,
+            'uno_base_port': self.DOC_CONVERSION_UNO_PORT
+        }
+    
+    def get_database_pool_settings(self):
+        """Return database connection pool settings as a dictionary"""
+        return {
+            'min_size': self.DB_POOL_MIN_SIZE,
+            'max_size': self.DB_POOL_MAX_SIZE,
+            'max_lifetime': self.DB_POOL_MAX_LIFETIME,
+            'timeout': self.DB_POOL_TIMEOUT,
+            'health_check_idle': self.DB_POOL_HEALTH_CHECK_IDLE
+        }
+    
+    def get_text_search_settings(self):
+        """Return full-text search index settings as a dictionary"""
+        return {
+            'enabled': self.ENABLE_TEXT_SEARCH_INDEX,
+            'ts_config': self.TEXT_SEARCH_CONFIG,
+            'enable_trigram': self.TEXT_SEARCH_TRIGRAM,
+            'backfill_batch_size': self.TEXT_SEARCH_BACKFILL_BATCH_SIZE
+        }
+    
+    def get_person_name_index_settings(self):
+        """Return person name index settings as a dictionary"""
+        return {
+            'enabled': self.ENABLE_PERSON_NAME_INDEX,
+            'backfill_batch_size': self.PERSON_NAME_BACKFILL_BATCH_SIZE
+        }
+    
+    def get_vector_index_settings(self):
+        """Return vector (ANN) index settings as a dictionary"""
+        return {
+            'enabled': self.ENABLE_VECTOR_INDEX,
+            'method': self.VECTOR_INDEX_METHOD,
+            'hnsw_m': self.HNSW_M,
+            'hnsw_ef_construction': self.HNSW_EF_CONSTRUCTION,
+            'ivfflat_lists': self.IVFFLAT_LISTS,
+            'maintenance_work_mem': self.VECTOR_INDEX_MAINTENANCE_WORK_MEM
+        }
+    
+    def get_file_registry_settings(self):
+        """Return content-addressed file registry settings as a dictionary"""
+        return {
+            'enabled': self.ENABLE_FILE_REGISTRY,
+            'registry_path': self.FILE_REGISTRY_PATH
         }
     
     def get_embedding_settings(self):
@@ -369,6 +548,7 @@ class Config:
             'backup_original_doc': self.BACKUP_ORIGINAL_DOC,
             'delete_original_doc': self.DELETE_ORIGINAL_DOC,
             'backup_directory': self.get_backup_directory(),
+            'backup_strategy': self.DOC_BACKUP_STRATEGY,
             'blacklist_directories': self.BLACKLIST_DIRECTORIES
         }
     
@@ -415,6 +595,11 @@ class Config:
             'structure_preservation': self.PRESERVE_DOC_STRUCTURE,
             'progress_logging': self.ENABLE_PROGRESS_LOGGING,
             'auto_convert_doc': self.AUTO_CONVERT_DOC,
+            'chunk_dedup': self.ENABLE_CHUNK_DEDUP,
+            'file_registry': self.ENABLE_FILE_REGISTRY,
+            'text_search_index': self.ENABLE_TEXT_SEARCH_INDEX,
+            'person_name_index': self.ENABLE_PERSON_NAME_INDEX,
+            'vector_index': self.ENABLE_VECTOR_INDEX,
             'enhanced_pdf_processing': self.ENABLE_ENHANCED_PDF_PROCESSING,
             'pdf_auto_method_selection': self.PDF_AUTO_METHOD_SELECTION,
             'pdf_table_extraction': self.PDF_ENABLE_TABLE_EXTRACTION,
@@ -458,6 +643,11 @@ def print_feature_status():
         ("PDF Auto Method Selection", config.is_feature_enabled('pdf_auto_method_selection')),
         ("PDF Table Extraction", config.is_feature_enabled('pdf_table_extraction')),
         ("PDF OCR Fallback", config.is_feature_enabled('pdf_ocr_fallback')),
+        ("Chunk Deduplication", config.is_feature_enabled('chunk_dedup')),
+        ("File Registry (content dedup)", config.is_feature_enabled('file_registry')),
+        ("Full-Text Search Index", config.is_feature_enabled('text_search_index')),
+        ("Person Name Index", config.is_feature_enabled('person_name_index')),
+        ("Vector ANN Index", config.is_feature_enabled('vector_index')),
         ("Progress Logging", config.is_feature_enabled('progress_logging')),
     ]
     
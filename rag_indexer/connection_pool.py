@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Connection pool module for RAG Document Indexer
+Reuses PostgreSQL connections across DatabaseManager operations instead of
+paying the TLS and authentication handshake on every query
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+import psycopg2
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the pool timeout"""
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe PostgreSQL connection pool with health checks and max-lifetime"""
+    
+    def __init__(self, connection_string, min_size=1, max_size=5, max_lifetime=1800,
+                 timeout=30, health_check_idle=30):
+        """
+        Initialize connection pool
+        
+        psycopg2's ThreadedConnectionPool closes every connection returned above
+        minconn and raises when exhausted, so idle connections are kept in a
+        LIFO list and a semaphore makes callers wait for a free slot.
+        
+        Args:
+            connection_string: PostgreSQL connection string
+            min_size: Connections opened up front
+            max_size: Maximum simultaneous connections
+            max_lifetime: Seconds after which a connection is closed and replaced
+            timeout: Seconds to wait for a free connection
+            health_check_idle: Connections idle longer than this are checked with SELECT 1
+        """
+        self.connection_string = connection_string
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_idle = health_check_idle
+        
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._created_at = {}
+        self._last_used = {}
+        self._open_connections = 0
+        self._closed = False
+        
+        self.stats = {
+            'checkouts': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'checkout_time_total': 0.0,
+            'checkout_time_max': 0.0,
+            'connections_created': 0,
+            'connections_recycled': 0,
+            'health_check_failures': 0,
+            'timeouts': 0
+        }
+        
+        for _ in range(self.min_size):
+            conn = self._connect()
+            self._last_used[id(conn)] = time.time()
+            self._idle.append(conn)
+    
+    def _connect(self):
+        """Open a new connection"""
+        conn = psycopg2.connect(self.connection_string)
+        with self._lock:
+            self._created_at[id(conn)] = time.time()
+            self._open_connections += 1
+            self.stats['connections_created'] += 1
+        return conn
+    
+    def _needs_replacement(self, conn):
+        """Check whether an idle connection is closed, too old or fails its health check"""
+        if conn.closed:
+            return True
+        
+        now = time.time()
+        conn_id = id(conn)
+        if self.max_lifetime and now - self._created_at.get(conn_id, now) > self.max_lifetime:
+            return True
+        
+        if now - self._last_used.get(conn_id, now) > self.health_check_idle:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                with self._lock:
+                    self.stats['health_check_failures'] += 1
+                return True
+        
+        return False
+    
+    def _discard(self, conn):
+        """Close a connection and forget it"""
+        conn_id = id(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass  # Server may already have dropped it
+        with self._lock:
+            self._created_at.pop(conn_id, None)
+            self._last_used.pop(conn_id, None)
+            self._open_connections -= 1
+            self.stats['connections_recycled'] += 1
+    
+    def _checkout(self):
+        """
+        Take a healthy connection from the pool, waiting up to the pool timeout
+        
+        Returns:
+            tuple: (connection, checkout_start_time)
+        """
+        if self._closed:
+            raise PoolTimeoutError("Connection pool is closed")
+        
+        wait_start = time.time()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.stats['timeouts'] += 1
+            raise PoolTimeoutError(f"No database connection available within {self.timeout}s")
+        
+        try:
+            conn = None
+            while conn is None:
+                with self._lock:
+                    candidate = self._idle.pop() if self._idle else None
+                
+                if candidate is None:
+                    conn = self._connect()
+                elif self._needs_replacement(candidate):
+                    self._discard(candidate)
+                else:
+                    conn = candidate
+        except Exception:
+            self._slots.release()
+            raise
+        
+        checkout_start = time.time()
+        wait_time = checkout_start - wait_start
+        with self._lock:
+            self.stats['checkouts'] += 1
+            self.stats['wait_time_total'] += wait_time
+            self.stats['wait_time_max'] = max(self.stats['wait_time_max'], wait_time)
+        
+        return conn, checkout_start
+    
+    def _release(self, conn, checkout_start):
+        """Return a connection to the pool, discarding it if it is broken"""
+        checkout_time = time.time() - checkout_start
+        with self._lock:
+            self.stats['checkout_time_total'] += checkout_time
+            self.stats['checkout_time_max'] = max(self.stats['checkout_time_max'], checkout_time)
+        
+        try:
+            if self._closed or conn.closed:
+                self._discard(conn)
+                return
+            
+            status = conn.get_transaction_status()
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn)
+                return
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            
+            with self._lock:
+                self._last_used[id(conn)] = time.time()
+                self._idle.append(conn)
+        except psycopg2.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+    
+    @contextmanager
+    def connection(self):
+        """
+        Check out a pooled connection
+        
+        Commits on success and rolls back on error like `with psycopg2.connect(...)`,
+        then returns the connection to the pool instead of leaving it open.
+        
+        Yields:
+            psycopg2 connection
+        """
+        conn, checkout_start = self._checkout()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._release(conn, checkout_start)
+    
+    def get_stats(self):
+        """
+        Get pool statistics including wait and checkout times
+        
+        Returns:
+            dict: Pool statistics
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats['open_connections'] = self._open_connections
+            stats['idle_connections'] = len(self._idle)
+        
+        checkouts = stats['checkouts']
+        stats['max_size'] = self.max_size
+        stats['avg_wait_ms'] = (stats['wait_time_total'] / checkouts * 1000) if checkouts else 0.0
+        stats['avg_checkout_ms'] = (stats['checkout_time_total'] / checkouts * 1000) if checkouts else 0.0
+        return stats
+    
+    def close(self):
+        """Close idle connections; checked-out connections are closed when returned"""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+
+def print_pool_statistics(pool_stats):
+    """
+    Print connection pool statistics
+    
+    Args:
+        pool_stats: Statistics from ConnectionPool.get_stats()
+    """
+    print(f"\nCONNECTION POOL STATISTICS:")
+    print(f"   Checkouts: {pool_stats['checkouts']:,}")
+    print(f"   Connections opened: {pool_stats['connections_created']} "
+          f"(recycled: {pool_stats['connections_recycled']}, max: {pool_stats['max_size']})")
+    print(f"   Average wait: {pool_stats['avg_wait_ms']:.1f}ms (max: {pool_stats['wait_time_max'] * 1000:.1f}ms)")
+    print(f"   Average checkout: {pool_stats['avg_checkout_ms']:.1f}ms (max: {pool_stats['checkout_time_max'] * 1000:.1f}ms)")
+    if pool_stats['timeouts'] or pool_stats['health_check_failures']:
+        print(f"   Timeouts: {pool_stats['timeouts']}, failed health checks: {pool_stats['health_check_failures']}")
+
+
+def create_connection_pool(connection_string, pool_settings=None):
+    """
+    Create a connection pool from configuration settings
+    
+    Args:
+        connection_string: PostgreSQL connection string
+        pool_settings: Settings from config.get_database_pool_settings() (defaults if None)
+    
+    Returns:
+        ConnectionPool: Connection pool
+    """
+    pool_settings = pool_settings or {}
+    return ConnectionPool(
+        connection_string,
+        min_size=pool_settings.get('min_size', 1),
+        max_size=pool_settings.get('max_size', 5),
+        max_lifetime=pool_settings.get('max_lifetime', 1800),
+        timeout=pool_settings.get('timeout', 30),
+        health_check_idle=pool_settings.get('health_check_idle', 30)
+    )
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LibreOffice conversion engine for RAG Document Indexer
+Keeps long-lived headless soffice instances (UNO listeners, one user profile each)
+and spreads .doc -> .docx conversions across them in parallel. Falls back to
+batched CLI invocations that convert many files per soffice start.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# --- UNO IMPORTS ---
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.connection import NoConnectException
+    UNO_AVAILABLE = True
+except ImportError:
+    UNO_AVAILABLE = False
+
+
+DOCX_FILTER_NAME = "MS Word 2007 XML"
+CONVERSION_ENGINES = ('auto', 'uno', 'cli', 'single')
+
+
+def find_soffice_binary():
+    """
+    Locate the LibreOffice executable
+
+    Returns:
+        str: Path to soffice/libreoffice, or None if not installed
+    """
+    for name in ('soffice', 'libreoffice'):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def _profile_option(profile_dir):
+    """Build the -env option that gives a soffice process its own user profile"""
+    return f"-env:UserInstallation={Path(profile_dir).resolve().as_uri()}"
+
+
+def _uno_property(name, value):
+    """Create a UNO PropertyValue"""
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+class SofficeInstance:
+    """One headless soffice process listening for UNO connections"""
+
+    def __init__(self, soffice_binary, port, profile_dir, startup_timeout=60):
+        """
+        Initialize soffice instance (call start() to launch)
+
+        Args:
+            soffice_binary: Path to soffice executable
+            port: Local TCP port for the UNO listener
+            profile_dir: Private user profile directory for this instance
+            startup_timeout: Seconds to wait for the listener to accept connections
+        """
+        self.soffice_binary = soffice_binary
+        self.port = port
+        self.profile_dir = profile_dir
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.desktop = None
+        self.broken = False
+        self.conversions = 0
+
+    def start(self):
+        """Launch soffice and connect to its desktop over UNO"""
+        cmd = [
+            self.soffice_binary,
+            '--headless', '--invisible', '--nologo', '--norestore', '--nodefault', '--nolockcheck',
+            _profile_option(self.profile_dir),
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        ]
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        connect_url = f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        deadline = time.time() + self.startup_timeout
+
+        while True:
+            try:
+                context = resolver.resolve(connect_url)
+                break
+            except NoConnectException:
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"soffice on port {self.port} exited during startup")
+                if time.time() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"soffice on port {self.port} did not start within {self.startup_timeout}s")
+                time.sleep(0.5)
+
+        self.desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+    def convert(self, doc_path, docx_path):
+        """
+        Convert one document through the running instance
+
+        Args:
+            doc_path: Source .doc path
+            docx_path: Target .docx path
+        """
+        document = self.desktop.loadComponentFromURL(
+            Path(doc_path).resolve().as_uri(), "_blank", 0,
+            (_uno_property("Hidden", True), _uno_property("ReadOnly", True))
+        )
+        if document is None:
+            raise RuntimeError("LibreOffice could not open the document")
+
+        try:
+            document.storeToURL(
+                Path(docx_path).resolve().as_uri(),
+                (_uno_property("FilterName", DOCX_FILTER_NAME), _uno_property("Overwrite", True))
+            )
+            self.conversions += 1
+        finally:
+            document.close(True)
+
+    def is_alive(self):
+        """Check whether the soffice process is still running"""
+        return self.process is not None and self.process.poll() is None
+
+    def kill(self):
+        """Kill the soffice process (used by the conversion watchdog)"""
+        if self.is_alive():
+            self.process.kill()
+
+    def stop(self):
+        """Terminate soffice gracefully, killing it if it does not exit"""
+        try:
+            if self.desktop is not None and self.is_alive():
+                self.desktop.terminate()
+        except Exception:
+            pass  # Bridge may already be gone
+
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+        self.desktop = None
+        self.process = None
+
+    def restart(self):
+        """Restart a crashed or hung instance"""
+        self.stop()
+        self.start()
+
+
+class UnoConversionPool:
+    """Pool of long-lived soffice instances converting documents in parallel"""
+
+    def __init__(self, num_instances=2, base_port=2002, timeout=60, soffice_binary=None):
+        """
+        Initialize conversion pool
+
+        Args:
+            num_instances: Number of soffice instances to run
+            base_port: First UNO listener port (one port per instance)
+            timeout: Per-document conversion timeout in seconds
+            soffice_binary: Path to soffice executable (auto-detected if None)
+        """
+        self.num_instances = max(1, num_instances)
+        self.base_port = base_port
+        self.timeout = timeout
+        self.soffice_binary = soffice_binary or find_soffice_binary()
+        self.instances = []
+        self.profile_root = None
+        self._idle = queue.Queue()
+        self.stats = {
+            'instances_started': 0,
+            'restarts': 0,
+            'timeouts': 0
+        }
+
+    def start(self):
+        """
+        Start soffice instances, each with its own user profile
+
+        Raises:
+            RuntimeError: If UNO is unavailable or no instance could be started
+        """
+        if not UNO_AVAILABLE:
+            raise RuntimeError("Python UNO bindings not available (install python3-uno)")
+        if not self.soffice_binary:
+            raise RuntimeError("soffice executable not found")
+
+        self.profile_root = tempfile.mkdtemp(prefix="rag_soffice_")
+
+        for i in range(self.num_instances):
+            instance = SofficeInstance(
+                self.soffice_binary,
+                self.base_port + i,
+                os.path.join(self.profile_root, f"profile_{i}")
+            )
+            try:
+                instance.start()
+            except Exception as e:
+                print(f"   WARNING: Could not start soffice instance on port {instance.port}: {e}")
+                continue
+            self.instances.append(instance)
+            self._idle.put(instance)
+
+        self.stats['instances_started'] = len(self.instances)
+        if not self.instances:
+            self.stop()
+            raise RuntimeError("No soffice instance could be started")
+
+        return self
+
+    def _convert_job(self, job):
+        """Convert one (doc_path, docx_path) job on the next idle instance"""
+        doc_path, docx_path = job
+        instance = self._idle.get()
+        if instance.broken:
+            self._idle.put(instance)
+            return doc_path, (False, None, f"soffice instance on port {instance.port} unavailable")
+
+        # Watchdog: a hung conversion is killed so the blocking UNO call returns
+        watchdog = threading.Timer(self.timeout, instance.kill)
+        watchdog.start()
+
+        try:
+            instance.convert(doc_path, docx_path)
+            if Path(docx_path).exists():
+                return doc_path, (True, Path(docx_path), None)
+            return doc_path, (False, None, "Converted file not found")
+        except Exception as e:
+            if not instance.is_alive():
+                self.stats['timeouts'] += 1
+                return doc_path, (False, None, f"LibreOffice conversion timed out or crashed: {e}")
+            return doc_path, (False, None, f"LibreOffice UNO error: {e}")
+        finally:
+            watchdog.cancel()
+            if not instance.is_alive():
+                try:
+                    instance.restart()
+                    self.stats['restarts'] += 1
+                except Exception as e:
+                    instance.broken = True
+                    print(f"   WARNING: soffice instance on port {instance.port} could not be restarted: {e}")
+            self._idle.put(instance)
+
+    def convert_many(self, jobs):
+        """
+        Convert documents in parallel across all instances
+
+        Args:
+            jobs: List of (doc_path, docx_path) tuples
+
+        Returns:
+            dict: doc_path -> (success, docx_path, error_message)
+        """
+        with ThreadPoolExecutor(max_workers=len(self.instances)) as executor:
+            return dict(executor.map(self._convert_job, jobs))
+
+    def stop(self):
+        """Stop all instances and remove their temporary profiles"""
+        for instance in self.instances:
+            instance.stop()
+        self.instances = []
+        if self.profile_root:
+            shutil.rmtree(self.profile_root, ignore_errors=True)
+            self.profile_root = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def convert_batch_cli(jobs, batch_size=50, workers=2, timeout=60, soffice_binary=None):
+    """
+    Convert documents with batched soffice CLI calls (many files per process start)
+
+    Files are grouped by output directory because --outdir applies to the whole
+    call. Parallel calls each get their own user profile so they do not block
+    on the shared profile lock.
+
+    Args:
+        jobs: List of (doc_path, docx_path) tuples; docx_path must be <outdir>/<stem>.docx
+        batch_size: Maximum number of files per soffice call
+        workers: Number of soffice calls to run in parallel
+        timeout: Per-document timeout in seconds (scaled by batch length)
+        soffice_binary: Path to soffice executable (auto-detected if None)
+
+    Returns:
+        dict: doc_path -> (success, docx_path, error_message)
+    """
+    soffice_binary = soffice_binary or find_soffice_binary()
+    if not soffice_binary:
+        return {doc_path: (False, None, "soffice executable not found") for doc_path, _ in jobs}
+
+    by_outdir = {}
+    for doc_path, docx_path in jobs:
+        by_outdir.setdefault(str(Path(docx_path).parent), []).append((doc_path, docx_path))
+
+    batches = []
+    for outdir, outdir_jobs in by_outdir.items():
+        for start in range(0, len(outdir_jobs), max(1, batch_size)):
+            batches.append((outdir, outdir_jobs[start:start + batch_size]))
+
+    profile_root = tempfile.mkdtemp(prefix="rag_soffice_cli_")
+    profiles = queue.Queue()
+    for i in range(max(1, workers)):
+        profiles.put(os.path.join(profile_root, f"profile_{i}"))
+
+    def run_batch(batch):
+        outdir, batch_jobs = batch
+        profile_dir = profiles.get()
+        cmd = [
+            soffice_binary, '--headless', '--norestore', '--nolockcheck',
+            _profile_option(profile_dir),
+            '--convert-to', 'docx', '--outdir', outdir
+        ] + [str(doc_path) for doc_path, _ in batch_jobs]
+
+        error = None
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout * len(batch_jobs))
+            if result.returncode != 0:
+                error = (result.stderr or "LibreOffice conversion failed").strip()[-500:]
+        except subprocess.TimeoutExpired:
+            error = "LibreOffice batch conversion timed out"
+        except Exception as e:
+            error = f"LibreOffice error: {str(e)}"
+        finally:
+            profiles.put(profile_dir)
+
+        # Success is judged per file: a batch can partially succeed
+        batch_results = []
+        for doc_path, docx_path in batch_jobs:
+            if Path(docx_path).exists():
+                batch_results.append((doc_path, (True, Path(docx_path), None)))
+            else:
+                batch_results.append((doc_path, (False, None, error or "Converted file not found")))
+        return batch_results
+
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for batch_results in executor.map(run_batch, batches):
+                results.update(batch_results)
+    finally:
+        shutil.rmtree(profile_root, ignore_errors=True)
+
+    return results
@@ -6,10 +6,12 @@ Handles PostgreSQL operations, record checking, safe deletion, and end-to-end fi
 """
 
 import os
+import json
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
 import sys
+from connection_pool import create_connection_pool
 
 
 def get_user_confirmation(prompt, default_no=True):
@@ -76,6 +78,18 @@ def get_files_in_database(connection_string, table_name="documents"):
                     if file_name:
                         files_in_db.add(file_name)
                 
+                # Alias copies registered by the file registry share the canonical records
+                cur.execute(f"""
+                    SELECT DISTINCT jsonb_array_elements_text(metadata->'alias_paths') as alias_path
+                    FROM vecs.{table_name}
+                    WHERE jsonb_typeof(metadata->'alias_paths') = 'array'
+                """)
+                
+                for row in cur.fetchall():
+                    alias_path = row['alias_path']
+                    files_in_db.add(os.path.normpath(os.path.abspath(alias_path)))
+                    files_in_db.add(os.path.basename(alias_path))
+                
                 print(f"?? Found {len(files_in_db)} unique files in database")
                 
     except Exception as e:
@@ -137,7 +151,8 @@ def analyze_missing_file(file_path):
     return f"{file_name} - PROCESSING_PIPELINE_FAILURE (file looks valid but failed somewhere in the pipeline)"
 
 
-def compare_directory_with_database(directory_path, connection_string, table_name="documents", recursive=True):
+def compare_directory_with_database(directory_path, connection_string, table_name="documents", recursive=True,
+                                    snapshot=None):
     """
     Compare files in directory with files actually stored in database
     
@@ -146,6 +161,7 @@ def compare_directory_with_database(directory_path, connection_string, table_nam
         connection_string: PostgreSQL connection string
         table_name: Name of the documents table
         recursive: Whether to scan directory recursively
+        snapshot: Optional DirectorySnapshot from the loading stage (avoids another walk)
     
     Returns:
         dict: Comprehensive comparison results
@@ -156,7 +172,7 @@ def compare_directory_with_database(directory_path, connection_string, table_nam
     from file_utils import scan_files_in_directory
     
     # Step 1: Get all files in directory
-    all_files_in_dir = scan_files_in_directory(directory_path, recursive)
+    all_files_in_dir = scan_files_in_directory(directory_path, recursive, snapshot=snapshot)
     
     # Normalize all directory file paths
     normalized_dir_files = set()
@@ -218,22 +234,24 @@ def compare_directory_with_database(directory_path, connection_string, table_nam
 class DatabaseManager:
     """Database manager for handling PostgreSQL operations"""
     
-    def __init__(self, connection_string, table_name="documents"):
+    def __init__(self, connection_string, table_name="documents", pool_settings=None):
         """
         Initialize database manager
         
         Args:
             connection_string: PostgreSQL connection string
             table_name: Name of the documents table
+            pool_settings: Connection pool settings from config.get_database_pool_settings()
         """
         self.connection_string = connection_string
         self.table_name = table_name
+        self.pool = create_connection_pool(connection_string, pool_settings)
         self._test_connection()
     
     def _test_connection(self):
         """Test database connection and validate setup"""
         try:
-            with psycopg2.connect(self.connection_string) as conn:
+            with self.get_connection() as conn:
                 with conn.cursor() as cur:
                     # Test basic connection
                     cur.execute("SELECT 1")
@@ -261,8 +279,21 @@ class DatabaseManager:
             raise
     
     def get_connection(self):
-        """Get a new database connection"""
-        return psycopg2.connect(self.connection_string)
+        """Get a pooled database connection (use as a context manager)"""
+        return self.pool.connection()
+    
+    def get_pool_stats(self):
+        """
+        Get connection pool statistics
+        
+        Returns:
+            dict: Pool checkout, wait and checkout-time statistics
+        """
+        return self.pool.get_stats()
+    
+    def close(self):
+        """Close pooled database connections"""
+        self.pool.close()
     
     def execute_query(self, query, params=None, fetch=False):
         """
@@ -360,6 +391,35 @@ class DatabaseManager:
             print(f"Error deleting existing records: {e}")
             return 0
     
+    def set_alias_paths(self, canonical_path, alias_paths):
+        """
+        Store alias paths of identical file copies in the canonical file's records
+        
+        Args:
+            canonical_path: File path the records were indexed under
+            alias_paths: List of other paths with identical content
+        
+        Returns:
+            int: Number of records updated
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        UPDATE vecs.{} 
+                        SET metadata = jsonb_set(metadata, '{{alias_paths}}', %s::jsonb)
+                        WHERE metadata->>'file_path' = %s
+                    """.format(self.table_name), (json.dumps(alias_paths), canonical_path))
+                    updated_count = cur.rowcount
+                
+                conn.commit()
+            
+            return updated_count
+            
+        except Exception as e:
+            print(f"Error updating alias paths: {e}")
+            return 0
+    
     def get_database_stats(self):
         """
         Get database statistics
@@ -632,13 +692,14 @@ class DatabaseManager:
         
         print("="*50)
     
-    def analyze_directory_vs_database(self, directory_path, recursive=True):
+    def analyze_directory_vs_database(self, directory_path, recursive=True, snapshot=None):
         """
         Perform end-to-end analysis comparing directory with database
         
         Args:
             directory_path: Path to directory to analyze
             recursive: Whether to scan recursively
+            snapshot: Optional DirectorySnapshot from the loading stage
         
         Returns:
             dict: Analysis results
@@ -647,19 +708,21 @@ class DatabaseManager:
             directory_path, 
             self.connection_string, 
             self.table_name, 
-            recursive
+            recursive,
+            snapshot
         )
 
 
-def create_database_manager(connection_string, table_name="documents"):
+def create_database_manager(connection_string, table_name="documents", pool_settings=None):
     """
     Create a database manager instance
     
     Args:
         connection_string: PostgreSQL connection string
         table_name: Name of the documents table
+        pool_settings: Connection pool settings (defaults if None)
     
     Returns:
         DatabaseManager: Configured database manager
     """
-    return DatabaseManager(connection_string, table_name)
\ No newline at end of file
+    return DatabaseManager(connection_string, table_name, pool_settings)
\ No newline at end of file
@@ -6,8 +6,8 @@ Advanced directory loading with specialized document parsing, hybrid processing,
 """
 
 import os
-from pathlib import Path
 from document_parsers import HybridDocumentProcessor
+from directory_snapshot import create_directory_snapshot
 
 
 class AdvancedDirectoryLoader:
@@ -15,7 +15,7 @@ class AdvancedDirectoryLoader:
     Advanced directory loader with specialized document parsing, hybrid processing, and PDF support
     """
     
-    def __init__(self, input_dir, recursive=True, config=None):
+    def __init__(self, input_dir, recursive=True, config=None, snapshot=None):
         """
         Initialize advanced directory loader
         
@@ -23,10 +23,12 @@ class AdvancedDirectoryLoader:
             input_dir: Input directory path
             recursive: Whether to scan recursively
             config: Configuration object
+            snapshot: Optional DirectorySnapshot shared with other loading stages
         """
         self.input_dir = input_dir
         self.recursive = recursive
         self.config = config
+        self.snapshot = snapshot
         
         # Initialize hybrid processor with PDF support
         self.hybrid_processor = HybridDocumentProcessor(config)
@@ -70,25 +72,20 @@ class AdvancedDirectoryLoader:
         }
         
         try:
-            if self.recursive:
-                file_iterator = Path(self.input_dir).rglob('*')
-            else:
-                file_iterator = Path(self.input_dir).glob('*')
+            if self.snapshot is None:
+                self.snapshot = create_directory_snapshot(self.input_dir, self.recursive, self.config)
             
-            for file_path in file_iterator:
-                if file_path.is_file():
-                    file_ext = file_path.suffix.lower()
-                    
-                    if file_ext == '.docx':
-                        file_categories['docx_files'].append(str(file_path))
-                    elif file_ext == '.doc':
-                        file_categories['doc_files'].append(str(file_path))
-                    elif file_ext == '.pdf':  # NEW: PDF file detection
-                        file_categories['pdf_files'].append(str(file_path))
-                    else:
-                        file_categories['other_files'].append(str(file_path))
-                    
-                    self.loading_stats['total_files_found'] += 1
+            for entry in self.snapshot.entries:
+                if entry.suffix == '.docx':
+                    file_categories['docx_files'].append(entry.path)
+                elif entry.suffix == '.doc':
+                    file_categories['doc_files'].append(entry.path)
+                elif entry.suffix == '.pdf':  # NEW: PDF file detection
+                    file_categories['pdf_files'].append(entry.path)
+                else:
+                    file_categories['other_files'].append(entry.path)
+                
+                self.loading_stats['total_files_found'] += 1
             
             self.loading_stats['docx_files'] = len(file_categories['docx_files'])
             self.loading_stats['doc_files'] = len(file_categories['doc_files'])
@@ -284,7 +281,7 @@ class AdvancedDirectoryLoader:
         }
 
 
-def scan_directory_files(directory, recursive=True, include_pdf=True):
+def scan_directory_files(directory, recursive=True, include_pdf=True, snapshot=None):
     """
     Scan directory and return comprehensive file statistics (including PDF)
     
@@ -292,6 +289,7 @@ def scan_directory_files(directory, recursive=True, include_pdf=True):
         directory: Directory to scan
         recursive: Whether to scan recursively
         include_pdf: Whether to include PDF files in statistics
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         dict: Comprehensive directory statistics
@@ -315,59 +313,56 @@ def scan_directory_files(directory, recursive=True, include_pdf=True):
             'file_extensions': {}
         }
         
-        if recursive:
-            file_iterator = Path(directory).rglob('*')
-        else:
-            file_iterator = Path(directory).glob('*')
+        if snapshot is None:
+            snapshot = create_directory_snapshot(directory, recursive)
         
-        for file_path in file_iterator:
-            if file_path.is_file():
-                stats['total_files'] += 1
-                
-                # Get file info
-                file_ext = file_path.suffix.lower()
-                file_size = file_path.stat().st_size
-                
-                stats['total_size'] += file_size
-                
-                # Count by extension
-                if file_ext in stats['file_extensions']:
-                    stats['file_extensions'][file_ext] += 1
-                else:
-                    stats['file_extensions'][file_ext] = 1
-                
-                # Categorize files
-                if file_ext in ['.txt', '.md', '.rst', '.log']:
-                    stats['text_files'] += 1
-                elif file_ext in ['.pdf', '.docx', '.doc', '.rtf']:
-                    stats['document_files'] += 1
-                    if file_ext in ['.docx', '.doc']:
-                        stats['word_documents'] += 1
-                        if file_ext == '.docx':
-                            stats['docx_files'] += 1
-                        elif file_ext == '.doc':
-                            stats['doc_files'] += 1
-                    elif file_ext == '.pdf' and include_pdf:  # NEW: PDF categorization
-                        stats['pdf_files'] += 1
-                elif file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-                    stats['image_files'] += 1
-                else:
-                    stats['other_files'] += 1
-                
-                # Count files that support advanced parsing
+        for entry in snapshot.entries:
+            stats['total_files'] += 1
+            
+            # Get file info (stat result captured by the snapshot)
+            file_ext = entry.suffix
+            file_size = entry.size
+            
+            stats['total_size'] += file_size
+            
+            # Count by extension
+            if file_ext in stats['file_extensions']:
+                stats['file_extensions'][file_ext] += 1
+            else:
+                stats['file_extensions'][file_ext] = 1
+            
+            # Categorize files
+            if file_ext in ['.txt', '.md', '.rst', '.log']:
+                stats['text_files'] += 1
+            elif file_ext in ['.pdf', '.docx', '.doc', '.rtf']:
+                stats['document_files'] += 1
                 if file_ext in ['.docx', '.doc']:
-                    stats['advanced_parsing_candidates'] += 1
-                
-                # NEW: Count files that support PDF processing
-                if file_ext == '.pdf' and include_pdf:
-                    stats['pdf_processing_candidates'] += 1
-                
-                # Track large files (>10MB)
-                if file_size > 10 * 1024 * 1024:
-                    stats['large_files'].append({
-                        'path': str(file_path),
-                        'size_mb': file_size / (1024 * 1024)
-                    })
+                    stats['word_documents'] += 1
+                    if file_ext == '.docx':
+                        stats['docx_files'] += 1
+                    elif file_ext == '.doc':
+                        stats['doc_files'] += 1
+                elif file_ext == '.pdf' and include_pdf:  # NEW: PDF categorization
+                    stats['pdf_files'] += 1
+            elif file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
+                stats['image_files'] += 1
+            else:
+                stats['other_files'] += 1
+            
+            # Count files that support advanced parsing
+            if file_ext in ['.docx', '.doc']:
+                stats['advanced_parsing_candidates'] += 1
+            
+            # NEW: Count files that support PDF processing
+            if file_ext == '.pdf' and include_pdf:
+                stats['pdf_processing_candidates'] += 1
+            
+            # Track large files (>10MB)
+            if file_size > 10 * 1024 * 1024:
+                stats['large_files'].append({
+                    'path': entry.path,
+                    'size_mb': file_size / (1024 * 1024)
+                })
         
         stats['total_size_mb'] = stats['total_size'] / (1024 * 1024)
         return stats
@@ -376,7 +371,7 @@ def scan_directory_files(directory, recursive=True, include_pdf=True):
         return {'error': str(e)}
 
 
-def analyze_pdf_files_in_directory(directory, recursive=True, max_analyze=10):
+def analyze_pdf_files_in_directory(directory, recursive=True, max_analyze=10, snapshot=None):
     """
     NEW: Analyze PDF files in directory for processing strategy
     
@@ -384,6 +379,7 @@ def analyze_pdf_files_in_directory(directory, recursive=True, max_analyze=10):
         directory: Directory to scan
         recursive: Whether to scan recursively
         max_analyze: Maximum number of files to analyze in detail
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         dict: PDF analysis results
@@ -392,15 +388,9 @@ def analyze_pdf_files_in_directory(directory, recursive=True, max_analyze=10):
         from document_parsers import EnhancedPDFProcessor
         
         # Find all PDF files
-        pdf_files = []
-        if recursive:
-            file_iterator = Path(directory).rglob('*.pdf')
-        else:
-            file_iterator = Path(directory).glob('*.pdf')
-        
-        for pdf_file in file_iterator:
-            if pdf_file.is_file():
-                pdf_files.append(str(pdf_file))
+        if snapshot is None:
+            snapshot = create_directory_snapshot(directory, recursive)
+        pdf_files = snapshot.file_paths(extensions=['.pdf'])
         
         if not pdf_files:
             return {'total_pdfs': 0, 'message': 'No PDF files found'}
@@ -573,7 +563,7 @@ def print_pdf_analysis_summary(analysis_results):
             print(f"   Estimated total time: {total_time/3600:.1f} hours")
 
 
-def get_enhanced_directory_summary(directory, recursive=True, analyze_pdfs=True):
+def get_enhanced_directory_summary(directory, recursive=True, analyze_pdfs=True, snapshot=None):
     """
     NEW: Get enhanced directory summary including PDF analysis
     
@@ -581,14 +571,17 @@ def get_enhanced_directory_summary(directory, recursive=True, analyze_pdfs=True)
         directory: Directory to analyze
         recursive: Whether to scan recursively
         analyze_pdfs: Whether to perform detailed PDF analysis
+        snapshot: Optional DirectorySnapshot shared with other loading stages
     
     Returns:
         dict: Complete directory analysis
     """
     print(f"?? Enhanced Directory Analysis: {directory}")
     
-    # Basic file statistics
-    stats = scan_directory_files(directory, recursive, include_pdf=True)
+    # Basic file statistics (one scan shared by both analyses)
+    if snapshot is None:
+        snapshot = create_directory_snapshot(directory, recursive)
+    stats = scan_directory_files(directory, recursive, include_pdf=True, snapshot=snapshot)
     
     if 'error' in stats:
         return {'error': stats['error']}
@@ -597,7 +590,7 @@ def get_enhanced_directory_summary(directory, recursive=True, analyze_pdfs=True)
     pdf_analysis = {}
     if analyze_pdfs and stats.get('pdf_files', 0) > 0:
         print(f"?? Found {stats['pdf_files']} PDF files, performing detailed analysis...")
-        pdf_analysis = analyze_pdf_files_in_directory(directory, recursive, max_analyze=10)
+        pdf_analysis = analyze_pdf_files_in_directory(directory, recursive, max_analyze=10, snapshot=snapshot)
     
     # Combine results
     enhanced_summary = {
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Directory snapshot module for RAG Document Indexer
+Walks DOCUMENTS_DIR once with os.scandir and shares the file list, stat results
+and extension buckets with every loading stage instead of re-walking the tree
+"""
+
+import os
+import time
+from collections import namedtuple
+
+from file_utils_core import is_blacklisted_directory
+
+
+class SnapshotEntry(namedtuple('SnapshotEntry', ['path', 'name', 'suffix', 'stat', 'hidden'])):
+    """File entry with the stat result captured during the scan"""
+    __slots__ = ()
+
+    @property
+    def size(self):
+        return self.stat.st_size
+
+    @property
+    def mtime(self):
+        return self.stat.st_mtime
+
+
+def _make_entry(path, stat_info, hidden):
+    """Build a snapshot entry from a path and its stat result"""
+    name = os.path.basename(path)
+    return SnapshotEntry(
+        path=path,
+        name=name,
+        suffix=os.path.splitext(name)[1].lower(),
+        stat=stat_info,
+        hidden=hidden
+    )
+
+
+class DirectorySnapshot:
+    """Single-pass listing of a directory tree with blacklist filtering applied"""
+
+    def __init__(self, directory, recursive=True, blacklist_directories=None):
+        """
+        Initialize directory snapshot (call build() to scan)
+
+        Args:
+            directory: Directory to scan
+            recursive: Whether to scan recursively
+            blacklist_directories: List of directory names to exclude
+        """
+        self.directory = directory
+        self.recursive = recursive
+        self.blacklist_directories = blacklist_directories or []
+        self._entries = {}
+        self._sorted_entries = None
+        self.directories_scanned = 0
+        self.skipped_directories = []  # (path, reason) for blacklisted directories
+        self.scan_errors = []
+        self.build_time = 0.0
+
+    def build(self, verbose=False):
+        """
+        Scan the directory tree once with os.scandir
+
+        Blacklisted directories are pruned without being entered. Paths are
+        built with os.path.join from the given root, matching os.walk output.
+
+        Args:
+            verbose: Whether to print scanning info
+
+        Returns:
+            DirectorySnapshot: self
+        """
+        start_time = time.time()
+        self._entries = {}
+        self._sorted_entries = None
+        self.directories_scanned = 0
+        self.skipped_directories = []
+        self.scan_errors = []
+
+        if verbose:
+            print(f"Scanning directory once: {self.directory}")
+            if self.blacklist_directories:
+                print(f"Blacklisted directories: {', '.join(self.blacklist_directories)}")
+
+        # Stack of (directory_path, inside_hidden_directory)
+        stack = [(self.directory, False)]
+        while stack:
+            current_dir, hidden_parent = stack.pop()
+            self.directories_scanned += 1
+            subdirectories = []
+
+            try:
+                with os.scandir(current_dir) as iterator:
+                    for entry in iterator:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                # Name-only check: no extra stat calls per directory
+                                if is_blacklisted_directory(entry.path, self.blacklist_directories):
+                                    self.skipped_directories.append(
+                                        (entry.path, f"Directory '{entry.name}' is blacklisted")
+                                    )
+                                elif self.recursive:
+                                    subdirectories.append((entry.path, hidden_parent or entry.name.startswith('.')))
+                            elif entry.is_file():
+                                hidden = hidden_parent or entry.name.startswith('.')
+                                self._entries[entry.path] = _make_entry(entry.path, entry.stat(), hidden)
+                        except OSError as e:
+                            self.scan_errors.append(f"{entry.path}: {e}")
+            except OSError as e:
+                self.scan_errors.append(f"{current_dir}: {e}")
+                if current_dir == self.directory:
+                    print(f"ERROR: Failed to scan directory {self.directory}: {e}")
+
+            # Reverse so subdirectories are visited in listing order
+            stack.extend(reversed(subdirectories))
+
+        self.build_time = time.time() - start_time
+
+        if verbose:
+            print(f"Found {len(self._entries)} files in {self.directories_scanned} directories "
+                  f"({len(self.skipped_directories)} blacklisted) in {self.build_time:.2f}s")
+
+        return self
+
+    @property
+    def entries(self):
+        """List of file entries sorted by path"""
+        if self._sorted_entries is None:
+            self._sorted_entries = [self._entries[path] for path in sorted(self._entries)]
+        return self._sorted_entries
+
+    def file_paths(self, extensions=None, include_hidden=True):
+        """
+        Get file paths, optionally restricted to extensions
+
+        Args:
+            extensions: Iterable of lowercase extensions (e.g. ['.pdf']) or None for all
+            include_hidden: Whether to include hidden files and files in hidden directories
+
+        Returns:
+            list: Sorted file paths
+        """
+        if extensions is not None:
+            extensions = set(extensions)
+        return [
+            entry.path for entry in self.entries
+            if (extensions is None or entry.suffix in extensions)
+            and (include_hidden or not entry.hidden)
+        ]
+
+    def get_extension_buckets(self):
+        """
+        Group file entries by lowercase extension
+
+        Returns:
+            dict: extension -> list of entries
+        """
+        buckets = {}
+        for entry in self.entries:
+            buckets.setdefault(entry.suffix, []).append(entry)
+        return buckets
+
+    def get_entry(self, file_path):
+        """
+        Get snapshot entry for a path
+
+        Args:
+            file_path: File path as listed in the snapshot
+
+        Returns:
+            SnapshotEntry: Entry or None if not in snapshot
+        """
+        return self._entries.get(file_path)
+
+    def refresh_paths(self, file_paths):
+        """
+        Re-stat specific paths after the tree was modified (e.g. .doc conversion)
+
+        Args:
+            file_paths: Paths that may have been created, changed or deleted
+        """
+        self._sorted_entries = None
+        for file_path in file_paths:
+            file_path = str(file_path)
+            try:
+                stat_info = os.stat(file_path)
+            except OSError:
+                self._entries.pop(file_path, None)
+                continue
+
+            previous = self._entries.get(file_path)
+            hidden = previous.hidden if previous else os.path.basename(file_path).startswith('.')
+            self._entries[file_path] = _make_entry(file_path, stat_info, hidden)
+
+    def iter_blacklisted_files(self):
+        """
+        Walk only the blacklisted subtrees that the snapshot pruned
+
+        Yields:
+            str: File paths inside blacklisted directories
+        """
+        for skipped_dir, _ in self.skipped_directories:
+            for root, dirs, files in os.walk(skipped_dir):
+                for file_name in files:
+                    yield os.path.join(root, file_name)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def create_directory_snapshot(directory, recursive=True, config=None, verbose=False):
+    """
+    Create and build a directory snapshot with blacklist filtering from config
+
+    Args:
+        directory: Directory to scan
+        recursive: Whether to scan recursively
+        config: Configuration object with blacklist settings
+        verbose: Whether to print scanning info
+
+    Returns:
+        DirectorySnapshot: Built snapshot
+    """
+    blacklist_directories = None
+    if config:
+        blacklist_directories = config.BLACKLIST_DIRECTORIES
+
+    return DirectorySnapshot(directory, recursive, blacklist_directories).build(verbose)
@@ -13,6 +13,42 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 import tempfile
+import time
+from conversion_engine import UnoConversionPool, convert_batch_cli
+
+# --- REFLINK SUPPORT ---
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False  # Windows: no FICLONE, link/copy only
+
+
+FICLONE = 0x40049409  # Linux ioctl: share extents with the source file (btrfs, XFS, bcachefs)
+
+
+def reflink_file(src_path, dst_path):
+    """
+    Clone a file with the FICLONE ioctl (copy-on-write, no data is copied)
+    
+    Args:
+        src_path: Source file path
+        dst_path: Destination file path (must not exist)
+    
+    Raises:
+        OSError: If the platform or filesystem does not support reflinks
+    """
+    if not FCNTL_AVAILABLE:
+        raise OSError("reflink not supported on this platform")
+    
+    with open(src_path, 'rb') as src, open(dst_path, 'xb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(dst_path)
+            raise
+    shutil.copystat(src_path, dst_path)
 
 
 class DocumentConverter:
@@ -51,6 +87,28 @@ class DocumentConverter:
             'deletion_failed': 0     # NEW: Track failed deletions
         }
         
+        # Bulk conversion engine settings
+        if config:
+            self.conversion_settings = config.get_conversion_settings()
+        else:
+            self.conversion_settings = {
+                'engine': 'auto',
+                'workers': 2,
+                'batch_size': 50,
+                'timeout': 60,
+                'uno_base_port': 2002
+            }
+        self.engine_used = None
+        
+        # Backup strategy: auto tries hardlink, then reflink, then copy
+        if config:
+            self.backup_strategy = config.DOC_BACKUP_STRATEGY
+        else:
+            self.backup_strategy = 'auto'
+        self.backup_strategy_counts = {}
+        self.backup_time = 0.0
+        self._pending_renames = {}  # doc_path -> backup path, moved after conversion
+        
         # Check if conversion tools are available
         self.libreoffice_available = self._check_libreoffice()
         self.pandoc_available = self._check_pandoc()
@@ -124,10 +182,17 @@ class DocumentConverter:
                 suffix = backup_file_path.suffix
                 backup_file_path = backup_file_path.parent / f"{stem}_backup_{timestamp}{suffix}"
             
-            # Copy the file preserving metadata
-            shutil.copy2(doc_path, backup_file_path)
+            if self.backup_strategy == 'rename':
+                # Original stays in place for conversion and is moved afterwards
+                self._pending_renames[str(doc_path)] = backup_file_path
+                return str(backup_file_path)
+            
+            start_time = time.time()
+            strategy = self._store_backup(doc_path, backup_file_path)
+            self.backup_time += time.time() - start_time
+            self.backup_strategy_counts[strategy] = self.backup_strategy_counts.get(strategy, 0) + 1
             
-            print(f"   Ì†ΩÌ≥Å Backup created: {backup_file_path}")
+            print(f"   Ì†ΩÌ≥Å Backup created ({strategy}): {backup_file_path}")
             self.conversion_stats['backup_created'] += 1
             
             return str(backup_file_path)
@@ -137,6 +202,72 @@ class DocumentConverter:
             self.conversion_stats['backup_failed'] += 1
             return None
     
+    def _store_backup(self, doc_path, backup_file_path):
+        """
+        Write the backup using the cheapest strategy the filesystem supports
+        
+        A hardlink is atomic and copies nothing when the backup directory is on
+        the same filesystem; deleting the original afterwards just drops the
+        working directory's name. Reflinks share extents on copy-on-write
+        filesystems. A full copy is the last fallback.
+        
+        Args:
+            doc_path: Path to original .doc file
+            backup_file_path: Target backup path
+        
+        Returns:
+            str: Strategy used ('link', 'reflink' or 'copy')
+        """
+        if self.backup_strategy in ('auto', 'link'):
+            try:
+                os.link(doc_path, backup_file_path)
+                return 'link'
+            except OSError:
+                pass  # Cross-device or hardlinks unsupported
+        
+        if self.backup_strategy in ('auto', 'link', 'reflink'):
+            try:
+                reflink_file(doc_path, backup_file_path)
+                return 'reflink'
+            except OSError:
+                pass  # No copy-on-write support
+        
+        shutil.copy2(doc_path, backup_file_path)
+        return 'copy'
+    
+    def _move_original_to_backup(self, doc_path, backup_file_path):
+        """
+        Move original .doc file into the backup tree (rename strategy)
+        
+        Args:
+            doc_path: Path to original .doc file
+            backup_file_path: Reserved backup path
+        
+        Returns:
+            bool: True if the original was moved
+        """
+        start_time = time.time()
+        try:
+            try:
+                os.rename(doc_path, backup_file_path)
+                strategy = 'rename'
+            except OSError:
+                # Different filesystem: shutil.move copies and deletes
+                shutil.move(str(doc_path), str(backup_file_path))
+                strategy = 'copy'
+        except Exception as e:
+            print(f"   ‚ö†Ô∏è WARNING: Could not move {doc_path} to backup: {e}")
+            self.conversion_stats['backup_failed'] += 1
+            self.conversion_stats['deletion_failed'] += 1
+            return False
+        
+        self.backup_time += time.time() - start_time
+        self.backup_strategy_counts[strategy] = self.backup_strategy_counts.get(strategy, 0) + 1
+        self.conversion_stats['backup_created'] += 1
+        self.conversion_stats['originals_deleted'] += 1
+        print(f"   Ì†ΩÌ≥Å Original moved to backup ({strategy}): {backup_file_path}")
+        return True
+    
     def _delete_original_file(self, doc_path):
         """
         Delete original .doc file after successful backup and conversion
@@ -147,6 +278,10 @@ class DocumentConverter:
         Returns:
             bool: True if deletion was successful, False otherwise
         """
+        backup_file_path = self._pending_renames.pop(str(doc_path), None)
+        if backup_file_path is not None:
+            return self._move_original_to_backup(doc_path, backup_file_path)
+        
         try:
             doc_path_obj = Path(doc_path)
             
@@ -278,6 +413,22 @@ class DocumentConverter:
             if success:
                 docx_path = result_path
         
+        return self._finalize_conversion(doc_path, docx_path, success, error_msg, backup_path)
+    
+    def _finalize_conversion(self, doc_path, docx_path, success, error_msg, backup_path):
+        """
+        Apply pandoc fallback, update statistics and delete the original after a LibreOffice attempt
+        
+        Args:
+            doc_path: Path to .doc file
+            docx_path: Converted (or intended) .docx path
+            success: Whether LibreOffice conversion succeeded
+            error_msg: LibreOffice error message if it failed
+            backup_path: Backup path from _backup_original_file (or None)
+        
+        Returns:
+            tuple: (success, docx_path, error_message)
+        """
         # Fallback to pandoc if LibreOffice failed
         if not success and self.pandoc_available:
             print(f"   Ì†ΩÌ¥Ñ Retrying {doc_path.name} with pandoc...")
@@ -310,19 +461,124 @@ class DocumentConverter:
             self.conversion_stats['failed_files'].append(str(doc_path))
             print(f"   ‚ùå ERROR: Failed to convert {doc_path.name}: {error_msg}")
             
+            # Rename strategy: nothing was moved, the original stays in place
+            if self._pending_renames.pop(str(doc_path), None) is not None:
+                backup_path = None
+            
             # If backup was created but conversion failed, note it
             if backup_path:
                 print(f"   Ì†ΩÌ≥Å Original preserved in backup: {Path(backup_path).name}")
             
             return False, None, error_msg
     
-    def scan_and_convert_directory(self, directory_path, recursive=True):
+    def _convert_with_libreoffice_bulk(self, jobs):
+        """
+        Convert many .doc files with LibreOffice using the configured engine
+        
+        'uno' keeps long-lived soffice instances and converts in parallel over UNO,
+        'cli' runs batched soffice calls with many files each, 'single' starts one
+        soffice per file. 'auto' prefers UNO and falls back to batched CLI.
+        
+        Args:
+            jobs: List of (doc_path, docx_path) tuples
+        
+        Returns:
+            dict: doc_path -> (success, docx_path, error_message)
+        """
+        if not jobs or not self.libreoffice_available:
+            return {}
+        
+        settings = self.conversion_settings
+        engine = settings['engine']
+        
+        if engine in ('auto', 'uno') and len(jobs) > 1:
+            pool = UnoConversionPool(
+                num_instances=min(settings['workers'], len(jobs)),
+                base_port=settings['uno_base_port'],
+                timeout=settings['timeout']
+            )
+            try:
+                pool.start()
+            except RuntimeError as e:
+                print(f"   ‚ö†Ô∏è UNO conversion server unavailable ({e}) - using batched CLI conversion")
+            else:
+                try:
+                    print(f"   Ì†ΩÌ¥Ñ Converting {len(jobs)} files over UNO with {len(pool.instances)} soffice instances...")
+                    self.engine_used = 'uno'
+                    return pool.convert_many(jobs)
+                finally:
+                    pool.stop()
+        
+        if engine == 'single' or len(jobs) == 1:
+            self.engine_used = 'single'
+            results = {}
+            for doc_path, docx_path in jobs:
+                print(f"   Ì†ΩÌ¥Ñ Converting {Path(doc_path).name} with LibreOffice...")
+                results[doc_path] = self._convert_with_libreoffice(doc_path, Path(docx_path).parent)
+            return results
+        
+        print(f"   Ì†ΩÌ¥Ñ Converting {len(jobs)} files with batched LibreOffice CLI "
+              f"({settings['batch_size']} per call, {settings['workers']} parallel)...")
+        self.engine_used = 'cli'
+        return convert_batch_cli(
+            jobs,
+            batch_size=settings['batch_size'],
+            workers=settings['workers'],
+            timeout=settings['timeout']
+        )
+    
+    def convert_files(self, doc_files):
+        """
+        Convert many .doc files in one LibreOffice pass with backup and deletion of originals
+        
+        Args:
+            doc_files: List of .doc paths
+        
+        Returns:
+            list: Paths of .docx files available after conversion
+        """
+        converted_files = []
+        jobs = []
+        backups = {}
+        
+        # Step 1: Skip existing targets and create backups BEFORE conversion
+        for doc_path in map(Path, doc_files):
+            if not doc_path.exists():
+                print(f"   ‚ö†Ô∏è WARNING: File not found: {doc_path}")
+                continue
+            
+            docx_path = doc_path.parent / f"{doc_path.stem}.docx"
+            if docx_path.exists():
+                print(f"   ‚ÑπÔ∏è INFO: {docx_path.name} already exists, skipping conversion")
+                converted_files.append(str(docx_path))
+                continue
+            
+            self.conversion_stats['attempted'] += 1
+            backups[doc_path] = self._backup_original_file(doc_path)
+            jobs.append((doc_path, docx_path))
+        
+        # Step 2: One bulk LibreOffice pass for all files
+        results = self._convert_with_libreoffice_bulk(jobs)
+        
+        # Step 3: Pandoc fallback, statistics and original deletion per file
+        for doc_path, docx_path in jobs:
+            success, result_path, error_msg = results.get(doc_path, (False, None, "LibreOffice not available"))
+            success, result_path, error_msg = self._finalize_conversion(
+                doc_path, result_path or docx_path, success, error_msg, backups[doc_path]
+            )
+            if success:
+                converted_files.append(str(result_path))
+        
+        return converted_files
+    
+    def scan_and_convert_directory(self, directory_path, recursive=True, doc_files=None):
         """
         Scan directory for .doc files and convert them to .docx with enhanced backup and deletion
         
         Args:
             directory_path: Directory to scan
             recursive: Whether to scan subdirectories
+            doc_files: Optional pre-scanned list of .doc paths (skips the directory walk)
         
         Returns:
             dict: Conversion results with backup and deletion information
@@ -337,8 +593,10 @@ class DocumentConverter:
             print(f"Ì†ΩÌ≥Å Backup directory: {self.backup_base_dir}")
         print(f"Ì†ΩÌ∑ëÔ∏è Original .doc files will be deleted after successful backup and conversion")
         
-        # Find all .doc files
-        if recursive:
+        # Find all .doc files unless the caller already has them from a directory snapshot
+        if doc_files is not None:
+            doc_files = [Path(doc_file) for doc_file in doc_files]
+        elif recursive:
             doc_files = list(directory_path.rglob("*.doc"))
         else:
             doc_files = list(directory_path.glob("*.doc"))
@@ -359,12 +617,8 @@ class DocumentConverter:
         
         print(f"Ì†ΩÌ≥Ñ Found {len(doc_files)} .doc files to convert")
         
-        # Convert each file
-        converted_files = []
-        for doc_file in doc_files:
-            success, docx_path, error = self.convert_single_file(doc_file)
-            if success:
-                converted_files.append(str(docx_path))
+        # Convert all files in one bulk pass
+        converted_files = self.convert_files(doc_files)
         
         # Return enhanced results with deletion statistics
         return {
@@ -378,6 +632,10 @@ class DocumentConverter:
             'originals_deleted': self.conversion_stats['originals_deleted'],  # NEW
             'deletion_failed': self.conversion_stats['deletion_failed'],      # NEW
             'backup_directory': self.backup_base_dir,
+            'backup_strategy': self.backup_strategy,
+            'backup_strategies_used': dict(self.backup_strategy_counts),
+            'backup_time': self.backup_time,
+            'conversion_engine': self.engine_used,
             'success_rate': (self.conversion_stats['successful'] / self.conversion_stats['attempted'] * 100) if self.conversion_stats['attempted'] > 0 else 0
         }
     
@@ -391,6 +649,9 @@ class DocumentConverter:
         print(f"‚ùå Failed conversions: {self.conversion_stats['failed']}")
         print(f"Ì†ΩÌ≥Å Backups created: {self.conversion_stats['backup_created']}")
         print(f"‚ö†Ô∏è Backup failures: {self.conversion_stats['backup_failed']}")
+        if self.backup_strategy_counts:
+            strategies = ', '.join(f"{name}: {count}" for name, count in sorted(self.backup_strategy_counts.items()))
+            print(f"Backup strategy: {self.backup_strategy} ({strategies}) in {self.backup_time:.2f}s")
         print(f"Ì†ΩÌ∑ëÔ∏è Originals deleted: {self.conversion_stats['originals_deleted']}")  # NEW
         print(f"‚ùå Deletion failures: {self.conversion_stats['deletion_failed']}")   # NEW
         
@@ -430,6 +691,9 @@ class DocumentConverter:
             'backup_enabled': self.backup_originals,
             'backups_created': self.conversion_stats['backup_created'],
             'backup_failures': self.conversion_stats['backup_failed'],
+            'backup_strategy': self.backup_strategy,
+            'backup_strategies_used': dict(self.backup_strategy_counts),
+            'backup_time': self.backup_time,
             'delete_originals': True,  # Always true now
             'originals_deleted': self.conversion_stats['originals_deleted'],  # NEW
             'deletion_failures': self.conversion_stats['deletion_failed']     # NEW
@@ -148,14 +148,27 @@ class EmbeddingProcessor:
         """
         self.embed_model = embed_model
         self.vector_store = vector_store
+        self.reuse_sources = set()  # content hashes whose embeddings duplicates will reuse
+        self.reusable_embeddings = {}
         self.stats = {
             'total_processed': 0,
             'successful_embeddings': 0,
             'failed_embeddings': 0,
+            'reused_embeddings': 0,
             'successful_saves': 0,
             'failed_saves': 0
         }
     
+    def set_reuse_sources(self, content_hashes):
+        """
+        Register canonical chunks whose embeddings should be kept for duplicates
+        
+        Args:
+            content_hashes: Set of canonical content hashes from ChunkDeduplicator
+        """
+        self.reuse_sources = set(content_hashes)
+        self.reusable_embeddings = {}
+    
     def validate_content_for_embedding(self, content):
         """
         Validate content before embedding generation - ?????????? ?????????
@@ -229,6 +242,14 @@ class EmbeddingProcessor:
             if not is_valid:
                 return False, f"validation_failed: {reason}"
             
+            # Duplicate chunk: reuse the canonical chunk's embedding if already generated
+            canonical_hash = node.metadata.get('duplicate_of')
+            if canonical_hash and canonical_hash in self.reusable_embeddings:
+                node.embedding = self.reusable_embeddings[canonical_hash]
+                self.stats['successful_embeddings'] += 1
+                self.stats['reused_embeddings'] += 1
+                return True, None
+            
             # SAFE: NO MORE UNSAFE OLLAMA RESTARTS DURING EMBEDDING GENERATION!
             # Ollama restarts are now handled safely at batch level in batch_processor.py
             
@@ -236,6 +257,11 @@ class EmbeddingProcessor:
             embedding = self.embed_model.get_text_embedding(content)
             node.embedding = embedding
             
+            # Keep embedding for later duplicates (falls back to this node if the canonical one failed)
+            reuse_key = canonical_hash or node.metadata.get('content_hash')
+            if reuse_key in self.reuse_sources:
+                self.reusable_embeddings[reuse_key] = embedding
+            
             self.stats['successful_embeddings'] += 1
             return True, None
             
@@ -460,6 +486,7 @@ class EmbeddingProcessor:
             'total_processed': self.stats['total_processed'],
             'successful_embeddings': self.stats['successful_embeddings'],
             'failed_embeddings': self.stats['failed_embeddings'],
+            'reused_embeddings': self.stats['reused_embeddings'],
             'successful_saves': self.stats['successful_saves'],
             'failed_saves': self.stats['failed_saves'],
             'embedding_success_rate': (self.stats['successful_embeddings'] / self.stats['total_processed'] * 100) if self.stats['total_processed'] > 0 else 0,
@@ -474,6 +501,7 @@ class EmbeddingProcessor:
         print(f"  Total chunks processed: {stats['total_processed']}")
         print(f"  Successful embeddings: {stats['successful_embeddings']}")
         print(f"  Failed embeddings: {stats['failed_embeddings']}")
+        print(f"  Reused embeddings (duplicates): {stats['reused_embeddings']}")
         print(f"  Embedding success rate: {stats['embedding_success_rate']:.1f}%")
         print(f"  Successful saves: {stats['successful_saves']}")
         print(f"  Failed saves: {stats['failed_saves']}")
@@ -486,6 +514,7 @@ class EmbeddingProcessor:
             'total_processed': 0,
             'successful_embeddings': 0,
             'failed_embeddings': 0,
+            'reused_embeddings': 0,
             'successful_saves': 0,
             'failed_saves': 0
         }
@@ -529,6 +558,50 @@ class NodeProcessor:
         
         return True, "valid"
     
+    def validate_and_enhance_node(self, node, indexed_at):
+        """
+        Validate and enhance a node in a single pass over its content
+        
+        Splits the content once and reuses the word list for both the
+        validation rules and the word_count metadata.
+        
+        Args:
+            node: Node to process
+            indexed_at: Timestamp for indexing
+        
+        Returns:
+            tuple: (is_valid, reason)
+        """
+        content = node.get_content()
+        stripped = content.strip()
+        
+        if not stripped:
+            return False, "empty_content"
+        
+        if len(stripped) < self.min_chunk_length:
+            return False, f"too_short ({len(stripped)} chars)"
+        
+        word_count = len(stripped.split())
+        if word_count <= 5:
+            return False, "too_few_words"
+        
+        if stripped.isdigit():
+            return False, "only_digits"
+        
+        if 'file_name' not in node.metadata:
+            node.metadata['file_name'] = node.get_metadata_str()
+        
+        node.metadata.update({
+            'text': content,
+            'indexed_at': indexed_at,
+            'content_length': len(content),
+            'word_count': word_count,
+            'paragraph_count': len([p for p in content.split('\n\n') if p.strip()]),
+            'safe_processing': True  # Mark as safely processed
+        })
+        
+        return True, "valid"
+    
     def enhance_node_metadata(self, node, indexed_at=None):
         """
         Safely enhance node metadata with additional information
@@ -561,13 +634,14 @@ class NodeProcessor:
         
         return node
     
-    def filter_and_enhance_nodes(self, all_nodes, show_progress=True):
+    def filter_and_enhance_nodes(self, all_nodes, show_progress=True, indexed_at=None):
         """
         Safely filter and enhance a list of nodes
         
         Args:
             all_nodes: List of nodes to process
             show_progress: Whether to show progress updates
+            indexed_at: Timestamp for indexing (defaults to now)
         
         Returns:
             tuple: (valid_nodes, invalid_nodes_info)
@@ -576,55 +650,59 @@ class NodeProcessor:
         invalid_nodes = []
         
         total_nodes = len(all_nodes)
-        indexed_at = datetime.now().isoformat()
-        
-        # Track invalid files
-        invalid_files_summary = {}
+        if indexed_at is None:
+            indexed_at = datetime.now().isoformat()
         
         for i, node in enumerate(all_nodes):
             if show_progress and i % 1000 == 0:
                 print(f"  Safe processing nodes: {i}/{total_nodes}")
             
-            is_valid, reason = self.validate_node(node)
+            is_valid, reason = self.validate_and_enhance_node(node, indexed_at)
             
             if is_valid:
-                enhanced_node = self.enhance_node_metadata(node, indexed_at)
-                valid_nodes.append(enhanced_node)
+                valid_nodes.append(node)
             else:
-                file_name = node.metadata.get('file_name', 'Unknown')
-                
-                invalid_info = {
+                content = node.get_content()
+                invalid_nodes.append({
                     'node_index': i,
                     'reason': reason,
-                    'content_preview': node.get_content()[:100],
-                    'file_name': file_name,
-                    'content_length': len(node.get_content())
-                }
-                invalid_nodes.append(invalid_info)
-                
-                # Count invalid reasons per file
-                if file_name not in invalid_files_summary:
-                    invalid_files_summary[file_name] = {}
-                if reason not in invalid_files_summary[file_name]:
-                    invalid_files_summary[file_name][reason] = 0
-                invalid_files_summary[file_name][reason] += 1
+                    'content_preview': content[:100],
+                    'file_name': node.metadata.get('file_name', 'Unknown'),
+                    'content_length': len(content)
+                })
         
         if show_progress:
-            print(f"  Safe node filtering complete: {len(valid_nodes)} valid, {len(invalid_nodes)} invalid")
-            
-            # Print detailed invalid files report
-            if invalid_files_summary:
-                print(f"\nInvalid chunks by file:")
-                for file_name, reasons in invalid_files_summary.items():
-                    total_invalid = sum(reasons.values())
-                    reasons_str = ", ".join([f"{reason}: {count}" for reason, count in reasons.items()])
-                    print(f"  {file_name}: {total_invalid} invalid chunks ({reasons_str})")
-                    
-                # Save detailed report to file
-                self._save_invalid_chunks_report(invalid_files_summary, invalid_nodes)
+            self.print_invalid_nodes_report(valid_nodes, invalid_nodes)
         
         return valid_nodes, invalid_nodes
     
+    def print_invalid_nodes_report(self, valid_nodes, invalid_nodes):
+        """
+        Print per-file invalid chunk summary and save the detailed report
+        
+        Args:
+            valid_nodes: List of valid nodes
+            invalid_nodes: List of invalid node info dicts
+        """
+        # Track invalid files
+        invalid_files_summary = {}
+        for invalid_info in invalid_nodes:
+            reasons = invalid_files_summary.setdefault(invalid_info['file_name'], {})
+            reasons[invalid_info['reason']] = reasons.get(invalid_info['reason'], 0) + 1
+        
+        print(f"  Safe node filtering complete: {len(valid_nodes)} valid, {len(invalid_nodes)} invalid")
+        
+        # Print detailed invalid files report
+        if invalid_files_summary:
+            print(f"\nInvalid chunks by file:")
+            for file_name, reasons in invalid_files_summary.items():
+                total_invalid = sum(reasons.values())
+                reasons_str = ", ".join([f"{reason}: {count}" for reason, count in reasons.items()])
+                print(f"  {file_name}: {total_invalid} invalid chunks ({reasons_str})")
+                
+            # Save detailed report to file
+            self._save_invalid_chunks_report(invalid_files_summary, invalid_nodes)
+    
     def _save_invalid_chunks_report(self, invalid_files_summary, invalid_nodes):
         """Save detailed report of invalid chunks to file"""
         try:
@@ -673,8 +751,17 @@ class NodeProcessor:
         if not nodes:
             return {'total': 0}
         
-        content_lengths = [len(node.get_content()) for node in nodes]
-        word_counts = [len(node.get_content().split()) for node in nodes]
+        # Reuse counts computed during enhancement instead of re-splitting content
+        content_lengths = []
+        word_counts = []
+        for node in nodes:
+            if 'content_length' in node.metadata and 'word_count' in node.metadata:
+                content_lengths.append(node.metadata['content_length'])
+                word_counts.append(node.metadata['word_count'])
+            else:
+                content = node.get_content()
+                content_lengths.append(len(content))
+                word_counts.append(len(content.split()))
         
         # Group by file
         files = {}
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed file registry for RAG Document Indexer
+Tracks source files by SHA-256 across master indexer runs so identical copies
+in different Year/Number directories are parsed, OCR'd and embedded only once
+"""
+
+import os
+import sqlite3
+import hashlib
+import time
+from datetime import datetime
+
+
+HASH_READ_SIZE = 1024 * 1024
+
+
+def compute_file_sha256(file_path):
+    """
+    Compute SHA-256 digest of a file's content
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_READ_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileRegistry:
+    """SQLite-backed registry mapping file content hashes to a canonical indexed path"""
+
+    def __init__(self, registry_path):
+        """
+        Initialize file registry
+
+        Args:
+            registry_path: Path to the SQLite registry database
+        """
+        self.registry_path = registry_path
+        registry_dir = os.path.dirname(os.path.abspath(registry_path))
+        os.makedirs(registry_dir, exist_ok=True)
+
+        # Several indexer runs may share one registry file, so wait on locks
+        self.connection = sqlite3.connect(registry_path, timeout=30)
+        self._create_tables()
+        self.reset_stats()
+
+    def _create_tables(self):
+        """Create registry tables if they do not exist"""
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    sha256 TEXT PRIMARY KEY,
+                    canonical_path TEXT NOT NULL,
+                    file_size INTEGER,
+                    first_seen_at TEXT,
+                    indexed_at TEXT
+                )
+            """)
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS paths (
+                    path TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL,
+                    file_size INTEGER,
+                    mtime_ns INTEGER,
+                    seen_at TEXT
+                )
+            """)
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_paths_sha256 ON paths (sha256)")
+
+    def reset_stats(self):
+        """Reset registry statistics for the current run"""
+        self.stats = {
+            'files_checked': 0,
+            'files_hashed': 0,
+            'hash_cache_hits': 0,
+            'unique_files': 0,
+            'alias_files': 0,
+            'bytes_skipped': 0,
+            'hashing_time': 0.0
+        }
+
+    def get_file_hash(self, file_path):
+        """
+        Get content hash for a file, reusing the cached hash if size and mtime are unchanged
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            tuple: (sha256, file_size)
+        """
+        stat_result = os.stat(file_path)
+        row = self.connection.execute(
+            "SELECT sha256, file_size, mtime_ns FROM paths WHERE path = ?", (file_path,)
+        ).fetchone()
+
+        if row and row[1] == stat_result.st_size and row[2] == stat_result.st_mtime_ns:
+            self.stats['hash_cache_hits'] += 1
+            return row[0], stat_result.st_size
+
+        start_time = time.time()
+        sha256 = compute_file_sha256(file_path)
+        self.stats['hashing_time'] += time.time() - start_time
+        self.stats['files_hashed'] += 1
+
+        with self.connection:
+            if row and row[0] != sha256:
+                # Content changed: this path no longer holds the old canonical copy
+                self.connection.execute(
+                    "DELETE FROM files WHERE sha256 = ? AND canonical_path = ?", (row[0], file_path)
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO paths (path, sha256, file_size, mtime_ns, seen_at) VALUES (?, ?, ?, ?, ?)",
+                (file_path, sha256, stat_result.st_size, stat_result.st_mtime_ns, datetime.now().isoformat())
+            )
+
+        return sha256, stat_result.st_size
+
+    def partition_files(self, file_paths):
+        """
+        Split files into those that need processing and aliases of already known content
+
+        A file is an alias when its content hash is registered under a different
+        canonical path that was either indexed in an earlier run or is being
+        processed in this run. Otherwise the file becomes the canonical copy.
+
+        Args:
+            file_paths: List of file paths (as stored in document metadata)
+
+        Returns:
+            tuple: (files_to_process, aliases) where aliases is a list of dicts
+                   with 'path', 'canonical_path', 'sha256' and 'file_size'
+        """
+        files_to_process = []
+        aliases = []
+        processing_now = set()
+        now = datetime.now().isoformat()
+
+        for file_path in file_paths:
+            self.stats['files_checked'] += 1
+
+            try:
+                sha256, file_size = self.get_file_hash(file_path)
+            except OSError as e:
+                print(f"WARNING: Could not hash {file_path}: {e}")
+                files_to_process.append(file_path)
+                continue
+
+            row = self.connection.execute(
+                "SELECT canonical_path, indexed_at FROM files WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+
+            if row and row[0] != file_path and (row[1] or row[0] in processing_now):
+                aliases.append({
+                    'path': file_path,
+                    'canonical_path': row[0],
+                    'sha256': sha256,
+                    'file_size': file_size
+                })
+                self.stats['alias_files'] += 1
+                self.stats['bytes_skipped'] += file_size
+                continue
+
+            if not row or row[0] != file_path:
+                # New content, or the previous canonical copy was never indexed
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO files (sha256, canonical_path, file_size, first_seen_at, indexed_at) "
+                        "VALUES (?, ?, ?, COALESCE((SELECT first_seen_at FROM files WHERE sha256 = ?), ?), NULL)",
+                        (sha256, file_path, file_size, sha256, now)
+                    )
+
+            processing_now.add(file_path)
+            files_to_process.append(file_path)
+            self.stats['unique_files'] += 1
+
+        return files_to_process, aliases
+
+    def mark_indexed(self, file_paths):
+        """
+        Mark canonical files as indexed so later copies are treated as aliases
+
+        Args:
+            file_paths: Canonical file paths whose chunks were saved
+        """
+        now = datetime.now().isoformat()
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE files SET indexed_at = ? WHERE canonical_path = ?",
+                [(now, file_path) for file_path in file_paths]
+            )
+
+    def get_alias_paths(self, canonical_path):
+        """
+        Get all known alias paths for a canonical file
+
+        Args:
+            canonical_path: Canonical file path
+
+        Returns:
+            list: Sorted alias paths
+        """
+        rows = self.connection.execute("""
+            SELECT p.path FROM paths p
+            JOIN files f ON f.sha256 = p.sha256
+            WHERE f.canonical_path = ? AND p.path != f.canonical_path
+            ORDER BY p.path
+        """, (canonical_path,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_stats(self):
+        """
+        Get registry statistics
+
+        Returns:
+            dict: Registry statistics for the current run and totals
+        """
+        total_files = self.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        total_paths = self.connection.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+        return {
+            **self.stats,
+            'registry_path': self.registry_path,
+            'registered_files': total_files,
+            'registered_paths': total_paths
+        }
+
+    def close(self):
+        """Close registry database connection"""
+        self.connection.close()
+
+
+def print_file_registry_statistics(registry_stats):
+    """
+    Print file registry statistics
+
+    Args:
+        registry_stats: Statistics from FileRegistry.get_stats()
+    """
+    print(f"\n🗂️ FILE REGISTRY STATISTICS:")
+    print(f"   Registry: {registry_stats['registry_path']}")
+    print(f"   Files checked: {registry_stats['files_checked']:,}")
+    print(f"   Files hashed: {registry_stats['files_hashed']:,} (cache hits: {registry_stats['hash_cache_hits']:,})")
+    print(f"   Unique files to process: {registry_stats['unique_files']:,}")
+    print(f"   Alias copies skipped: {registry_stats['alias_files']:,} ({registry_stats['bytes_skipped'] / (1024 * 1024):.1f} MB)")
+    print(f"   Registered contents/paths: {registry_stats['registered_files']:,}/{registry_stats['registered_paths']:,}")
+    print(f"   Hashing time: {registry_stats['hashing_time']:.2f}s")
+
+
+def sync_alias_records(registry, db_manager, canonical_paths):
+    """
+    Write the registry's alias path list into the canonical file's database records
+
+    Args:
+        registry: FileRegistry instance
+        db_manager: DatabaseManager instance
+        canonical_paths: Canonical file paths to update
+
+    Returns:
+        int: Number of database records updated
+    """
+    updated = 0
+    for canonical_path in sorted(set(canonical_paths)):
+        alias_paths = registry.get_alias_paths(canonical_path)
+        if alias_paths:
+            updated += db_manager.set_alias_paths(canonical_path, alias_paths)
+    return updated
+
+
+def create_file_registry(registry_settings):
+    """
+    Create a file registry from configuration settings
+
+    Args:
+        registry_settings: Settings from config.get_file_registry_settings()
+
+    Returns:
+        FileRegistry: Registry instance, or None if disabled or unavailable
+    """
+    if not registry_settings['enabled']:
+        return None
+
+    try:
+        return FileRegistry(registry_settings['registry_path'])
+    except (sqlite3.Error, OSError) as e:
+        print(f"WARNING: File registry unavailable ({e}) - processing every file copy")
+        return None
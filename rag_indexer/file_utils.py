@@ -11,6 +11,7 @@ import os
 from pathlib import Path
 from llama_index.core import SimpleDirectoryReader, Document
 from doc_converter import DocumentConverter, check_conversion_tools
+from directory_snapshot import create_directory_snapshot
 from file_utils_core import (
     clean_content_from_null_bytes, 
     safe_read_file, 
@@ -20,7 +21,7 @@ from file_utils_core import (
 )
 
 
-def scan_files_in_directory_filtered(directory, recursive=True, config=None, verbose=False):
+def scan_files_in_directory_filtered(directory, recursive=True, config=None, verbose=False, snapshot=None):
     """
     Scan directory with blacklist filtering using config
     
@@ -29,6 +30,7 @@ def scan_files_in_directory_filtered(directory, recursive=True, config=None, ver
         recursive: Whether to scan recursively
         config: Configuration object with blacklist settings
         verbose: Whether to print detailed info
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         list: List of file paths (excludes blacklisted directories)
@@ -37,10 +39,10 @@ def scan_files_in_directory_filtered(directory, recursive=True, config=None, ver
     if config:
         blacklist_directories = config.BLACKLIST_DIRECTORIES
     
-    return scan_files_in_directory(directory, recursive, blacklist_directories, verbose)
+    return scan_files_in_directory(directory, recursive, blacklist_directories, verbose, snapshot)
 
 
-def get_directory_stats_with_blacklist(directory, recursive=True, config=None, verbose=False):
+def get_directory_stats_with_blacklist(directory, recursive=True, config=None, verbose=False, snapshot=None):
     """
     Get directory statistics with blacklist filtering
     
@@ -49,6 +51,7 @@ def get_directory_stats_with_blacklist(directory, recursive=True, config=None, v
         recursive: Whether to scan recursively
         config: Configuration object with blacklist settings
         verbose: Whether to print detailed info
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         dict: Directory statistics including blacklist info
@@ -57,7 +60,7 @@ def get_directory_stats_with_blacklist(directory, recursive=True, config=None, v
     if config:
         blacklist_directories = config.BLACKLIST_DIRECTORIES
     
-    return scan_directory_with_stats(directory, recursive, blacklist_directories, verbose)
+    return scan_directory_with_stats(directory, recursive, blacklist_directories, verbose, snapshot)
 
 
 def normalize_file_path(file_path):
@@ -149,7 +152,8 @@ class SimpleDirectoryLoader:
     FIXED: Updated to handle original file deletion after conversion
     """
     
-    def __init__(self, input_dir, recursive=True, auto_convert_doc=True, backup_originals=True, config=None):
+    def __init__(self, input_dir, recursive=True, auto_convert_doc=True, backup_originals=True, config=None,
+                 file_registry=None, snapshot=None):
         """
         Initialize with directory path, conversion options, and config
         
@@ -159,12 +163,17 @@ class SimpleDirectoryLoader:
             auto_convert_doc: Whether to automatically convert .doc files
             backup_originals: Whether to create backup copies
             config: Configuration object with enhanced settings
+            file_registry: Optional FileRegistry used to skip copies of already indexed files
+            snapshot: Optional DirectorySnapshot shared with other loading stages
         """
         self.input_dir = input_dir
         self.recursive = recursive
         self.auto_convert_doc = auto_convert_doc
         self.backup_originals = backup_originals
         self.config = config
+        self.file_registry = file_registry
+        self.snapshot = snapshot
+        self.registry_aliases = []
         self.documents_loaded = 0
         self.loading_time = 0
         self.conversion_results = None
@@ -174,6 +183,17 @@ class SimpleDirectoryLoader:
         if config:
             self.blacklist_directories = config.BLACKLIST_DIRECTORIES
     
+    def _get_snapshot(self):
+        """
+        Get the shared directory snapshot, scanning the directory once if none was provided
+        
+        Returns:
+            DirectorySnapshot: Snapshot of the input directory
+        """
+        if self.snapshot is None:
+            self.snapshot = create_directory_snapshot(self.input_dir, self.recursive, self.config)
+        return self.snapshot
+    
     def _preprocess_doc_files(self):
         """
         Preprocess .doc files by converting them to .docx with enhanced backup system
@@ -210,7 +230,8 @@ class SimpleDirectoryLoader:
             self.input_dir, 
             self.recursive, 
             self.config, 
-            verbose=True
+            verbose=True,
+            snapshot=self._get_snapshot()
         )
         
         # Filter for .doc files only
@@ -239,12 +260,18 @@ class SimpleDirectoryLoader:
             
             conversion_results = converter.scan_and_convert_directory(
                 self.input_dir, 
-                recursive=self.recursive
+                recursive=self.recursive,
+                doc_files=doc_files
             )
             
+            # Conversion changed the tree: update only the affected snapshot entries
+            self.snapshot.refresh_paths(doc_files + conversion_results.get('converted_files', []))
+            
             # Print enhanced results with deletion info
             if conversion_results['successful'] > 0:
                 print(f"‚úÖ Successfully converted {conversion_results['successful']} .doc files to .docx")
+                if conversion_results.get('conversion_engine'):
+                    print(f"   Conversion engine: {conversion_results['conversion_engine']}")
                 if conversion_results['backup_created'] > 0:
                     print(f"Ì†ΩÌ≥Å Created {conversion_results['backup_created']} backup files")
                 # FIXED: Show deletion results
@@ -296,7 +323,8 @@ class SimpleDirectoryLoader:
                 self.input_dir, 
                 self.recursive, 
                 self.config, 
-                verbose=True
+                verbose=True,
+                snapshot=self._get_snapshot()
             )
             print_directory_scan_summary(stats, show_blacklist_info=True)
         
@@ -306,17 +334,20 @@ class SimpleDirectoryLoader:
         # Step 2: Load documents normally (now including converted .docx files)
         print("\nÌ†ΩÌ≥ñ Loading documents with SimpleDirectoryReader...")
         
-        # Use standard SimpleDirectoryReader
-        reader = SimpleDirectoryReader(
-            input_dir=self.input_dir,
-            recursive=self.recursive
-        )
+        # Use standard SimpleDirectoryReader on the snapshot's file list (blacklist applied,
+        # hidden files excluded as SimpleDirectoryReader does) instead of another directory walk
+        input_files = self._get_snapshot().file_paths(include_hidden=False)
+        reader = SimpleDirectoryReader(input_files=input_files) if input_files else None
+        
+        # Skip files whose identical content is already indexed under another path
+        if self.file_registry is not None and reader is not None:
+            reader = self._apply_file_registry(reader)
         
         import time
         start_time = time.time()
         
         try:
-            documents = reader.load_data()
+            documents = reader.load_data() if reader is not None else []
             self.documents_loaded = len(documents)
             print(f"‚úÖ Successfully loaded {self.documents_loaded} documents")
         except Exception as e:
@@ -337,7 +368,8 @@ class SimpleDirectoryLoader:
             'blacklist_applied': len(self.blacklist_directories) > 0,
             'blacklisted_directories': self.blacklist_directories,
             'directories_scanned': 0,  # Will be filled if stats available
-            'directories_skipped': 0   # Will be filled if stats available
+            'directories_skipped': 0,  # Will be filled if stats available
+            'registry_aliases': len(self.registry_aliases)
         }
         
         # Add directory scan stats if available
@@ -347,7 +379,8 @@ class SimpleDirectoryLoader:
                     self.input_dir, 
                     self.recursive, 
                     self.config, 
-                    verbose=False
+                    verbose=False,
+                    snapshot=self._get_snapshot()
                 )
                 loading_stats.update({
                     'directories_scanned': dir_stats['directories_scanned'],
@@ -360,6 +393,30 @@ class SimpleDirectoryLoader:
         
         return documents, loading_stats, self.conversion_results
     
+    def _apply_file_registry(self, reader):
+        """
+        Restrict a reader to files not already indexed under another path
+        
+        Args:
+            reader: SimpleDirectoryReader listing all input files
+        
+        Returns:
+            SimpleDirectoryReader: Reader for unique files, or None if every file is an alias
+        """
+        input_files = [str(input_file) for input_file in reader.input_files]
+        files_to_process, self.registry_aliases = self.file_registry.partition_files(input_files)
+        
+        if not self.registry_aliases:
+            return reader
+        
+        print(f"File registry: {len(self.registry_aliases)} files already indexed under another path - recorded as aliases")
+        
+        if not files_to_process:
+            print("File registry: all files in this directory are copies of indexed files")
+            return None
+        
+        return SimpleDirectoryReader(input_files=files_to_process)
+    
     def get_loading_stats(self):
         """
         Get enhanced loading statistics with blacklist and conversion info
@@ -475,7 +532,8 @@ class SimpleDirectoryLoader:
             }
 
 
-def create_safe_reader(documents_dir, recursive=True, auto_convert_doc=True, backup_originals=True, config=None):
+def create_safe_reader(documents_dir, recursive=True, auto_convert_doc=True, backup_originals=True, config=None,
+                       file_registry=None, snapshot=None):
     """
     Create a SimpleDirectoryLoader instance with .doc conversion and blacklist filtering
     FIXED: Updated to handle original file deletion
@@ -486,6 +544,8 @@ def create_safe_reader(documents_dir, recursive=True, auto_convert_doc=True, bac
         auto_convert_doc: Whether to automatically convert .doc files
         backup_originals: Whether to backup original .doc files
         config: Configuration object with enhanced settings
+        file_registry: Optional FileRegistry used to skip copies of already indexed files
+        snapshot: Optional DirectorySnapshot shared with other loading stages
     
     Returns:
         SimpleDirectoryLoader: Enhanced loader instance with blacklist support and deletion handling
@@ -495,11 +555,13 @@ def create_safe_reader(documents_dir, recursive=True, auto_convert_doc=True, bac
         recursive=recursive,
         auto_convert_doc=auto_convert_doc,
         backup_originals=backup_originals,
-        config=config  # Pass config for blacklist and backup settings
+        config=config,  # Pass config for blacklist and backup settings
+        file_registry=file_registry,
+        snapshot=snapshot
     )
 
 
-def check_directory_for_conversion_issues(documents_dir, config=None):
+def check_directory_for_conversion_issues(documents_dir, config=None, snapshot=None):
     """
     Check directory for potential conversion issues and conflicts
     FIXED: Updated to account for original file deletion
@@ -507,6 +569,7 @@ def check_directory_for_conversion_issues(documents_dir, config=None):
     Args:
         documents_dir: Directory to check
         config: Configuration object
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         dict: Analysis of potential issues
@@ -542,12 +605,13 @@ def check_directory_for_conversion_issues(documents_dir, config=None):
         
         # Check for .doc files in directories that would be blacklisted
         if config and config.BLACKLIST_DIRECTORIES:
-            all_files = scan_files_in_directory(documents_dir, recursive=True, blacklist_directories=None)
-            doc_files = [f for f in all_files if f.lower().endswith('.doc')]
+            if snapshot is None:
+                snapshot = create_directory_snapshot(documents_dir, recursive=True, config=config)
             
-            for doc_file in doc_files:
-                if config.is_blacklisted_directory(doc_file):
-                    issues['doc_files_in_blacklisted_dirs'].append(doc_file)
+            # Only the pruned blacklisted subtrees need walking; the rest is already in the snapshot
+            for file_path in snapshot.iter_blacklisted_files():
+                if file_path.lower().endswith('.doc'):
+                    issues['doc_files_in_blacklisted_dirs'].append(file_path)
             
             if issues['doc_files_in_blacklisted_dirs']:
                 issues['recommendations'].append("Some .doc files are in blacklisted directories and won't be processed")
@@ -571,7 +635,7 @@ def check_directory_for_conversion_issues(documents_dir, config=None):
     return issues
 
 
-def print_conversion_readiness_check(documents_dir, config=None):
+def print_conversion_readiness_check(documents_dir, config=None, snapshot=None):
     """
     Print a readiness check for document conversion
     FIXED: Updated to mention original file deletion
@@ -579,6 +643,7 @@ def print_conversion_readiness_check(documents_dir, config=None):
     Args:
         documents_dir: Directory to check
         config: Configuration object
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     """
     print("\nÌ†ΩÌ≥ä DOCUMENT CONVERSION READINESS CHECK:")
     print("=" * 50)
@@ -592,7 +657,7 @@ def print_conversion_readiness_check(documents_dir, config=None):
     
     # Check directory issues
     if config:
-        issues = check_directory_for_conversion_issues(documents_dir, config)
+        issues = check_directory_for_conversion_issues(documents_dir, config, snapshot)
         
         print(f"Ì†ΩÌ≥Å Backup directory: {config.get_backup_directory()}")
         print(f"Ì†ΩÌ∫´ Blacklist enabled: {'‚úÖ Yes' if config.BLACKLIST_DIRECTORIES else '‚ùå No'}")
@@ -594,19 +594,21 @@ def validate_file_path(file_path):
         return False, f"Error accessing file: {e}"
 
 
-def get_file_info(file_path):
+def get_file_info(file_path, stat_info=None):
     """
     Get detailed information about a file
     
     Args:
         file_path: Path to the file
+        stat_info: Optional stat result already collected (avoids another stat call)
     
     Returns:
         dict: File information including size, extension, etc.
     """
     try:
         path_obj = Path(file_path)
-        stat_info = os.stat(file_path)
+        if stat_info is None:
+            stat_info = os.stat(file_path)
         
         return {
             'name': path_obj.name,
@@ -694,7 +696,7 @@ def should_skip_directory(directory_path, blacklist_directories=None, verbose=Fa
     return False, None
 
 
-def scan_files_in_directory(directory, recursive=True, blacklist_directories=None, verbose=False):
+def scan_files_in_directory(directory, recursive=True, blacklist_directories=None, verbose=False, snapshot=None):
     """
     Scan directory to get all files with blacklist filtering
     
@@ -703,12 +705,13 @@ def scan_files_in_directory(directory, recursive=True, blacklist_directories=Non
         recursive: Whether to scan recursively
         blacklist_directories: List of directory names to exclude
         verbose: Whether to print detailed scanning info
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         list: List of file paths (excludes blacklisted directories)
     """
-    file_list = []
-    skipped_dirs = []
+    # Imported here: directory_snapshot depends on this module
+    from directory_snapshot import DirectorySnapshot
     
     try:
         if verbose:
@@ -716,33 +719,11 @@ def scan_files_in_directory(directory, recursive=True, blacklist_directories=Non
             if blacklist_directories:
                 print(f"Ì†ΩÌ∫´ Blacklisted directories: {', '.join(blacklist_directories)}")
         
-        if recursive:
-            # Use os.walk for better control over directory traversal
-            for root, dirs, files in os.walk(directory):
-                # Filter out blacklisted directories from dirs list
-                # This prevents os.walk from entering them
-                original_dirs = dirs.copy()
-                dirs[:] = []  # Clear the list
-                
-                for dir_name in original_dirs:
-                    dir_path = os.path.join(root, dir_name)
-                    should_skip, reason = should_skip_directory(dir_path, blacklist_directories, verbose)
-                    
-                    if should_skip:
-                        skipped_dirs.append((dir_path, reason))
-                    else:
-                        dirs.append(dir_name)  # Add back to dirs for traversal
-                
-                # Add files from current directory
-                for file_name in files:
-                    file_path = os.path.join(root, file_name)
-                    file_list.append(file_path)
-        else:
-            # Non-recursive scan
-            directory_path = Path(directory)
-            for item in directory_path.iterdir():
-                if item.is_file():
-                    file_list.append(str(item))
+        if snapshot is None:
+            snapshot = DirectorySnapshot(directory, recursive, blacklist_directories).build()
+        
+        file_list = snapshot.file_paths()
+        skipped_dirs = snapshot.skipped_directories
         
         if verbose and skipped_dirs:
             print(f"Ì†ΩÌ∫´ Skipped {len(skipped_dirs)} blacklisted directories:")
@@ -756,11 +737,12 @@ def scan_files_in_directory(directory, recursive=True, blacklist_directories=Non
     
     except Exception as e:
         print(f"‚ùå ERROR: Failed to scan directory {directory}: {e}")
+        file_list = []
     
     return file_list
 
 
-def scan_directory_with_stats(directory, recursive=True, blacklist_directories=None, verbose=False):
+def scan_directory_with_stats(directory, recursive=True, blacklist_directories=None, verbose=False, snapshot=None):
     """
     Scan directory and return comprehensive statistics with blacklist info
     RESILIENT VERSION: Better reporting of what can/cannot be processed
@@ -770,6 +752,7 @@ def scan_directory_with_stats(directory, recursive=True, blacklist_directories=N
         recursive: Whether to scan recursively
         blacklist_directories: List of directory names to exclude
         verbose: Whether to print detailed info
+        snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
     
     Returns:
         dict: Comprehensive directory statistics including blacklist info
@@ -805,25 +788,21 @@ def scan_directory_with_stats(directory, recursive=True, blacklist_directories=N
         if verbose:
             print(f"Ì†ΩÌ≥ä Analyzing directory: {directory}")
         
-        # Get all files with blacklist filtering
-        all_files = scan_files_in_directory(directory, recursive, blacklist_directories, verbose=False)
+        # Single scan: file list, stat results and directory counts come from the snapshot
+        if snapshot is None:
+            from directory_snapshot import DirectorySnapshot
+            snapshot = DirectorySnapshot(directory, recursive, blacklist_directories).build()
         
-        # Count directories
-        if recursive:
-            for root, dirs, files in os.walk(directory):
-                stats['directories_scanned'] += 1
-                
-                # Check for blacklisted directories
-                for dir_name in dirs:
-                    dir_path = os.path.join(root, dir_name)
-                    if blacklist_directories and is_blacklisted_directory(dir_path, blacklist_directories):
-                        stats['directories_skipped'] += 1
-                        stats['blacklisted_directories'].append(dir_name)
+        stats['directories_scanned'] = snapshot.directories_scanned
+        stats['directories_skipped'] = len(snapshot.skipped_directories)
+        stats['blacklisted_directories'] = [Path(path).name for path, _ in snapshot.skipped_directories]
+        stats['scan_errors'].extend(snapshot.scan_errors)
         
         # Analyze each file with resilient processing awareness
-        for file_path in all_files:
+        for entry in snapshot.entries:
+            file_path = entry.path
             try:
-                file_info = get_file_info(file_path)
+                file_info = get_file_info(file_path, entry.stat)
                 
                 if 'error' in file_info:
                     stats['problematic_files'].append(file_path)
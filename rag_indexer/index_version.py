@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index version module for RAG Document Indexer
+Keeps a version stamp for the documents table that changes on every write, so
+the search application can invalidate cached results when the index changes
+"""
+
+
+def _names(table_name):
+    """Build object names derived from the documents table"""
+    return {
+        'table': f"vecs.{table_name}",
+        'version_table': f"vecs.{table_name}_index_version",
+        'function': f"vecs.{table_name}_bump_index_version",
+        'trigger': f"{table_name}_index_version_trigger"
+    }
+
+
+def ensure_index_version(db_manager):
+    """
+    Create the version table and a statement-level trigger that bumps it
+    
+    The trigger fires once per INSERT/UPDATE/DELETE statement on the documents
+    table, so vector store writes, deletions and alias updates all change the
+    stamp without touching each write path.
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        bool: True if the trigger is installed (False if the documents table does not exist yet)
+    """
+    names = _names(db_manager.table_name)
+    
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {names['version_table']} (
+                    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                    version BIGINT NOT NULL DEFAULT 1,
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+            """)
+            cur.execute(f"INSERT INTO {names['version_table']} (id) VALUES (1) ON CONFLICT (id) DO NOTHING")
+            
+            cur.execute("SELECT to_regclass(%s)", (names['table'],))
+            if cur.fetchone()[0] is None:
+                return False
+            
+            cur.execute(f"""
+                CREATE OR REPLACE FUNCTION {names['function']}() RETURNS trigger AS $$
+                BEGIN
+                    UPDATE {names['version_table']} SET version = version + 1, updated_at = now() WHERE id = 1;
+                    RETURN NULL;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            cur.execute(f"DROP TRIGGER IF EXISTS {names['trigger']} ON {names['table']}")
+            cur.execute(f"""
+                CREATE TRIGGER {names['trigger']}
+                AFTER INSERT OR UPDATE OR DELETE ON {names['table']}
+                FOR EACH STATEMENT EXECUTE FUNCTION {names['function']}()
+            """)
+    
+    return True
+
+
+def bump_index_version(db_manager):
+    """
+    Bump the version stamp explicitly (e.g. after a run that created the table)
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        int: New version, or None if the version table is missing
+    """
+    names = _names(db_manager.table_name)
+    
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s)", (names['version_table'],))
+            if cur.fetchone()[0] is None:
+                return None
+            cur.execute(f"""
+                UPDATE {names['version_table']} SET version = version + 1, updated_at = now()
+                WHERE id = 1
+                RETURNING version
+            """)
+            row = cur.fetchone()
+    
+    return row[0] if row else None
+
+
+def prepare_index_version(db_manager):
+    """
+    Install the version stamp before indexing (called by the indexer)
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        bool: True if the trigger is installed
+    """
+    try:
+        installed = ensure_index_version(db_manager)
+        print(f"Index version stamp: {'ready' if installed else 'pending (table not created yet)'}")
+        return installed
+    except Exception as e:
+        print(f"WARNING: Index version stamp not created ({e}) - search result cache relies on TTL only")
+        return False
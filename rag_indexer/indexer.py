@@ -22,6 +22,12 @@ from config import get_config, print_feature_status
 from file_utils import create_safe_reader
 from ocr_processor import create_ocr_processor, check_ocr_availability
 from database_manager import create_database_manager
+from connection_pool import print_pool_statistics
+from text_search_schema import prepare_text_search, backfill_text_search
+from vector_index import prepare_vector_index
+from index_version import prepare_index_version, bump_index_version
+from person_name_index import prepare_person_name_index, backfill_person_names
+from file_registry import create_file_registry, sync_alias_records
 from embedding_processor import create_embedding_processor, create_node_processor
 from batch_processor import create_batch_processor, create_progress_tracker
 from utils import (
@@ -44,6 +50,7 @@ from analysis_helpers import (
 )
 from chunk_helpers import (
     create_and_filter_chunks_enhanced,
+    deduplicate_chunks_enhanced,
     create_chunk_processing_report,
     save_chunk_processing_report
 )
@@ -148,6 +155,8 @@ def main():
         'rotation_stats': {},
         'quality_analysis_results': {},
         'advanced_parsing_usage': 0,
+        'dedup_stats': {},
+        'registry_aliases': 0,
         'processing_stages': []
     }
     
@@ -199,12 +208,26 @@ def main():
             progress_tracker.add_checkpoint("Enhanced components initialized")
             
             # Create enhanced processors
-            db_manager = create_database_manager(config.CONNECTION_STRING, config.TABLE_NAME)
+            db_manager = create_database_manager(
+                config.CONNECTION_STRING, config.TABLE_NAME, config.get_database_pool_settings()
+            )
+            
+            # tsvector column + trigger so new chunks are searchable through the FTS index
+            text_search_status = prepare_text_search(db_manager, config.get_text_search_settings())
+            
+            # Name -> chunk table maintained by a trigger, for indexed person lookups
+            person_name_index_ready = prepare_person_name_index(db_manager, config.get_person_name_index_settings())
+            
+            # Version stamp bumped on every write; invalidates the search app's result cache
+            index_version_ready = prepare_index_version(db_manager)
             embedding_processor = create_embedding_processor(
                 components['embed_model'], 
                 components['vector_store']
             )
             
+            # Shared content-addressed registry so identical copies are indexed once
+            file_registry = create_file_registry(config.get_file_registry_settings())
+            
             # Create batch processor with safe restart interval from config
             batch_restart_interval = getattr(config, 'BATCH_RESTART_INTERVAL', 5)
             batch_processor = create_batch_processor(
@@ -224,7 +247,7 @@ def main():
             
             try:
                 text_documents, image_documents, processing_summary = load_and_process_documents_enhanced(
-                    config, progress_tracker
+                    config, progress_tracker, file_registry
                 )
                 stats['processing_stages'].append('document_loading')
             except Exception as e:
@@ -246,6 +269,18 @@ def main():
             # Print enhanced loading summary
             print_enhanced_loading_summary(text_documents, image_documents, processing_summary, load_time)
             
+            # Copies of files indexed in earlier runs only need their alias paths recorded
+            registry_aliases = processing_summary.get('registry_aliases', [])
+            stats['registry_aliases'] = len(registry_aliases)
+            if file_registry is not None and registry_aliases:
+                loaded_paths = {doc.metadata.get('file_path') for doc in documents}
+                earlier_canonicals = {
+                    alias['canonical_path'] for alias in registry_aliases
+                    if alias['canonical_path'] not in loaded_paths
+                }
+                updated = sync_alias_records(file_registry, db_manager, earlier_canonicals)
+                print(f"?? Alias paths recorded on {updated} existing records")
+            
             if not documents:
                 print("?? No documents found in the specified directory.")
                 return
@@ -321,6 +356,11 @@ def main():
                 print("? No valid text chunks were generated. Exiting.")
                 return
             
+            # Files with at least one valid chunk become canonical copies once saved
+            indexed_file_paths = {
+                node.metadata['file_path'] for node in valid_nodes if node.metadata.get('file_path')
+            }
+            
             performance_monitor.checkpoint("Enhanced chunks processed", len(valid_nodes))
             
             # Check for interruption
@@ -328,6 +368,20 @@ def main():
                 print("Process interrupted during chunk creation")
                 return
             
+            # ===============================================================
+            # 5b. CHUNK DEDUPLICATION
+            # ===============================================================
+            
+            if config.ENABLE_CHUNK_DEDUP:
+                valid_nodes, stats['dedup_stats'] = deduplicate_chunks_enhanced(
+                    valid_nodes, config, embedding_processor, progress_tracker
+                )
+                stats['processing_stages'].append('chunk_deduplication')
+                
+                if not valid_nodes:
+                    print("? No chunks left after deduplication. Exiting.")
+                    return
+            
             # ===============================================================
             # 6. ENHANCED BATCH PROCESSING
             # ===============================================================
@@ -362,9 +416,33 @@ def main():
                 'total_failed_chunks': batch_results['total_failed_chunks'],
                 'total_embedding_errors': batch_results['total_embedding_errors'],
                 'avg_speed': batch_results['avg_speed'],
+                'reused_embeddings': batch_results.get('reused_embeddings', 0),
                 'total_time': batch_results['total_time']
             })
             
+            if file_registry is not None and batch_results['total_saved'] > 0:
+                file_registry.mark_indexed(indexed_file_paths)
+                sync_alias_records(file_registry, db_manager, indexed_file_paths)
+                file_registry.close()
+            
+            # First run on an empty database: the table only exists after the first save
+            if text_search_status is None and config.ENABLE_TEXT_SEARCH_INDEX and batch_results['total_saved'] > 0:
+                if prepare_text_search(db_manager, config.get_text_search_settings()):
+                    backfill_text_search(db_manager, config.TEXT_SEARCH_CONFIG, config.TEXT_SEARCH_BACKFILL_BATCH_SIZE)
+            
+            # Same for the person name index: chunks saved before the trigger existed need a backfill
+            if person_name_index_ready is False and batch_results['total_saved'] > 0:
+                if prepare_person_name_index(db_manager, config.get_person_name_index_settings()):
+                    backfill_person_names(db_manager, config.PERSON_NAME_BACKFILL_BATCH_SIZE)
+            
+            # ANN index for vector search (no-op when one already exists)
+            if batch_results['total_saved'] > 0:
+                prepare_vector_index(db_manager, config.get_vector_index_settings())
+                
+                if not index_version_ready:
+                    prepare_index_version(db_manager)
+                bump_index_version(db_manager)
+            
             performance_monitor.checkpoint("Enhanced batch processing completed", batch_results['total_saved'])
             progress_tracker.add_checkpoint("Enhanced processing completed", batch_results['total_saved'])
             
@@ -373,7 +451,9 @@ def main():
             # ===============================================================
             
             # Perform comprehensive enhanced analysis
-            final_analysis = analyze_final_results_enhanced(config, db_manager, log_dir, stats)
+            final_analysis = analyze_final_results_enhanced(
+                config, db_manager, log_dir, stats, processing_summary.get('directory_snapshot')
+            )
             stats['processing_stages'].append('final_analysis')
             
             # ===============================================================
@@ -404,6 +484,8 @@ def main():
             # Print enhanced performance summary
             performance_monitor.print_performance_summary()
             progress_tracker.print_progress_summary()
+            print_pool_statistics(db_manager.get_pool_stats())
+            db_manager.close()
             
             # Enhanced final status report
             create_enhanced_status_report(
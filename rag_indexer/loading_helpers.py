@@ -10,13 +10,14 @@ import time
 from datetime import datetime
 
 
-def load_and_process_documents_enhanced(config, progress_tracker):
+def load_and_process_documents_enhanced(config, progress_tracker, file_registry=None):
     """
     Enhanced document loading with automatic .doc conversion, blacklist filtering, PDF processing, and comprehensive features
     
     Args:
         config: Configuration object with enhanced settings
         progress_tracker: Progress tracker instance
+        file_registry: Optional FileRegistry used to skip copies of already indexed files
     
     Returns:
         tuple: (text_documents, image_documents, processing_summary)
@@ -40,16 +41,21 @@ def load_and_process_documents_enhanced(config, progress_tracker):
     from file_utils import create_safe_reader, print_conversion_readiness_check
     from ocr_processor import create_ocr_processor
     from directory_scanner import get_enhanced_directory_summary, print_enhanced_directory_summary
+    from directory_snapshot import create_directory_snapshot
+    
+    # Walk the documents directory once; every stage below reuses this snapshot
+    snapshot = create_directory_snapshot(config.DOCUMENTS_DIR, recursive=True, config=config, verbose=True)
     
     # Perform readiness check
-    print_conversion_readiness_check(config.DOCUMENTS_DIR, config)
+    print_conversion_readiness_check(config.DOCUMENTS_DIR, config, snapshot)
     
     # NEW: Enhanced directory analysis with PDF support
     print("\n?? Performing enhanced directory analysis...")
     enhanced_summary = get_enhanced_directory_summary(
         config.DOCUMENTS_DIR, 
         recursive=True, 
-        analyze_pdfs=config.is_feature_enabled('enhanced_pdf_processing')
+        analyze_pdfs=config.is_feature_enabled('enhanced_pdf_processing'),
+        snapshot=snapshot
     )
     
     # Print detailed directory summary
@@ -61,7 +67,9 @@ def load_and_process_documents_enhanced(config, progress_tracker):
         recursive=True,
         auto_convert_doc=config.AUTO_CONVERT_DOC,      # From config
         backup_originals=config.BACKUP_ORIGINAL_DOC,   # From config
-        config=config  # Pass full config for blacklist and backup settings
+        config=config,  # Pass full config for blacklist and backup settings
+        file_registry=file_registry,
+        snapshot=snapshot
     )
     
     # Load documents (now with blacklist filtering, .doc conversion, and enhanced backup)
@@ -85,7 +93,7 @@ def load_and_process_documents_enhanced(config, progress_tracker):
         )
         
         # Process images with blacklist filtering
-        image_docs, ocr_stats = ocr_processor.process_images_in_directory(config.DOCUMENTS_DIR)
+        image_docs, ocr_stats = ocr_processor.process_images_in_directory(config.DOCUMENTS_DIR, file_registry, snapshot)
         image_documents.extend(image_docs)
         
         progress_tracker.add_checkpoint("Images processed with OCR", len(image_documents))
@@ -105,7 +113,10 @@ def load_and_process_documents_enhanced(config, progress_tracker):
         'backup_directory': config.get_backup_directory(),
         'enhanced_features_used': [],
         'directory_analysis': enhanced_summary,  # NEW: Include directory analysis
-        'pdf_processing_summary': {}  # NEW: PDF processing summary
+        'pdf_processing_summary': {},  # NEW: PDF processing summary
+        'registry_aliases': reader.registry_aliases + ocr_stats.get('registry_aliases', []),
+        'file_registry_stats': file_registry.get_stats() if file_registry is not None else {},
+        'directory_snapshot': snapshot
     }
     
     # Track which enhanced features were actually used
@@ -123,6 +134,9 @@ def load_and_process_documents_enhanced(config, progress_tracker):
     if ocr_stats and ocr_stats.get('successful', 0) > 0:
         enhanced_features_used.append('OCR text extraction')
     
+    if processing_summary['registry_aliases']:
+        enhanced_features_used.append('Content-addressed file deduplication')
+    
     # NEW: Track PDF processing usage
     pdf_stats = {}
     if hasattr(reader, 'hybrid_processor') and hasattr(reader.hybrid_processor, 'pdf_processor'):
@@ -192,6 +206,11 @@ def print_enhanced_loading_summary(text_documents, image_documents, loading_stat
     else:
         print(f"\n?? Blacklist Filtering: Disabled (all directories processed)")
     
+    # File registry information
+    if loading_stats.get('file_registry_stats'):
+        from file_registry import print_file_registry_statistics
+        print_file_registry_statistics(loading_stats['file_registry_stats'])
+    
     # Enhanced conversion statistics
     if loading_stats.get('conversion_results'):
         conversion = loading_stats['conversion_results']
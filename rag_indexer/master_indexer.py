@@ -834,6 +834,28 @@ def create_final_summary(total_directories, successful_directories, failed_direc
     log_master_message(f"{'='*80}")
 
 
+def print_registry_summary(registry_path):
+    """
+    Print totals from the shared content-addressed file registry
+    
+    Args:
+        registry_path: Path to the SQLite registry database
+    """
+    if not registry_path or not os.path.exists(registry_path):
+        return
+    
+    try:
+        import sqlite3
+        with sqlite3.connect(registry_path) as connection:
+            unique_files = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            total_paths = connection.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+        print(f"File registry: {unique_files} unique files across {total_paths} paths "
+              f"({max(total_paths - unique_files, 0)} alias copies)")
+        log_master_message(f"File registry: {unique_files} unique files, {total_paths} paths")
+    except Exception as e:
+        log_master_message(f"Warning: Could not read file registry: {e}")
+
+
 def main():
     """
     Enhanced dynamic main function - discovers and processes Year/Number directory structure
@@ -863,9 +885,15 @@ def main():
     else:
         print(f"Ì†ΩÌ≤æ Using configured backup directory: {os.getenv('DOC_BACKUP_ABSOLUTE_PATH')}")
     
+    # Share one content-addressed file registry across all subdirectory runs
+    if not os.getenv("FILE_REGISTRY_PATH"):
+        os.environ['FILE_REGISTRY_PATH'] = os.path.join(os.path.dirname(root_directory), "file_registry.db")
+    print(f"File registry: {os.getenv('FILE_REGISTRY_PATH')}")
+    
     log_master_message(f"Enhanced Dynamic Master Indexer started")
     log_master_message(f"Root directory: {root_directory}")
     log_master_message(f"Backup directory: {os.getenv('DOC_BACKUP_ABSOLUTE_PATH', 'Not set')}")
+    log_master_message(f"File registry: {os.getenv('FILE_REGISTRY_PATH')}")
     log_master_message(f"Service directories excluded: {', '.join(EXCLUDED_DIRECTORIES)}")
     log_master_message(f"Enhanced logging: Detailed output capture enabled")
     
@@ -984,6 +1012,7 @@ def main():
     print(f"  Total time: {total_time/60:.1f} minutes")
     
     print(f"Ì†ΩÌ≤æ Backup directory: {os.getenv('DOC_BACKUP_ABSOLUTE_PATH', 'Not configured')}")
+    print_registry_summary(os.getenv('FILE_REGISTRY_PATH'))
     print(f"Ì†ΩÌ≥ã Master log: ./logs/master_indexer.log")
     print(f"Ì†ΩÌ≥Ñ Detailed logs: ./logs/indexer_detailed_*.log")
     
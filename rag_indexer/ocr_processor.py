@@ -375,6 +375,7 @@ class OCRProcessor:
         """
         self.quality_threshold = quality_threshold
         self.batch_size = batch_size
+        self.config = config
         self.is_available = OCR_AVAILABLE
         
         # Load configuration settings
@@ -836,32 +837,33 @@ class OCRProcessor:
         except:
             pass  # Silently fail if can't write log
     
-    def get_image_files(self, directory):
+    def get_image_files(self, directory, snapshot=None):
         """
-        Get list of image files in directory
+        Get list of image files in directory (blacklisted directories excluded)
         
         Args:
             directory: Directory to scan
+            snapshot: Optional DirectorySnapshot to reuse instead of walking the tree again
         
         Returns:
             list: List of image file paths
         """
         image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
-        image_files = []
         
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in image_extensions):
-                    image_files.append(os.path.join(root, file))
+        if snapshot is None:
+            from directory_snapshot import create_directory_snapshot
+            snapshot = create_directory_snapshot(directory, recursive=True, config=self.config)
         
-        return image_files
+        return snapshot.file_paths(extensions=image_extensions)
     
-    def process_images_in_directory(self, directory):
+    def process_images_in_directory(self, directory, file_registry=None, snapshot=None):
         """
         Process all images in directory and extract text with enhanced features
         
         Args:
             directory: Directory containing images
+            file_registry: Optional FileRegistry used to skip copies of already indexed images
+            snapshot: Optional DirectorySnapshot shared with other loading stages
         
         Returns:
             tuple: (documents, stats) where documents is list of Document objects
@@ -874,12 +876,21 @@ class OCRProcessor:
         print("Scanning for images with enhanced OCR processing...")
         
         # Get all image files
-        image_files = self.get_image_files(directory)
+        image_files = self.get_image_files(directory, snapshot)
         
         if not image_files:
             print("No image files found.")
             return [], {'processed': 0, 'successful': 0, 'message': 'No images found'}
         
+        registry_aliases = []
+        if file_registry is not None:
+            image_files, registry_aliases = file_registry.partition_files(image_files)
+            if registry_aliases:
+                print(f"File registry: {len(registry_aliases)} images already indexed under another path - skipping OCR")
+            if not image_files:
+                return [], {'processed': 0, 'successful': 0, 'message': 'All images already indexed',
+                            'registry_aliases': registry_aliases}
+        
         documents = []
         stats = {
             'processed': 0,
@@ -890,7 +901,8 @@ class OCRProcessor:
             'quality_scores': [],
             'rotation_stats': self.rotation_stats.copy(),
             'language_detection': {},
-            'quality_failures': {}
+            'quality_failures': {},
+            'registry_aliases': registry_aliases
         }
         
         print(f"Found {len(image_files)} image files to process")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Person name index module for RAG Document Indexer
+Maintains a normalized person name -> (chunk id, file) table so the search
+application answers person queries with a primary key lookup instead of
+chained LIKE '%term%' scans over every chunk
+
+A row trigger re-extracts names whenever a chunk is inserted or its metadata
+changes, and a foreign key with ON DELETE CASCADE removes them with the chunk,
+so the table stays correct on re-index and deletion whatever the write path.
+
+Run directly to migrate and backfill an existing table:
+    python person_name_index.py            # create schema, then backfill
+    python person_name_index.py --status   # show coverage only
+"""
+
+import sys
+import time
+
+
+PERSON_NAMES_SUFFIX = "_person_names"
+
+# One capitalized word: Nolan, O'Brien, Lloyd-Atkinson
+_NAME_WORD = r"(?:[A-Z]'|[A-Z][a-z]+-)?[A-Z][a-z]+"
+
+# Runs of two or more capitalized words, optionally with middle initials (John A. Smith)
+NAME_RUN_PATTERN = rf"\m({_NAME_WORD}(?:\s+(?:[A-Z]\.\s+)?{_NAME_WORD})+)\M"
+
+# Names are indexed as every 2 and 3 word window of a run, so "Course Breeda Daly"
+# still yields "breeda daly"
+MIN_NAME_WORDS = 2
+MAX_NAME_WORDS = 3
+
+
+def _names(table_name):
+    """Build object names derived from the documents table"""
+    return {
+        'table': f"vecs.{table_name}",
+        'names_table': f"vecs.{table_name}{PERSON_NAMES_SUFFIX}",
+        'chunk_index': f"{table_name}{PERSON_NAMES_SUFFIX}_chunk_idx",
+        'extract_function': f"vecs.{table_name}_extract_person_names",
+        'function': f"vecs.{table_name}_person_names_update",
+        'trigger': f"{table_name}_person_names_trigger"
+    }
+
+
+def normalize_person_name(name):
+    """
+    Normalize a name the way the index stores it (lowercase, no middle initials)
+    
+    Args:
+        name: Person name as written in a query or document
+    
+    Returns:
+        str: Normalized name, e.g. 'John A. Smith' -> 'john smith'
+    """
+    words = [word for word in name.split() if not (len(word.rstrip('.')) == 1 and word[0].isalpha())]
+    return ' '.join(words).lower()
+
+
+def ensure_person_name_index(db_manager):
+    """
+    Create the name table, the extraction function and the row trigger if missing
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        bool: True if the trigger is installed (False if the documents table does not exist yet)
+    """
+    names = _names(db_manager.table_name)
+    sql_pattern = NAME_RUN_PATTERN.replace("'", "''")  # Embedded as a SQL literal
+    
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s)", (names['table'],))
+            if cur.fetchone()[0] is None:
+                return False
+            
+            # Composite primary key (name, chunk_id) is the lookup index
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS {names['names_table']} (
+                    name TEXT NOT NULL,
+                    chunk_id VARCHAR NOT NULL REFERENCES {names['table']} (id) ON DELETE CASCADE,
+                    file_name TEXT,
+                    PRIMARY KEY (name, chunk_id)
+                )
+            """)
+            # Needed by the cascade and by per-chunk replacement in the trigger
+            cur.execute(f"""
+                CREATE INDEX IF NOT EXISTS {names['chunk_index']}
+                ON {names['names_table']} (chunk_id)
+            """)
+            
+            cur.execute(f"""
+                CREATE OR REPLACE FUNCTION {names['extract_function']}(body TEXT) RETURNS SETOF TEXT AS $$
+                    SELECT DISTINCT lower(array_to_string(run.words[i : i + n - 1], ' '))
+                    FROM (
+                        SELECT regexp_split_to_array(
+                            regexp_replace(m[1], '\\s+[A-Z]\\.', '', 'g'), '\\s+'
+                        ) AS words
+                        FROM regexp_matches(COALESCE(body, ''), '{sql_pattern}', 'g') AS m
+                    ) AS run,
+                    generate_series({MIN_NAME_WORDS}, {MAX_NAME_WORDS}) AS n,
+                    generate_series(1, cardinality(run.words) - n + 1) AS i
+                $$ LANGUAGE sql IMMUTABLE
+            """)
+            cur.execute(f"""
+                CREATE OR REPLACE FUNCTION {names['function']}() RETURNS trigger AS $$
+                BEGIN
+                    IF TG_OP = 'UPDATE' THEN
+                        DELETE FROM {names['names_table']} WHERE chunk_id = NEW.id;
+                    END IF;
+                    INSERT INTO {names['names_table']} (name, chunk_id, file_name)
+                    SELECT name, NEW.id, NEW.metadata->>'file_name'
+                    FROM {names['extract_function']}(NEW.metadata->>'text') AS name
+                    ON CONFLICT DO NOTHING;
+                    RETURN NULL;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            cur.execute(f"DROP TRIGGER IF EXISTS {names['trigger']} ON {names['table']}")
+            cur.execute(f"""
+                CREATE TRIGGER {names['trigger']}
+                AFTER INSERT OR UPDATE OF metadata ON {names['table']}
+                FOR EACH ROW EXECUTE FUNCTION {names['function']}()
+            """)
+    
+    return True
+
+
+def get_person_name_coverage(db_manager):
+    """
+    Count indexed names and the chunks they point to
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        dict: 'chunks', 'chunks_with_names', 'names' and 'entries' counts (None if the table is absent)
+    """
+    names = _names(db_manager.table_name)
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s)", (names['names_table'],))
+            if cur.fetchone()[0] is None:
+                return None
+            
+            cur.execute(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM {names['table']}),
+                    COUNT(DISTINCT chunk_id),
+                    COUNT(DISTINCT name),
+                    COUNT(*)
+                FROM {names['names_table']}
+            """)
+            chunks, chunks_with_names, distinct_names, entries = cur.fetchone()
+    
+    return {
+        'chunks': chunks,
+        'chunks_with_names': chunks_with_names,
+        'names': distinct_names,
+        'entries': entries
+    }
+
+
+def backfill_person_names(db_manager, batch_size=1000):
+    """
+    Extract names for existing chunks in committed batches (keyset pagination by id)
+    
+    Re-running is safe: existing entries are kept and missing ones added.
+    
+    Args:
+        db_manager: DatabaseManager instance
+        batch_size: Chunks processed per transaction (keeps lock time short)
+    
+    Returns:
+        int: Number of chunks processed
+    """
+    names = _names(db_manager.table_name)
+    processed = 0
+    last_id = ''
+    start_time = time.time()
+    
+    while True:
+        with db_manager.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    WITH batch AS (
+                        SELECT id, metadata FROM {names['table']}
+                        WHERE id > %s
+                        ORDER BY id
+                        LIMIT %s
+                    ), inserted AS (
+                        INSERT INTO {names['names_table']} (name, chunk_id, file_name)
+                        SELECT name, batch.id, batch.metadata->>'file_name'
+                        FROM batch, {names['extract_function']}(batch.metadata->>'text') AS name
+                        ON CONFLICT DO NOTHING
+                    )
+                    SELECT COUNT(*), MAX(id) FROM batch
+                """, (last_id, batch_size))
+                count, max_id = cur.fetchone()
+        
+        if not count:
+            break
+        
+        processed += count
+        last_id = max_id
+        elapsed = time.time() - start_time
+        print(f"   Extracted names for {processed:,} chunks ({processed / elapsed:.0f} chunks/sec)")
+    
+    return processed
+
+
+def prepare_person_name_index(db_manager, person_name_settings):
+    """
+    Install the person name index before indexing (called by the indexer)
+    
+    Args:
+        db_manager: DatabaseManager instance
+        person_name_settings: Settings from config.get_person_name_index_settings()
+    
+    Returns:
+        bool: True if the trigger is installed, None if disabled
+    """
+    if not person_name_settings['enabled']:
+        return None
+    
+    try:
+        installed = ensure_person_name_index(db_manager)
+        print(f"Person name index: {'ready' if installed else 'pending (table not created yet)'}")
+        return installed
+    except Exception as e:
+        print(f"WARNING: Person name index not created ({e}) - person queries will use text matching")
+        return False
+
+
+def main():
+    """Create the person name index and backfill it from existing chunks"""
+    from config import get_config
+    from database_manager import create_database_manager
+    
+    config = get_config()
+    settings = config.get_person_name_index_settings()
+    db_manager = create_database_manager(
+        config.CONNECTION_STRING, config.TABLE_NAME, config.get_database_pool_settings()
+    )
+    
+    print("=" * 60)
+    print(f"PERSON NAME INDEX: vecs.{config.TABLE_NAME}{PERSON_NAMES_SUFFIX}")
+    print("=" * 60)
+    
+    try:
+        if '--status' not in sys.argv:
+            if not ensure_person_name_index(db_manager):
+                print(f"Table vecs.{config.TABLE_NAME} does not exist yet - run the indexer first")
+                return
+            
+            print(f"Backfilling existing chunks in batches of {settings['backfill_batch_size']}...")
+            processed = backfill_person_names(db_manager, settings['backfill_batch_size'])
+            print(f"Backfill complete: {processed:,} chunks processed")
+        
+        coverage = get_person_name_coverage(db_manager)
+        if coverage is None:
+            print("Name table not present - run without --status to migrate")
+        else:
+            print(f"Coverage: {coverage['chunks_with_names']:,}/{coverage['chunks']:,} chunks mention a name "
+                  f"({coverage['names']:,} distinct names, {coverage['entries']:,} entries)")
+    finally:
+        db_manager.close()
+    
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Text search schema module for RAG Document Indexer
+Adds a stored tsvector column (kept current by a trigger) and a pg_trgm index
+on the chunk text so keyword search becomes an index lookup instead of a
+sequential LIKE scan over every chunk's JSONB metadata
+
+Run directly to migrate and backfill an existing table:
+    python text_search_schema.py            # create schema, then backfill
+    python text_search_schema.py --status   # show coverage only
+"""
+
+import sys
+import time
+
+
+TEXT_SEARCH_COLUMN = "text_search"
+
+
+def _names(table_name):
+    """Build object names derived from the documents table"""
+    return {
+        'table': f"vecs.{table_name}",
+        'function': f"vecs.{table_name}_text_search_update",
+        'trigger': f"{table_name}_text_search_trigger",
+        'fts_index': f"{table_name}_text_search_idx",
+        'trgm_index': f"{table_name}_text_trgm_idx"
+    }
+
+
+def ensure_text_search_schema(db_manager, ts_config="simple", enable_trigram=True):
+    """
+    Create the tsvector column, its update trigger and the GIN indexes if missing
+    
+    The trigger fills the column for every chunk the indexer inserts, so no
+    change to the vector store write path is needed. Existing rows are filled
+    by backfill_text_search().
+    
+    Args:
+        db_manager: DatabaseManager instance
+        ts_config: PostgreSQL text search configuration (e.g. 'simple', 'english')
+        enable_trigram: Whether to create the pg_trgm index for substring matching
+    
+    Returns:
+        dict: Schema status with 'tsvector' and 'trigram' flags
+    """
+    names = _names(db_manager.table_name)
+    status = {'tsvector': False, 'trigram': False}
+    
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"ALTER TABLE {names['table']} ADD COLUMN IF NOT EXISTS {TEXT_SEARCH_COLUMN} tsvector")
+            cur.execute(f"""
+                CREATE OR REPLACE FUNCTION {names['function']}() RETURNS trigger AS $$
+                BEGIN
+                    NEW.{TEXT_SEARCH_COLUMN} := to_tsvector('{ts_config}'::regconfig, COALESCE(NEW.metadata->>'text', ''));
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            cur.execute(f"DROP TRIGGER IF EXISTS {names['trigger']} ON {names['table']}")
+            cur.execute(f"""
+                CREATE TRIGGER {names['trigger']}
+                BEFORE INSERT OR UPDATE OF metadata ON {names['table']}
+                FOR EACH ROW EXECUTE FUNCTION {names['function']}()
+            """)
+            cur.execute(f"""
+                CREATE INDEX IF NOT EXISTS {names['fts_index']}
+                ON {names['table']} USING gin ({TEXT_SEARCH_COLUMN})
+            """)
+            status['tsvector'] = True
+    
+    if enable_trigram:
+        # Separate transaction: the extension may need privileges the indexer lacks
+        try:
+            with db_manager.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                    # Same expression as the retriever's LOWER(metadata->>'text') LIKE filters
+                    cur.execute(f"""
+                        CREATE INDEX IF NOT EXISTS {names['trgm_index']}
+                        ON {names['table']} USING gin (LOWER(metadata->>'text') gin_trgm_ops)
+                    """)
+            status['trigram'] = True
+        except Exception as e:
+            print(f"WARNING: Could not create pg_trgm index: {e}")
+    
+    return status
+
+
+def get_text_search_coverage(db_manager):
+    """
+    Count chunks with and without a populated tsvector
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        dict: 'total', 'indexed' and 'missing' chunk counts (None if column is absent)
+    """
+    names = _names(db_manager.table_name)
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = 'vecs' AND table_name = %s AND column_name = %s
+            """, (db_manager.table_name, TEXT_SEARCH_COLUMN))
+            if not cur.fetchone():
+                return None
+            
+            cur.execute(f"""
+                SELECT COUNT(*), COUNT({TEXT_SEARCH_COLUMN})
+                FROM {names['table']}
+            """)
+            total, indexed = cur.fetchone()
+    
+    return {'total': total, 'indexed': indexed, 'missing': total - indexed}
+
+
+def backfill_text_search(db_manager, ts_config="simple", batch_size=1000):
+    """
+    Populate the tsvector column for existing chunks in committed batches
+    
+    Args:
+        db_manager: DatabaseManager instance
+        ts_config: PostgreSQL text search configuration
+        batch_size: Rows updated per transaction (keeps lock time short)
+    
+    Returns:
+        int: Number of rows backfilled
+    """
+    names = _names(db_manager.table_name)
+    total_updated = 0
+    start_time = time.time()
+    
+    while True:
+        with db_manager.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    UPDATE {names['table']}
+                    SET {TEXT_SEARCH_COLUMN} = to_tsvector(%s::regconfig, COALESCE(metadata->>'text', ''))
+                    WHERE id IN (
+                        SELECT id FROM {names['table']}
+                        WHERE {TEXT_SEARCH_COLUMN} IS NULL
+                        LIMIT %s
+                    )
+                """, (ts_config, batch_size))
+                updated = cur.rowcount
+        
+        if updated <= 0:
+            break
+        
+        total_updated += updated
+        elapsed = time.time() - start_time
+        print(f"   Backfilled {total_updated:,} chunks ({total_updated / elapsed:.0f} rows/sec)")
+    
+    return total_updated
+
+
+def prepare_text_search(db_manager, text_search_settings):
+    """
+    Ensure the text search schema exists before indexing (called by the indexer)
+    
+    Args:
+        db_manager: DatabaseManager instance
+        text_search_settings: Settings from config.get_text_search_settings()
+    
+    Returns:
+        dict: Schema status, or None if disabled or the migration failed
+    """
+    if not text_search_settings['enabled']:
+        return None
+    
+    try:
+        status = ensure_text_search_schema(
+            db_manager,
+            text_search_settings['ts_config'],
+            text_search_settings['enable_trigram']
+        )
+        print(f"Text search index: tsvector {'ready' if status['tsvector'] else 'missing'}, "
+              f"trigram {'ready' if status['trigram'] else 'missing'}")
+        return status
+    except Exception as e:
+        print(f"WARNING: Text search schema not created ({e}) - database search will use LIKE scans")
+        return None
+
+
+def main():
+    """Migrate the documents table for full-text search and backfill existing chunks"""
+    from config import get_config
+    from database_manager import create_database_manager
+    
+    config = get_config()
+    settings = config.get_text_search_settings()
+    db_manager = create_database_manager(
+        config.CONNECTION_STRING, config.TABLE_NAME, config.get_database_pool_settings()
+    )
+    
+    print("=" * 60)
+    print(f"TEXT SEARCH MIGRATION: vecs.{config.TABLE_NAME}")
+    print("=" * 60)
+    
+    try:
+        if '--status' not in sys.argv:
+            status = ensure_text_search_schema(db_manager, settings['ts_config'], settings['enable_trigram'])
+            print(f"Schema: tsvector={'OK' if status['tsvector'] else 'FAILED'}, "
+                  f"trigram={'OK' if status['trigram'] else 'SKIPPED'} (config: {settings['ts_config']})")
+            
+            print(f"Backfilling existing chunks in batches of {settings['backfill_batch_size']}...")
+            updated = backfill_text_search(db_manager, settings['ts_config'], settings['backfill_batch_size'])
+            print(f"Backfill complete: {updated:,} chunks updated")
+        
+        coverage = get_text_search_coverage(db_manager)
+        if coverage is None:
+            print(f"Column '{TEXT_SEARCH_COLUMN}' not present - run without --status to migrate")
+        else:
+            print(f"Coverage: {coverage['indexed']:,}/{coverage['total']:,} chunks "
+                  f"({coverage['missing']:,} missing)")
+    finally:
+        db_manager.close()
+    
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
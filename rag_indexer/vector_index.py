@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vector index module for RAG Document Indexer
+Creates, rebuilds and benchmarks the approximate-nearest-neighbour (HNSW or
+IVFFlat) index on the vecs embedding column, so vector search stops being an
+exact scan over every chunk as the table grows
+
+Run directly to manage the index:
+    python vector_index.py --status
+    python vector_index.py --create [--method hnsw|ivfflat]
+    python vector_index.py --rebuild [--method hnsw|ivfflat]
+    python vector_index.py --benchmark [--queries 20] [--top-k 10]
+"""
+
+import argparse
+import math
+import threading
+import time
+
+
+VECTOR_COLUMN = "vec"
+ANN_METHODS = ('hnsw', 'ivfflat')
+
+# vecs collections are queried with cosine distance (<=>)
+DISTANCE_OPS = "vector_cosine_ops"
+DISTANCE_OPERATOR = "<=>"
+
+# Per-query recall knobs benchmarked by default
+DEFAULT_EF_SEARCH_VALUES = (20, 40, 80, 160, 320)
+DEFAULT_PROBES_VALUES = (1, 5, 10, 20, 50)
+
+
+def _format_size(size_bytes):
+    """Format a byte count for display"""
+    size = float(size_bytes or 0)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def _percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def default_ivfflat_lists(row_count):
+    """
+    Pick the IVFFlat list count recommended by pgvector
+    
+    Args:
+        row_count: Number of vectors in the table
+    
+    Returns:
+        int: rows / 1000 up to 1M rows, sqrt(rows) above
+    """
+    if row_count <= 1000000:
+        return max(1, row_count // 1000)
+    return int(math.sqrt(row_count))
+
+
+def get_vector_indexes(db_manager):
+    """
+    List HNSW/IVFFlat indexes on the documents table
+    
+    Args:
+        db_manager: DatabaseManager instance
+    
+    Returns:
+        list: Dicts with 'name', 'method', 'size_bytes', 'valid' and 'definition'
+    """
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT c.relname, am.amname, pg_relation_size(c.oid), i.indisvalid, pg_get_indexdef(c.oid)
+                FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                JOIN pg_am am ON am.oid = c.relam
+                JOIN pg_class t ON t.oid = i.indrelid
+                JOIN pg_namespace n ON n.oid = t.relnamespace
+                WHERE n.nspname = 'vecs' AND t.relname = %s AND am.amname IN ('hnsw', 'ivfflat')
+                ORDER BY i.indisvalid DESC, c.relname
+            """, (db_manager.table_name,))
+            rows = cur.fetchall()
+    
+    return [
+        {'name': name, 'method': method, 'size_bytes': size, 'valid': valid, 'definition': definition}
+        for name, method, size, valid, definition in rows
+    ]
+
+
+def _count_vectors(db_manager):
+    """Count rows with an embedding"""
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT COUNT(*) FROM vecs.{db_manager.table_name} WHERE {VECTOR_COLUMN} IS NOT NULL")
+            return cur.fetchone()[0]
+
+
+def _watch_build_progress(db_manager, stop_event, interval):
+    """Print pg_stat_progress_create_index for the table until stop_event is set"""
+    while not stop_event.wait(interval):
+        try:
+            with db_manager.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+                        FROM pg_stat_progress_create_index
+                        WHERE relid = %s::regclass
+                    """, (f"vecs.{db_manager.table_name}",))
+                    row = cur.fetchone()
+        except Exception:
+            return  # Progress is informational; never disturb the build
+        
+        if row:
+            phase, blocks_done, blocks_total, tuples_done, tuples_total = row
+            if tuples_total:
+                detail = f"{tuples_done:,}/{tuples_total:,} tuples ({tuples_done / tuples_total * 100:.0f}%)"
+            elif blocks_total:
+                detail = f"{blocks_done:,}/{blocks_total:,} blocks ({blocks_done / blocks_total * 100:.0f}%)"
+            else:
+                detail = f"{tuples_done:,} tuples"
+            print(f"   Index build: {phase} - {detail}")
+
+
+def create_vector_index(db_manager, method='hnsw', hnsw_m=16, hnsw_ef_construction=64,
+                        ivfflat_lists=0, maintenance_work_mem='', rebuild=False, progress_interval=10):
+    """
+    Create (or rebuild) the ANN index on the embedding column
+    
+    The index is built CONCURRENTLY so searches keep working during the
+    build. A rebuild creates the new index first and only then drops the
+    old one, so there is never a window without an index.
+    
+    Args:
+        db_manager: DatabaseManager instance
+        method: 'hnsw' or 'ivfflat'
+        hnsw_m: HNSW max connections per layer
+        hnsw_ef_construction: HNSW candidate list size during build
+        ivfflat_lists: IVFFlat list count (0 = derive from row count)
+        maintenance_work_mem: Optional memory for the build (e.g. '1GB')
+        rebuild: Replace existing ANN indexes
+        progress_interval: Seconds between progress reports
+    
+    Returns:
+        dict: Index info with 'name', 'method', 'size_bytes', 'build_time' and 'created'
+    """
+    if method not in ANN_METHODS:
+        raise ValueError(f"Unknown vector index method: {method}")
+    
+    existing = get_vector_indexes(db_manager)
+    valid_existing = [index for index in existing if index['valid']]
+    if valid_existing and not rebuild:
+        print(f"Vector index already exists: {valid_existing[0]['name']} ({valid_existing[0]['method']}, "
+              f"{_format_size(valid_existing[0]['size_bytes'])})")
+        return dict(valid_existing[0], build_time=0.0, created=False)
+    
+    row_count = _count_vectors(db_manager)
+    if method == 'hnsw':
+        with_clause = f"m = {int(hnsw_m)}, ef_construction = {int(hnsw_ef_construction)}"
+    else:
+        if row_count == 0:
+            raise ValueError("IVFFlat needs existing vectors to train its lists - index documents first")
+        lists = int(ivfflat_lists) or default_ivfflat_lists(row_count)
+        with_clause = f"lists = {lists}"
+    
+    existing_names = {index['name'] for index in existing}
+    index_name = f"{db_manager.table_name}_{VECTOR_COLUMN}_{method}_idx"
+    build_name = f"{index_name}_new" if index_name in existing_names else index_name
+    
+    print(f"Building {method.upper()} index {index_name} on {row_count:,} vectors ({with_clause})...")
+    
+    stop_event = threading.Event()
+    watcher = threading.Thread(
+        target=_watch_build_progress, args=(db_manager, stop_event, progress_interval), daemon=True
+    )
+    start_time = time.time()
+    
+    with db_manager.get_connection() as conn:
+        # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction block
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                if maintenance_work_mem:
+                    cur.execute("SET maintenance_work_mem = %s", (maintenance_work_mem,))
+                
+                watcher.start()
+                try:
+                    cur.execute(f"""
+                        CREATE INDEX CONCURRENTLY {build_name}
+                        ON vecs.{db_manager.table_name}
+                        USING {method} ({VECTOR_COLUMN} {DISTANCE_OPS})
+                        WITH ({with_clause})
+                    """)
+                except Exception:
+                    # A failed concurrent build leaves an INVALID index behind
+                    cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS vecs.{build_name}")
+                    raise
+                finally:
+                    stop_event.set()
+                
+                for index in existing:
+                    if index['name'] != build_name:
+                        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS vecs.{index['name']}")
+                if build_name != index_name:
+                    cur.execute(f"ALTER INDEX vecs.{build_name} RENAME TO {index_name}")
+                
+                if maintenance_work_mem:
+                    cur.execute("RESET maintenance_work_mem")
+        finally:
+            conn.autocommit = False
+    
+    watcher.join(timeout=1)
+    build_time = time.time() - start_time
+    
+    info = next((index for index in get_vector_indexes(db_manager) if index['name'] == index_name), None)
+    size_bytes = info['size_bytes'] if info else 0
+    print(f"Vector index ready: {index_name} ({_format_size(size_bytes)}, built in {build_time:.1f}s)")
+    
+    return {
+        'name': index_name,
+        'method': method,
+        'size_bytes': size_bytes,
+        'valid': True,
+        'definition': info['definition'] if info else '',
+        'build_time': build_time,
+        'created': True
+    }
+
+
+def prepare_vector_index(db_manager, vector_index_settings):
+    """
+    Create the ANN index after indexing if the table has none (called by the indexer)
+    
+    Args:
+        db_manager: DatabaseManager instance
+        vector_index_settings: Settings from config.get_vector_index_settings()
+    
+    Returns:
+        dict: Index info, or None if disabled or the build failed
+    """
+    if not vector_index_settings['enabled']:
+        return None
+    
+    try:
+        return create_vector_index(
+            db_manager,
+            method=vector_index_settings['method'],
+            hnsw_m=vector_index_settings['hnsw_m'],
+            hnsw_ef_construction=vector_index_settings['hnsw_ef_construction'],
+            ivfflat_lists=vector_index_settings['ivfflat_lists'],
+            maintenance_work_mem=vector_index_settings['maintenance_work_mem']
+        )
+    except Exception as e:
+        print(f"WARNING: Vector index not created ({e}) - vector search will scan the whole table")
+        return None
+
+
+def _timed_search(cur, table, query_vector, top_k):
+    """Run one nearest-neighbour query and return (ids, latency_ms)"""
+    start = time.perf_counter()
+    cur.execute(f"""
+        SELECT id FROM {table}
+        ORDER BY {VECTOR_COLUMN} {DISTANCE_OPERATOR} %s::vector
+        LIMIT %s
+    """, (query_vector, top_k))
+    ids = [row[0] for row in cur.fetchall()]
+    return ids, (time.perf_counter() - start) * 1000
+
+
+def benchmark_vector_index(db_manager, num_queries=20, top_k=10, setting_values=None):
+    """
+    Measure latency and recall of the ANN index against exact search
+    
+    Query vectors are sampled from the table. Exact results come from the same
+    query with index scans disabled; recall@k is the share of exact neighbours
+    the index returns at each hnsw.ef_search / ivfflat.probes value.
+    
+    Args:
+        db_manager: DatabaseManager instance
+        num_queries: Number of sampled query vectors
+        top_k: Neighbours per query
+        setting_values: ef_search (HNSW) or probes (IVFFlat) values to test
+    
+    Returns:
+        dict: 'method', 'exact' stats and per-setting 'results' list
+    """
+    indexes = [index for index in get_vector_indexes(db_manager) if index['valid']]
+    if not indexes:
+        raise ValueError("No valid vector index found - run with --create first")
+    
+    method = indexes[0]['method']
+    setting_name = 'hnsw.ef_search' if method == 'hnsw' else 'ivfflat.probes'
+    if setting_values is None:
+        setting_values = DEFAULT_EF_SEARCH_VALUES if method == 'hnsw' else DEFAULT_PROBES_VALUES
+    
+    table = f"vecs.{db_manager.table_name}"
+    
+    with db_manager.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT {VECTOR_COLUMN}::text FROM {table}
+                WHERE {VECTOR_COLUMN} IS NOT NULL
+                ORDER BY random()
+                LIMIT %s
+            """, (num_queries,))
+            query_vectors = [row[0] for row in cur.fetchall()]
+            
+            # Exact search: same query with the ANN index disabled
+            cur.execute("SET LOCAL enable_indexscan = off")
+            exact_ids = []
+            exact_latencies = []
+            for query_vector in query_vectors:
+                ids, latency = _timed_search(cur, table, query_vector, top_k)
+                exact_ids.append(set(ids))
+                exact_latencies.append(latency)
+            cur.execute("RESET enable_indexscan")
+            
+            results = []
+            for value in setting_values:
+                cur.execute(f"SET LOCAL {setting_name} = {int(value)}")
+                latencies = []
+                recalls = []
+                for query_vector, expected in zip(query_vectors, exact_ids):
+                    ids, latency = _timed_search(cur, table, query_vector, top_k)
+                    latencies.append(latency)
+                    if expected:
+                        recalls.append(len(expected.intersection(ids)) / len(expected))
+                
+                results.append({
+                    'setting': value,
+                    'avg_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+                    'p95_ms': _percentile(latencies, 95),
+                    'recall': sum(recalls) / len(recalls) if recalls else 0.0
+                })
+    
+    return {
+        'method': method,
+        'setting_name': setting_name,
+        'queries': len(query_vectors),
+        'top_k': top_k,
+        'exact': {
+            'avg_ms': sum(exact_latencies) / len(exact_latencies) if exact_latencies else 0.0,
+            'p95_ms': _percentile(exact_latencies, 95)
+        },
+        'results': results
+    }
+
+
+def print_vector_index_status(db_manager):
+    """
+    Print ANN indexes on the documents table with their sizes
+    
+    Args:
+        db_manager: DatabaseManager instance
+    """
+    row_count = _count_vectors(db_manager)
+    indexes = get_vector_indexes(db_manager)
+    
+    print(f"Vectors: {row_count:,}")
+    if not indexes:
+        print("Vector index: NONE - vector search is an exact scan over every chunk")
+        return
+    
+    for index in indexes:
+        print(f"Vector index: {index['name']} ({index['method']}, {_format_size(index['size_bytes'])}"
+              f"{'' if index['valid'] else ', INVALID'})")
+        print(f"   {index['definition']}")
+        if index['method'] == 'ivfflat' and 'lists' in index['definition']:
+            print(f"   Recommended lists for current size: {default_ivfflat_lists(row_count)}")
+
+
+def print_benchmark_results(benchmark):
+    """
+    Print the latency/recall tradeoff table from benchmark_vector_index()
+    
+    Args:
+        benchmark: Result of benchmark_vector_index()
+    """
+    print(f"\nVECTOR INDEX BENCHMARK ({benchmark['method']}, {benchmark['queries']} queries, top_k={benchmark['top_k']}):")
+    print(f"   {'setting':<22} {'avg ms':>9} {'p95 ms':>9} {'recall':>8}")
+    print(f"   {'exact (no index)':<22} {benchmark['exact']['avg_ms']:>9.2f} {benchmark['exact']['p95_ms']:>9.2f} {1.0:>8.3f}")
+    for result in benchmark['results']:
+        label = f"{benchmark['setting_name']}={result['setting']}"
+        print(f"   {label:<22} {result['avg_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['recall']:>8.3f}")
+
+
+def main():
+    """Manage and benchmark the vector index from the command line"""
+    from config import get_config
+    from database_manager import create_database_manager
+    
+    config = get_config()
+    settings = config.get_vector_index_settings()
+    
+    parser = argparse.ArgumentParser(description="Manage the pgvector ANN index on the documents table")
+    parser.add_argument('--status', action='store_true', help="Show indexes and sizes")
+    parser.add_argument('--create', action='store_true', help="Create the index if missing")
+    parser.add_argument('--rebuild', action='store_true', help="Rebuild the index with current parameters")
+    parser.add_argument('--benchmark', action='store_true', help="Compare latency/recall against exact search")
+    parser.add_argument('--method', choices=ANN_METHODS, default=settings['method'])
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--top-k', type=int, default=10)
+    args = parser.parse_args()
+    
+    db_manager = create_database_manager(
+        config.CONNECTION_STRING, config.TABLE_NAME, config.get_database_pool_settings()
+    )
+    
+    print("=" * 60)
+    print(f"VECTOR INDEX: vecs.{config.TABLE_NAME}")
+    print("=" * 60)
+    
+    try:
+        if args.create or args.rebuild:
+            create_vector_index(
+                db_manager,
+                method=args.method,
+                hnsw_m=settings['hnsw_m'],
+                hnsw_ef_construction=settings['hnsw_ef_construction'],
+                ivfflat_lists=settings['ivfflat_lists'],
+                maintenance_work_mem=settings['maintenance_work_mem'],
+                rebuild=args.rebuild
+            )
+        
+        print_vector_index_status(db_manager)
+        
+        if args.benchmark:
+            print_benchmark_results(benchmark_vector_index(db_manager, args.queries, args.top_k))
+    finally:
+        db_manager.close()
+    
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
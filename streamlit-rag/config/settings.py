@@ -14,6 +14,13 @@ class DatabaseConfig:
     connection_string: str
     table_name: str = "documents"
     schema: str = "vecs"
+    
+    # Connection pool (shared by retriever, status checks and scripts)
+    pool_min_size: int = 1
+    pool_max_size: int = 10
+    pool_max_lifetime: float = 1800.0    # Recycle connections after 30 minutes
+    pool_timeout: float = 10.0           # Max wait for a free connection
+    pool_health_check_idle: float = 30.0 # SELECT 1 before reusing connections idle this long
 
 @dataclass
 class EmbeddingConfig:
@@ -21,6 +28,10 @@ class EmbeddingConfig:
     model_name: str = "nomic-embed-text"
     dimension: int = 768
     base_url: str = "http://localhost:11434"
+    
+    # Query embedding LRU (keyed by model + normalized query); path enables SQLite persistence
+    query_cache_size: int = 1024
+    query_cache_path: Optional[str] = None
 
 @dataclass
 class LLMConfig:
@@ -29,6 +40,13 @@ class LLMConfig:
     main_model: str = "llama3.2:3b"
     main_base_url: str = "http://localhost:11434"
     main_timeout: float = 60.0
+    main_temperature: float = 0.1
+    main_max_tokens: int = 512
+    
+    # Answer synthesis: fused chunks packed into the prompt up to a token budget
+    enable_answer_generation: bool = True
+    answer_context_tokens: int = 3000
+    answer_min_chunk_tokens: int = 64  # A chunk cut to fit the budget keeps at least this much
     
     # Entity extraction LLM (more precise)
     extraction_model: str = "llama3:8b-instruct-q4_K_M"
@@ -64,6 +82,19 @@ class SearchConfig:
     complex_query_top_k: int = 30
     vector_max_top_k: int = 1000  # Supabase/vecs hard limit
     
+    # "direct": one pgvector query with SQL threshold and column projection; "llamaindex": VectorIndexRetriever;
+    # "snapshot": in-process search over a local export of the embeddings (direct until it is built)
+    vector_search_backend: str = "direct"
+    vector_snippet_chars: int = 2000  # Chunk text returned inline per hit; longer chunks are fetched in full by id
+    vector_hnsw_ef_search: int = 40   # Higher = better recall, slower (raised to top_k when smaller)
+    vector_ivfflat_probes: int = 10   # Lists scanned per query with an IVFFlat index
+    
+    # Vector snapshot (memory-mapped .npy matrices synced from the vecs table in a background thread)
+    vector_snapshot_path: str = "./vector_snapshot"
+    vector_snapshot_dtype: str = "float32"  # "float16" halves disk/page cache but converts every row per query
+    vector_snapshot_sync_interval: float = 30.0  # Seconds between index version checks
+    vector_snapshot_hnsw: bool = False  # Approximate search via hnswlib (if installed) instead of exact
+    
     # ?? DATABASE SEARCH SETTINGS
     database_search_enabled: bool = True
     database_max_results: int = 100
@@ -71,6 +102,34 @@ class SearchConfig:
     database_base_score: float = 0.60         # Base score for database results
     database_score_per_occurrence: float = 0.05  # Bonus per query occurrence
     
+    # "fts": GIN-indexed tsvector lookups ranked by ts_rank_cd; "like": LIKE scans
+    database_search_backend: str = "fts"
+    database_text_search_config: str = "simple"  # Must match the indexer's TEXT_SEARCH_CONFIG
+    database_person_index: bool = True  # Answer full-name queries from the indexer's name table
+    
+    # Local BM25 index (NumPy CSR postings, memory-mapped) synced from the vecs table
+    # in a background thread; queries never touch Postgres
+    enable_bm25_search: bool = True
+    bm25_index_path: str = "./bm25_index"
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    bm25_sync_interval: float = 30.0  # Seconds between index version checks
+    
+    # End-to-end result cache shared by all sessions (invalidated by the indexer's version stamp)
+    enable_result_cache: bool = True
+    result_cache_size: int = 256
+    result_cache_ttl: float = 3600.0
+    result_cache_version_check_interval: float = 5.0
+    
+    # Start database/vector retrieval on the raw question while entity extraction
+    # and query rewriting run; only the incremental searches start afterwards
+    enable_speculative_retrieval: bool = True
+    
+    # Per-strategy timeouts (strategies run concurrently; a timed-out strategy is cancelled)
+    database_timeout: float = 10.0
+    vector_timeout: float = 30.0
+    bm25_timeout: float = 5.0
+    
     # Multi-query settings
     max_query_variants: int = 3
     enable_query_rewriting: bool = True
@@ -84,6 +143,7 @@ class SearchConfig:
     
     # ?? HYBRID FUSION WEIGHTS
     vector_result_weight: float = 0.7
+    bm25_result_weight: float = 0.8
     database_result_weight: float = 1.0      # Database gets higher weight
     exact_match_boost: float = 1.3           # Boost for exact entity matches
     person_name_boost: float = 1.2           # Boost for person name queries
@@ -103,6 +163,17 @@ class EntityExtractionConfig:
     # Known entities for special handling (updated for hybrid search)
     known_entities: Dict[str, Dict] = None
     
+    # Fast path: gazetteer (known entities + names harvested from the index) and
+    # regex run first; LLM/spaCy are skipped only for a gazetteer match at this confidence
+    fast_path_confidence: float = 0.85
+    harvest_index_names: bool = True
+    harvested_names_limit: int = 5000
+    harvested_name_min_mentions: int = 2
+    
+    # Extraction results cache (LRU + TTL, keyed by normalized query)
+    cache_size: int = 1024
+    cache_ttl: float = 3600.0
+    
     # Extraction prompts
     person_extraction_prompt: str = """Extract only the person's name from this question. Return ONLY the name, no other words.
 
@@ -218,6 +289,31 @@ class UIConfig:
                 "Bernie Loughnane documents"
             ]
 
+@dataclass
+class APIConfig:
+    """Headless search API (search_api.py) and the Streamlit client of it"""
+    host: str = "0.0.0.0"
+    port: int = 8000
+    max_concurrent_searches: int = 8    # Further searches queue (Ollama and the pool are shared)
+    search_timeout: float = 120.0       # Server-side limit per search
+    
+    # When set, Streamlit sends searches to this service instead of running the pipeline itself
+    url: Optional[str] = None
+    client_timeout: float = 180.0
+
+@dataclass
+class TracingConfig:
+    """Span tracing of the search pipeline (utils/tracing.py)"""
+    enabled: bool = True
+    latency_window: int = 1000          # Spans per stage behind the rolling p50/p95/p99
+    
+    # Exports (both off by default): rotating JSONL file and an OTLP/HTTP JSON collector
+    jsonl_path: Optional[str] = None    # e.g. ./traces/spans.jsonl
+    jsonl_max_bytes: int = 10 * 1024 * 1024
+    jsonl_backup_count: int = 5
+    otlp_endpoint: Optional[str] = None  # e.g. http://localhost:4318/v1/traces
+    service_name: str = "streamlit-rag"
+
 class ProductionRAGConfig:
     """Main configuration class for Production RAG System with Hybrid Search"""
     
@@ -225,24 +321,75 @@ class ProductionRAGConfig:
         # Load environment variables
         self.database = DatabaseConfig(
             connection_string=self._get_connection_string(),
-            table_name=os.getenv("TABLE_NAME", "documents")
+            table_name=os.getenv("TABLE_NAME", "documents"),
+            pool_min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            pool_max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            pool_health_check_idle=float(os.getenv("DB_POOL_HEALTH_CHECK_IDLE", "30"))
         )
         
         self.embedding = EmbeddingConfig(
             model_name=os.getenv("EMBEDDING_MODEL", "nomic-embed-text"),
-            base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+            base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+            query_cache_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "1024")),
+            query_cache_path=os.getenv("EMBEDDING_CACHE_PATH") or None
         )
         
         self.llm = LLMConfig(
             main_model=os.getenv("MAIN_LLM_MODEL", "llama3.2:3b"),
             extraction_model=os.getenv("EXTRACTION_LLM_MODEL", "llama3:8b-instruct-q4_K_M"),
-            rewrite_model=os.getenv("REWRITE_LLM_MODEL", "llama3.2:3b")
+            rewrite_model=os.getenv("REWRITE_LLM_MODEL", "llama3.2:3b"),
+            main_max_tokens=int(os.getenv("ANSWER_MAX_TOKENS", "512")),
+            enable_answer_generation=os.getenv("ENABLE_ANSWER_GENERATION", "true").lower() == "true",
+            answer_context_tokens=int(os.getenv("ANSWER_CONTEXT_TOKENS", "3000"))
         )
         
-        self.search = SearchConfig()
-        self.entity_extraction = EntityExtractionConfig()
+        self.search = SearchConfig(
+            vector_search_backend=os.getenv("VECTOR_SEARCH_BACKEND", "direct").lower(),
+            vector_hnsw_ef_search=int(os.getenv("VECTOR_HNSW_EF_SEARCH", "40")),
+            vector_ivfflat_probes=int(os.getenv("VECTOR_IVFFLAT_PROBES", "10")),
+            vector_snapshot_path=os.getenv("VECTOR_SNAPSHOT_PATH", "./vector_snapshot"),
+            vector_snapshot_dtype=os.getenv("VECTOR_SNAPSHOT_DTYPE", "float32").lower(),
+            vector_snapshot_sync_interval=float(os.getenv("VECTOR_SNAPSHOT_SYNC_INTERVAL", "30")),
+            vector_snapshot_hnsw=os.getenv("VECTOR_SNAPSHOT_HNSW", "false").lower() == "true",
+            database_search_backend=os.getenv("DATABASE_SEARCH_BACKEND", "fts").lower(),
+            database_text_search_config=os.getenv("TEXT_SEARCH_CONFIG", "simple").lower(),
+            database_person_index=os.getenv("DATABASE_PERSON_INDEX", "true").lower() == "true",
+            enable_bm25_search=os.getenv("ENABLE_BM25_SEARCH", "true").lower() == "true",
+            bm25_index_path=os.getenv("BM25_INDEX_PATH", "./bm25_index"),
+            bm25_sync_interval=float(os.getenv("BM25_SYNC_INTERVAL", "30")),
+            enable_result_cache=os.getenv("ENABLE_RESULT_CACHE", "true").lower() == "true",
+            result_cache_size=int(os.getenv("RESULT_CACHE_SIZE", "256")),
+            result_cache_ttl=float(os.getenv("RESULT_CACHE_TTL", "3600")),
+            enable_speculative_retrieval=os.getenv("ENABLE_SPECULATIVE_RETRIEVAL", "true").lower() == "true"
+        )
+        self.entity_extraction = EntityExtractionConfig(
+            fast_path_confidence=float(os.getenv("ENTITY_FAST_PATH_CONFIDENCE", "0.85")),
+            harvest_index_names=os.getenv("HARVEST_INDEX_NAMES", "true").lower() == "true",
+            cache_size=int(os.getenv("ENTITY_CACHE_SIZE", "1024")),
+            cache_ttl=float(os.getenv("ENTITY_CACHE_TTL", "3600"))
+        )
         self.query_rewrite = QueryRewriteConfig()
         self.ui = UIConfig()
+        self.api = APIConfig(
+            host=os.getenv("SEARCH_API_HOST", "0.0.0.0"),
+            port=int(os.getenv("SEARCH_API_PORT", "8000")),
+            max_concurrent_searches=int(os.getenv("SEARCH_API_MAX_CONCURRENT", "8")),
+            search_timeout=float(os.getenv("SEARCH_API_TIMEOUT", "120")),
+            url=(os.getenv("SEARCH_API_URL") or "").rstrip("/") or None,
+            client_timeout=float(os.getenv("SEARCH_API_CLIENT_TIMEOUT", "180"))
+        )
+        
+        self.tracing = TracingConfig(
+            enabled=os.getenv("TRACING_ENABLED", "true").lower() == "true",
+            latency_window=int(os.getenv("TRACE_LATENCY_WINDOW", "1000")),
+            jsonl_path=os.getenv("TRACE_JSONL_PATH") or None,
+            jsonl_max_bytes=int(float(os.getenv("TRACE_JSONL_MAX_MB", "10")) * 1024 * 1024),
+            jsonl_backup_count=int(os.getenv("TRACE_JSONL_BACKUPS", "5")),
+            otlp_endpoint=os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or None,
+            service_name=os.getenv("OTEL_SERVICE_NAME", "streamlit-rag")
+        )
     
     def _get_connection_string(self) -> str:
         """Get database connection string from environment"""
@@ -262,7 +409,11 @@ class ProductionRAGConfig:
         validation_results = {}
         
         # Check database connection
-        validation_results["database_config"] = bool(self.database.connection_string)
+        validation_results["database_config"] = bool(
+            self.database.connection_string and
+            0 <= self.database.pool_min_size <= self.database.pool_max_size and
+            self.database.pool_max_size >= 1
+        )
         
         # Check embedding configuration
         validation_results["embedding_config"] = bool(
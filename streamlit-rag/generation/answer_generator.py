@@ -0,0 +1,326 @@
+# generation/answer_generator.py
+# Answer synthesis with the main LLM: fused results packed into a token budget, tokens streamed as they arrive
+
+import math
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# on_token(text): each streamed piece of the answer, in order
+TokenCallback = Callable[[str], None]
+
+# No tokenizer for the Ollama models here: ~4 characters per token for English text
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " ..."
+
+ANSWER_PROMPT = """You answer questions using only the numbered document excerpts below.
+Cite the excerpts you use by number, like [1] or [2][3]. If the excerpts do not contain the answer, say so briefly.
+
+Excerpts:
+{context}
+
+Question: {question}{focus}
+Answer:"""
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+@dataclass
+class PackedContext:
+    """Prompt context built from fused results"""
+    text: str
+    sources: List[Any]  # RetrievalResult objects in the context, numbered from 1
+    tokens: int         # Estimated tokens of text
+    duplicates: int     # Results skipped as repeats of a higher-scored result
+    omitted: int        # Results left out for lack of budget
+    truncated: bool     # The last source was cut to fit
+
+def pack_context(results: List[Any], token_budget: int, min_chunk_tokens: int = 64) -> PackedContext:
+    """
+    Pack results into numbered excerpts, best score first, until the token budget is spent
+    
+    Results repeating an earlier document id or text (whitespace and case aside) are
+    skipped. A result that does not fit is cut when at least min_chunk_tokens of it
+    would remain, otherwise skipped so that shorter lower-scored results can still fit.
+    """
+    ranked = sorted(results, key=lambda r: r.similarity_score, reverse=True)
+    seen_ids = set()
+    seen_texts = set()
+    blocks = []
+    sources = []
+    used = 0
+    duplicates = 0
+    omitted = 0
+    truncated = False
+    
+    for result in ranked:
+        text = " ".join(result.full_content.split())
+        text_key = text.lower()
+        if (result.document_id and result.document_id in seen_ids) or text_key in seen_texts:
+            duplicates += 1
+            continue
+        if result.document_id:
+            seen_ids.add(result.document_id)
+        seen_texts.add(text_key)
+        
+        if truncated or not text:
+            omitted += 1
+            continue
+        
+        header = f"[{len(sources) + 1}] {result.filename}\n"
+        remaining = token_budget - used
+        if estimate_tokens(header + text) > remaining:
+            # Characters left for the cut text once the header and the marker are counted
+            room = remaining * CHARS_PER_TOKEN - len(header) - len(TRUNCATION_MARKER)
+            if room < min_chunk_tokens * CHARS_PER_TOKEN:
+                omitted += 1
+                continue
+            text = text[:room].rsplit(" ", 1)[0] + TRUNCATION_MARKER
+            truncated = True
+        
+        block = header + text
+        blocks.append(block)
+        sources.append(result)
+        used += estimate_tokens(block)
+    
+    return PackedContext(
+        text="\n\n".join(blocks),
+        sources=sources,
+        tokens=used,
+        duplicates=duplicates,
+        omitted=omitted,
+        truncated=truncated
+    )
+
+@dataclass
+class AnswerGenerationResult:
+    """Generated answer with its context and streaming metrics"""
+    answer: str
+    method: str                             # llm / llm_partial / template
+    model: Optional[str] = None
+    context: Optional[PackedContext] = None
+    time_to_first_token: Optional[float] = None  # Seconds from the LLM request to the first token
+    generation_time: float = 0.0
+    output_tokens: int = 0
+    tokens_per_sec: Optional[float] = None  # Output tokens over the streaming time after the first token
+    error: Optional[str] = None
+
+def build_template_answer(question: str, results: List[Any], entity_result: Any, rewrite_result: Any,
+                          query_analysis: Any = None) -> str:
+    """Templated summary of the results (no LLM): used when generation is off, unavailable or fails"""
+    
+    if not results:
+        return f"""No relevant information found for your query: "{question}"
+
+🔍 Search Summary:
+- Entity extracted: "{entity_result.entity}" (confidence: {entity_result.confidence:.1%})
+- Query variants tried: {len(rewrite_result.rewrites)}
+- Method used: {entity_result.method}
+- Search strategy: Hybrid (Vector + Database)
+
+💡 Suggestions:
+- Try rephrasing your query
+- Use more specific terms
+- Check if the information exists in the knowledge base"""
+    
+    # Analyze results quality and source distribution
+    database_results = [r for r in results if "database" in r.source_method]
+    vector_results = [r for r in results if ("vector" in r.source_method or "llamaindex" in r.source_method)]
+    
+    high_quality = [r for r in results if r.similarity_score >= 0.7]
+    medium_quality = [r for r in results if 0.4 <= r.similarity_score < 0.7]
+    
+    # Generate contextual answer
+    answer_parts = []
+    
+    # Header with hybrid search success
+    answer_parts.append(f"🎯 Found **{len(results)} relevant documents** for **{entity_result.entity}**:")
+    
+    # Show source distribution
+    if database_results and vector_results:
+        answer_parts.append(f"📊 **Hybrid Search**: {len(database_results)} exact matches + {len(vector_results)} semantic matches")
+    elif database_results:
+        answer_parts.append(f"🗄️ **Database Search**: {len(database_results)} exact matches found")
+    elif vector_results:
+        answer_parts.append(f"🔍 **Vector Search**: {len(vector_results)} semantic matches found")
+    
+    # High quality results summary
+    if high_quality:
+        answer_parts.append(f"\n**📋 Primary Information** ({len(high_quality)} high-confidence documents):")
+        for i, result in enumerate(high_quality[:3], 1):
+            preview = result.content[:200] + "..." if len(result.content) > 200 else result.content
+            source_indicator = "🗄️" if "database" in result.source_method else "🔍"
+            answer_parts.append(f"{i}. {source_indicator} **{result.filename}** ({result.similarity_score:.3f}): {preview}")
+    
+    # Medium quality results summary
+    if medium_quality and len(high_quality) < 3:
+        needed = 3 - len(high_quality)
+        answer_parts.append(f"\n**📄 Additional Information** ({len(medium_quality)} medium-confidence documents):")
+        for i, result in enumerate(medium_quality[:needed], len(high_quality) + 1):
+            preview = result.content[:150] + "..." if len(result.content) > 150 else result.content
+            source_indicator = "🗄️" if "database" in result.source_method else "🔍"
+            answer_parts.append(f"{i}. {source_indicator} **{result.filename}** ({result.similarity_score:.3f}): {preview}")
+    
+    # Hybrid search intelligence summary
+    answer_parts.append(f"\n**🧠 Search Intelligence:**")
+    answer_parts.append(f"- Entity analysis: {entity_result.method} extraction")
+    answer_parts.append(f"- Query variants: {len(rewrite_result.rewrites)} strategies tried")
+    if query_analysis is not None:
+        query_type = "Person" if query_analysis.is_person_query else "General"
+        answer_parts.append(f"- Query type: {query_type} ({query_analysis.search_strategy.replace('_', ' ')} strategy)")
+    answer_parts.append(f"- Search approach: Hybrid (Database + Vector)")
+    answer_parts.append(f"- Best match confidence: {max(r.similarity_score for r in results):.1%}")
+    
+    return "\n".join(answer_parts)
+
+class ProductionAnswerGenerator:
+    """Streams an answer from the main LLM over the packed results, with the template as fallback"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.llm_config = config.llm
+        self.llm = None
+        if self.llm_config.enable_answer_generation:
+            self._initialize_llm()
+    
+    def _initialize_llm(self):
+        """Initialize the main LLM for answer generation"""
+        try:
+            from llama_index.llms.ollama import Ollama
+            
+            self.llm = Ollama(
+                model=self.llm_config.main_model,
+                base_url=self.llm_config.main_base_url,
+                request_timeout=self.llm_config.main_timeout,
+                additional_kwargs={
+                    "temperature": self.llm_config.main_temperature,
+                    "num_predict": self.llm_config.main_max_tokens
+                }
+            )
+            logger.info(f"Answer generator initialized: {self.llm_config.main_model}")
+        
+        except Exception as e:
+            logger.error(f"Failed to initialize answer generator: {e}")
+            self.llm = None
+    
+    def is_available(self) -> bool:
+        """Check if LLM is available"""
+        return self.llm is not None
+    
+    async def generate(self, question: str, results: List[Any], entity_result: Any, rewrite_result: Any,
+                       query_analysis: Any = None, on_token: Optional[TokenCallback] = None) -> AnswerGenerationResult:
+        """Answer the question from the fused results, streaming tokens to on_token"""
+        start = time.time()
+        
+        if not results or not self.is_available():
+            answer = build_template_answer(question, results, entity_result, rewrite_result, query_analysis)
+            return AnswerGenerationResult(answer=answer, method="template", generation_time=time.time() - start)
+        
+        context = pack_context(results, self.llm_config.answer_context_tokens, self.llm_config.answer_min_chunk_tokens)
+        focus = ""
+        if entity_result.entity and entity_result.entity.lower() != question.strip().lower():
+            focus = f"\n(The question is about: {entity_result.entity})"
+        prompt = ANSWER_PROMPT.format(context=context.text, question=question, focus=focus)
+        
+        logger.info(f"Answer context: {len(context.sources)} sources, ~{context.tokens} tokens "
+                    f"({context.duplicates} duplicates, {context.omitted} omitted)")
+        
+        pieces: List[str] = []
+        first_token_at = None
+        output_tokens = 0
+        error = None
+        
+        def emit(text: str):
+            pieces.append(text)
+            if on_token:
+                on_token(text)
+        
+        try:
+            async for delta, raw in self._stream_completion(prompt):
+                if not delta:
+                    # Ollama's final message carries the exact output token count
+                    if raw and raw.get("eval_count"):
+                        output_tokens = raw["eval_count"]
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.time()
+                emit(delta)
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"Answer generation failed after {len(pieces)} tokens: {e}")
+        
+        finished_at = time.time()
+        
+        if not "".join(pieces).strip():
+            answer = build_template_answer(question, results, entity_result, rewrite_result, query_analysis)
+            return AnswerGenerationResult(
+                answer=answer,
+                method="template",
+                model=self.llm_config.main_model,
+                context=context,
+                generation_time=finished_at - start,
+                error=error or "empty answer"
+            )
+        
+        output_tokens = output_tokens or len(pieces)
+        streaming_time = finished_at - first_token_at
+        if error:
+            emit("\n\n⚠️ *Answer generation was interrupted.*")
+        emit("\n\n**Sources:** " + ", ".join(f"[{i}] {source.filename}" for i, source in enumerate(context.sources, 1)))
+        
+        return AnswerGenerationResult(
+            answer="".join(pieces),
+            method="llm_partial" if error else "llm",
+            model=self.llm_config.main_model,
+            context=context,
+            time_to_first_token=first_token_at - start,
+            generation_time=finished_at - start,
+            output_tokens=output_tokens,
+            tokens_per_sec=output_tokens / streaming_time if streaming_time > 0 else None,
+            error=error
+        )
+    
+    async def _stream_completion(self, prompt: str):
+        """
+        Yield (delta, raw) pairs from the LLM's streaming completion
+        
+        The blocking stream is read on its own thread and handed to the event loop
+        through a queue; when the consumer stops early the thread stops reading.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed (search abandoned)
+                stop.set()
+        
+        def produce():
+            try:
+                for response in self.llm.stream_complete(prompt):
+                    if stop.is_set():
+                        return
+                    put(("delta", response.delta, response.raw))
+                put(("done", None, None))
+            except Exception as e:
+                put(("error", e, None))
+        
+        threading.Thread(target=produce, name="answer-stream", daemon=True).start()
+        try:
+            while True:
+                kind, value, raw = await queue.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise value
+                yield value, raw if isinstance(raw, dict) else None
+        finally:
+            stop.set()
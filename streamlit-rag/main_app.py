@@ -7,12 +7,13 @@
 
 import streamlit as st
 import time
+import html
 import logging
 import asyncio
 import sys
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict
 import traceback
 
 # Add project root to path
@@ -36,10 +37,9 @@ st.set_page_config(
 # Import project modules
 try:
     from config.settings import config
-    from query_processing.entity_extractor import ProductionEntityExtractor
-    from query_processing.query_rewriter import ProductionQueryRewriter
-    from retrieval.multi_retriever import MultiStrategyRetriever
-    from retrieval.results_fusion import ResultsFusionEngine
+    from retrieval.multi_retriever import RetrievalResult
+    from search_pipeline import SearchPipeline
+    from utils.search_client import SearchAPIClient
     from utils.excel_export import render_excel_export_section
 except ImportError as e:
     st.error(f"Import error: {e}")
@@ -137,54 +137,25 @@ def on_query_change():
 
 @st.cache_resource
 def initialize_production_system():
-    """Initialize the production RAG system with hybrid search"""
+    """Initialize the search backend: the local pipeline, or the search API client when SEARCH_API_URL is set"""
     try:
-        logger.info("Initializing Production RAG System...")
-        
-        # Validate configuration
-        validation_results = config.validate_config()
-        invalid_configs = [k for k, v in validation_results.items() if not v]
-        
-        if invalid_configs:
-            error_msg = f"Invalid configuration: {', '.join(invalid_configs)}"
-            logger.error(error_msg)
-            raise ValueError(error_msg)
-        
-        # Initialize components
-        entity_extractor = ProductionEntityExtractor(config)
-        query_rewriter = ProductionQueryRewriter(config)
-        retriever = MultiStrategyRetriever(config)
-        fusion_engine = ResultsFusionEngine(config)
-        
-        # Check component status
-        component_status = {
-            "entity_extractor": len(entity_extractor.get_available_extractors()) > 0,
-            "query_rewriter": len(query_rewriter.get_rewriter_status()) > 0,
-            "retriever": len(retriever.get_retriever_status()) > 0,
-            "fusion_engine": True
-        }
-        
-        failed_components = [k for k, v in component_status.items() if not v]
-        if failed_components:
-            logger.warning(f"Some components failed to initialize: {failed_components}")
-        
-        logger.info("Production RAG System initialized successfully")
-        
-        return {
-            "entity_extractor": entity_extractor,
-            "query_rewriter": query_rewriter, 
-            "retriever": retriever,
-            "fusion_engine": fusion_engine,
-            "status": component_status
-        }
+        if config.api.url:
+            logger.info(f"Using search API at {config.api.url}")
+            client = SearchAPIClient(config.api.url, timeout=config.api.client_timeout)
+            
+            # Compacted results reload their text through the service
+            RetrievalResult.text_loader = client.fetch_chunk_texts
+            return client
         
+        return SearchPipeline(config)
+    
     except Exception as e:
         logger.error(f"Failed to initialize system: {e}")
         logger.error(traceback.format_exc())
         raise
 
-async def run_production_search(system_components: Dict, question: str):
-    """Execute production-grade hybrid search pipeline"""
+async def run_production_search(search_backend, question: str):
+    """Execute production-grade hybrid search pipeline (locally or through the search API)"""
     
     # Set search in progress at the start
     st.session_state.search_in_progress = True
@@ -194,241 +165,46 @@ async def run_production_search(system_components: Dict, question: str):
     with progress_container:
         progress_bar = st.progress(0)
         status_text = st.empty()
+        answer_placeholder = st.empty()
+    
+    def report_progress(percent: int, message: str):
+        progress_bar.progress(percent)
+        status_text.text(message)
+    
+    # Stream the answer as it is generated, redrawing at most every 50ms
+    streamed = {"text": "", "drawn_at": 0.0}
     
-    pipeline_start = time.time()
+    def show_token(text: str):
+        streamed["text"] += text
+        now = time.time()
+        if now - streamed["drawn_at"] >= 0.05:
+            streamed["drawn_at"] = now
+            # Escaped: the answer is LLM output over indexed text, not trusted HTML
+            answer_placeholder.markdown(f'<div class="success-box">{html.escape(streamed["text"])}▌</div>', unsafe_allow_html=True)
     
     try:
-        # STAGE 1: Entity Extraction
-        status_text.text("🧠 Smart entity extraction...")
-        progress_bar.progress(15)
-        
-        extraction_start = time.time()
-        entity_result = system_components["entity_extractor"].extract_entity(question)
-        extraction_time = time.time() - extraction_start
-        
-        logger.info(f"Entity extraction: '{entity_result.entity}' via {entity_result.method} (confidence: {entity_result.confidence:.2f})")
-        
-        # STAGE 2: Query Rewriting  
-        status_text.text("✏️ Query transformation...")
-        progress_bar.progress(30)
-        
-        rewrite_start = time.time()
-        rewrite_result = system_components["query_rewriter"].rewrite_query(
-            question, entity_result.entity
-        )
-        rewrite_time = time.time() - rewrite_start
-        
-        logger.info(f"Query rewriting: {len(rewrite_result.rewrites)} variants via {rewrite_result.method}")
-        
-        # STAGE 3: 🆕 Hybrid Multi-Strategy Retrieval
-        status_text.text("🔍 Hybrid multi-strategy retrieval...")
-        progress_bar.progress(50)
-        
-        retrieval_start = time.time()
-        
-        # Get required terms for content filtering
-        required_terms = []
-        if entity_result.entity != question.strip():
-            # Extract words from entity for filtering
-            entity_words = [word.lower() for word in entity_result.entity.split() 
-                           if len(word) > 2 and word.lower() not in ['the', 'and', 'or']]
-            required_terms = entity_words
-        
-        multi_retrieval_result = await system_components["retriever"].multi_retrieve(
-            queries=rewrite_result.rewrites,
-            extracted_entity=entity_result.entity,
-            required_terms=required_terms
-        )
-        retrieval_time = time.time() - retrieval_start
+        result = await search_backend.search(question, progress=report_progress, on_token=show_token)
         
-        logger.info(f"Multi-retrieval: {len(multi_retrieval_result.results)} results via {', '.join(multi_retrieval_result.methods_used)}")
-        
-        # STAGE 4: 🆕 Hybrid Results Fusion
-        status_text.text("⚖️ Advanced hybrid fusion...")
-        progress_bar.progress(75)
-        
-        fusion_start = time.time()
-        fusion_result = system_components["fusion_engine"].fuse_results(
-            all_results=multi_retrieval_result.results,
-            original_query=question,
-            extracted_entity=entity_result.entity,
-            required_terms=required_terms
-        )
-        fusion_time = time.time() - fusion_start
-        
-        logger.info(f"Results fusion: {fusion_result.final_count} final results via {fusion_result.fusion_method}")
-        
-        # STAGE 5: Answer Generation
-        status_text.text("📝 Generating intelligent answer...")
-        progress_bar.progress(90)
-        
-        answer_start = time.time()
-        answer = await generate_production_answer(
-            question, fusion_result.fused_results, entity_result, rewrite_result
-        )
-        answer_time = time.time() - answer_start
-        
-        # Complete pipeline
-        total_time = time.time() - pipeline_start
-        
-        progress_bar.progress(100)
-        status_text.text("✅ Hybrid search completed!")
-        
-        # Clear progress after delay
-        await asyncio.sleep(1)
+        # Clear progress after delay (cache hits and streamed answers are already complete)
+        if not result["performance_metrics"].get("cache_hit") and not streamed["text"]:
+            await asyncio.sleep(1)
         progress_container.empty()
         
-        return {
-            "original_question": question,
-            "entity_result": entity_result,
-            "rewrite_result": rewrite_result,
-            "retrieval_result": multi_retrieval_result,
-            "fusion_result": fusion_result,
-            "answer": answer,
-            "performance_metrics": {
-                "total_time": total_time,
-                "extraction_time": extraction_time,
-                "rewrite_time": rewrite_time,
-                "retrieval_time": retrieval_time,
-                "fusion_time": fusion_time,
-                "answer_time": answer_time,
-                "pipeline_efficiency": {
-                    "extraction_pct": (extraction_time / total_time) * 100,
-                    "rewrite_pct": (rewrite_time / total_time) * 100,
-                    "retrieval_pct": (retrieval_time / total_time) * 100,
-                    "fusion_pct": (fusion_time / total_time) * 100,
-                    "answer_pct": (answer_time / total_time) * 100
-                }
-            }
-        }
-        
+        return result
+    
     except Exception as e:
         progress_container.empty()
         logger.error(f"Production search failed: {e}")
-        logger.error(traceback.format_exc())
         raise
     finally:
         # Always clear search in progress flag
         st.session_state.search_in_progress = False
 
-async def generate_production_answer(question: str, results: List[Any], entity_result: Any, rewrite_result: Any) -> str:
-    """Generate production-quality answer with hybrid search context"""
-    
-    if not results:
-        return f"""No relevant information found for your query: "{question}"
-
-🔍 Search Summary:
-- Entity extracted: "{entity_result.entity}" (confidence: {entity_result.confidence:.1%})
-- Query variants tried: {len(rewrite_result.rewrites)}
-- Method used: {entity_result.method}
-- Search strategy: Hybrid (Vector + Database)
-
-💡 Suggestions:
-- Try rephrasing your query
-- Use more specific terms
-- Check if the information exists in the knowledge base"""
-
-    # Analyze results quality and source distribution
-    database_results = [r for r in results if "database" in r.source_method]
-    vector_results = [r for r in results if ("vector" in r.source_method or "llamaindex" in r.source_method)]
-    
-    high_quality = [r for r in results if r.similarity_score >= 0.7]
-    medium_quality = [r for r in results if 0.4 <= r.similarity_score < 0.7]
-    
-    # Generate contextual answer
-    answer_parts = []
-    
-    # Header with hybrid search success
-    answer_parts.append(f"🎯 Found **{len(results)} relevant documents** for **{entity_result.entity}**:")
-    
-    # Show source distribution
-    if database_results and vector_results:
-        answer_parts.append(f"📊 **Hybrid Search**: {len(database_results)} exact matches + {len(vector_results)} semantic matches")
-    elif database_results:
-        answer_parts.append(f"🗄️ **Database Search**: {len(database_results)} exact matches found")
-    elif vector_results:
-        answer_parts.append(f"🔍 **Vector Search**: {len(vector_results)} semantic matches found")
-    
-    # High quality results summary
-    if high_quality:
-        answer_parts.append(f"\n**📋 Primary Information** ({len(high_quality)} high-confidence documents):")
-        for i, result in enumerate(high_quality[:3], 1):
-            preview = result.content[:200] + "..." if len(result.content) > 200 else result.content
-            source_indicator = "🗄️" if "database" in result.source_method else "🔍"
-            answer_parts.append(f"{i}. {source_indicator} **{result.filename}** ({result.similarity_score:.3f}): {preview}")
-    
-    # Medium quality results summary  
-    if medium_quality and len(high_quality) < 3:
-        needed = 3 - len(high_quality)
-        answer_parts.append(f"\n**📄 Additional Information** ({len(medium_quality)} medium-confidence documents):")
-        for i, result in enumerate(medium_quality[:needed], len(high_quality) + 1):
-            preview = result.content[:150] + "..." if len(result.content) > 150 else result.content
-            source_indicator = "🗄️" if "database" in result.source_method else "🔍"
-            answer_parts.append(f"{i}. {source_indicator} **{result.filename}** ({result.similarity_score:.3f}): {preview}")
-    
-    # Hybrid search intelligence summary
-    answer_parts.append(f"\n**🧠 Search Intelligence:**")
-    answer_parts.append(f"- Entity analysis: {entity_result.method} extraction")
-    answer_parts.append(f"- Query variants: {len(rewrite_result.rewrites)} strategies tried")
-    answer_parts.append(f"- Search approach: Hybrid (Database + Vector)")
-    answer_parts.append(f"- Best match confidence: {max(r.similarity_score for r in results):.1%}")
-    
-    return "\n".join(answer_parts)
-
 @st.cache_data(ttl=300)
 def get_system_status():
     """Get cached system status with hybrid search info"""
     try:
-        system = initialize_production_system()
-        
-        # Check database
-        try:
-            import psycopg2
-            conn = psycopg2.connect(config.database.connection_string)
-            cur = conn.cursor()
-            cur.execute(f"SELECT COUNT(*) FROM {config.database.schema}.{config.database.table_name}")
-            total_docs = cur.fetchone()[0]
-            cur.execute(f"SELECT COUNT(DISTINCT metadata->>'file_name') FROM {config.database.schema}.{config.database.table_name} WHERE metadata->>'file_name' IS NOT NULL")
-            unique_files = cur.fetchone()[0]
-            cur.close()
-            conn.close()
-            
-            database_status = {
-                "available": True,
-                "total_documents": total_docs,
-                "unique_files": unique_files
-            }
-        except Exception as e:
-            database_status = {"available": False, "error": str(e)}
-        
-        # Check embedding model
-        try:
-            from llama_index.embeddings.ollama import OllamaEmbedding
-            embed_model = OllamaEmbedding(
-                model_name=config.embedding.model_name,
-                base_url=config.embedding.base_url
-            )
-            test_embedding = embed_model.get_text_embedding("test")
-            embedding_status = {
-                "available": len(test_embedding) == config.embedding.dimension,
-                "model": config.embedding.model_name,
-                "dimension": len(test_embedding) if test_embedding else 0
-            }
-        except Exception as e:
-            embedding_status = {"available": False, "error": str(e)}
-        
-        return {
-            "system": system["status"],
-            "database": database_status,
-            "embedding": embedding_status,
-            "components": {
-                "entity_extractors": system["entity_extractor"].get_extractor_status(),
-                "query_rewriters": system["query_rewriter"].get_rewriter_status(),
-                "retrievers": system["retriever"].get_retriever_status()
-            },
-            "hybrid_enabled": config.search.enable_hybrid_search if hasattr(config.search, 'enable_hybrid_search') else True
-        }
-        
+        return initialize_production_system().get_status()
     except Exception as e:
         return {"error": str(e), "system": {}}
 
@@ -460,6 +236,102 @@ def render_sidebar():
         else:
             st.error("❌ Database Error")
         
+        # Live counters (not part of the cached status)
+        try:
+            live_stats = initialize_production_system().get_stats()
+        except Exception as e:
+            st.warning(f"Live stats unavailable: {e}")
+            live_stats = {}
+        
+        # Connection pool metrics
+        pool_metrics = live_stats.get("pool")
+        if pool_metrics:
+            with st.expander("🔌 Connection Pool", expanded=False):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Avg Wait", f"{pool_metrics['avg_wait_ms']:.1f}ms")
+                    st.metric("Open", f"{pool_metrics['open_connections']}/{pool_metrics['max_size']}")
+                with col2:
+                    st.metric("Avg Checkout", f"{pool_metrics['avg_checkout_ms']:.1f}ms")
+                    st.metric("Checkouts", pool_metrics["checkouts"])
+                if pool_metrics["timeouts"] or pool_metrics["health_check_failures"]:
+                    st.warning(f"Timeouts: {pool_metrics['timeouts']} | Failed health checks: {pool_metrics['health_check_failures']}")
+        
+        # Search result cache counters
+        result_cache_stats = live_stats.get("result_cache")
+        if result_cache_stats:
+            with st.expander("⚡ Result Cache", expanded=False):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Hits", result_cache_stats["hits"])
+                    st.metric("Hit Rate", f"{result_cache_stats['hit_rate']:.0%}")
+                with col2:
+                    st.metric("Misses", result_cache_stats["misses"])
+                    st.metric("Size", f"{result_cache_stats['size']}/{result_cache_stats['max_size']}")
+                st.caption(f"Index version: {result_cache_stats['index_version'] if result_cache_stats['index_version'] is not None else 'n/a'}"
+                           f" | invalidations: {result_cache_stats['invalidations']} | TTL: {result_cache_stats['ttl']:.0f}s")
+        
+        # Query embedding cache counters
+        cache_stats = live_stats.get("embedding_cache")
+        if cache_stats:
+            with st.expander("🧮 Embedding Cache", expanded=False):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Hits", cache_stats["hits"])
+                    st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+                with col2:
+                    st.metric("Misses", cache_stats["misses"])
+                    st.metric("Size", f"{cache_stats['size']}/{cache_stats['max_size']}")
+                st.caption(f"{cache_stats['embedded_texts']} texts embedded in {cache_stats['embedding_requests']} requests"
+                           f" ({cache_stats['batch_requests']} batched)"
+                           f"{' | persisted' if cache_stats['persistent'] else ''}")
+        
+        # Local BM25 index (built and synced in the background)
+        bm25_stats = live_stats.get("bm25")
+        if bm25_stats:
+            with st.expander("🔤 BM25 Index", expanded=False):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Documents", f"{bm25_stats['documents']:,}")
+                with col2:
+                    st.metric("Segments", bm25_stats["segments"])
+                st.caption(f"Index version: {bm25_stats['index_version']}")
+                if bm25_stats["last_sync_error"]:
+                    st.warning(f"Sync failed: {bm25_stats['last_sync_error']}")
+        
+        # Local vector snapshot (exported and synced in the background)
+        snapshot_stats = live_stats.get("vector_snapshot")
+        if snapshot_stats:
+            with st.expander("🧮 Vector Snapshot", expanded=False):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("Vectors", f"{snapshot_stats['documents']:,}")
+                with col2:
+                    st.metric("Segments", snapshot_stats["segments"])
+                search_mode = "HNSW" if snapshot_stats["hnsw"] else "exact"
+                st.caption(f"{snapshot_stats['dtype']}, dim {snapshot_stats['dimension']}, {search_mode} search")
+                st.caption(f"Index version: {snapshot_stats['index_version']}")
+                if snapshot_stats["last_sync_error"]:
+                    st.warning(f"Sync failed: {snapshot_stats['last_sync_error']}")
+        
+        # Rolling per-stage latency from the pipeline's spans
+        tracing_stats = live_stats.get("tracing")
+        if tracing_stats and tracing_stats["stages"]:
+            with st.expander("⏱️ Stage Latency", expanded=False):
+                st.table([
+                    {
+                        "Stage": name,
+                        "p50 ms": f"{stage['p50_ms']:.0f}",
+                        "p95 ms": f"{stage['p95_ms']:.0f}",
+                        "p99 ms": f"{stage['p99_ms']:.0f}",
+                        "Count": stage["count"]
+                    }
+                    for name, stage in tracing_stats["stages"].items()
+                ])
+                st.caption(f"Last {max(stage['window'] for stage in tracing_stats['stages'].values())} spans per stage"
+                           f" | export: {', '.join(tracing_stats['exporters']) or 'off'}"
+                           + (f" | dropped: {tracing_stats['dropped']}" if tracing_stats["dropped"] else ""))
+        
         # Embedding status
         if status["embedding"]["available"]:
             st.success("🔍 Embeddings Ready")
@@ -565,15 +437,21 @@ def render_search_results(result: Dict):
     
     # Main answer
     st.header("📋 Answer")
-    st.markdown(f'<div class="success-box">{result["answer"]}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="success-box">{html.escape(result["answer"])}</div>', unsafe_allow_html=True)
     
     # Performance metrics
     metrics = result["performance_metrics"]
     st.header("📊 Performance Analytics")
     
+    if metrics.get("cache_hit"):
+        st.info(f"⚡ Served from result cache in {metrics['cache_lookup_time'] * 1000:.1f}ms "
+                f"(computed {metrics['cache_age']:.0f}s ago, original pipeline time shown below)")
+    
     col1, col2, col3, col4 = st.columns(4)
     with col1:
         st.metric("⏱️ Total Time", f"{metrics['total_time']:.2f}s")
+        if metrics.get("time_to_first_token") is not None:
+            st.metric("⚡ First Token", f"{metrics['time_to_first_token']:.2f}s")
     with col2:
         st.metric("📄 Results Found", result["fusion_result"].final_count)
     with col3:
@@ -598,6 +476,32 @@ def render_search_results(result: Dict):
         with col3:
             st.metric("📝 Answer Generation", f"{metrics['answer_time']:.3f}s", f"{efficiency['answer_pct']:.1f}%")
             st.metric("🚀 Pipeline Efficiency", f"{(1/metrics['total_time']):.2f} q/s")
+        
+        if metrics.get("answer_method"):
+            answer_info = f"**Answer:** {metrics['answer_method']}"
+            if metrics.get("answer_ttft") is not None:
+                answer_info += (f", first token {metrics['answer_ttft']:.2f}s after the LLM request, "
+                                f"{metrics['answer_tokens']} tokens at {metrics['tokens_per_sec'] or 0:.1f} tok/s")
+            if metrics.get("context_sources"):
+                answer_info += f" | context: {metrics['context_sources']} sources, ~{metrics['context_tokens']} tokens"
+            st.write(answer_info)
+        
+        # Concurrent retrieval strategies: retrieval time tracks the slowest one
+        strategy_timings = result["retrieval_result"].metadata.get("strategy_timings", {})
+        if strategy_timings:
+            st.write("**Retrieval Strategies (concurrent):** " + ", ".join(
+                f"{name}: {seconds:.3f}s" for name, seconds in strategy_timings.items()
+            ))
+        if metrics.get("speculative_time") is not None:
+            reused = result["retrieval_result"].metadata.get("speculative_reused", [])
+            st.write(f"**Speculative Retrieval:** {metrics['speculative_time']:.3f}s on the raw question, "
+                     f"{metrics['speculative_overlap']:.3f}s overlapped with {metrics['llm_stages_time']:.3f}s of LLM stages"
+                     + (f" (reused by: {', '.join(reused)})" if reused else " (merged into fusion)"))
+        timed_out = result["retrieval_result"].metadata.get("timed_out_strategies", [])
+        if timed_out:
+            st.warning(f"Timed out: {', '.join(timed_out)}")
+        if metrics.get("trace_id"):
+            st.caption(f"Trace ID: {metrics['trace_id']} (per-stage spans in the trace export)")
     
     # 🆕 Hybrid Retrieval Intelligence
     retrieval_result = result["retrieval_result"]
@@ -662,11 +566,14 @@ def render_search_results(result: Dict):
                 
                 with col1:
                     st.markdown("**📄 Content Preview:**")
+                    show_full_text = doc.text_length > len(doc.content) and st.checkbox(
+                        f"Show full text ({doc.text_length:,} characters)", key=f"full_text_{i}"
+                    )
                     st.text_area(
                         "preview", 
-                        doc.content, 
-                        height=150, 
-                        key=f"preview_{i}", 
+                        doc.full_content if show_full_text else doc.content, 
+                        height=300 if show_full_text else 150, 
+                        key=f"full_{i}" if show_full_text else f"preview_{i}", 
                         label_visibility="collapsed"
                     )
                 
@@ -783,7 +690,7 @@ def main():
             ))
             st.session_state.search_results = result
             st.session_state.search_performed = True
-            
+        
         except Exception as e:
             st.error(f"Hybrid search failed: {e}")
             logger.error(f"Search error: {e}")
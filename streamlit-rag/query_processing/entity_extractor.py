@@ -2,9 +2,12 @@
 # Smart entity extraction with multiple methods and fallbacks
 
 import re
+import time
 import logging
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple, Iterable, Any
+from dataclasses import dataclass, replace
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
@@ -248,6 +251,168 @@ class RegexEntityExtractor(BaseEntityExtractor):
         
         return min(1.0, max(0.0, confidence))
 
+class GazetteerEntityExtractor(BaseEntityExtractor):
+    """Dictionary lookup of known person names (case-insensitive, no LLM round-trip)"""
+    
+    # Longest names are tried first so "Mary Ann Smith" wins over "Mary Ann"
+    MAX_NAME_WORDS = 4
+    
+    def __init__(self, names: Iterable[str] = (), confidence: float = 0.95):
+        self.names: Dict[str, Tuple[str, float]] = {}  # lowercase name -> (display form, match confidence)
+        self.add_names(names, confidence)
+    
+    def add_names(self, names: Iterable[str], confidence: float = 0.95):
+        """
+        Add names to the dictionary (display form is kept; title-cased if given lowercase)
+        
+        Names already present keep their confidence, so known entities added
+        first are not downgraded by the same name harvested from the index.
+        """
+        updated = dict(self.names)
+        for name in names:
+            normalized = " ".join(name.split())
+            if len(normalized) < 3:
+                continue
+            display = normalized if normalized != normalized.lower() else normalized.title()
+            updated.setdefault(normalized.lower(), (display, confidence))
+        self.names = updated  # Swapped whole so concurrent lookups see a consistent dict
+    
+    def is_available(self) -> bool:
+        """Available once the dictionary holds at least one name"""
+        return bool(self.names)
+    
+    def extract(self, query: str) -> EntityExtractionResult:
+        """Find the longest dictionary name in the query"""
+        words = re.findall(r"[A-Za-z][A-Za-z'\-]*", query)
+        lowered = [word.lower() for word in words]
+        names = self.names
+        
+        matches = []
+        confidence = 0.0
+        for size in range(min(self.MAX_NAME_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                entry = names.get(" ".join(lowered[start:start + size]))
+                if entry and not any(entry[0].lower() in m.lower() for m in matches):
+                    if not matches:
+                        confidence = entry[1]
+                    matches.append(entry[0])
+        
+        if not matches:
+            return EntityExtractionResult(
+                entity=query.strip(),
+                confidence=0.0,
+                method="gazetteer_no_match"
+            )
+        
+        logger.info(f"?? Gazetteer matched entity: '{matches[0]}'")
+        return EntityExtractionResult(
+            entity=matches[0],
+            confidence=confidence,
+            method="gazetteer",
+            alternatives=matches[1:],
+            metadata={"dictionary_size": len(names)}
+        )
+
+def harvest_person_names(config, limit: int = 5000, min_mentions: int = 2) -> List[str]:
+    """
+    Harvest capitalized multi-word names that recur across indexed chunks
+    
+    Reads the indexer's person name table when present, otherwise scans the
+    chunk text once with a regular expression.
+    
+    Args:
+        config: ProductionRAGConfig (database settings)
+        limit: Maximum number of names returned (most mentioned first)
+        min_mentions: Minimum number of mentions for a name to be kept
+    
+    Returns:
+        List of names; empty if the index is unreachable
+    """
+    from utils.connection_pool import get_connection_pool
+    
+    table = f"{config.database.schema}.{config.database.table_name}"
+    names_table = f"{table}_person_names"
+    # Words that start sentences or headings rather than names
+    stop_words = {'the', 'this', 'that', 'these', 'with', 'from', 'for', 'and', 'date', 'page',
+                  'certificate', 'course', 'training', 'level', 'dear', 'total', 'name'}
+    
+    try:
+        pool = get_connection_pool(config.database.connection_string, config.database)
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SET LOCAL statement_timeout = '30s'")
+                cur.execute("SELECT to_regclass(%s)", (names_table,))
+                if cur.fetchone()[0] is not None:
+                    source = f"SELECT name FROM {names_table}"
+                else:
+                    source = f"SELECT (regexp_matches(metadata->>'text', %(pattern)s, 'g'))[1] AS name FROM {table}"
+                cur.execute(f"""
+                    SELECT name, COUNT(*) AS mentions
+                    FROM ({source}) AS found
+                    GROUP BY name
+                    HAVING COUNT(*) >= %(min_mentions)s
+                    ORDER BY mentions DESC
+                    LIMIT %(limit)s
+                """, {
+                    "pattern": r"\m([A-Z][a-z]+(?: [A-Z][a-z]+){1,2})\M",
+                    "min_mentions": min_mentions,
+                    "limit": limit
+                })
+                rows = cur.fetchall()
+    except Exception as e:
+        logger.warning(f"?? Could not harvest person names from index: {e}")
+        return []
+    
+    names = [row[0] for row in rows if not set(row[0].lower().split()) & stop_words]
+    logger.info(f"?? Harvested {len(names)} person names from {table}")
+    return names
+
+class EntityExtractionCache:
+    """Thread-safe LRU + TTL cache of extraction results keyed by normalized query"""
+    
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, EntityExtractionResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def _key(query: str) -> str:
+        # Case is kept: capitalization drives regex and LLM extraction
+        return " ".join(query.split())
+    
+    def get(self, query: str) -> Optional[EntityExtractionResult]:
+        """Get a copy of the cached result, or None if missing or expired"""
+        key = self._key(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            result = entry[1]
+        return replace(result, alternatives=list(result.alternatives), metadata=dict(result.metadata, cache_hit=True))
+    
+    def put(self, query: str, result: EntityExtractionResult):
+        """Store a result, evicting the least recently used"""
+        with self._lock:
+            self._entries[self._key(query)] = (time.time(), result)
+            self._entries.move_to_end(self._key(query))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._metrics, size=len(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
 class SpacyEntityExtractor(BaseEntityExtractor):
     """SpaCy-based entity extraction (optional)"""
     
@@ -323,11 +488,25 @@ class SpacyEntityExtractor(BaseEntityExtractor):
             )
 
 class ProductionEntityExtractor:
-    """Production-ready entity extractor with multiple methods and intelligent fallback"""
+    """Production-ready entity extractor with multiple methods and intelligent fallback
+    
+    Tiers: cache -> fast path (gazetteer, regex) -> LLM/spaCy unless a gazetteer
+    match reaches entity_extraction.fast_path_confidence.
+    """
+    
+    FAST_PATH = ["gazetteer", "regex"]
+    SLOW_PATH = ["llm", "spacy"]
+    # Only dictionary matches may skip the slow path: regex rates any Title-Case
+    # run ("What Fire Safety Training") as highly as a name
+    CONCLUSIVE_METHODS = {"gazetteer"}
     
     def __init__(self, config):
         self.config = config
         self.extractors = {}
+        self.cache = EntityExtractionCache(
+            config.entity_extraction.cache_size,
+            config.entity_extraction.cache_ttl
+        )
         
         # Initialize available extractors
         self._initialize_extractors()
@@ -337,6 +516,20 @@ class ProductionEntityExtractor:
         # Always available
         self.extractors["regex"] = RegexEntityExtractor()
         
+        # Gazetteer: known entities plus names that recur in the index. Harvested
+        # names are only Title-Case phrases ("Fire Safety" as much as "John Smith"),
+        # so their matches stay below the fast-path cutoff and still reach the LLM
+        extraction_config = self.config.entity_extraction
+        gazetteer = GazetteerEntityExtractor(extraction_config.known_entities.keys())
+        if extraction_config.harvest_index_names:
+            gazetteer.add_names(harvest_person_names(
+                self.config,
+                extraction_config.harvested_names_limit,
+                extraction_config.harvested_name_min_mentions
+            ), confidence=min(0.75, extraction_config.fast_path_confidence - 0.05))
+        if gazetteer.is_available():
+            self.extractors["gazetteer"] = gazetteer
+        
         # LLM extractor (if available)
         if "llm" in self.config.entity_extraction.extraction_methods:
             llm_extractor = LLMEntityExtractor(self.config.llm)
@@ -362,24 +555,37 @@ class ProductionEntityExtractor:
         
         query = query.strip()
         
-        # Try extractors in order of preference
-        extraction_order = ["llm", "spacy", "regex"]
+        cached = self.cache.get(query)
+        if cached is not None:
+            logger.info(f"? Cached extraction: '{cached.entity}' via {cached.method}")
+            return cached
+        
         results = []
         
-        for extractor_name in extraction_order:
-            if extractor_name in self.extractors:
-                try:
-                    result = self.extractors[extractor_name].extract(query)
-                    results.append(result)
+        # Fast path first: the LLM is only consulted when it is not confident enough
+        for extractor_name in self.FAST_PATH + self.SLOW_PATH:
+            if extractor_name not in self.extractors:
+                continue
+            conclusive = [r for r in results if r.method in self.CONCLUSIVE_METHODS]
+            if extractor_name in self.SLOW_PATH and conclusive:
+                best_fast = max(conclusive, key=lambda x: x.confidence)
+                if best_fast.confidence >= self.config.entity_extraction.fast_path_confidence:
+                    logger.info(f"? Fast path extraction: '{best_fast.entity}' via {best_fast.method}")
+                    self.cache.put(query, best_fast)
+                    return best_fast
+            try:
+                result = self.extractors[extractor_name].extract(query)
+                results.append(result)
+                
+                # If we get high confidence result from the slow path, use it
+                if extractor_name in self.SLOW_PATH and result.confidence > 0.7:
+                    logger.info(f"? High confidence extraction: '{result.entity}' via {result.method}")
+                    self.cache.put(query, result)
+                    return result
                     
-                    # If we get high confidence result, use it
-                    if result.confidence > 0.7:
-                        logger.info(f"? High confidence extraction: '{result.entity}' via {result.method}")
-                        return result
-                        
-                except Exception as e:
-                    logger.warning(f"?? Extractor {extractor_name} failed: {e}")
-                    continue
+            except Exception as e:
+                logger.warning(f"?? Extractor {extractor_name} failed: {e}")
+                continue
         
         # Select best result from all attempts
         if results:
@@ -392,6 +598,7 @@ class ProductionEntityExtractor:
             ]
             
             logger.info(f"?? Best extraction: '{best_result.entity}' via {best_result.method} (confidence: {best_result.confidence:.2f})")
+            self.cache.put(query, best_result)
             return best_result
         
         # Ultimate fallback
@@ -452,4 +659,8 @@ class ProductionEntityExtractor:
     
     def get_extractor_status(self) -> Dict[str, bool]:
         """Get status of all extractors"""
-        return {name: extractor.is_available() for name, extractor in self.extractors.items()}
\ No newline at end of file
+        return {name: extractor.is_available() for name, extractor in self.extractors.items()}
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get extraction cache statistics"""
+        return self.cache.get_stats()
\ No newline at end of file
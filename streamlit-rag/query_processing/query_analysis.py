@@ -0,0 +1,227 @@
+# query_processing/query_analysis.py
+# Query classification computed once per search and shared by retrieval, fusion and answer generation
+
+import re
+import logging
+from typing import List, Dict, Optional, Any
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+class PersonNameDetector:
+    """Universal person name detection using best practices from NLP literature"""
+    
+    def __init__(self):
+        # Universal person name patterns from NLP best practices
+        self.person_patterns = [
+            # Basic: First Last (most common)
+            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',
+            
+            # With middle initial: First M. Last
+            r'\b[A-Z][a-z]+\s+[A-Z]\.\s+[A-Z][a-z]+\b',
+            
+            # With middle name: First Middle Last
+            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+\b',
+            
+            # Hyphenated names: Smith-Jones, Lloyd-Atkinson
+            r'\b[A-Z][a-z]+-[A-Z][a-z]+\b',
+            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+-[A-Z][a-z]+\b',
+            
+            # Names with apostrophes: D'Angelo, O'Brien
+            r"\b[A-Z]'[A-Z][a-z]+\b",
+            r"\b[A-Z][a-z]+\s+[A-Z]'[A-Z][a-z]+\b",
+            
+            # Names with prefixes: Van der, De, Di, etc.
+            r'\b[A-Z][a-z]+\s+(?:van|de|di|du|da|del|della|von|zu)\s+[A-Z][a-z]+\b',
+            r'\b(?:Van|De|Di|Du|Da|Del|Della|Von|Zu)\s+[A-Z][a-z]+\b',
+            
+            # Names with suffixes: Jr., Sr., III
+            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+(?:Jr|Sr|III|II|IV)\b',
+        ]
+        
+        # Compile patterns for performance
+        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.person_patterns]
+        
+        # Keywords that often indicate person queries
+        self.person_keywords = [
+            'who is', 'tell me about', 'find', 'about', 'information about',
+            'show me', 'give me', 'details about', 'biography', 'profile'
+        ]
+    
+    def is_person_query(self, query: str, extracted_entity: Optional[str] = None) -> bool:
+        """Detect if query is about a person using universal patterns"""
+        
+        # Check extracted entity first (if available)
+        if extracted_entity:
+            if self.contains_person_name(extracted_entity):
+                return True
+        
+        # Check original query
+        if self.contains_person_name(query):
+            return True
+        
+        # Check for person-related keywords + capitalized words
+        query_lower = query.lower()
+        has_person_keywords = any(keyword in query_lower for keyword in self.person_keywords)
+        has_capitalized_words = bool(re.search(r'\b[A-Z][a-z]+\b', query))
+        
+        return has_person_keywords and has_capitalized_words
+    
+    def contains_person_name(self, text: str) -> bool:
+        """Check if text contains a person name using universal patterns"""
+        if not text or len(text.strip()) < 2:
+            return False
+        
+        # Try each compiled pattern
+        for pattern in self.compiled_patterns:
+            if pattern.search(text):
+                return True
+        
+        return False
+    
+    def extract_person_names(self, text: str) -> List[str]:
+        """Extract all person names from text using universal patterns"""
+        names = []
+        
+        for pattern in self.compiled_patterns:
+            matches = pattern.findall(text)
+            names.extend(matches)
+        
+        # Remove duplicates while preserving order
+        unique_names = []
+        for name in names:
+            if name not in unique_names:
+                unique_names.append(name)
+        
+        return unique_names
+    
+    def get_person_name_terms(self, text: str) -> List[str]:
+        """Get individual terms from detected person names for content validation"""
+        # Extract person names using regex patterns
+        person_names = self.extract_person_names(text)
+        
+        if not person_names:
+            return []
+        
+        # Extract individual terms from person names
+        terms = []
+        for name in person_names:
+            # Split name into individual terms and clean them
+            name_terms = [
+                term.strip().lower()
+                for term in re.split(r'[\s\-\']', name)
+                if len(term.strip()) > 1
+            ]
+            terms.extend(name_terms)
+        
+        # Remove duplicates while preserving order
+        unique_terms = []
+        for term in terms:
+            if term not in unique_terms:
+                unique_terms.append(term)
+        
+        return unique_terms
+
+# Fusion's person rule: the extracted entity looks like a name, or person wording plus a capitalized word
+FUSION_PERSON_PATTERNS = [
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b', re.IGNORECASE),  # First Last
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+\b', re.IGNORECASE),  # First Middle Last
+]
+FUSION_PERSON_INDICATORS = ['who is', 'tell me about', 'show me', 'find', 'about']
+
+@dataclass
+class QueryAnalysis:
+    """
+    Everything derived from a query and its extracted entity
+    
+    Built once per search; retrievers searching a different string (the entity,
+    a rewrite) get a derived analysis through for_query(), memoized per string.
+    The three person flags keep the rules their consumers have always used.
+    """
+    query: str
+    extracted_entity: Optional[str]
+    query_lower: str
+    entity_lower: str
+    query_terms: List[str]           # Lowercased words longer than 2 characters
+    is_person_query: bool            # Config rule: strategy selection, query routing, dedupe
+    person_detected: bool            # PersonNameDetector: thresholds, content validation, person tier
+    person_terms: List[str]          # Name terms of the entity (or query) when person_detected
+    fusion_person_query: bool        # Fusion rule: fusion strategy and boosts
+    complexity: str                  # simple / medium / complex
+    search_strategy: str
+    search_params: Dict[str, Any]
+    _analyzer: "QueryAnalyzer" = field(repr=False, compare=False, default=None)
+    _variants: Dict[str, "QueryAnalysis"] = field(repr=False, compare=False, default_factory=dict)
+    
+    def for_query(self, query: str) -> "QueryAnalysis":
+        """Analysis of another query string with the same entity (self for the analyzed query)"""
+        if query == self.query or self._analyzer is None:
+            return self
+        variant = self._variants.get(query)
+        if variant is None:
+            variant = self._analyzer.analyze(query, self.extracted_entity, _variants=self._variants)
+        return variant
+
+class QueryAnalyzer:
+    """Builds QueryAnalysis objects from the config rules and the person name detector"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.person_detector = PersonNameDetector()
+    
+    def analyze(self, query: str, extracted_entity: Optional[str] = None,
+                _variants: Optional[Dict[str, QueryAnalysis]] = None) -> QueryAnalysis:
+        """Classify a query once"""
+        person_detected = self.person_detector.is_person_query(query, extracted_entity)
+        person_terms = self.person_detector.get_person_name_terms(extracted_entity or query) if person_detected else []
+        
+        analysis = QueryAnalysis(
+            query=query,
+            extracted_entity=extracted_entity,
+            query_lower=query.lower(),
+            entity_lower=extracted_entity.lower() if extracted_entity else "",
+            query_terms=[term.strip().lower() for term in query.split() if len(term) > 2],
+            is_person_query=self.config.is_person_query(query, extracted_entity),
+            person_detected=person_detected,
+            person_terms=person_terms,
+            fusion_person_query=self._fusion_person_query(query, extracted_entity),
+            complexity=self._query_complexity(query),
+            search_strategy=self.config.get_search_strategy(query, extracted_entity),
+            search_params=self.config.get_dynamic_search_params(query, extracted_entity),
+            _analyzer=self
+        )
+        if _variants is not None:
+            analysis._variants = _variants
+        analysis._variants[query] = analysis
+        return analysis
+    
+    def resolve(self, query: str, analysis: Optional[QueryAnalysis] = None,
+                extracted_entity: Optional[str] = None) -> QueryAnalysis:
+        """Analysis for a query: derived from the search's shared analysis when one is passed"""
+        if analysis is not None:
+            return analysis.for_query(query)
+        return self.analyze(query, extracted_entity)
+    
+    def _fusion_person_query(self, query: str, extracted_entity: Optional[str]) -> bool:
+        if extracted_entity:
+            # Check if extracted entity looks like a person name
+            for pattern in FUSION_PERSON_PATTERNS:
+                if pattern.search(extracted_entity):
+                    return True
+        
+        # Check query for person indicators
+        query_lower = query.lower()
+        has_person_indicator = any(indicator in query_lower for indicator in FUSION_PERSON_INDICATORS)
+        has_capitalized_words = bool(re.search(r'\b[A-Z][a-z]+\b', query))
+        
+        return has_person_indicator and has_capitalized_words
+    
+    def _query_complexity(self, query: str) -> str:
+        word_count = len(query.split())
+        
+        if word_count <= 3:
+            return "simple"
+        elif word_count <= 6:
+            return "medium"
+        else:
+            return "complex"
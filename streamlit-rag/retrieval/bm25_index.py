@@ -0,0 +1,172 @@
+# retrieval/bm25_index.py
+# Local BM25 inverted index over the vecs chunks: NumPy CSR postings, memory-mapped from disk
+
+import os
+import re
+import json
+import math
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+from retrieval.segment_store import DocumentSegment, SegmentedSnapshot, load_array, save_array
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with",
+    "about", "me", "tell", "show", "find", "who", "what", "give"
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens without stop words (same rules for chunks and queries)"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) > 1 and token not in STOP_WORDS]
+
+class BM25Segment(DocumentSegment):
+    """
+    Segment with its own vocabulary and postings
+
+    Postings are stored term-major in CSR form: the documents containing term t
+    are docs[indptr[t]:indptr[t + 1]] with term frequencies tf[...].
+    """
+
+    @classmethod
+    def _build_payload(cls, path: str, documents: List[Dict[str, Any]]):
+        vocab: Dict[str, int] = {}
+        term_ids, doc_ids, freqs = [], [], []
+        doc_len = np.zeros(len(documents), dtype=np.int32)
+
+        for doc_index, document in enumerate(documents):
+            tokens = tokenize(document.get("text") or "")
+            doc_len[doc_index] = len(tokens)
+            for term, count in Counter(tokens).items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                doc_ids.append(doc_index)
+                freqs.append(count)
+
+        # Sort postings by term (stable, so documents stay ascending within a term)
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        order = np.argsort(term_ids, kind="stable")
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(vocab)), out=indptr[1:])
+
+        save_array(os.path.join(path, "indptr.npy"), indptr)
+        save_array(os.path.join(path, "docs.npy"), np.asarray(doc_ids, dtype=np.int32)[order])
+        save_array(os.path.join(path, "tf.npy"), np.minimum(np.asarray(freqs, dtype=np.int64), 65535).astype(np.uint16)[order])
+        save_array(os.path.join(path, "doc_len.npy"), doc_len)
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(vocab, f, ensure_ascii=False)
+
+    def _load_payload(self):
+        with open(os.path.join(self.path, "vocab.json"), encoding="utf-8") as f:
+            self.vocab: Dict[str, int] = json.load(f)
+        self.indptr = load_array(os.path.join(self.path, "indptr.npy"))
+        self.docs = load_array(os.path.join(self.path, "docs.npy"))
+        self.tf = load_array(os.path.join(self.path, "tf.npy"))
+        self.doc_len = load_array(os.path.join(self.path, "doc_len.npy"))
+
+    def _set_deleted(self, deleted: np.ndarray):
+        self.live_length = int(self.doc_len[~deleted].sum()) if len(deleted) else 0
+        super()._set_deleted(deleted)
+
+    def postings(self, term: str) -> Optional[Tuple[int, int]]:
+        """Get the postings range of a term, or None if the segment does not contain it"""
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            return None
+        return int(self.indptr[term_id]), int(self.indptr[term_id + 1])
+
+    def matched_terms(self, doc_index: int, terms: List[str]) -> List[str]:
+        """Query terms whose postings contain the document (postings are sorted by document)"""
+        matched = []
+        for term in terms:
+            postings = self.postings(term)
+            if postings is None:
+                continue
+            docs = self.docs[postings[0]:postings[1]]
+            position = np.searchsorted(docs, doc_index)
+            if position < len(docs) and docs[position] == doc_index:
+                matched.append(term)
+        return matched
+
+class BM25Index(SegmentedSnapshot):
+    """Segmented BM25 index kept in sync with the vecs table"""
+
+    SEGMENT_CLASS = BM25Segment
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75, **kwargs):
+        """
+        Args:
+            path: Index directory
+            k1: Term frequency saturation
+            b: Document length normalization
+            **kwargs: Segment and compaction limits (see SegmentedSnapshot)
+        """
+        super().__init__(path, **kwargs)
+        self.k1 = k1
+        self.b = b
+
+    def search(self, query: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Rank documents for a query with Okapi BM25
+
+        Returns:
+            Stored documents with 'bm25_score' and 'score' (BM25 divided by the
+            query's maximum attainable score, so it falls in 0-1) and 'matched_terms'
+        """
+        segments = self.segments  # Snapshot: sync swaps the list, never mutates it
+        terms = list(dict.fromkeys(tokenize(query)))
+        total_docs = sum(segment.live_count for segment in segments)
+        if not terms or not total_docs:
+            return []
+        avgdl = max(1.0, sum(segment.live_length for segment in segments) / total_docs)
+
+        # Document frequencies across segments (tombstoned postings count until compaction)
+        ranges = []
+        df = Counter()
+        for segment in segments:
+            segment_ranges = {}
+            for term in terms:
+                postings = segment.postings(term)
+                if postings is not None:
+                    segment_ranges[term] = postings
+                    df[term] += postings[1] - postings[0]
+            ranges.append(segment_ranges)
+        if not df:
+            return []
+        idf = {term: math.log(1 + (total_docs - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+        max_score = sum(idf[term] * (self.k1 + 1) for term in idf)
+
+        candidates = []
+        for segment, segment_ranges in zip(segments, ranges):
+            if not segment_ranges:
+                continue
+            scores = np.zeros(len(segment.ids), dtype=np.float32)
+            for term, (start, end) in segment_ranges.items():
+                docs = segment.docs[start:end]
+                tf = segment.tf[start:end].astype(np.float32)
+                norm = self.k1 * (1 - self.b + self.b * segment.doc_len[docs] / avgdl)
+                scores[docs] += idf[term] * tf * (self.k1 + 1) / (tf + norm)
+            scores[segment.deleted] = 0
+
+            hits = np.flatnonzero(scores)
+            if len(hits) > top_k:
+                hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            candidates.extend((float(scores[i]), segment, int(i)) for i in hits)
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        results = []
+        for score, segment, doc_index in candidates[:top_k]:
+            document = segment.get_document(doc_index)
+            document.update({
+                "bm25_score": score,
+                "score": score / max_score,
+                "matched_terms": segment.matched_terms(doc_index, terms)
+            })
+            results.append(document)
+        return results
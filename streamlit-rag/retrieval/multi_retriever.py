@@ -4,31 +4,256 @@
 import time
 import logging
 import asyncio
-import re
-from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass
+import threading
+import functools
+import contextvars
+from collections.abc import Mapping, MutableMapping
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple, Any, Callable
+from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 import concurrent.futures
+import numpy as np
 import psycopg2
 import psycopg2.extras
 
+from utils.connection_pool import get_connection_pool
+from utils.embedding_cache import QueryEmbeddingCache, normalize_query
+from utils.tracing import tracer
+from retrieval.bm25_index import BM25Index
+from retrieval.vector_snapshot import VectorSnapshot
+from query_processing.query_analysis import QueryAnalysis, QueryAnalyzer
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+# tsvector column maintained by rag_indexer/text_search_schema.py
+TEXT_SEARCH_COLUMN = "text_search"
+
+# Name -> chunk table maintained by rag_indexer/person_name_index.py (2-3 word names)
+PERSON_NAMES_SUFFIX = "_person_names"
+
+def normalize_person_name(name: str) -> str:
+    """Normalize a name the way the indexer stores it (lowercase, no middle initials)"""
+    words = [word for word in name.split() if not (len(word.rstrip('.')) == 1 and word[0].isalpha())]
+    return ' '.join(words).lower()
+
+# Blocking I/O (psycopg2, Ollama embeddings) runs here rather than in the loop's default
+# executor, so asyncio.run() does not wait on a timed-out call before returning
+_blocking_executor = concurrent.futures.ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval")
+
+async def run_blocking(func, *args):
+    """Run a blocking call in the retrieval thread pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    # The caller's context goes along, so spans opened in the worker nest under the current one
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(context.run, func, *args))
+
+# Characters of chunk text kept as the preview (RetrievalResult.content)
+PREVIEW_CHARS = 500
+
+def shared_metadata(**fields) -> Mapping[str, Any]:
+    """Read-only metadata shared by every result of one retrieval call"""
+    return MappingProxyType(fields)
+
+class ResultMetadata(MutableMapping):
+    """
+    Result metadata: a shared read-only base plus a small per-result annotation dict
+    
+    Fields common to a whole retrieval call live once in the base; per-result
+    fields and stage annotations (fusion scores, dedupe reasons) are written to
+    the annotations, shadowing base keys rather than changing them.
+    """
+    
+    __slots__ = ("base", "annotations")
+    
+    def __init__(self, base: Optional[Mapping[str, Any]] = None, annotations: Optional[Dict[str, Any]] = None):
+        self.base = base if base is not None else _EMPTY_METADATA
+        self.annotations = annotations if annotations is not None else {}
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in self.annotations:
+            return self.annotations[key]
+        return self.base[key]
+    
+    def __setitem__(self, key: str, value: Any):
+        self.annotations[key] = value
+    
+    def __delitem__(self, key: str):
+        if key in self.base:
+            raise TypeError(f"'{key}' is shared base metadata and cannot be deleted")
+        del self.annotations[key]
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self.annotations or key in self.base
+    
+    def __iter__(self):
+        yield from self.annotations
+        for key in self.base:
+            if key not in self.annotations:
+                yield key
+    
+    def __len__(self) -> int:
+        return len(self.annotations) + sum(1 for key in self.base if key not in self.annotations)
+    
+    def __repr__(self) -> str:
+        return f"ResultMetadata({dict(self)!r})"
+    
+    def __reduce__(self):
+        # mappingproxy cannot be copied or pickled; the base is rebuilt (unshared) instead
+        return (_restore_metadata, (dict(self.base), dict(self.annotations)))
+
+_EMPTY_METADATA = shared_metadata()
+
+def _restore_metadata(base: Dict[str, Any], annotations: Dict[str, Any]) -> ResultMetadata:
+    return ResultMetadata(MappingProxyType(base), annotations)
+
 class RetrievalResult:
-    """Single retrieval result"""
-    content: str
-    full_content: str
-    filename: str
-    similarity_score: float
-    metadata: Dict[str, Any]
-    source_method: str
-    document_id: str = ""
-    chunk_index: int = 0
+    """
+    Single retrieval result
     
-    def __post_init__(self):
-        if not self.metadata:
-            self.metadata = {}
+    Slotted, since hundreds are built per query. The preview (content) is derived
+    from the text on first use; compact() drops the text once the pipeline is
+    done, and full_content then reloads it by document id through text_loader.
+    """
+    
+    __slots__ = ("filename", "similarity_score", "metadata", "source_method", "document_id", "chunk_index",
+                 "_full_content", "_preview", "_text_length", "_content_lower", "_normalized_text")
+    
+    # Batched id -> chunk text lookup, installed by MultiStrategyRetriever
+    text_loader: Optional[Callable[[List[str]], Dict[str, str]]] = None
+    
+    def __init__(self, 
+                 full_content: str, 
+                 filename: str, 
+                 similarity_score: float, 
+                 metadata: Optional[Mapping[str, Any]], 
+                 source_method: str, 
+                 document_id: str = "", 
+                 chunk_index: int = 0):
+        self._full_content: Optional[str] = full_content
+        self._preview: Optional[str] = None
+        self._text_length = len(full_content)
+        self._content_lower: Optional[str] = None
+        self._normalized_text: Optional[str] = None
+        self.filename = filename
+        self.similarity_score = similarity_score
+        self.metadata = metadata if isinstance(metadata, ResultMetadata) else ResultMetadata(annotations=dict(metadata or {}))
+        self.source_method = source_method
+        self.document_id = document_id
+        self.chunk_index = chunk_index
+    
+    def __repr__(self) -> str:
+        return (f"RetrievalResult(filename={self.filename!r}, similarity_score={self.similarity_score:.3f}, "
+                f"source_method={self.source_method!r}, document_id={self.document_id!r})")
+    
+    @property
+    def content(self) -> str:
+        """Preview: the first PREVIEW_CHARS characters of the text"""
+        if self._preview is None:
+            text = self._full_content or ""
+            self._preview = text[:PREVIEW_CHARS] + "..." if len(text) > PREVIEW_CHARS else text
+        return self._preview
+    
+    @property
+    def full_content(self) -> str:
+        """Full chunk text, reloaded by id after compact() (the preview if it cannot be reloaded)"""
+        if self._full_content is None:
+            load_full_content([self])
+        return self._full_content if self._full_content is not None else self.content
+    
+    @property
+    def text_length(self) -> int:
+        """Length of the full text (known without loading it)"""
+        return self._text_length
+    
+    @property
+    def is_compact(self) -> bool:
+        """True while the full text is not held in memory"""
+        return self._full_content is None
+    
+    @property
+    def content_lower(self) -> str:
+        """Lowercased full content, computed once, for matches that must ignore the filename"""
+        if self._content_lower is None:
+            self._content_lower = self.full_content.lower()
+        return self._content_lower
+    
+    @property
+    def normalized_text(self) -> str:
+        """Lowercased full content and filename, computed once and reused by dedupe, scoring and fusion"""
+        if self._normalized_text is None:
+            self._normalized_text = f"{self.content_lower} {self.filename.lower()}"
+        return self._normalized_text
+    
+    def copy(self) -> "RetrievalResult":
+        """Independent copy (own text state and annotations; the read-only metadata base is shared)"""
+        clone = RetrievalResult.__new__(RetrievalResult)
+        for slot in RetrievalResult.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        clone.metadata = ResultMetadata(self.metadata.base, dict(self.metadata.annotations))
+        return clone
+    
+    def compact(self):
+        """Keep the preview and drop the full text (and its lowercased copies)"""
+        self.content
+        self._full_content = None
+        self._content_lower = None
+        self._normalized_text = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form with the preview only (the full text is reloaded by id)"""
+        return {
+            "content": self.content,
+            "text_length": self.text_length,
+            "filename": self.filename,
+            "similarity_score": self.similarity_score,
+            "metadata": dict(self.metadata),
+            "source_method": self.source_method,
+            "document_id": self.document_id,
+            "chunk_index": self.chunk_index
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetrievalResult":
+        """Rebuild a compact result from to_dict() output"""
+        result = cls(
+            full_content="",
+            filename=data["filename"],
+            similarity_score=data["similarity_score"],
+            metadata=data.get("metadata"),
+            source_method=data["source_method"],
+            document_id=data.get("document_id", ""),
+            chunk_index=data.get("chunk_index", 0)
+        )
+        result._full_content = None
+        result._preview = data["content"]
+        result._text_length = data.get("text_length", len(data["content"]))
+        return result
+
+def load_full_content(results: List[RetrievalResult]) -> int:
+    """
+    Reload the text of compacted results with one batched lookup
+    
+    Returns:
+        Number of results whose text was loaded
+    """
+    missing = [result for result in results if result.is_compact and result.document_id]
+    if not missing or RetrievalResult.text_loader is None:
+        return 0
+    
+    try:
+        texts = RetrievalResult.text_loader(list({result.document_id for result in missing}))
+    except Exception as e:
+        logger.warning(f"?? Could not load full text for {len(missing)} results: {e}")
+        return 0
+    
+    loaded = 0
+    for result in missing:
+        text = texts.get(result.document_id)
+        if text is not None:
+            result._full_content = text
+            loaded += 1
+    return loaded
 
 @dataclass
 class MultiRetrievalResult:
@@ -45,119 +270,34 @@ class MultiRetrievalResult:
         if self.metadata is None:
             self.metadata = {}
 
-class PersonNameDetector:
-    """Universal person name detection using best practices from NLP literature"""
-    
-    def __init__(self):
-        # Universal person name patterns from NLP best practices
-        self.person_patterns = [
-            # Basic: First Last (most common)
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',
-            
-            # With middle initial: First M. Last
-            r'\b[A-Z][a-z]+\s+[A-Z]\.\s+[A-Z][a-z]+\b',
-            
-            # With middle name: First Middle Last
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+\b',
-            
-            # Hyphenated names: Smith-Jones, Lloyd-Atkinson
-            r'\b[A-Z][a-z]+-[A-Z][a-z]+\b',
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+-[A-Z][a-z]+\b',
-            
-            # Names with apostrophes: D'Angelo, O'Brien
-            r"\b[A-Z]'[A-Z][a-z]+\b",
-            r"\b[A-Z][a-z]+\s+[A-Z]'[A-Z][a-z]+\b",
-            
-            # Names with prefixes: Van der, De, Di, etc.
-            r'\b[A-Z][a-z]+\s+(?:van|de|di|du|da|del|della|von|zu)\s+[A-Z][a-z]+\b',
-            r'\b(?:Van|De|Di|Du|Da|Del|Della|Von|Zu)\s+[A-Z][a-z]+\b',
-            
-            # Names with suffixes: Jr., Sr., III
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+(?:Jr|Sr|III|II|IV)\b',
-        ]
-        
-        # Compile patterns for performance
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.person_patterns]
-        
-        # Keywords that often indicate person queries
-        self.person_keywords = [
-            'who is', 'tell me about', 'find', 'about', 'information about',
-            'show me', 'give me', 'details about', 'biography', 'profile'
-        ]
+@dataclass
+class SpeculativeRetrieval:
+    """Retrievals started on the raw question while entity extraction and rewriting run"""
+    tasks: Dict[Tuple[str, str], "asyncio.Task"]  # (strategy, normalized query) -> task, until claimed
+    started_at: float
+    finished_at: Dict[Tuple[str, str], float] = field(default_factory=dict)
+    total: int = 0
     
-    def is_person_query(self, query: str, extracted_entity: Optional[str] = None) -> bool:
-        """Detect if query is about a person using universal patterns"""
-        
-        # Check extracted entity first (if available)
-        if extracted_entity:
-            if self.contains_person_name(extracted_entity):
-                return True
-        
-        # Check original query
-        if self.contains_person_name(query):
-            return True
-        
-        # Check for person-related keywords + capitalized words
-        query_lower = query.lower()
-        has_person_keywords = any(keyword in query_lower for keyword in self.person_keywords)
-        has_capitalized_words = bool(re.search(r'\b[A-Z][a-z]+\b', query))
-        
-        return has_person_keywords and has_capitalized_words
+    def take(self, strategy: str, query: str) -> Optional["asyncio.Task"]:
+        """Claim the task for a strategy/query so it is reused instead of re-run"""
+        return self.tasks.pop((strategy, normalize_query(query)), None)
     
-    def contains_person_name(self, text: str) -> bool:
-        """Check if text contains a person name using universal patterns"""
-        if not text or len(text.strip()) < 2:
-            return False
-        
-        # Try each compiled pattern
-        for pattern in self.compiled_patterns:
-            if pattern.search(text):
-                return True
-        
-        return False
+    def take_remaining(self) -> Dict[Tuple[str, str], "asyncio.Task"]:
+        """Claim every task no strategy reused (their results are merged as-is)"""
+        remaining, self.tasks = self.tasks, {}
+        return remaining
     
-    def extract_person_names(self, text: str) -> List[str]:
-        """Extract all person names from text using universal patterns"""
-        names = []
-        
-        for pattern in self.compiled_patterns:
-            matches = pattern.findall(text)
-            names.extend(matches)
-        
-        # Remove duplicates while preserving order
-        unique_names = []
-        for name in names:
-            if name not in unique_names:
-                unique_names.append(name)
-        
-        return unique_names
+    def duration(self) -> Optional[float]:
+        """Seconds from start until the last speculative retrieval finished (None if any is unfinished)"""
+        if not self.total or len(self.finished_at) < self.total:
+            return None
+        return max(self.finished_at.values()) - self.started_at
     
-    def get_person_name_terms(self, text: str) -> List[str]:
-        """Get individual terms from detected person names for content validation"""
-        # Extract person names using regex patterns
-        person_names = self.extract_person_names(text)
-        
-        if not person_names:
-            return []
-        
-        # Extract individual terms from person names
-        terms = []
-        for name in person_names:
-            # Split name into individual terms and clean them
-            name_terms = [
-                term.strip().lower() 
-                for term in re.split(r'[\s\-\']', name) 
-                if len(term.strip()) > 1
-            ]
-            terms.extend(name_terms)
-        
-        # Remove duplicates while preserving order
-        unique_terms = []
-        for term in terms:
-            if term not in unique_terms:
-                unique_terms.append(term)
-        
-        return unique_terms
+    def cancel(self):
+        """Cancel every unclaimed speculative retrieval"""
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
 
 class BaseRetriever(ABC):
     """Base class for retrievers"""
@@ -184,7 +324,14 @@ class LlamaIndexRetriever(BaseRetriever):
         self.config = config
         self.index = None
         self.embed_model = None
-        self.person_detector = PersonNameDetector()
+        self.query_analyzer = QueryAnalyzer(config)
+        self.pool = None
+        self._retrievers: Dict[int, Any] = {}  # VectorIndexRetriever per top_k (fallback path)
+        self.embedding_cache = QueryEmbeddingCache(
+            config.embedding.model_name,
+            max_size=config.embedding.query_cache_size,
+            persist_path=config.embedding.query_cache_path
+        )
         self._initialize_components()
     
     def _initialize_components(self):
@@ -219,6 +366,9 @@ class LlamaIndexRetriever(BaseRetriever):
                 embed_model=self.embed_model
             )
             
+            if self.config.search.vector_search_backend in ("direct", "snapshot"):
+                self.pool = get_connection_pool(self.config.database.connection_string, self.config.database)
+            
             logger.info("? LlamaIndex Retriever initialized successfully")
             
         except Exception as e:
@@ -233,22 +383,20 @@ class LlamaIndexRetriever(BaseRetriever):
     def get_name(self) -> str:
         return "llamaindex_vector"
     
-    def _get_smart_threshold(self, query: str, extracted_entity: str = None) -> float:
+    def _get_smart_threshold(self, analysis: QueryAnalysis) -> float:
         """Get smart threshold based on query analysis and config"""
         
         # Check if we have entity-specific config
-        if extracted_entity:
-            entity_config = self.config.get_entity_config(extracted_entity)
+        if analysis.extracted_entity:
+            entity_config = self.config.get_entity_config(analysis.extracted_entity)
             return entity_config["similarity_threshold"]
         
         # Use person detector for threshold selection
-        is_person = self.person_detector.is_person_query(query, extracted_entity)
-        
-        if is_person:
+        if analysis.person_detected:
             return self.config.search.entity_similarity_threshold
         
         # Adaptive threshold based on query complexity
-        word_count = len(query.split())
+        word_count = len(analysis.query.split())
         if word_count <= 2:
             return self.config.search.default_similarity_threshold
         elif word_count >= 6:
@@ -262,10 +410,12 @@ class LlamaIndexRetriever(BaseRetriever):
             logger.warning("?? LlamaIndex retriever not available")
             return []
         
+        # Person detection and name terms come from the search's shared analysis
+        analysis = self.query_analyzer.resolve(query, kwargs.get('query_analysis'), kwargs.get('extracted_entity'))
+        
         # Get smart threshold if not provided
-        extracted_entity = kwargs.get('extracted_entity')
         if similarity_threshold is None:
-            similarity_threshold = self._get_smart_threshold(query, extracted_entity)
+            similarity_threshold = self._get_smart_threshold(analysis)
         
         # Respect vector max top_k limit
         actual_top_k = min(top_k, self.config.search.vector_max_top_k)
@@ -273,84 +423,58 @@ class LlamaIndexRetriever(BaseRetriever):
         logger.info(f"?? Vector search: '{query}' (threshold: {similarity_threshold}, top_k: {actual_top_k})")
         
         try:
-            from llama_index.core.retrievers import VectorIndexRetriever
-            from llama_index.core.postprocessor import SimilarityPostprocessor
-            
-            # Create retriever
-            retriever = VectorIndexRetriever(
-                index=self.index,
-                similarity_top_k=actual_top_k,
-                embed_model=self.embed_model
-            )
-            
-            # Create similarity postprocessor
-            similarity_postprocessor = SimilarityPostprocessor(
-                similarity_cutoff=similarity_threshold
-            )
-            
-            # Retrieve nodes
-            nodes = retriever.retrieve(query)
-            logger.info(f"   Vector: {len(nodes)} candidates retrieved")
-            
-            # Apply similarity filtering
-            filtered_nodes = similarity_postprocessor.postprocess_nodes(nodes)
-            logger.info(f"   Vector: {len(filtered_nodes)} after similarity filter")
+            # Embedding and search both block, so they run in a worker thread
+            # rather than stalling concurrent strategies
+            with tracer.span("vector.search", top_k=actual_top_k, threshold=similarity_threshold) as span:
+                candidates, backend = await run_blocking(
+                    self._search_candidates, query, actual_top_k, similarity_threshold, 
+                    kwargs.get('metadata_filters'), kwargs.get('query_embedding')
+                )
+                span.set_attributes(backend=backend, candidates=len(candidates))
             
             # Content validation
-            validated_nodes = []
+            validated = []
             
-            for node in filtered_nodes:
+            for candidate in candidates:
                 try:
-                    content = node.node.text if hasattr(node.node, 'text') else str(node.node)
-                    
                     # Smart content relevance check
-                    if self._is_content_relevant(query, content, extracted_entity):
-                        validated_nodes.append(node)
+                    if self._is_content_relevant(analysis, candidate["content"]):
+                        validated.append(candidate)
                     else:
-                        similarity_score = node.score if hasattr(node, 'score') else 0.0
-                        metadata = node.node.metadata if hasattr(node.node, 'metadata') else {}
-                        filename = metadata.get('file_name', 'Unknown')
-                        logger.debug(f"   Filtered out: {filename} (score: {similarity_score:.3f}) - not relevant")
+                        filename = candidate["metadata"].get('file_name', 'Unknown')
+                        logger.debug(f"   Filtered out: {filename} (score: {candidate['score']:.3f}) - not relevant")
                         
                 except Exception as e:
                     logger.warning(f"Error validating node: {e}")
                     continue
             
-            logger.info(f"   Vector: {len(validated_nodes)} after content validation")
+            logger.info(f"   Vector: {len(validated)} after content validation")
+            
+            # Vector-specific metadata is the same for every result of this call
+            call_metadata = shared_metadata(
+                content_validated=True,
+                smart_threshold_used=similarity_threshold,
+                person_detected=analysis.person_detected,
+                query_validated=query,
+                vector_backend=backend
+            )
             
             # Convert to RetrievalResult objects
             results = []
-            for i, node in enumerate(validated_nodes):
+            for i, candidate in enumerate(validated):
                 try:
-                    # Extract metadata
-                    metadata = node.node.metadata if hasattr(node.node, 'metadata') else {}
-                    filename = metadata.get('file_name', 'Unknown')
-                    
-                    # Get content
-                    content = node.node.text if hasattr(node.node, 'text') else str(node.node)
-                    
-                    # Get similarity score
-                    similarity_score = node.score if hasattr(node, 'score') else 0.0
+                    metadata = candidate["metadata"]
                     
                     result = RetrievalResult(
-                        content=content[:500] + "..." if len(content) > 500 else content,
-                        full_content=content,
-                        filename=filename,
-                        similarity_score=similarity_score,
-                        metadata=metadata,
+                        full_content=candidate["content"],
+                        filename=metadata.get('file_name', 'Unknown'),
+                        similarity_score=candidate["score"],
+                        metadata=ResultMetadata(call_metadata, dict(metadata)),
                         source_method=self.get_name(),
-                        document_id=metadata.get('id', ''),
-                        chunk_index=metadata.get('chunk_index', 0)
+                        document_id=candidate["document_id"],
+                        chunk_index=candidate["chunk_index"]
                     )
                     
-                    # Add vector-specific metadata
-                    result.metadata.update({
-                        "content_validated": True,
-                        "smart_threshold_used": similarity_threshold,
-                        "person_detected": self.person_detector.is_person_query(query, extracted_entity),
-                        "query_validated": query
-                    })
-                    
                     results.append(result)
                     
                 except Exception as e:
@@ -360,19 +484,186 @@ class LlamaIndexRetriever(BaseRetriever):
             logger.info(f"? Vector search completed: {len(results)} results")
             return results
             
+        except asyncio.CancelledError:
+            logger.warning("?? Vector search cancelled (the embedding request finishes in the background)")
+            raise
         except Exception as e:
             logger.error(f"? Vector search failed: {e}")
             return []
     
-    def _is_content_relevant(self, query: str, content: str, extracted_entity: str = None) -> bool:
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed queries through the LRU cache, sending all misses in one batched request (blocking)
+        
+        Returns embeddings in the order of the given queries.
+        """
+        with tracer.span("embedding", queries=len(queries)) as span:
+            found, missing = self.embedding_cache.get_many(queries)
+            span.set_attributes(cache_hits=len(queries) - len(missing), embedded=len(missing))
+            
+            if missing:
+                batched = len(missing) > 1 and not getattr(self.embed_model, "query_instruction", None)
+                if batched:
+                    # Without a query instruction, query and text embeddings are identical
+                    embeddings = self.embed_model.get_text_embedding_batch(missing)
+                else:
+                    embeddings = [self.embed_model.get_query_embedding(query) for query in missing]
+                
+                new_entries = dict(zip(missing, embeddings))
+                self.embedding_cache.put_many(new_entries, batched=batched)
+                found.update(new_entries)
+                logger.info(f"   Vector: embedded {len(missing)} of {len(queries)} queries ({len(queries) - len(missing)} cached)")
+        
+        return [found[normalize_query(query)] for query in queries]
+    
+    def _search_candidates(self, 
+                           query: str, 
+                           top_k: int, 
+                           similarity_threshold: float,
+                           metadata_filters: Optional[Dict[str, Any]] = None,
+                           query_embedding: Optional[List[float]] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Search with the configured backend (blocking); returns candidates and the backend name"""
+        if self.pool is not None:
+            candidates = self._direct_search(query, top_k, similarity_threshold, metadata_filters, query_embedding)
+            logger.info(f"   Vector: {len(candidates)} candidates above threshold (direct pgvector)")
+            return candidates, "direct"
+        
+        return self._llamaindex_search(query, top_k, similarity_threshold, query_embedding), "llamaindex"
+    
+    def _direct_search(self, 
+                       query: str, 
+                       top_k: int, 
+                       similarity_threshold: float,
+                       metadata_filters: Optional[Dict[str, Any]] = None,
+                       query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """
+        Single pgvector query: nearest chunks by cosine distance with the
+        threshold applied in SQL, projecting only the columns results need
+        (LlamaIndex loads the whole metadata JSON, which repeats the text)
+        """
+        embedding = query_embedding or self.embed_queries([query])[0]
+        table = f"{self.config.database.schema}.{self.config.database.table_name}"
+        
+        params = {
+            "embedding": "[" + ",".join(str(float(x)) for x in embedding) + "]",
+            "snippet_chars": self.config.search.vector_snippet_chars,
+            "top_k": top_k,
+            "threshold": similarity_threshold
+        }
+        
+        filter_condition = ""
+        if metadata_filters:
+            # Containment is served by a GIN index on metadata when one exists
+            filter_condition = "WHERE metadata @> %(filters)s"
+            params["filters"] = psycopg2.extras.Json(metadata_filters)
+        
+        # The inner ORDER BY/LIMIT is what the HNSW/IVFFlat index serves; the score
+        # is the one SupabaseVectorStore reports (1 - exp(-distance)), so existing
+        # similarity thresholds keep their meaning
+        search_sql = f"""
+        SELECT id, file_name, chunk_index, snippet, text_length, 1 - exp(-distance) as score
+        FROM (
+            SELECT 
+                id,
+                (metadata->>'file_name') as file_name,
+                (metadata->>'chunk_index') as chunk_index,
+                LEFT(metadata->>'text', %(snippet_chars)s) as snippet,
+                LENGTH(metadata->>'text') as text_length,
+                vec <=> %(embedding)s::vector as distance
+            FROM {table}
+            {filter_condition}
+            ORDER BY vec <=> %(embedding)s::vector
+            LIMIT %(top_k)s
+        ) nearest
+        WHERE 1 - exp(-distance) >= %(threshold)s
+        ORDER BY distance
+        """
+        
+        with self.pool.connection() as conn:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                # Per-query recall/latency knobs for whichever ANN index exists
+                # (rag_indexer/vector_index.py); HNSW returns at most ef_search rows
+                cur.execute("SET LOCAL hnsw.ef_search = %s", (min(1000, max(self.config.search.vector_hnsw_ef_search, top_k)),))
+                cur.execute("SET LOCAL ivfflat.probes = %s", (self.config.search.vector_ivfflat_probes,))
+                cur.execute(search_sql, params)
+                rows = cur.fetchall()
+                
+                # Chunks longer than the inline snippet (PDF chunks run to ~8k characters) get
+                # their full text in one more query: relevance checks, scoring and the answer
+                # context need all of it, and text_length must stay the chunk's length
+                long_ids = [row['id'] for row in rows if (row.get('text_length') or 0) > len(row.get('snippet') or '')]
+                full_texts = {}
+                if long_ids:
+                    cur.execute(f"SELECT id, metadata->>'text' AS text FROM {table} WHERE id = ANY(%s)", (long_ids,))
+                    full_texts = {text_row['id']: text_row['text'] or '' for text_row in cur.fetchall()}
+        
+        candidates = []
+        for row in rows:
+            chunk_index = int(row.get('chunk_index') or 0)
+            candidates.append({
+                "content": full_texts.get(row['id'], row.get('snippet') or ''),
+                "metadata": {
+                    "file_name": row.get('file_name') or 'Unknown',
+                    "chunk_index": chunk_index,
+                    "text_length": row.get('text_length') or 0
+                },
+                "score": float(row['score']),
+                "document_id": str(row['id']),
+                "chunk_index": chunk_index
+            })
+        
+        return candidates
+    
+    def _llamaindex_search(self, 
+                           query: str, 
+                           top_k: int, 
+                           similarity_threshold: float,
+                           query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """Fallback search through VectorIndexRetriever and SimilarityPostprocessor (blocking)"""
+        from llama_index.core import QueryBundle
+        from llama_index.core.retrievers import VectorIndexRetriever
+        from llama_index.core.postprocessor import SimilarityPostprocessor
+        
+        # Retrievers are reusable; only similarity_top_k differs between calls
+        retriever = self._retrievers.get(top_k)
+        if retriever is None:
+            retriever = VectorIndexRetriever(
+                index=self.index,
+                similarity_top_k=top_k,
+                embed_model=self.embed_model
+            )
+            self._retrievers[top_k] = retriever
+        
+        # A precomputed embedding skips the retriever's own embed call
+        embedding = query_embedding or self.embed_queries([query])[0]
+        nodes = retriever.retrieve(QueryBundle(query_str=query, embedding=embedding))
+        logger.info(f"   Vector: {len(nodes)} candidates retrieved")
+        
+        # Apply similarity filtering
+        filtered_nodes = SimilarityPostprocessor(similarity_cutoff=similarity_threshold).postprocess_nodes(nodes)
+        logger.info(f"   Vector: {len(filtered_nodes)} after similarity filter")
+        
+        candidates = []
+        for node in filtered_nodes:
+            metadata = node.node.metadata if hasattr(node.node, 'metadata') else {}
+            candidates.append({
+                "content": node.node.text if hasattr(node.node, 'text') else str(node.node),
+                "metadata": metadata,
+                "score": node.score if hasattr(node, 'score') else 0.0,
+                "document_id": metadata.get('id', ''),
+                "chunk_index": metadata.get('chunk_index', 0)
+            })
+        
+        return candidates
+    
+    def _is_content_relevant(self, analysis: QueryAnalysis, content: str) -> bool:
         """Smart content relevance check"""
         
-        query_lower = query.lower()
         content_lower = content.lower()
         
         # Check if query contains person names
-        if self.person_detector.is_person_query(query, extracted_entity):
-            person_terms = self.person_detector.get_person_name_terms(extracted_entity or query)
+        if analysis.person_detected:
+            person_terms = analysis.person_terms
             
             if person_terms:
                 # For person queries, require ALL person name terms
@@ -380,7 +671,7 @@ class LlamaIndexRetriever(BaseRetriever):
                 return found_terms == len(person_terms)
         
         # For non-person queries - general relevance check
-        query_words = [word for word in query_lower.split() if len(word) > 2]
+        query_words = analysis.query_terms
         if not query_words:
             return True
         
@@ -388,12 +679,105 @@ class LlamaIndexRetriever(BaseRetriever):
         found_words = sum(1 for word in query_words if word in content_lower)
         return found_words / len(query_words) >= 0.7
 
+class SnapshotVectorRetriever(LlamaIndexRetriever):
+    """Vector retriever over a local memory-mapped snapshot of the embeddings"""
+    
+    def __init__(self, config):
+        super().__init__(config)
+        search = config.search
+        self.snapshot = VectorSnapshot(
+            search.vector_snapshot_path,
+            dtype=search.vector_snapshot_dtype,
+            use_hnsw=search.vector_snapshot_hnsw,
+            hnsw_ef_search=search.vector_hnsw_ef_search
+        )
+        self.table = f"{config.database.schema}.{config.database.table_name}"
+        self.last_sync_error: Optional[str] = None
+        
+        try:
+            self.snapshot.load()
+        except Exception as e:
+            logger.warning(f"?? Vector snapshot at {search.vector_snapshot_path} unreadable, re-exporting: {e}")
+        
+        # Until the first export finishes, searches go to pgvector
+        self._stop = threading.Event()
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="vector-snapshot-sync", daemon=True)
+        self._sync_thread.start()
+    
+    def _sync_loop(self):
+        """Follow the indexer's version stamp, then rebuild the HNSW index if enabled"""
+        while not self._stop.is_set():
+            try:
+                self.snapshot.sync(self.pool, self.table, f"{self.table}_index_version")
+                self.snapshot.ensure_ann()
+                self.last_sync_error = None
+            except Exception as e:
+                self.last_sync_error = str(e)
+                logger.warning(f"?? Vector snapshot sync failed: {e}")
+            self._stop.wait(self.config.search.vector_snapshot_sync_interval)
+    
+    def _search_candidates(self, 
+                           query: str, 
+                           top_k: int, 
+                           similarity_threshold: float,
+                           metadata_filters: Optional[Dict[str, Any]] = None,
+                           query_embedding: Optional[List[float]] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Search the snapshot; metadata filters and an unbuilt snapshot go to pgvector"""
+        embedding = query_embedding or self.embed_queries([query])[0]
+        if metadata_filters or not self.snapshot.document_count() or self.snapshot.dimension != len(embedding):
+            return super()._search_candidates(query, top_k, similarity_threshold, metadata_filters, embedding)
+        
+        candidates = []
+        for hit in self.snapshot.search([embedding], top_k)[0]:
+            # Hits are best first, but the score (1 - exp(-distance)) grows with distance:
+            # filter every hit, as the direct backend's WHERE clause does
+            if hit["score"] < similarity_threshold:
+                continue
+            chunk_index = int(hit.get("chunk_index") or 0)
+            text = hit.get("text") or ""
+            candidates.append({
+                "content": text,
+                "metadata": {
+                    "file_name": hit.get("file_name") or "Unknown",
+                    "chunk_index": chunk_index,
+                    "text_length": len(text)
+                },
+                "score": hit["score"],
+                "document_id": str(hit["id"]),
+                "chunk_index": chunk_index
+            })
+        
+        logger.info(f"   Vector: {len(candidates)} candidates above threshold (snapshot)")
+        return candidates, "snapshot"
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get snapshot size and sync state"""
+        return {
+            "documents": self.snapshot.document_count(),
+            "segments": len(self.snapshot.segments),
+            "dimension": self.snapshot.dimension,
+            "dtype": str(self.snapshot.dtype),
+            "hnsw": self.snapshot.use_hnsw,
+            "index_version": self.snapshot.index_version,
+            "last_sync_error": self.last_sync_error
+        }
+
 class DatabaseRetriever(BaseRetriever):
     """?? HYBRID DATABASE RETRIEVER - Direct database search for exact matches"""
     
+    # Match tiers computed by the ranked query, in priority order
+    STRATEGIES = {
+        1: {"name": "exact_phrase", "match_type": "exact_phrase", "label": "exact phrase"},
+        2: {"name": "person_name", "match_type": "person_name_match", "label": "person name"},
+        3: {"name": "flexible_terms", "match_type": "flexible_terms", "label": "flexible term"}
+    }
+    
     def __init__(self, config):
         self.config = config
-        self.person_detector = PersonNameDetector()
+        self.query_analyzer = QueryAnalyzer(config)
+        self.pool = get_connection_pool(config.database.connection_string, config.database)
+        self.use_text_search = None  # Resolved on first search
+        self.use_person_index = None  # Resolved on first search
     
     def is_available(self) -> bool:
         """Database retriever is always available"""
@@ -406,321 +790,418 @@ class DatabaseRetriever(BaseRetriever):
         """?? Hybrid database search with multiple strategies"""
         logger.info(f"??? Database hybrid search for: '{query}'")
         
+        # psycopg2 blocks, so the search runs in a worker thread; on cancellation
+        # (timeout) the running statement is cancelled server-side
+        analysis = self.query_analyzer.resolve(query, kwargs.get('query_analysis'), kwargs.get('extracted_entity'))
+        active = {}
         try:
-            conn = psycopg2.connect(self.config.database.connection_string)
-            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
-            
-            results = []
-            
-            # Strategy 1: Exact phrase match (highest priority)
-            exact_results = await self._exact_phrase_search(cur, query, top_k)
-            results.extend(exact_results)
-            logger.info(f"   Database: {len(exact_results)} exact phrase matches")
-            
-            # Strategy 2: Person name search (if person query and still need more results)
-            extracted_entity = kwargs.get('extracted_entity')
-            if self.person_detector.is_person_query(query, extracted_entity) and len(results) < top_k:
-                needed = top_k - len(results)
-                person_results = await self._person_name_search(
-                    cur, extracted_entity or query, needed, 
-                    exclude_ids=[r.document_id for r in results]
-                )
-                results.extend(person_results)
-                logger.info(f"   Database: {len(person_results)} person name matches")
-            
-            # Strategy 3: Flexible term search (if still need more)
-            if len(results) < top_k:
-                needed = top_k - len(results)
-                terms_results = await self._flexible_terms_search(
-                    cur, query, needed,
-                    exclude_ids=[r.document_id for r in results]
-                )
-                results.extend(terms_results)
-                logger.info(f"   Database: {len(terms_results)} flexible term matches")
-            
-            cur.close()
-            conn.close()
-            
+            results = await run_blocking(self._search_sync, analysis, top_k, active)
             logger.info(f"? Database search completed: {len(results)} total results")
             return results
             
+        except asyncio.CancelledError:
+            conn = active.get("connection")
+            if conn is not None:
+                try:
+                    conn.cancel()
+                except Exception as e:
+                    logger.warning(f"Could not cancel database query: {e}")
+            logger.warning("?? Database search cancelled")
+            raise
         except Exception as e:
             logger.error(f"? Database search failed: {e}")
             return []
     
-    async def _exact_phrase_search(self, cur, query: str, limit: int) -> List[RetrievalResult]:
-        """Exact phrase matching with high relevance scoring"""
-        search_sql = f"""
-        SELECT 
-            id,
-            metadata,
-            (metadata->>'text') as text_content,
-            (metadata->>'file_name') as file_name,
-            (metadata->>'chunk_index') as chunk_index
-        FROM {self.config.database.schema}.{self.config.database.table_name}
-        WHERE LOWER(metadata->>'text') LIKE LOWER(%s)
-        AND metadata->>'file_name' IS NOT NULL
-        ORDER BY LENGTH(metadata->>'text') ASC
-        LIMIT %s
-        """
+    def _search_sync(self, analysis: QueryAnalysis, top_k: int, active: Dict[str, Any]) -> List[RetrievalResult]:
+        """Run all database strategies as one ranked query on a pooled connection (blocking)"""
+        query = analysis.query
+        extracted_entity = analysis.extracted_entity
+        
+        # Person strategy only applies to person queries (same rule as before)
+        person_terms = analysis.person_terms
+        if person_terms:
+            logger.info(f"   Database: Searching for person terms: {person_terms}")
+        
+        # Individual terms (more flexible than exact phrase)
+        terms = analysis.query_terms
+        
+        # Pooled connection: no TLS/auth handshake per search
+        with self.pool.connection() as conn:
+            active["connection"] = conn
+            cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            self._detect_text_search(cur)
+            self._detect_person_index(cur)
+            
+            # Full names are answered by the indexer's name table (a primary key lookup)
+            person_name = None
+            if person_terms and self.use_person_index:
+                normalized = normalize_person_name(extracted_entity or query)
+                if 2 <= len(normalized.split()) <= 3:
+                    person_name = normalized
+                    logger.info(f"   Database: Person name index lookup for '{person_name}'")
+            
+            search_sql, params = self._build_ranked_query(query, person_terms, terms, top_k, person_name)
+            cur.execute(search_sql, params)
+            rows = cur.fetchall()
+            
+            cur.close()
+            active.pop("connection", None)
         
-        search_term = f"%{query}%"
-        cur.execute(search_sql, (search_term, limit))
-        rows = cur.fetchall()
+        tier_metadata = self._tier_metadata(query, person_terms, terms)
         
         results = []
         for row in rows:
             try:
-                content = row.get('text_content', '')
-                if not content:
-                    continue
-                
-                metadata = row.get('metadata', {})
-                filename = row.get('file_name') or metadata.get('file_name', 'Unknown')
-                
-                # Calculate relevance based on query occurrences and content quality
-                query_count = content.lower().count(query.lower())
-                relevance_score = min(
-                    self.config.search.database_exact_match_score,
-                    self.config.search.database_base_score + (query_count * self.config.search.database_score_per_occurrence)
-                )
-                
-                result = RetrievalResult(
-                    content=content[:500] + "..." if len(content) > 500 else content,
-                    full_content=content,
-                    filename=filename,
-                    similarity_score=relevance_score,
-                    metadata=metadata,
-                    source_method=self.get_name(),
-                    document_id=str(row.get('id', '')),
-                    chunk_index=int(row.get('chunk_index', 0) or 0)
-                )
-                
-                result.metadata.update({
-                    "match_type": "exact_phrase",
-                    "search_query": query,
-                    "query_occurrences": query_count,
-                    "database_strategy": "exact_phrase"
-                })
-                
-                results.append(result)
-                
+                result = self._row_to_result(row, tier_metadata[row['match_tier']])
+                if result:
+                    results.append(result)
             except Exception as e:
-                logger.warning(f"Error processing exact match: {e}")
+                logger.warning(f"Error processing database match: {e}")
                 continue
         
+        for strategy in self.STRATEGIES.values():
+            count = sum(1 for r in results if r.metadata.get("database_strategy") == strategy["name"])
+            logger.info(f"   Database: {count} {strategy['label']} matches")
+        
         return results
     
-    async def _person_name_search(self, cur, query: str, limit: int, exclude_ids: List[str] = None) -> List[RetrievalResult]:
-        """Person name based search using name term extraction"""
-        if exclude_ids is None:
-            exclude_ids = []
+    def _detect_text_search(self, cur):
+        """Use the tsvector backend only if the indexer's text_search column exists (checked once)"""
+        if self.use_text_search is not None:
+            return
+        
+        if self.config.search.database_search_backend != "fts":
+            self.use_text_search = False
+            return
+        
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s AND column_name = %s
+        """, (self.config.database.schema, self.config.database.table_name, TEXT_SEARCH_COLUMN))
+        self.use_text_search = cur.fetchone() is not None
+        
+        if self.use_text_search:
+            logger.info("??? Database search backend: tsvector full-text index")
+        else:
+            logger.warning(f"?? Column '{TEXT_SEARCH_COLUMN}' not found - run rag_indexer/text_search_schema.py; using LIKE scans")
+    
+    def _detect_person_index(self, cur):
+        """Use the indexer's person name table if it exists (checked once)"""
+        if self.use_person_index is not None:
+            return
         
-        # Extract person name terms
-        person_terms = self.person_detector.get_person_name_terms(query)
-        if not person_terms:
-            return []
+        if not self.config.search.database_person_index:
+            self.use_person_index = False
+            return
         
-        logger.info(f"   Database: Searching for person terms: {person_terms}")
+        table = f"{self.config.database.schema}.{self.config.database.table_name}{PERSON_NAMES_SUFFIX}"
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (table,))
+        self.use_person_index = bool(cur.fetchone()["present"])
         
-        # Build SQL for person name terms
-        conditions = []
-        params = []
+        if self.use_person_index:
+            logger.info(f"??? Person queries: name index {table}")
+        else:
+            logger.warning(f"?? Table {table} not found - run rag_indexer/person_name_index.py; person queries use text matching")
+    
+    def _build_ranked_query(self, query: str, person_terms: List[str], terms: List[str], limit: int,
+                            person_name: Optional[str] = None):
+        """
+        Build one SQL statement covering exact phrase, person name and flexible term matching
+        
+        Each row gets the tier of the first strategy it matches (1 = exact phrase,
+        2 = person name, 3 = flexible terms). Ordering by tier, then by rank/length,
+        returns the same rows the three sequential queries with NOT IN exclusions did,
+        in a single scan and round trip. Relevance scores are computed server-side
+        for the top rows only.
+        
+        With person_name (normalized) and person_terms, the person tier also takes
+        the chunks the indexer's name table lists for the name. The term match
+        stays: the table only holds Title-Case first-last names, not "DALY, Breeda"
+        or "McDonald". Without person_terms there is no person tier.
+        """
+        search = self.config.search
+        table = f"{self.config.database.schema}.{self.config.database.table_name}"
+        text_lower = "LOWER(metadata->>'text')"
+        phrase = query.lower()
+        
+        params = {
+            "phrase": phrase,
+            "person_terms": person_terms,
+            "terms": terms,
+            "limit": limit,
+            "exact_score": search.database_exact_match_score,
+            "base_score": search.database_base_score,
+            "score_per_occurrence": search.database_score_per_occurrence
+        }
         
-        for term in person_terms:
-            conditions.append("LOWER(metadata->>'text') LIKE LOWER(%s)")
-            params.append(f"%{term}%")
+        # (tier, match condition, rank expression) per active strategy; LIKE has no rank
+        tiers = []
+        from_extra = ""
+        
+        # Uncorrelated subquery runs once (InitPlan); = ANY(ARRAY(...)) is a primary key lookup
+        person_index_condition = None
+        if person_name and person_terms:
+            params["person_name"] = person_name
+            names_table = f"{table}{PERSON_NAMES_SUFFIX}"
+            person_index_condition = f"id = ANY(ARRAY(SELECT chunk_id FROM {names_table} WHERE name = %(person_name)s))"
+        
+        if self.use_text_search:
+            params.update({
+                "ts_config": search.database_text_search_config,
+                "person_text": ' '.join(person_terms),
+                "terms_text": ' OR '.join(terms)
+            })
+            queries = [(1, "phrase_q", "phraseto_tsquery(%(ts_config)s::regconfig, %(phrase)s)")]
+            if person_terms:
+                queries.append((2, "person_q", "plainto_tsquery(%(ts_config)s::regconfig, %(person_text)s)"))
+            if terms:
+                queries.append((3, "terms_q", "websearch_to_tsquery(%(ts_config)s::regconfig, %(terms_text)s)"))
+            
+            from_extra = "".join(f", {tsquery} AS {alias}" for _, alias, tsquery in queries)
+            for tier, alias, _ in queries:
+                condition = f"{TEXT_SEARCH_COLUMN} @@ {alias}"
+                if tier == 2 and person_index_condition:
+                    condition = f"({person_index_condition} OR {condition})"
+                tiers.append((tier, condition, f"ts_rank_cd({TEXT_SEARCH_COLUMN}, {alias})"))
+            # One GIN lookup for the union of all strategies
+            where_match = f"{TEXT_SEARCH_COLUMN} @@ ({' || '.join(alias for _, alias, _ in queries)})"
+            if person_index_condition:
+                where_match = f"{where_match} OR {person_index_condition}"
+        else:
+            params["phrase_pattern"] = f"%{phrase}%"
+            tiers.append((1, f"{text_lower} LIKE %(phrase_pattern)s", None))
+            
+            person_conditions = [person_index_condition] if person_index_condition else []
+            if person_terms:
+                conditions = []
+                for i, term in enumerate(person_terms):
+                    params[f"person_{i}"] = f"%{term}%"
+                    conditions.append(f"{text_lower} LIKE %(person_{i})s")
+                person_conditions.append(f"({' AND '.join(conditions)})")
+            if person_conditions:
+                tiers.append((2, f"({' OR '.join(person_conditions)})", None))
+            
+            if terms:
+                conditions = []
+                for i, term in enumerate(terms):
+                    params[f"term_{i}"] = f"%{term}%"
+                    conditions.append(f"{text_lower} LIKE %(term_{i})s")
+                tiers.append((3, f"({' OR '.join(conditions)})", None))
+            
+            # Expanded LIKE conditions (not LIKE ANY) so the pg_trgm index can be used
+            where_match = ' OR '.join(condition for _, condition, _ in tiers)
         
-        exclude_condition = ""
-        if exclude_ids:
-            exclude_condition = f"AND id NOT IN ({','.join(['%s'] * len(exclude_ids))})"
-            params.extend(exclude_ids)
+        tier_case = " ".join(f"WHEN {condition} THEN {tier}" for tier, condition, _ in tiers)
+        rank_case = "0"
+        if self.use_text_search:
+            rank_case = "CASE " + " ".join(f"WHEN {condition} THEN {rank}" for _, condition, rank in tiers) + " END"
         
         search_sql = f"""
+        WITH top_matches AS (
+            SELECT 
+                id,
+                metadata,
+                (metadata->>'text') as text_content,
+                {text_lower} as text_lower,
+                (metadata->>'file_name') as file_name,
+                (metadata->>'chunk_index') as chunk_index,
+                CASE {tier_case} END as match_tier,
+                {rank_case} as text_rank
+            FROM {table}{from_extra}
+            WHERE ({where_match})
+            AND metadata->>'file_name' IS NOT NULL
+            ORDER BY match_tier ASC, text_rank DESC, LENGTH(metadata->>'text') ASC
+            LIMIT %(limit)s
+        )
         SELECT 
-            id,
-            metadata,
-            (metadata->>'text') as text_content,
-            (metadata->>'file_name') as file_name,
-            (metadata->>'chunk_index') as chunk_index
-        FROM {self.config.database.schema}.{self.config.database.table_name}
-        WHERE ({' AND '.join(conditions)}) {exclude_condition}
-        AND metadata->>'file_name' IS NOT NULL
-        ORDER BY LENGTH(metadata->>'text') ASC
-        LIMIT %s
+            id, metadata - 'text' as metadata, text_content, file_name, chunk_index, match_tier, text_rank,
+            phrase_stats.occurrences as query_occurrences,
+            person_stats.found as person_terms_found,
+            terms_stats.found as terms_found,
+            CASE match_tier
+                WHEN 1 THEN LEAST(%(exact_score)s, %(base_score)s + phrase_stats.occurrences * %(score_per_occurrence)s)
+                WHEN 2 THEN CASE
+                    WHEN person_stats.found = 0 THEN 0.1
+                    WHEN person_stats.found = cardinality(%(person_terms)s::text[]) THEN %(exact_score)s
+                    ELSE %(base_score)s + person_stats.found::float / cardinality(%(person_terms)s::text[]) * 0.2
+                END
+                ELSE CASE
+                    WHEN terms_stats.found = 0 THEN 0.1
+                    ELSE LEAST(
+                        %(base_score)s,
+                        %(base_score)s * 0.8
+                            + terms_stats.found::float / cardinality(%(terms)s::text[]) * 0.2
+                            + LEAST(0.2, terms_stats.occurrences * 0.02)
+                    )
+                END
+            END as relevance_score
+        FROM top_matches,
+        LATERAL (
+            SELECT (LENGTH(text_lower) - LENGTH(REPLACE(text_lower, %(phrase)s, ''))) / GREATEST(LENGTH(%(phrase)s), 1) as occurrences
+        ) phrase_stats,
+        LATERAL (
+            SELECT COUNT(*) FILTER (WHERE POSITION(t IN text_lower) > 0) as found
+            FROM unnest(%(person_terms)s::text[]) t
+        ) person_stats,
+        LATERAL (
+            SELECT 
+                COUNT(*) FILTER (WHERE POSITION(t IN text_lower) > 0) as found,
+                COALESCE(SUM((LENGTH(text_lower) - LENGTH(REPLACE(text_lower, t, ''))) / LENGTH(t)), 0) as occurrences
+            FROM unnest(%(terms)s::text[]) t
+        ) terms_stats
+        ORDER BY match_tier ASC, text_rank DESC, LENGTH(text_content) ASC
         """
         
-        params.append(limit)
-        cur.execute(search_sql, params)
-        rows = cur.fetchall()
+        return search_sql, params
+    
+    def _tier_metadata(self, query: str, person_terms: List[str], terms: List[str]) -> Dict[int, Mapping[str, Any]]:
+        """Strategy-level metadata, shared by all rows of the same tier"""
+        tier_metadata = {}
+        for tier, strategy in self.STRATEGIES.items():
+            if strategy["name"] == "exact_phrase":
+                search_fields = {"search_query": query}
+            elif strategy["name"] == "person_name":
+                search_fields = {"person_terms": person_terms}
+            else:
+                search_fields = {"search_terms": terms}
+            tier_metadata[tier] = shared_metadata(
+                match_type=strategy["match_type"],
+                database_strategy=strategy["name"],
+                **search_fields
+            )
+        return tier_metadata
+    
+    def _row_to_result(self, row: Dict[str, Any], tier_metadata: Mapping[str, Any]) -> Optional[RetrievalResult]:
+        """Convert a ranked database row into a RetrievalResult"""
+        content = row.get('text_content', '')
+        if not content:
+            return None
+        
+        metadata = dict(row.get('metadata') or {})  # Chunk metadata without the text (see _build_ranked_query)
+        filename = row.get('file_name') or metadata.get('file_name', 'Unknown')
+        relevance_score = float(row.get('relevance_score') or 0.1)
+        
+        metadata["text_rank"] = row.get('text_rank') if self.use_text_search else None
+        if tier_metadata["database_strategy"] == "exact_phrase":
+            metadata["query_occurrences"] = row.get('query_occurrences', 0)
+        else:
+            metadata["terms_coverage"] = relevance_score
+        
+        return RetrievalResult(
+            full_content=content,
+            filename=filename,
+            similarity_score=relevance_score,
+            metadata=ResultMetadata(tier_metadata, metadata),
+            source_method=self.get_name(),
+            document_id=str(row.get('id', '')),
+            chunk_index=int(row.get('chunk_index', 0) or 0)
+        )
+
+class BM25Retriever(BaseRetriever):
+    """Lexical retriever over a local memory-mapped BM25 index of the vecs chunks"""
+    
+    def __init__(self, config):
+        self.config = config
+        search = config.search
+        self.index = BM25Index(search.bm25_index_path, k1=search.bm25_k1, b=search.bm25_b)
+        self.pool = get_connection_pool(config.database.connection_string, config.database)
+        self.table = f"{config.database.schema}.{config.database.table_name}"
+        self.last_sync_error: Optional[str] = None
+        
+        try:
+            self.index.load()
+        except Exception as e:
+            logger.warning(f"?? BM25 index at {search.bm25_index_path} unreadable, rebuilding: {e}")
         
-        results = []
-        for row in rows:
+        # Sync (initial build, then incremental updates) never blocks a search
+        self._stop = threading.Event()
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="bm25-sync", daemon=True)
+        self._sync_thread.start()
+    
+    def _sync_loop(self):
+        """Follow the indexer's version stamp and apply new/removed chunks"""
+        while not self._stop.is_set():
             try:
-                content = row.get('text_content', '')
-                if not content:
-                    continue
-                
-                metadata = row.get('metadata', {})
-                filename = row.get('file_name') or metadata.get('file_name', 'Unknown')
-                
-                # Calculate relevance based on person term coverage
-                relevance_score = self._calculate_person_relevance(content, person_terms)
-                
-                result = RetrievalResult(
-                    content=content[:500] + "..." if len(content) > 500 else content,
-                    full_content=content,
-                    filename=filename,
-                    similarity_score=relevance_score,
-                    metadata=metadata,
-                    source_method=self.get_name(),
-                    document_id=str(row.get('id', '')),
-                    chunk_index=int(row.get('chunk_index', 0) or 0)
-                )
-                
-                result.metadata.update({
-                    "match_type": "person_name_match",
-                    "person_terms": person_terms,
-                    "terms_coverage": relevance_score,
-                    "database_strategy": "person_name"
-                })
-                
-                results.append(result)
-                
+                self.index.sync(self.pool, self.table, f"{self.table}_index_version")
+                self.last_sync_error = None
             except Exception as e:
-                logger.warning(f"Error processing person name match: {e}")
-                continue
-        
-        return results
+                self.last_sync_error = str(e)
+                logger.warning(f"?? BM25 index sync failed: {e}")
+            self._stop.wait(self.config.search.bm25_sync_interval)
     
-    async def _flexible_terms_search(self, cur, query: str, limit: int, exclude_ids: List[str] = None) -> List[RetrievalResult]:
-        """Flexible terms matching for broader recall"""
-        if exclude_ids is None:
-            exclude_ids = []
-        
-        # Extract individual terms (more flexible than exact phrase)
-        terms = [term.strip().lower() for term in query.split() if len(term) > 2]
-        if not terms:
+    def is_available(self) -> bool:
+        """Available as soon as the index holds documents"""
+        return self.index.document_count() > 0
+    
+    def get_name(self) -> str:
+        return "bm25_lexical"
+    
+    async def retrieve(self, query: str, top_k: int = 10, **kwargs) -> List[RetrievalResult]:
+        """BM25 search (NumPy over memory-mapped postings, in a worker thread)"""
+        if not self.is_available():
+            logger.info("   BM25: index not built yet")
             return []
         
-        # Build SQL with OR condition for flexibility
-        conditions = []
-        params = []
-        
-        for term in terms:
-            conditions.append("LOWER(metadata->>'text') LIKE LOWER(%s)")
-            params.append(f"%{term}%")
-        
-        exclude_condition = ""
-        if exclude_ids:
-            exclude_condition = f"AND id NOT IN ({','.join(['%s'] * len(exclude_ids))})"
-            params.extend(exclude_ids)
-        
-        search_sql = f"""
-        SELECT 
-            id,
-            metadata,
-            (metadata->>'text') as text_content,
-            (metadata->>'file_name') as file_name,
-            (metadata->>'chunk_index') as chunk_index
-        FROM {self.config.database.schema}.{self.config.database.table_name}
-        WHERE ({' OR '.join(conditions)}) {exclude_condition}
-        AND metadata->>'file_name' IS NOT NULL
-        ORDER BY LENGTH(metadata->>'text') ASC
-        LIMIT %s
-        """
-        
-        params.append(limit)
-        cur.execute(search_sql, params)
-        rows = cur.fetchall()
+        try:
+            hits = await run_blocking(self.index.search, query, top_k)
+        except Exception as e:
+            logger.error(f"? BM25 search failed: {e}")
+            return []
         
+        bm25_metadata = shared_metadata(match_type="bm25")
         results = []
-        for row in rows:
-            try:
-                content = row.get('text_content', '')
-                if not content:
-                    continue
-                
-                metadata = row.get('metadata', {})
-                filename = row.get('file_name') or metadata.get('file_name', 'Unknown')
-                
-                # Calculate relevance based on term coverage
-                relevance_score = self._calculate_terms_relevance(content, terms)
-                
-                result = RetrievalResult(
-                    content=content[:500] + "..." if len(content) > 500 else content,
-                    full_content=content,
-                    filename=filename,
-                    similarity_score=relevance_score,
-                    metadata=metadata,
-                    source_method=self.get_name(),
-                    document_id=str(row.get('id', '')),
-                    chunk_index=int(row.get('chunk_index', 0) or 0)
-                )
-                
-                result.metadata.update({
-                    "match_type": "flexible_terms",
-                    "search_terms": terms,
-                    "terms_coverage": relevance_score,
-                    "database_strategy": "flexible_terms"
-                })
-                
-                results.append(result)
-                
-            except Exception as e:
-                logger.warning(f"Error processing flexible terms match: {e}")
-                continue
-        
+        for hit in hits:
+            content = hit.get("text") or ""
+            results.append(RetrievalResult(
+                full_content=content,
+                filename=hit.get("file_name") or "Unknown",
+                similarity_score=hit["score"],
+                metadata=ResultMetadata(bm25_metadata, {
+                    "file_name": hit.get("file_name"),
+                    "chunk_index": hit.get("chunk_index"),
+                    "bm25_score": hit["bm25_score"],
+                    "matched_terms": hit["matched_terms"]
+                }),
+                source_method=self.get_name(),
+                document_id=str(hit.get("id", "")),
+                chunk_index=int(hit.get("chunk_index") or 0)
+            ))
+        
+        logger.info(f"? BM25 search completed: {len(results)} results")
         return results
     
-    def _calculate_person_relevance(self, content: str, person_terms: List[str]) -> float:
-        """Calculate relevance for person name matches"""
-        content_lower = content.lower()
-        found_terms = sum(1 for term in person_terms if term in content_lower)
-        
-        if found_terms == 0:
-            return 0.1
-        
-        # High score for person matches (requires ALL terms)
-        if found_terms == len(person_terms):
-            return self.config.search.database_exact_match_score
-        
-        # Partial matches get medium scores
-        coverage_score = found_terms / len(person_terms)
-        return self.config.search.database_base_score + coverage_score * 0.2
-    
-    def _calculate_terms_relevance(self, content: str, terms: List[str]) -> float:
-        """Calculate relevance based on term coverage"""
-        content_lower = content.lower()
-        found_terms = sum(1 for term in terms if term in content_lower)
-        
-        if found_terms == 0:
-            return 0.1
-        
-        # Base score from coverage
-        coverage_score = found_terms / len(terms)
-        
-        # Boost for multiple occurrences
-        total_occurrences = sum(content_lower.count(term) for term in terms)
-        occurrence_boost = min(0.2, total_occurrences * 0.02)
-        
-        base_score = self.config.search.database_base_score * 0.8  # Lower than exact matches
-        return min(self.config.search.database_base_score, base_score + coverage_score * 0.2 + occurrence_boost)
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index size and sync state"""
+        return {
+            "documents": self.index.document_count(),
+            "segments": len(self.index.segments),
+            "index_version": self.index.index_version,
+            "last_sync_error": self.last_sync_error
+        }
 
 class MultiStrategyRetriever:
     """?? HYBRID Multi-strategy retriever with Vector + Database search"""
     
+    # Vector search runs at most this many query variants
+    MAX_VECTOR_VARIANTS = 2
+    
     def __init__(self, config):
         self.config = config
         self.retrievers = {}
-        self.person_detector = PersonNameDetector()
+        self.query_analyzer = QueryAnalyzer(config)
         self._initialize_retrievers()
+        
+        # Compacted results reload their text through this retriever
+        RetrievalResult.text_loader = self.fetch_chunk_texts
     
     def _initialize_retrievers(self):
         """Initialize all available retrievers"""
         # Vector retriever (if enabled)
         if self.config.search.enable_vector_search:
-            llamaindex_retriever = LlamaIndexRetriever(self.config)
+            if self.config.search.vector_search_backend == "snapshot":
+                llamaindex_retriever = SnapshotVectorRetriever(self.config)
+            else:
+                llamaindex_retriever = LlamaIndexRetriever(self.config)
             if llamaindex_retriever.is_available():
                 self.retrievers["vector"] = llamaindex_retriever
         
@@ -728,16 +1209,71 @@ class MultiStrategyRetriever:
         if self.config.search.enable_database_search:
             self.retrievers["database"] = DatabaseRetriever(self.config)
         
+        # BM25 retriever (if enabled); registered even while its index is still building
+        if self.config.search.enable_bm25_search:
+            try:
+                self.retrievers["bm25"] = BM25Retriever(self.config)
+            except Exception as e:
+                logger.error(f"? Failed to initialize BM25 retriever: {e}")
+        
         logger.info(f"?? Initialized retrievers: {list(self.retrievers.keys())}")
     
+    def analyze_query(self, query: str, extracted_entity: Optional[str] = None) -> QueryAnalysis:
+        """Classify a query once; the analysis is then passed to retrieval, fusion and answer generation"""
+        return self.query_analyzer.analyze(query, extracted_entity)
+    
+    def start_speculative_retrieval(self, question: str) -> SpeculativeRetrieval:
+        """
+        Start database and vector retrieval on the raw question right away
+        
+        Must be called from a running event loop. The searches run while the
+        LLM stages (entity extraction, rewriting) are still in progress;
+        multi_retrieve() then reuses them for matching queries and merges the rest.
+        """
+        analysis = self.analyze_query(question)
+        search_params = analysis.search_params
+        speculative = SpeculativeRetrieval(tasks={}, started_at=time.time())
+        
+        if self.config.search.enable_database_search and "database" in self.retrievers:
+            speculative.tasks[("database", normalize_query(question))] = asyncio.create_task(
+                self.retrievers["database"].retrieve(question, search_params["top_k"], query_analysis=analysis)
+            )
+        
+        if self.config.search.enable_vector_search and "vector" in self.retrievers:
+            # Same budget as one variant of the usual two, since it stands in for one
+            speculative.tasks[("vector", normalize_query(question))] = asyncio.create_task(
+                self.retrievers["vector"].retrieve(
+                    question, 
+                    self._vector_variant_top_k(search_params["top_k"], self.MAX_VECTOR_VARIANTS), 
+                    similarity_threshold=search_params["similarity_threshold"],
+                    query_analysis=analysis
+                )
+            )
+        
+        for key, task in speculative.tasks.items():
+            task.add_done_callback(lambda _, key=key: speculative.finished_at.__setitem__(key, time.time()))
+        speculative.total = len(speculative.tasks)
+        
+        logger.info(f"?? Speculative retrieval started for raw question ({speculative.total} strategies)")
+        return speculative
+    
     async def multi_retrieve(self, 
                            queries: List[str], 
                            extracted_entity: Optional[str] = None,
-                           required_terms: List[str] = None) -> MultiRetrievalResult:
-        """?? HYBRID multi-strategy retrieval with intelligent strategy selection"""
+                           required_terms: List[str] = None,
+                           speculative: Optional[SpeculativeRetrieval] = None,
+                           query_analysis: Optional[QueryAnalysis] = None) -> MultiRetrievalResult:
+        """?? HYBRID multi-strategy retrieval with intelligent strategy selection
+        
+        With a SpeculativeRetrieval, strategies whose query matches the raw
+        question reuse the running search; only the incremental retrievals for
+        the entity and rewrites are started here. The search's QueryAnalysis
+        (built here if not passed) is handed to every retriever.
+        """
         start_time = time.time()
         all_results = []
         methods_used = []
+        speculative_reused = []
         
         primary_query = queries[0] if queries else ""
         
@@ -746,15 +1282,23 @@ class MultiStrategyRetriever:
         logger.info(f"   Entity: '{extracted_entity}'")
         logger.info(f"   Required terms: {required_terms}")
         
-        # Determine optimal search strategy
-        search_strategy = self.config.get_search_strategy(primary_query, extracted_entity)
-        is_person_query = self.config.is_person_query(primary_query, extracted_entity)
-        
-        # Get dynamic search parameters
-        search_params = self.config.get_dynamic_search_params(primary_query, extracted_entity)
+        # Strategy, person flag and search parameters of the primary query
+        if query_analysis is None:
+            query_analysis = self.analyze_query(primary_query, extracted_entity)
+        analysis = query_analysis.for_query(primary_query)
+        search_strategy = analysis.search_strategy
+        is_person_query = analysis.is_person_query
+        search_params = analysis.search_params
         logger.info(f"?? Strategy: {search_strategy} | Person query: {is_person_query}")
         logger.info(f"?? Search params: {search_params}")
         
+        # Strategies 1 and 2 run concurrently: latency is the slower strategy, not the sum
+        strategy_timings = {}
+        timed_out = []
+        database_task = None
+        vector_task = None
+        bm25_task = None
+        
         # ?? STRATEGY 1: Database Search (if enabled and appropriate)
         if (self.config.search.enable_database_search and 
             "database" in self.retrievers and
@@ -766,11 +1310,92 @@ class MultiStrategyRetriever:
             db_query = extracted_entity if extracted_entity and is_person_query else primary_query
             logger.info(f"   Database query: '{db_query}'")
             
-            database_results = await self.retrievers["database"].retrieve(
-                db_query, 
-                search_params["top_k"],
-                extracted_entity=extracted_entity
-            )
+            database_search = speculative.take("database", db_query) if speculative else None
+            if database_search is not None:
+                speculative_reused.append("database")
+                logger.info("   Database: reusing speculative search")
+            else:
+                database_search = self.retrievers["database"].retrieve(
+                    db_query, 
+                    search_params["top_k"],
+                    extracted_entity=extracted_entity,
+                    query_analysis=analysis
+                )
+            
+            database_task = asyncio.create_task(self._run_strategy(
+                "database",
+                database_search,
+                self.config.search.database_timeout,
+                strategy_timings,
+                timed_out
+            ))
+        
+        # ?? STRATEGY 2: Vector Search (if enabled)
+        if (self.config.search.enable_vector_search and 
+            "vector" in self.retrievers):
+            
+            logger.info(f"?? STRATEGY 2: Vector search")
+            
+            if is_person_query and extracted_entity:
+                # For person queries, use both entity and original query
+                vector_queries = [extracted_entity, primary_query] if extracted_entity != primary_query else [extracted_entity]
+                logger.info(f"   Person query variants: {vector_queries}")
+            else:
+                # For general queries, use multiple variants
+                vector_queries = queries[:2]  # Limit to 2 variants
+                logger.info(f"   General query variants: {vector_queries}")
+            
+            prefetched = {}
+            if speculative:
+                for query in vector_queries[:self.MAX_VECTOR_VARIANTS]:
+                    task = speculative.take("vector", query)
+                    if task is not None:
+                        prefetched[query] = task
+                        speculative_reused.append("vector")
+            
+            vector_task = asyncio.create_task(self._run_strategy(
+                "vector",
+                self._retrieve_with_vector_variants(
+                    vector_queries, 
+                    search_params["top_k"],
+                    search_params["similarity_threshold"],
+                    prefetched=prefetched,
+                    extracted_entity=extracted_entity,
+                    query_analysis=analysis
+                ),
+                self.config.search.vector_timeout,
+                strategy_timings,
+                timed_out
+            ))
+        
+        # ?? STRATEGY 3: Local BM25 lexical search (no database round-trip)
+        if "bm25" in self.retrievers and self.retrievers["bm25"].is_available():
+            bm25_query = extracted_entity if extracted_entity and is_person_query else primary_query
+            logger.info(f"?? STRATEGY 3: BM25 search for '{bm25_query}'")
+            
+            bm25_task = asyncio.create_task(self._run_strategy(
+                "bm25",
+                self.retrievers["bm25"].retrieve(bm25_query, search_params["top_k"]),
+                self.config.search.bm25_timeout,
+                strategy_timings,
+                timed_out
+            ))
+        
+        # Speculative searches no strategy reused (raw question differs from the
+        # entity/rewrites) still ran for free during the LLM stages: merge them
+        speculative_task = None
+        unclaimed = speculative.take_remaining() if speculative else {}
+        if unclaimed:
+            speculative_task = asyncio.create_task(self._run_strategy(
+                "speculative",
+                self._gather_speculative(unclaimed),
+                max(self.config.search.database_timeout, self.config.search.vector_timeout),
+                strategy_timings,
+                timed_out
+            ))
+        
+        if database_task is not None:
+            database_results = await database_task
             
             if database_results:
                 all_results.extend(database_results)
@@ -782,6 +1407,12 @@ class MultiStrategyRetriever:
                     search_params.get("database_priority", False) and 
                     len(database_results) >= 10):
                     logger.info("?? Database priority: sufficient exact matches found, skipping vector search")
+                    if vector_task is not None:
+                        vector_task.cancel()
+                    if bm25_task is not None:
+                        bm25_task.cancel()
+                    if speculative_task is not None:
+                        speculative_task.cancel()
                     final_results = database_results[:search_params["top_k"]]
                     
                     return MultiRetrievalResult(
@@ -795,33 +1426,17 @@ class MultiStrategyRetriever:
                             "search_params": search_params,
                             "strategy": search_strategy,
                             "person_query": is_person_query,
-                            "early_return": "database_priority"
+                            "early_return": "database_priority",
+                            "strategy_timings": strategy_timings,
+                            "timed_out_strategies": timed_out,
+                            "speculative_reused": speculative_reused
                         }
                     )
             else:
                 logger.info("?? Strategy 1: No database results found")
         
-        # ?? STRATEGY 2: Vector Search (if enabled)
-        if (self.config.search.enable_vector_search and 
-            "vector" in self.retrievers):
-            
-            logger.info(f"?? STRATEGY 2: Vector search")
-            
-            if is_person_query and extracted_entity:
-                # For person queries, use both entity and original query
-                vector_queries = [extracted_entity, primary_query] if extracted_entity != primary_query else [extracted_entity]
-                logger.info(f"   Person query variants: {vector_queries}")
-            else:
-                # For general queries, use multiple variants
-                vector_queries = queries[:2]  # Limit to 2 variants
-                logger.info(f"   General query variants: {vector_queries}")
-            
-            vector_results = await self._retrieve_with_vector_variants(
-                vector_queries, 
-                search_params["top_k"],
-                search_params["similarity_threshold"],
-                extracted_entity=extracted_entity
-            )
+        if vector_task is not None:
+            vector_results = await vector_task
             
             if vector_results:
                 all_results.extend(vector_results)
@@ -830,9 +1445,24 @@ class MultiStrategyRetriever:
             else:
                 logger.info("?? Strategy 2: No vector results found")
         
-        # ?? STRATEGY 3: Fallback Search (if primary strategies failed)
+        if bm25_task is not None:
+            bm25_results = await bm25_task
+            
+            if bm25_results:
+                all_results.extend(bm25_results)
+                methods_used.append("bm25_lexical")
+                logger.info(f"? Strategy 3: {len(bm25_results)} BM25 results")
+        
+        if speculative_task is not None:
+            speculative_results = await speculative_task
+            if speculative_results:
+                all_results.extend(speculative_results)
+                methods_used.append("speculative_prefetch")
+                logger.info(f"? Speculative: {len(speculative_results)} results merged")
+        
+        # ?? STRATEGY 4: Fallback Search (if primary strategies failed)
         if not all_results:
-            logger.info(f"?? STRATEGY 3: Fallback search")
+            logger.info(f"?? STRATEGY 4: Fallback search")
             
             # Try with more relaxed parameters
             fallback_params = {
@@ -842,18 +1472,25 @@ class MultiStrategyRetriever:
             }
             
             if "database" in self.retrievers:
-                fallback_results = await self.retrievers["database"].retrieve(
-                    primary_query, 
-                    fallback_params["top_k"]
+                fallback_results = await self._run_strategy(
+                    "database_fallback",
+                    self.retrievers["database"].retrieve(
+                        primary_query, 
+                        fallback_params["top_k"],
+                        query_analysis=analysis
+                    ),
+                    self.config.search.database_timeout,
+                    strategy_timings,
+                    timed_out
                 )
                 
                 if fallback_results:
                     all_results.extend(fallback_results)
                     methods_used.append("database_fallback")
-                    logger.info(f"? Strategy 3: {len(fallback_results)} fallback results")
+                    logger.info(f"? Strategy 4: {len(fallback_results)} fallback results")
         
         # Hybrid deduplication and ranking
-        final_results = self._hybrid_dedupe_and_rank(all_results, search_params["top_k"], primary_query, extracted_entity)
+        final_results = self._hybrid_dedupe_and_rank(all_results, search_params["top_k"], analysis)
         
         retrieval_time = time.time() - start_time
         
@@ -863,6 +1500,7 @@ class MultiStrategyRetriever:
         logger.info(f"   Total candidates: {len(all_results)}")
         logger.info(f"   Final results: {len(final_results)}")
         logger.info(f"   Methods used: {', '.join(methods_used)}")
+        logger.info(f"   Strategy timings: {', '.join(f'{k}={v:.3f}s' for k, v in strategy_timings.items())}")
         logger.info(f"   Time: {retrieval_time:.3f}s")
         
         return MultiRetrievalResult(
@@ -876,49 +1514,117 @@ class MultiStrategyRetriever:
                 "search_params": search_params,
                 "strategy": search_strategy,
                 "person_query": is_person_query,
-                "hybrid_enabled": self.config.search.enable_hybrid_search
+                "hybrid_enabled": self.config.search.enable_hybrid_search,
+                "strategy_timings": strategy_timings,
+                "timed_out_strategies": timed_out,
+                "speculative_reused": speculative_reused
             }
         )
     
+    async def _gather_speculative(self, tasks: Dict[Tuple[str, str], "asyncio.Task"]) -> List[RetrievalResult]:
+        """Collect results of speculative searches that no strategy reused"""
+        results = []
+        try:
+            outcomes = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        
+        for (strategy, query), outcome in zip(tasks.keys(), outcomes):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"   ? Speculative {strategy} search failed: {outcome}")
+                continue
+            for result in outcome:
+                result.metadata["speculative"] = True
+                result.metadata["speculative_query"] = query
+            results.extend(outcome)
+        return results
+    
+    async def _run_strategy(self, 
+                            name: str, 
+                            coroutine, 
+                            timeout: float,
+                            strategy_timings: Dict[str, float],
+                            timed_out: List[str]) -> List[RetrievalResult]:
+        """Await one retrieval strategy with its own timeout; a timeout cancels it and yields no results"""
+        strategy_start = time.time()
+        with tracer.span(f"retrieval.{name}") as span:
+            try:
+                results = await asyncio.wait_for(coroutine, timeout=timeout)
+                span.set_attribute("results", len(results))
+                return results
+            except asyncio.TimeoutError:
+                logger.warning(f"?? Strategy '{name}' timed out after {timeout:.1f}s - cancelled")
+                timed_out.append(name)
+                span.set_attribute("timed_out", True)
+                return []
+            finally:
+                strategy_timings[name] = time.time() - strategy_start
+    
+    @staticmethod
+    def _vector_variant_top_k(top_k: int, variant_count: int) -> int:
+        """Results requested per vector variant: top_k distributed across the variants"""
+        return top_k // max(1, variant_count) + 2
+    
     async def _retrieve_with_vector_variants(self, 
                                            queries: List[str], 
                                            top_k: int, 
                                            similarity_threshold: float,
+                                           prefetched: Optional[Dict[str, "asyncio.Task"]] = None,
                                            **kwargs) -> List[RetrievalResult]:
-        """Retrieve with query variants using vector search"""
+        """Retrieve with query variants using vector search (prefetched: variant -> running search)"""
         
         if "vector" not in self.retrievers:
             return []
         
         retriever = self.retrievers["vector"]
         all_results = []
+        variants = queries[:self.MAX_VECTOR_VARIANTS]
         
-        # Process variants sequentially for better control
-        for i, query in enumerate(queries[:2]):  # Max 2 variants
+        for i, query in enumerate(variants):
+            logger.info(f"   ?? Vector variant {i+1}: '{query}'")
+        
+        prefetched = prefetched or {}
+        to_embed = [query for query in variants if query not in prefetched]
+        
+        # Remaining variants are embedded in one batched (and cached) request up front
+        embeddings = {}
+        if to_embed and retriever.is_available():
             try:
-                logger.info(f"   ?? Vector variant {i+1}: '{query}'")
-                
-                results = await retriever.retrieve(
-                    query, 
-                    top_k // len(queries) + 2,  # Distribute top_k across variants
-                    similarity_threshold=similarity_threshold,
-                    **kwargs
-                )
-                
-                if results:
-                    # Add variant metadata
-                    for result in results:
-                        result.metadata["vector_variant"] = i + 1
-                        result.metadata["vector_query"] = query
-                    
-                    all_results.extend(results)
-                    logger.info(f"   ? Vector variant {i+1}: {len(results)} results")
-                else:
-                    logger.info(f"   ?? Vector variant {i+1}: No results")
-                    
+                embeddings = dict(zip(to_embed, await run_blocking(retriever.embed_queries, to_embed)))
             except Exception as e:
-                logger.warning(f"   ? Vector variant {i+1} failed: {e}")
+                logger.warning(f"   ?? Batched variant embedding failed, embedding per variant: {e}")
+        
+        # Variants are searched concurrently; speculative searches are awaited, not re-run
+        variant_results = await asyncio.gather(*[
+            prefetched[query] if query in prefetched else retriever.retrieve(
+                query, 
+                self._vector_variant_top_k(top_k, len(queries)),
+                similarity_threshold=similarity_threshold,
+                query_embedding=embeddings.get(query),
+                **kwargs
+            )
+            for query in variants
+        ], return_exceptions=True)
+        
+        for i, (query, results) in enumerate(zip(variants, variant_results)):
+            if isinstance(results, BaseException):
+                if isinstance(results, asyncio.CancelledError):
+                    raise results
+                logger.warning(f"   ? Vector variant {i+1} failed: {results}")
                 continue
+            
+            if results:
+                # Add variant metadata
+                for result in results:
+                    result.metadata["vector_variant"] = i + 1
+                    result.metadata["vector_query"] = query
+                
+                all_results.extend(results)
+                logger.info(f"   ? Vector variant {i+1}: {len(results)} results")
+            else:
+                logger.info(f"   ?? Vector variant {i+1}: No results")
         
         logger.info(f"?? Vector variants summary: {len(all_results)} total results")
         return all_results
@@ -926,8 +1632,7 @@ class MultiStrategyRetriever:
     def _hybrid_dedupe_and_rank(self, 
                                all_results: List[RetrievalResult], 
                                max_results: int,
-                               primary_query: str,
-                               extracted_entity: str = None) -> List[RetrievalResult]:
+                               analysis: QueryAnalysis) -> List[RetrievalResult]:
         """?? Hybrid deduplication and ranking with source-aware scoring"""
         
         if not all_results:
@@ -935,6 +1640,7 @@ class MultiStrategyRetriever:
         
         # Group by filename for deduplication
         unique_results = {}
+        is_person = analysis.is_person_query
         
         for result in all_results:
             file_key = result.filename
@@ -946,9 +1652,6 @@ class MultiStrategyRetriever:
                 # Duplicate file - keep the better one
                 existing = unique_results[file_key]
                 
-                # Prefer database results for person queries
-                is_person = self.config.is_person_query(primary_query, extracted_entity)
-                
                 if is_person and result.source_method.startswith("database") and existing.source_method.startswith("vector"):
                     # Database result beats vector result for person queries
                     unique_results[file_key] = result
@@ -961,54 +1664,87 @@ class MultiStrategyRetriever:
                     # Keep existing
                     existing.metadata["dedup_reason"] = "kept_existing"
         
-        # Apply hybrid scoring
-        scored_results = []
-        for result in unique_results.values():
-            hybrid_score = self._calculate_hybrid_score(result, primary_query, extracted_entity)
-            result.metadata["hybrid_score"] = hybrid_score
-            scored_results.append(result)
+        # Apply hybrid scoring in one pass and sort by it
+        unique = list(unique_results.values())
+        hybrid_scores = self._calculate_hybrid_scores(unique, is_person, analysis.entity_lower)
+        for result, hybrid_score in zip(unique, hybrid_scores):
+            result.metadata["hybrid_score"] = float(hybrid_score)
         
-        # Sort by hybrid score
-        scored_results.sort(key=lambda x: x.metadata.get("hybrid_score", x.similarity_score), reverse=True)
+        scored_results = [unique[i] for i in np.argsort(-hybrid_scores, kind="stable")]
         
         logger.info(f"?? Hybrid deduplication: {len(all_results)} ? {len(scored_results)} unique ? {min(len(scored_results), max_results)} final")
         
         return scored_results[:max_results]
     
-    def _calculate_hybrid_score(self, 
-                               result: RetrievalResult, 
-                               query: str, 
-                               extracted_entity: str = None) -> float:
-        """?? Calculate hybrid score considering source method and query type"""
+    def _calculate_hybrid_scores(self, 
+                                 results: List[RetrievalResult], 
+                                 is_person: bool, 
+                                 entity_lower: str = "") -> np.ndarray:
+        """?? Calculate hybrid scores considering source method and query type"""
         
-        base_score = result.similarity_score
+        search = self.config.search
+        base_scores = np.array([result.similarity_score for result in results], dtype=np.float64)
         
         # Apply source method weights
-        if result.source_method.startswith("database"):
-            weight = self.config.search.database_result_weight
-        else:
-            weight = self.config.search.vector_result_weight
-        
-        weighted_score = base_score * weight
+        weights = np.array([
+            search.database_result_weight if result.source_method.startswith("database")
+            else search.bm25_result_weight if result.source_method.startswith("bm25")
+            else search.vector_result_weight
+            for result in results
+        ])
+        weighted_scores = base_scores * weights
         
         # Apply query-specific boosts
-        is_person = self.config.is_person_query(query, extracted_entity)
-        
         if is_person:
             # Boost person name matches
-            weighted_score *= self.config.search.person_name_boost
+            weighted_scores *= search.person_name_boost
             
-            # Extra boost for exact entity matches in content
-            if extracted_entity and extracted_entity.lower() in result.full_content.lower():
-                weighted_score *= self.config.search.exact_match_boost
+            # Extra boost for exact entity matches in content (not the filename)
+            if entity_lower:
+                entity_match = np.array([entity_lower in result.content_lower for result in results], dtype=bool)
+                weighted_scores *= np.where(entity_match, search.exact_match_boost, 1.0)
         
         # Content quality boost
-        content_length = len(result.full_content)
-        if 100 <= content_length <= 2000:  # Sweet spot for content length
-            weighted_score *= 1.05
+        content_lengths = np.array([result.text_length for result in results])
+        weighted_scores *= np.where((content_lengths >= 100) & (content_lengths <= 2000), 1.05, 1.0)  # Sweet spot for content length
         
-        # Ensure score stays within reasonable bounds
-        return min(1.0, weighted_score)
+        # Ensure scores stay within reasonable bounds
+        return np.minimum(1.0, weighted_scores)
+    
+    def get_embedding_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get query embedding cache counters (None without a vector retriever)"""
+        if "vector" not in self.retrievers:
+            return None
+        return self.retrievers["vector"].embedding_cache.get_stats()
+    
+    def get_bm25_stats(self) -> Optional[Dict[str, Any]]:
+        """Get BM25 index size and sync state (None without a BM25 retriever)"""
+        if "bm25" not in self.retrievers:
+            return None
+        return self.retrievers["bm25"].get_stats()
+    
+    def fetch_chunk_texts(self, document_ids: List[str]) -> Dict[str, str]:
+        """Load chunk text by document id in one query (used when compacted results are expanded)"""
+        if not document_ids:
+            return {}
+        
+        db_config = self.config.database
+        pool = get_connection_pool(db_config.connection_string, db_config)
+        with pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(f"""
+                    SELECT id, metadata->>'text'
+                    FROM {db_config.schema}.{db_config.table_name}
+                    WHERE id = ANY(%s)
+                """, (list(document_ids),))
+                return {row[0]: row[1] or "" for row in cur.fetchall()}
+    
+    def get_vector_snapshot_stats(self) -> Optional[Dict[str, Any]]:
+        """Get vector snapshot size and sync state (None unless the snapshot backend is used)"""
+        retriever = self.retrievers.get("vector")
+        if not isinstance(retriever, SnapshotVectorRetriever):
+            return None
+        return retriever.get_stats()
     
     def get_retriever_status(self) -> Dict[str, bool]:
         """Get status of all retrievers"""
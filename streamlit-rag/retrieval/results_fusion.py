@@ -6,8 +6,12 @@ import math
 import time
 from typing import List, Dict, Optional, Tuple, Any, Set
 from dataclasses import dataclass
+from functools import cached_property
 from collections import defaultdict, Counter
-import re
+
+import numpy as np
+
+from query_processing.query_analysis import QueryAnalysis, QueryAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,84 @@ class FusionResult:
     fusion_metadata: Dict[str, Any]
     fusion_time: float
 
+TRAINING_KEYWORDS = ['training', 'certificate', 'certification', 'course', 'completed', 'achieved']
+SIGNATURE_KEYWORDS = ['signature', 'signed', 'form', 'date:', 'location:']
+
+class FusionFeatures:
+    """
+    Per-result arrays for one fusion pass
+    
+    Texts come from RetrievalResult.normalized_text (content and filename,
+    lowercased once per result), so strategies score every result with NumPy
+    array arithmetic instead of re-lowercasing and re-scanning content per
+    strategy. Strategies that never looked at the filename match content_texts.
+    """
+    
+    def __init__(self, results: List[Any], method_weights: Dict[str, float]):
+        self.results = results
+        self._method_weights = method_weights
+    
+    # Arrays are built on first use, so each strategy only pays for what it reads
+    
+    @cached_property
+    def texts(self) -> List[str]:
+        return [result.normalized_text for result in self.results]
+    
+    @cached_property
+    def content_texts(self) -> List[str]:
+        return [result.content_lower for result in self.results]
+    
+    @cached_property
+    def base_scores(self) -> np.ndarray:
+        return np.array([result.similarity_score for result in self.results], dtype=np.float64)
+    
+    @cached_property
+    def method_weights(self) -> np.ndarray:
+        return np.array([self._method_weights.get(result.source_method, 1.0) for result in self.results], dtype=np.float64)
+    
+    @cached_property
+    def content_lengths(self) -> np.ndarray:
+        return np.array([result.text_length for result in self.results], dtype=np.int64)
+    
+    @cached_property
+    def query_occurrences(self) -> np.ndarray:
+        return np.array([result.metadata.get('query_occurrences', 0) for result in self.results], dtype=np.float64)
+    
+    @cached_property
+    def is_database(self) -> np.ndarray:
+        return np.array(["database" in result.source_method for result in self.results], dtype=bool)
+    
+    @cached_property
+    def is_vector(self) -> np.ndarray:
+        return np.array(
+            [("vector" in result.source_method or "llamaindex" in result.source_method) for result in self.results], dtype=bool
+        )
+    
+    def contains(self, needle: str, include_filename: bool = True) -> np.ndarray:
+        """Which texts contain needle (lowercase); all False for an empty needle"""
+        texts = self.texts if include_filename else self.content_texts
+        if not needle:
+            return np.zeros(len(texts), dtype=bool)
+        return np.fromiter((needle in text for text in texts), dtype=bool, count=len(texts))
+    
+    def count_contained(self, needles: List[str], include_filename: bool = True) -> np.ndarray:
+        """How many of needles each text contains"""
+        counts = np.zeros(len(self.results), dtype=np.int64)
+        for needle in needles:
+            counts += self.contains(needle, include_filename)
+        return counts
+    
+    def lookup(self, table: Dict[str, float], metadata_key: str) -> np.ndarray:
+        """Map each result's metadata value through table (1.0 when absent)"""
+        return np.array([table.get(result.metadata.get(metadata_key), 1.0) for result in self.results], dtype=np.float64)
+    
+    def ranked(self, scores: np.ndarray, indexes: Optional[np.ndarray] = None) -> List[Any]:
+        """Results at indexes (default: all) by descending score; ties keep the order of indexes"""
+        if indexes is None:
+            indexes = np.arange(len(self.results))
+        order = indexes[np.argsort(-scores[indexes], kind="stable")]
+        return [self.results[i] for i in order]
+
 class HybridResultsFusionEngine:
     """?? Advanced results fusion engine for hybrid retrieval with Vector + Database support"""
     
@@ -39,6 +121,9 @@ class HybridResultsFusionEngine:
             "database_exact": self.config.search.database_result_weight,
             "database_direct": self.config.search.database_result_weight,
             
+            # Local lexical index
+            "bm25_lexical": self.config.search.bm25_result_weight,
+            
             # Legacy methods
             "hybrid": 1.1,
             "spacy": 0.8
@@ -65,18 +150,15 @@ class HybridResultsFusionEngine:
             "signature_context": 0.9       # Just signature mention (lower priority)
         }
         
-        # ?? Person name detection patterns
-        self.person_patterns = [
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # First Last
-            r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # First Middle Last
-        ]
-        self.person_regex = [re.compile(pattern, re.IGNORECASE) for pattern in self.person_patterns]
+        # Used when fuse_results() is called without the search's QueryAnalysis
+        self.query_analyzer = QueryAnalyzer(config)
     
     def fuse_results(self, 
                     all_results: List[Any], 
                     original_query: str,
                     extracted_entity: Optional[str] = None,
-                    required_terms: List[str] = None) -> FusionResult:
+                    required_terms: List[str] = None,
+                    query_analysis: Optional[QueryAnalysis] = None) -> FusionResult:
         """?? Main hybrid fusion method with intelligent strategy selection"""
         
         start_time = time.time()
@@ -93,9 +175,10 @@ class HybridResultsFusionEngine:
         
         original_count = len(all_results)
         
-        # ?? Analyze query characteristics for fusion strategy selection
-        is_person_query = self._is_person_query(original_query, extracted_entity)
-        query_complexity = self._analyze_query_complexity(original_query)
+        # ?? Query characteristics for fusion strategy selection (computed once per search)
+        analysis = self.query_analyzer.resolve(original_query, query_analysis, extracted_entity)
+        is_person_query = analysis.fusion_person_query
+        query_complexity = analysis.complexity
         
         logger.info(f"?? Hybrid fusion: {original_count} results | Person query: {is_person_query} | Complexity: {query_complexity}")
         
@@ -115,7 +198,7 @@ class HybridResultsFusionEngine:
             )
         elif fusion_method == "hybrid_weighted_fusion":
             fused_results = self._hybrid_weighted_fusion(
-                deduplicated, original_query, extracted_entity, required_terms
+                deduplicated, original_query, extracted_entity, required_terms, analysis
             )
         elif fusion_method == "database_priority":
             fused_results = self._database_priority_fusion(
@@ -130,7 +213,7 @@ class HybridResultsFusionEngine:
         else:
             # Default: hybrid weighted fusion
             fused_results = self._hybrid_weighted_fusion(
-                deduplicated, original_query, extracted_entity, required_terms
+                deduplicated, original_query, extracted_entity, required_terms, analysis
             )
         
         # Apply final filters and quality checks
@@ -216,32 +299,26 @@ class HybridResultsFusionEngine:
         logger.info(f"   Categorized: {len(database_results)} database, {len(vector_results)} vector, {len(other_results)} other")
         
         # ?? Priority 1: Database results with person name scoring
-        scored_database = []
-        for result in database_results:
-            person_score = self._calculate_person_priority_score(result, query, extracted_entity)
+        database_features = FusionFeatures(database_results, self.method_weights)
+        person_scores = self._calculate_person_priority_scores(database_features, query, extracted_entity)
+        for result, person_score in zip(database_results, person_scores):
             result.metadata.update({
-                "person_priority_score": person_score,
+                "person_priority_score": float(person_score),
                 "fusion_priority": "database_person",
                 "fusion_method": "hybrid_person_priority"
             })
-            scored_database.append(result)
-        
-        # Sort database results by person priority score
-        scored_database.sort(key=lambda x: x.metadata["person_priority_score"], reverse=True)
+        scored_database = database_features.ranked(person_scores)
         
         # ?? Priority 2: Vector results with semantic scoring
-        scored_vector = []
-        for result in vector_results:
-            semantic_score = self._calculate_semantic_priority_score(result, query, extracted_entity)
+        vector_features = FusionFeatures(vector_results, self.method_weights)
+        semantic_scores = self._calculate_semantic_priority_scores(vector_features)
+        for result, semantic_score in zip(vector_results, semantic_scores):
             result.metadata.update({
-                "semantic_priority_score": semantic_score,
+                "semantic_priority_score": float(semantic_score),
                 "fusion_priority": "vector_semantic",
                 "fusion_method": "hybrid_person_priority"
             })
-            scored_vector.append(result)
-        
-        # Sort vector results by semantic priority
-        scored_vector.sort(key=lambda x: x.metadata["semantic_priority_score"], reverse=True)
+        scored_vector = vector_features.ranked(semantic_scores)
         
         # ?? Priority 3: Other results
         for result in other_results:
@@ -261,100 +338,86 @@ class HybridResultsFusionEngine:
                               results: List[Any], 
                               query: str,
                               extracted_entity: Optional[str] = None,
-                              required_terms: List[str] = None) -> List[Any]:
-        """?? Advanced hybrid weighted fusion with source-aware scoring"""
+                              required_terms: List[str] = None,
+                              query_analysis: Optional[QueryAnalysis] = None) -> List[Any]:
+        """?? Advanced hybrid weighted fusion with source-aware scoring (one NumPy pass over all results)"""
         
         logger.info(f"?? Hybrid weighted fusion with {len(results)} results")
         
-        query_lower = query.lower()
-        entity_lower = extracted_entity.lower() if extracted_entity else ""
+        analysis = self.query_analyzer.resolve(query, query_analysis, extracted_entity)
+        query_lower = analysis.query_lower
+        entity_lower = analysis.entity_lower
         required_terms_lower = [term.lower() for term in (required_terms or [])]
-        is_person_query = self._is_person_query(query, extracted_entity)
+        is_person_query = analysis.fusion_person_query
         
-        for result in results:
-            # ?? Base weight from source method
-            method_weight = self.method_weights.get(result.source_method, 1.0)
-            
-            # ?? Content analysis
-            content_lower = f"{result.content} {result.full_content} {result.filename}".lower()
-            
-            # ?? Start with base similarity score
-            base_score = result.similarity_score
-            
-            # ?? Quality multiplier calculation
-            quality_multiplier = 1.0
-            
-            # ?? Database strategy boost
-            if hasattr(result, 'metadata') and result.metadata.get('database_strategy'):
-                strategy = result.metadata['database_strategy']
-                quality_multiplier *= self.strategy_boosts.get(strategy, 1.0)
-            
-            # ?? Match type boost
-            if hasattr(result, 'metadata') and result.metadata.get('match_type'):
-                match_type = result.metadata['match_type']
-                quality_multiplier *= self.strategy_boosts.get(match_type, 1.0)
-            
-            # ?? Exact query match boost
-            if query_lower in content_lower:
-                quality_multiplier *= self.quality_indicators["person_name_exact" if is_person_query else "exact_match"]
-            
-            # ?? Entity match boost (for person queries)
-            if entity_lower and entity_lower in content_lower:
-                if is_person_query:
-                    quality_multiplier *= self.quality_indicators["person_name_exact"]
-                else:
-                    quality_multiplier *= 1.2
-            
-            # ?? Required terms coverage
-            if required_terms_lower:
-                found_terms = sum(1 for term in required_terms_lower if term in content_lower)
-                term_coverage = found_terms / len(required_terms_lower)
-                if term_coverage > 0.5:
-                    quality_multiplier *= (1.0 + term_coverage * 0.3)
-            
-            # ?? Query frequency boost
-            if hasattr(result, 'metadata') and result.metadata.get('query_occurrences', 0) > 1:
-                occurrences = result.metadata['query_occurrences']
-                quality_multiplier *= min(self.quality_indicators["high_query_frequency"], 1.0 + occurrences * 0.1)
-            
-            # ?? Content length quality
-            content_length = len(result.full_content)
-            if 100 <= content_length <= 2000:
-                quality_multiplier *= self.quality_indicators["optimal_content_length"]
-            elif content_length < 50:
-                quality_multiplier *= 0.8  # Penalty for very short content
-            
-            # ?? Context quality analysis
-            context_quality = self._analyze_content_context(content_lower, entity_lower, is_person_query)
-            quality_multiplier *= context_quality
-            
-            # ?? Calculate final weighted score
-            weighted_score = base_score * method_weight * quality_multiplier
-            
-            # ?? Store fusion metadata for debugging
+        features = FusionFeatures(results, self.method_weights)
+        
+        # ?? Match features
+        exact_query_match = features.contains(query_lower)
+        entity_match = features.contains(entity_lower)
+        if required_terms_lower:
+            term_coverage = features.count_contained(required_terms_lower) / len(required_terms_lower)
+        else:
+            term_coverage = np.zeros(len(results))
+        content_length_optimal = (features.content_lengths >= 100) & (features.content_lengths <= 2000)
+        
+        # ?? Quality multiplier: database strategy and match type boosts first
+        quality_multiplier = features.lookup(self.strategy_boosts, 'database_strategy')
+        quality_multiplier *= features.lookup(self.strategy_boosts, 'match_type')
+        
+        # ?? Exact query match and entity match boosts
+        exact_boost = self.quality_indicators["person_name_exact"] if is_person_query else self.strategy_boosts["exact_match"]
+        quality_multiplier *= np.where(exact_query_match, exact_boost, 1.0)
+        entity_boost = self.quality_indicators["person_name_exact"] if is_person_query else 1.2
+        quality_multiplier *= np.where(entity_match, entity_boost, 1.0)
+        
+        # ?? Required terms coverage
+        quality_multiplier *= np.where(term_coverage > 0.5, 1.0 + term_coverage * 0.3, 1.0)
+        
+        # ?? Query frequency boost
+        occurrences = features.query_occurrences
+        quality_multiplier *= np.where(
+            occurrences > 1, np.minimum(self.quality_indicators["high_query_frequency"], 1.0 + occurrences * 0.1), 1.0
+        )
+        
+        # ?? Content length quality (penalty for very short content)
+        quality_multiplier *= np.where(
+            content_length_optimal, self.quality_indicators["optimal_content_length"],
+            np.where(features.content_lengths < 50, 0.8, 1.0)
+        )
+        
+        # ?? Context quality analysis
+        context_quality = self._analyze_content_context(features, entity_lower, is_person_query)
+        quality_multiplier *= context_quality
+        
+        # ?? Calculate final weighted scores
+        weighted_scores = features.base_scores * features.method_weights * quality_multiplier
+        
+        # ?? Store fusion metadata for debugging
+        for index, result in enumerate(results):
             result.metadata.update({
-                "hybrid_weighted_score": weighted_score,
-                "method_weight": method_weight,
-                "quality_multiplier": quality_multiplier,
-                "base_score": base_score,
-                "context_quality": context_quality,
+                "hybrid_weighted_score": float(weighted_scores[index]),
+                "method_weight": float(features.method_weights[index]),
+                "quality_multiplier": float(quality_multiplier[index]),
+                "base_score": result.similarity_score,
+                "context_quality": float(context_quality[index]),
                 "fusion_method": "hybrid_weighted",
                 "is_person_query": is_person_query,
                 "fusion_factors": {
-                    "exact_query_match": query_lower in content_lower,
-                    "entity_match": entity_lower in content_lower if entity_lower else False,
-                    "term_coverage": found_terms / len(required_terms_lower) if required_terms_lower else 0,
+                    "exact_query_match": bool(exact_query_match[index]),
+                    "entity_match": bool(entity_match[index]),
+                    "term_coverage": float(term_coverage[index]),
                     "query_occurrences": result.metadata.get('query_occurrences', 0),
-                    "content_length_optimal": 100 <= content_length <= 2000,
+                    "content_length_optimal": bool(content_length_optimal[index]),
                     "database_strategy": result.metadata.get('database_strategy'),
                     "match_type": result.metadata.get('match_type')
                 }
             })
         
         # Sort by weighted score
-        sorted_results = sorted(results, key=lambda x: x.metadata.get("hybrid_weighted_score", x.similarity_score), reverse=True)
+        sorted_results = features.ranked(weighted_scores)
         
-        logger.info(f"?? Hybrid weighted fusion completed: scores range {sorted_results[0].metadata.get('hybrid_weighted_score', 0):.3f} to {sorted_results[-1].metadata.get('hybrid_weighted_score', 0):.3f}")
+        logger.info(f"?? Hybrid weighted fusion completed: scores range {weighted_scores.max():.3f} to {weighted_scores.min():.3f}")
         
         return sorted_results
     
@@ -367,28 +430,22 @@ class HybridResultsFusionEngine:
         
         logger.info(f"??? Database priority fusion")
         
-        database_results = [r for r in results if "database" in r.source_method]
-        other_results = [r for r in results if "database" not in r.source_method]
+        features = FusionFeatures(results, self.method_weights)
         
-        # Score database results highly
-        for result in database_results:
+        # Score database results highly (30% boost), keep other results as-is
+        priority_scores = features.base_scores * np.where(features.is_database, 1.3, 1.0)
+        for result, score in zip(results, priority_scores):
             result.metadata.update({
-                "database_priority_score": result.similarity_score * 1.3,  # 30% boost
+                "database_priority_score": float(score),
                 "fusion_method": "database_priority"
             })
         
-        # Keep other results as-is
-        for result in other_results:
-            result.metadata.update({
-                "database_priority_score": result.similarity_score,
-                "fusion_method": "database_priority"
-            })
-        
-        # Sort by database priority score
-        all_scored = database_results + other_results
-        all_scored.sort(key=lambda x: x.metadata.get("database_priority_score", x.similarity_score), reverse=True)
+        # Sort by database priority score (database results first among equal scores)
+        all_scored = features.ranked(
+            priority_scores, np.concatenate([np.flatnonzero(features.is_database), np.flatnonzero(~features.is_database)])
+        )
         
-        logger.info(f"??? Database priority: {len(database_results)} DB results prioritized over {len(other_results)} others")
+        logger.info(f"??? Database priority: {features.is_database.sum()} DB results prioritized over {(~features.is_database).sum()} others")
         
         return all_scored
     
@@ -401,52 +458,51 @@ class HybridResultsFusionEngine:
         
         logger.info(f"?? Vector priority fusion")
         
-        vector_results = [r for r in results if ("vector" in r.source_method or "llamaindex" in r.source_method)]
-        other_results = [r for r in results if not ("vector" in r.source_method or "llamaindex" in r.source_method)]
-        
-        # Score vector results highly
-        for result in vector_results:
-            result.metadata.update({
-                "vector_priority_score": result.similarity_score * 1.2,  # 20% boost
-                "fusion_method": "vector_priority"
-            })
+        features = FusionFeatures(results, self.method_weights)
         
-        # Keep other results as-is
-        for result in other_results:
+        # Score vector results highly (20% boost), keep other results as-is
+        priority_scores = features.base_scores * np.where(features.is_vector, 1.2, 1.0)
+        for result, score in zip(results, priority_scores):
             result.metadata.update({
-                "vector_priority_score": result.similarity_score,
+                "vector_priority_score": float(score),
                 "fusion_method": "vector_priority"
             })
         
-        # Sort by vector priority score
-        all_scored = vector_results + other_results
-        all_scored.sort(key=lambda x: x.metadata.get("vector_priority_score", x.similarity_score), reverse=True)
+        # Sort by vector priority score (vector results first among equal scores)
+        all_scored = features.ranked(
+            priority_scores, np.concatenate([np.flatnonzero(features.is_vector), np.flatnonzero(~features.is_vector)])
+        )
         
-        logger.info(f"?? Vector priority: {len(vector_results)} vector results prioritized over {len(other_results)} others")
+        logger.info(f"?? Vector priority: {features.is_vector.sum()} vector results prioritized over {(~features.is_vector).sum()} others")
         
         return all_scored
     
     def _reciprocal_rank_fusion(self, results: List[Any], query: str) -> List[Any]:
-        """?? Enhanced reciprocal rank fusion for hybrid results"""
+        """?? Enhanced reciprocal rank fusion for hybrid results (ranks precomputed per method, O(n log n))"""
         
         logger.info(f"?? Reciprocal rank fusion with hybrid awareness")
         
-        # Group results by method
+        result_ids = [self._create_result_id(result) for result in results]
+        
+        # Group results by method and sort each group independently; a result's rank
+        # is the position of the first result with its id in the group
         method_groups = defaultdict(list)
-        for result in results:
-            method_groups[result.source_method].append(result)
+        for index, result in enumerate(results):
+            method_groups[result.source_method].append(index)
         
-        # Sort each group independently  
-        for method in method_groups:
-            method_groups[method].sort(key=lambda x: x.similarity_score, reverse=True)
+        method_ranks: Dict[str, Dict[str, int]] = {}
+        for method, indexes in method_groups.items():
+            indexes.sort(key=lambda i: results[i].similarity_score, reverse=True)
+            ranks = {}
+            for rank, index in enumerate(indexes, start=1):
+                ranks.setdefault(result_ids[index], rank)
+            method_ranks[method] = ranks
         
         # Calculate RRF scores with hybrid weights
         rrf_scores = {}
         k = 60  # RRF constant
         
-        for result in results:
-            result_id = self._create_result_id(result)
-            
+        for result, result_id in zip(results, result_ids):
             if result_id not in rrf_scores:
                 rrf_scores[result_id] = {
                     "result": result,
@@ -456,26 +512,14 @@ class HybridResultsFusionEngine:
                     "hybrid_boost": self.method_weights.get(result.source_method, 1.0)
                 }
             
-            # Find rank in its method group
-            method_list = method_groups[result.source_method]
-            try:
-                rank = next(i for i, r in enumerate(method_list) if self._create_result_id(r) == result_id) + 1
-                rrf_contribution = 1.0 / (k + rank)
-                
-                # Apply hybrid weight
-                hybrid_weight = rrf_scores[result_id]["hybrid_boost"]
-                weighted_rrf = rrf_contribution * hybrid_weight
-                
-                rrf_scores[result_id]["rrf_score"] += weighted_rrf
-                rrf_scores[result_id]["ranks"][result.source_method] = rank
-                rrf_scores[result_id]["methods"].add(result.source_method)
-                
-            except (StopIteration, ValueError):
-                logger.warning(f"Could not find rank for result in RRF")
+            rank = method_ranks[result.source_method][result_id]
+            rrf_scores[result_id]["rrf_score"] += (1.0 / (k + rank)) * rrf_scores[result_id]["hybrid_boost"]
+            rrf_scores[result_id]["ranks"][result.source_method] = rank
+            rrf_scores[result_id]["methods"].add(result.source_method)
         
         # Boost results that appear in multiple methods (especially database + vector)
-        for result_id in rrf_scores:
-            methods = rrf_scores[result_id]["methods"]
+        for item in rrf_scores.values():
+            methods = item["methods"]
             method_count = len(methods)
             
             if method_count > 1:
@@ -484,9 +528,9 @@ class HybridResultsFusionEngine:
                 has_vector = any("vector" in method or "llamaindex" in method for method in methods)
                 
                 if has_database and has_vector:
-                    rrf_scores[result_id]["rrf_score"] *= 1.4  # Strong boost for hybrid matches
+                    item["rrf_score"] *= 1.4  # Strong boost for hybrid matches
                 else:
-                    rrf_scores[result_id]["rrf_score"] *= (1.0 + (method_count - 1) * 0.2)
+                    item["rrf_score"] *= (1.0 + (method_count - 1) * 0.2)
         
         # Sort by RRF score
         sorted_items = sorted(
@@ -635,107 +679,57 @@ class HybridResultsFusionEngine:
         
         return final_results
     
-    def _analyze_content_context(self, content_lower: str, entity_lower: str, is_person_query: bool) -> float:
-        """?? Analyze content context for quality scoring"""
+    def _analyze_content_context(self, features: FusionFeatures, entity_lower: str, is_person_query: bool) -> np.ndarray:
+        """?? Analyze content context for quality scoring (per result)"""
         
-        base_quality = 1.0
+        base_quality = np.ones(len(features.results))
         
-        if not is_person_query:
-            return base_quality
-        
-        if not entity_lower:
+        if not is_person_query or not entity_lower:
             return base_quality
         
         # Look for training/certification context (positive)
-        training_keywords = ['training', 'certificate', 'certification', 'course', 'completed', 'achieved']
-        training_context = sum(1 for keyword in training_keywords if keyword in content_lower)
-        if training_context > 0:
-            base_quality *= self.quality_indicators["training_context"]
+        training_context = features.count_contained(TRAINING_KEYWORDS)
+        base_quality *= np.where(training_context > 0, self.quality_indicators["training_context"], 1.0)
         
         # Look for signature-only context (negative)
-        signature_keywords = ['signature', 'signed', 'form', 'date:', 'location:']
-        signature_context = sum(1 for keyword in signature_keywords if keyword in content_lower)
-        if signature_context >= 2 and training_context == 0:
-            base_quality *= self.quality_indicators["signature_context"]
+        signature_context = features.count_contained(SIGNATURE_KEYWORDS)
+        base_quality *= np.where((signature_context >= 2) & (training_context == 0), self.quality_indicators["signature_context"], 1.0)
         
         return base_quality
     
-    def _is_person_query(self, query: str, extracted_entity: str = None) -> bool:
-        """?? Detect if query is about a person"""
-        
-        if extracted_entity:
-            # Check if extracted entity looks like a person name
-            for pattern in self.person_regex:
-                if pattern.search(extracted_entity):
-                    return True
-        
-        # Check query for person indicators
-        person_indicators = ['who is', 'tell me about', 'show me', 'find', 'about']
-        query_lower = query.lower()
+    def _calculate_person_priority_scores(self, features: FusionFeatures, query: str, extracted_entity: str = None) -> np.ndarray:
+        """?? Calculate person priority scores (used for database results)"""
         
-        has_person_indicator = any(indicator in query_lower for indicator in person_indicators)
-        has_capitalized_words = bool(re.search(r'\b[A-Z][a-z]+\b', query))
-        
-        return has_person_indicator and has_capitalized_words
-    
-    def _analyze_query_complexity(self, query: str) -> str:
-        """?? Analyze query complexity for fusion strategy selection"""
-        
-        word_count = len(query.split())
-        
-        if word_count <= 3:
-            return "simple"
-        elif word_count <= 6:
-            return "medium" 
-        else:
-            return "complex"
-    
-    def _calculate_person_priority_score(self, result: Any, query: str, extracted_entity: str = None) -> float:
-        """?? Calculate person priority score for database results"""
-        
-        base_score = result.similarity_score
-        content_lower = result.full_content.lower()
-        entity_lower = (extracted_entity or query).lower()
-        
-        # Start with base score
-        priority_score = base_score
-        
-        # Boost for exact entity matches
-        if entity_lower in content_lower:
-            priority_score *= 1.4
+        # Start with base scores, boost exact entity matches (content only, not the filename)
+        entity_match = features.contains((extracted_entity or query).lower(), include_filename=False)
+        priority_scores = features.base_scores * np.where(entity_match, 1.4, 1.0)
         
         # Boost for training context
-        training_keywords = ['training', 'certificate', 'certification', 'course', 'completed']
-        training_matches = sum(1 for keyword in training_keywords if keyword in content_lower)
-        if training_matches > 0:
-            priority_score *= (1.0 + training_matches * 0.1)
+        training_matches = features.count_contained(
+            ['training', 'certificate', 'certification', 'course', 'completed'], include_filename=False
+        )
+        priority_scores *= np.where(training_matches > 0, 1.0 + training_matches * 0.1, 1.0)
         
         # Boost for query occurrences
-        if hasattr(result, 'metadata') and result.metadata.get('query_occurrences', 0) > 1:
-            occurrences = result.metadata['query_occurrences']
-            priority_score *= min(1.3, 1.0 + occurrences * 0.1)
+        occurrences = features.query_occurrences
+        priority_scores *= np.where(occurrences > 1, np.minimum(1.3, 1.0 + occurrences * 0.1), 1.0)
         
-        return min(1.0, priority_score)
+        return np.minimum(1.0, priority_scores)
     
-    def _calculate_semantic_priority_score(self, result: Any, query: str, extracted_entity: str = None) -> float:
-        """?? Calculate semantic priority score for vector results"""
+    def _calculate_semantic_priority_scores(self, features: FusionFeatures) -> np.ndarray:
+        """?? Calculate semantic priority scores (used for vector results)"""
         
-        base_score = result.similarity_score
-        content_length = len(result.full_content)
-        
-        semantic_score = base_score
+        lengths = features.content_lengths
         
         # Content length quality
-        if 100 <= content_length <= 2000:
-            semantic_score *= 1.1
-        elif content_length < 50:
-            semantic_score *= 0.9
+        semantic_scores = features.base_scores * np.where(
+            (lengths >= 100) & (lengths <= 2000), 1.1, np.where(lengths < 50, 0.9, 1.0)
+        )
         
         # High similarity boost
-        if base_score > 0.7:
-            semantic_score *= 1.05
+        semantic_scores *= np.where(features.base_scores > 0.7, 1.05, 1.0)
         
-        return min(1.0, semantic_score)
+        return np.minimum(1.0, semantic_scores)
     
     def _create_result_id(self, result: Any) -> str:
         """Create unique identifier for result"""
@@ -0,0 +1,267 @@
+# retrieval/segment_store.py
+# Segmented on-disk snapshots of the vecs table, kept in sync from the indexer's version stamp
+
+import os
+import json
+import shutil
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def load_array(path: str) -> np.ndarray:
+    """Memory-map an .npy file (empty arrays cannot be mapped and are loaded directly)"""
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)
+
+def save_array(path: str, array: np.ndarray):
+    """Write an .npy file atomically"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+class DocumentSegment:
+    """
+    Immutable block of chunks: ids, a memory-mapped JSON document store and a deletion mask
+
+    Subclasses add their own arrays in _build_payload() / _load_payload().
+    Only the deletion mask changes after a segment is written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "ids.json"), encoding="utf-8") as f:
+            self.ids: List[str] = json.load(f)
+        self.store_offsets = load_array(os.path.join(path, "store_offsets.npy"))
+        self.store = np.memmap(os.path.join(path, "store.bin"), dtype=np.uint8, mode="r")
+        self._load_payload()
+
+        deleted_path = os.path.join(path, "deleted.npy")
+        deleted = np.load(deleted_path) if os.path.exists(deleted_path) else np.zeros(len(self.ids), dtype=bool)
+        self._set_deleted(deleted)
+
+    @classmethod
+    def build(cls, path: str, documents: List[Dict[str, Any]]) -> "DocumentSegment":
+        """
+        Write a segment for documents (dicts with at least 'id')
+
+        Args:
+            path: Segment directory (created; must not exist yet)
+            documents: Documents to store, at least one
+        """
+        os.makedirs(path)
+        offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        with open(os.path.join(path, "store.bin"), "wb") as store:
+            for doc_index, document in enumerate(documents):
+                record = json.dumps(cls._stored_fields(document), ensure_ascii=False).encode("utf-8")
+                store.write(record)
+                offsets[doc_index + 1] = offsets[doc_index] + len(record)
+
+        save_array(os.path.join(path, "store_offsets.npy"), offsets)
+        with open(os.path.join(path, "ids.json"), "w", encoding="utf-8") as f:
+            json.dump([document["id"] for document in documents], f)
+        cls._build_payload(path, documents)
+
+        return cls(path)
+
+    @classmethod
+    def _stored_fields(cls, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields kept in the JSON store (payload arrays hold the rest)"""
+        return document
+
+    @classmethod
+    def _build_payload(cls, path: str, documents: List[Dict[str, Any]]):
+        """Write subclass arrays"""
+
+    def _load_payload(self):
+        """Load subclass arrays"""
+
+    def _set_deleted(self, deleted: np.ndarray):
+        """Swap in a new deletion mask (and anything derived from it)"""
+        self.live_count = int(len(deleted) - deleted.sum())
+        self.deleted = deleted
+
+    def delete(self, doc_indexes: Iterable[int]):
+        """Mark documents as deleted and persist the mask"""
+        deleted = self.deleted.copy()
+        deleted[list(doc_indexes)] = True
+        save_array(os.path.join(self.path, "deleted.npy"), deleted)
+        self._set_deleted(deleted)
+
+    def get_document(self, doc_index: int) -> Dict[str, Any]:
+        """Read one stored document from the memory-mapped store"""
+        start, end = int(self.store_offsets[doc_index]), int(self.store_offsets[doc_index + 1])
+        return json.loads(self.store[start:end].tobytes().decode("utf-8"))
+
+    def live_documents(self) -> List[Dict[str, Any]]:
+        """Read every document not marked as deleted (in the form build() accepts)"""
+        return [self.get_document(i) for i in np.flatnonzero(~self.deleted)]
+
+class SegmentedSnapshot:
+    """
+    Local copy of the vecs table as a list of segments
+
+    Sync is incremental: when the indexer's version stamp changes, chunk ids are
+    diffed against the snapshot, new chunks become a new segment and removed
+    ones are tombstoned. When tombstones or segments pile up, live documents
+    are rewritten from the local store into one segment (no database reads).
+    """
+
+    MANIFEST = "manifest.json"
+    SEGMENT_CLASS = DocumentSegment
+
+    def __init__(self, path: str, max_segments: int = 8, max_deleted_ratio: float = 0.2):
+        """
+        Args:
+            path: Snapshot directory
+            max_segments: Segment count that triggers compaction
+            max_deleted_ratio: Share of deleted documents that triggers compaction
+        """
+        self.path = path
+        self.max_segments = max_segments
+        self.max_deleted_ratio = max_deleted_ratio
+
+        self.segments: List[DocumentSegment] = []
+        self.index_version: Optional[int] = None
+        self._next_segment = 1
+        self._sync_lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Load the snapshot from disk; returns False if there is none yet"""
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return False
+
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.segments = [self.SEGMENT_CLASS(os.path.join(self.path, name)) for name in manifest["segments"]]
+        self.index_version = manifest.get("index_version")
+        self._next_segment = manifest.get("next_segment", len(self.segments) + 1)
+        self._on_segments_changed()
+        logger.info(f"{type(self).__name__} loaded: {self.document_count()} documents in {len(self.segments)} segments")
+        return True
+
+    def document_count(self) -> int:
+        """Number of live documents"""
+        return sum(segment.live_count for segment in self.segments)
+
+    def _fetch_documents(self, cur, table: str, ids: List[str]) -> List[Dict[str, Any]]:
+        """Read new chunks in the form SEGMENT_CLASS.build() accepts"""
+        cur.execute(f"""
+            SELECT id, metadata->>'text', metadata->>'file_name', metadata->>'chunk_index'
+            FROM {table}
+            WHERE id = ANY(%s)
+        """, (ids,))
+        return [
+            {"id": row[0], "text": row[1] or "", "file_name": row[2], "chunk_index": row[3]}
+            for row in cur.fetchall()
+        ]
+
+    def _on_segments_changed(self):
+        """Hook for derived structures (called after load and after every change)"""
+
+    def sync(self, pool, table: str, version_table: Optional[str] = None, batch_size: int = 1000) -> bool:
+        """
+        Bring the snapshot up to date with the vecs table
+
+        Args:
+            pool: Connection pool (utils.connection_pool)
+            table: Documents table, e.g. 'vecs.documents'
+            version_table: Indexer's version stamp table; unchanged stamp means no work
+            batch_size: Chunks fetched per query
+
+        Returns:
+            True if the snapshot changed
+        """
+        with self._sync_lock:
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    version = None
+                    if version_table:
+                        cur.execute("SELECT to_regclass(%s)", (version_table,))
+                        if cur.fetchone()[0] is not None:
+                            cur.execute(f"SELECT version FROM {version_table} WHERE id = 1")
+                            row = cur.fetchone()
+                            version = row[0] if row else None
+                    if version is not None and version == self.index_version and self.segments:
+                        return False
+
+                    cur.execute(f"SELECT id FROM {table}")
+                    current_ids = {row[0] for row in cur.fetchall()}
+
+                    known = {}
+                    for segment_index, segment in enumerate(self.segments):
+                        for doc_index in np.flatnonzero(~segment.deleted):
+                            known[segment.ids[doc_index]] = (segment_index, int(doc_index))
+                    new_ids = sorted(current_ids - known.keys())
+                    removed_ids = known.keys() - current_ids
+
+                    documents = []
+                    for start in range(0, len(new_ids), batch_size):
+                        documents.extend(self._fetch_documents(cur, table, new_ids[start:start + batch_size]))
+
+            changed = self._apply_changes(documents, removed_ids, known, version)
+            if changed:
+                logger.info(f"{type(self).__name__} synced: +{len(documents)} / -{len(removed_ids)} chunks, "
+                            f"{self.document_count()} documents in {len(self.segments)} segments")
+            return changed
+
+    def _apply_changes(self, documents: List[Dict[str, Any]], removed_ids: Iterable[str],
+                       known: Dict[str, Tuple[int, int]], version: Optional[int]) -> bool:
+        """Tombstone removed chunks, add a segment for new ones, compact if needed"""
+        removed_by_segment: Dict[int, List[int]] = {}
+        for doc_id in removed_ids:
+            segment_index, doc_index = known[doc_id]
+            removed_by_segment.setdefault(segment_index, []).append(doc_index)
+        for segment_index, doc_indexes in removed_by_segment.items():
+            self.segments[segment_index].delete(doc_indexes)
+
+        segments = list(self.segments)
+        if documents:
+            segments.append(self._new_segment(documents))
+
+        total = sum(len(segment.ids) for segment in segments)
+        deleted = sum(len(segment.ids) - segment.live_count for segment in segments)
+        if len(segments) > self.max_segments or (total and deleted / total > self.max_deleted_ratio):
+            live = [document for segment in segments for document in segment.live_documents()]
+            compacted = [self._new_segment(live)] if live else []
+            logger.info(f"{type(self).__name__} compacted: {len(segments)} segments -> {len(compacted)}, {deleted} tombstones dropped")
+            old_segments, segments = segments, compacted
+        else:
+            old_segments = []
+
+        # Searches hold their own reference to the old list, so swapping is safe
+        self.segments = segments
+        self.index_version = version
+        self._write_manifest()
+        changed = bool(documents or removed_by_segment)
+        if changed:
+            self._on_segments_changed()
+        for segment in old_segments:
+            shutil.rmtree(segment.path, ignore_errors=True)
+        return changed
+
+    def _new_segment(self, documents: List[Dict[str, Any]]) -> DocumentSegment:
+        path = os.path.join(self.path, f"seg_{self._next_segment:06d}")
+        self._next_segment += 1
+        if os.path.exists(path):  # Left over from an interrupted sync
+            shutil.rmtree(path)
+        return self.SEGMENT_CLASS.build(path, documents)
+
+    def _write_manifest(self):
+        os.makedirs(self.path, exist_ok=True)
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "segments": [segment.name for segment in self.segments],
+                "index_version": self.index_version,
+                "next_segment": self._next_segment
+            }, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
@@ -0,0 +1,259 @@
+# retrieval/vector_snapshot.py
+# Local vector snapshot: embeddings exported from the vecs table into memory-mapped .npy matrices
+#
+# Export or refresh from the command line (run from the streamlit-rag directory):
+#     python -m retrieval.vector_snapshot            # sync the snapshot with the vecs table
+#     python -m retrieval.vector_snapshot --status   # show what is on disk
+
+import os
+import sys
+import time
+import logging
+from typing import Dict, List, Optional, Any, Sequence
+
+import numpy as np
+
+from retrieval.segment_store import DocumentSegment, SegmentedSnapshot, load_array, save_array
+
+try:
+    import hnswlib  # Optional approximate index; brute force is used without it
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in float32, so cosine similarity is a dot product (zero rows stay zero)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+def similarity_to_score(similarity: np.ndarray) -> np.ndarray:
+    """Cosine similarity -> the score SupabaseVectorStore and the direct backend report (1 - exp(-distance))"""
+    return 1.0 - np.exp(-(1.0 - similarity))
+
+class VectorSegment(DocumentSegment):
+    """Segment with an (n, dim) matrix of normalized embeddings in vectors.npy"""
+
+    @classmethod
+    def _stored_fields(cls, document: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in document.items() if key != "embedding"}
+
+    @classmethod
+    def _build_payload(cls, path: str, documents: List[Dict[str, Any]]):
+        # Rows arrive normalized and already in the snapshot dtype
+        save_array(os.path.join(path, "vectors.npy"), np.stack([document["embedding"] for document in documents]))
+
+    def _load_payload(self):
+        self.vectors = load_array(os.path.join(self.path, "vectors.npy"))
+
+    def live_documents(self) -> List[Dict[str, Any]]:
+        documents = []
+        for doc_index in np.flatnonzero(~self.deleted):
+            document = self.get_document(doc_index)
+            document["embedding"] = np.array(self.vectors[doc_index])
+            documents.append(document)
+        return documents
+
+class VectorSnapshot(SegmentedSnapshot):
+    """
+    Segmented copy of the vecs embeddings for in-process nearest neighbour search
+
+    Search is exact by default: rows are scanned in blocks with one matrix
+    product per block for all queries. With use_hnsw and hnswlib installed,
+    an HNSW graph over the live rows is built by ensure_ann() and used instead.
+    """
+
+    SEGMENT_CLASS = VectorSegment
+
+    def __init__(self, path: str, dtype: str = "float32", block_rows: int = 65536,
+                 use_hnsw: bool = False, hnsw_m: int = 16, hnsw_ef_construction: int = 200,
+                 hnsw_ef_search: int = 64, **kwargs):
+        """
+        Args:
+            path: Snapshot directory
+            dtype: Storage type of new segments, 'float32' or 'float16' (half the size,
+                   but every scanned block is converted to float32 per query)
+            block_rows: Rows multiplied per block (bounds the float32 working copy)
+            use_hnsw: Build an HNSW index when hnswlib is installed
+            hnsw_m: HNSW graph degree
+            hnsw_ef_construction: HNSW build-time candidate list size
+            hnsw_ef_search: HNSW query-time candidate list size (raised to top_k)
+            **kwargs: Segment and compaction limits (see SegmentedSnapshot)
+        """
+        super().__init__(path, **kwargs)
+        if dtype not in ("float16", "float32"):
+            raise ValueError(f"Unsupported snapshot dtype: {dtype}")
+        self.dtype = np.dtype(dtype)
+        self.block_rows = block_rows
+        self.use_hnsw = use_hnsw and hnswlib is not None
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self._ann = None  # (hnswlib.Index, segments, segment numbers, row numbers)
+
+        if use_hnsw and hnswlib is None:
+            logger.warning("?? hnswlib not installed - vector snapshot uses exact search")
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """Embedding dimension (None while empty)"""
+        for segment in self.segments:
+            return int(segment.vectors.shape[1])
+        return None
+
+    def _fetch_documents(self, cur, table: str, ids: List[str]) -> List[Dict[str, Any]]:
+        # vec::real[] arrives as a Python list without a pgvector adapter
+        cur.execute(f"""
+            SELECT id, vec::real[], metadata->>'text', metadata->>'file_name', metadata->>'chunk_index'
+            FROM {table}
+            WHERE id = ANY(%s)
+        """, (ids,))
+        rows = cur.fetchall()
+        if not rows:
+            return []
+
+        vectors = normalize_rows(np.array([row[1] for row in rows], dtype=np.float32)).astype(self.dtype)
+        return [
+            {"id": row[0], "embedding": vector, "text": row[2] or "", "file_name": row[3], "chunk_index": row[4]}
+            for row, vector in zip(rows, vectors)
+        ]
+
+    def _on_segments_changed(self):
+        # Rebuilt off the search path by ensure_ann(); exact search serves until then
+        self._ann = None
+
+    def ensure_ann(self) -> bool:
+        """
+        Build the HNSW index over live rows if enabled and out of date (blocking)
+
+        Returns:
+            True if an HNSW index is ready
+        """
+        if not self.use_hnsw:
+            return False
+        segments = self.segments
+        if self._ann is not None and self._ann[1] is segments:
+            return True
+        if not self.document_count():
+            return False
+
+        start_time = time.time()
+        vectors, segment_numbers, row_numbers = [], [], []
+        for segment_number, segment in enumerate(segments):
+            rows = np.flatnonzero(~segment.deleted)
+            vectors.append(np.asarray(segment.vectors[rows], dtype=np.float32))
+            segment_numbers.append(np.full(len(rows), segment_number, dtype=np.int32))
+            row_numbers.append(rows.astype(np.int64))
+        vectors = np.concatenate(vectors)
+
+        index = hnswlib.Index(space="ip", dim=vectors.shape[1])  # Rows are normalized: ip == cosine
+        index.init_index(max_elements=len(vectors), ef_construction=self.hnsw_ef_construction, M=self.hnsw_m)
+        index.add_items(vectors, np.arange(len(vectors)))
+        index.set_ef(self.hnsw_ef_search)
+
+        self._ann = (index, segments, np.concatenate(segment_numbers), np.concatenate(row_numbers))
+        logger.info(f"HNSW index built over {len(vectors)} vectors in {time.time() - start_time:.1f}s")
+        return True
+
+    def search(self, embeddings: Sequence[Sequence[float]], top_k: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Nearest chunks by cosine similarity for one or more query embeddings
+
+        Args:
+            embeddings: Query embedding, or a (queries, dim) batch
+            top_k: Results per query
+
+        Returns:
+            Per query, stored documents ('id', 'text', 'file_name', 'chunk_index')
+            with 'similarity' and 'score', best first
+        """
+        queries = normalize_rows(embeddings)
+        ann = self._ann
+        if ann is not None and ann[1] is self.segments:
+            segments = ann[1]
+            segment_numbers, row_numbers, similarities = self._search_ann(ann, queries, top_k)
+        else:
+            segments = self.segments  # Snapshot: sync swaps the list, never mutates it
+            segment_numbers, row_numbers, similarities = self._search_exact(segments, queries, top_k)
+
+        results = []
+        for query_index in range(len(queries)):
+            order = np.argsort(-similarities[:, query_index], kind="stable")[:top_k]
+            hits = []
+            for position in order:
+                similarity = float(similarities[position, query_index])
+                if not np.isfinite(similarity):
+                    break
+                segment = segments[segment_numbers[position, query_index]]
+                document = segment.get_document(int(row_numbers[position, query_index]))
+                document.update({"similarity": similarity, "score": float(similarity_to_score(similarity))})
+                hits.append(document)
+            results.append(hits)
+        return results
+
+    def _search_exact(self, segments: List[VectorSegment], queries: np.ndarray, top_k: int):
+        """Blockwise matrix products with a per-block partial sort; returns (k, queries) candidate arrays"""
+        segment_numbers, row_numbers, similarities = [], [], []
+        for segment_number, segment in enumerate(segments):
+            if not segment.live_count:
+                continue
+            for start in range(0, len(segment.ids), self.block_rows):
+                block = np.asarray(segment.vectors[start:start + self.block_rows], dtype=np.float32)
+                scores = block @ queries.T  # (rows, queries)
+                scores[segment.deleted[start:start + len(block)]] = -np.inf
+
+                if top_k < len(block):
+                    rows = np.argpartition(-scores, top_k - 1, axis=0)[:top_k]
+                else:
+                    rows = np.broadcast_to(np.arange(len(block))[:, None], scores.shape)
+                similarities.append(np.take_along_axis(scores, rows, axis=0))
+                row_numbers.append(rows + start)
+                segment_numbers.append(np.full(rows.shape, segment_number, dtype=np.int32))
+
+        if not similarities:
+            empty = np.empty((0, len(queries)))
+            return empty.astype(np.int32), empty.astype(np.int64), empty
+        return np.concatenate(segment_numbers), np.concatenate(row_numbers), np.concatenate(similarities)
+
+    def _search_ann(self, ann, queries: np.ndarray, top_k: int):
+        """HNSW lookup; returns (k, queries) candidate arrays like _search_exact"""
+        index, _, segment_of_label, row_of_label = ann
+        k = min(top_k, index.get_current_count())
+        index.set_ef(max(self.hnsw_ef_search, k))
+        labels, distances = index.knn_query(queries, k=k)  # (queries, k); ip distance = 1 - similarity
+        labels = labels.T.astype(np.int64)
+        return segment_of_label[labels], row_of_label[labels], 1.0 - distances.T
+
+def main():
+    """Export or refresh the vector snapshot configured in SearchConfig"""
+    from config.settings import config
+    from utils.connection_pool import get_connection_pool
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    search = config.search
+    table = f"{config.database.schema}.{config.database.table_name}"
+    snapshot = VectorSnapshot(search.vector_snapshot_path, dtype=search.vector_snapshot_dtype,
+                              use_hnsw=search.vector_snapshot_hnsw)
+    snapshot.load()
+
+    print("=" * 60)
+    print(f"VECTOR SNAPSHOT: {table} -> {search.vector_snapshot_path}")
+    print("=" * 60)
+
+    if "--status" not in sys.argv:
+        start_time = time.time()
+        pool = get_connection_pool(config.database.connection_string, config.database)
+        changed = snapshot.sync(pool, table, f"{table}_index_version")
+        print(f"Sync: {'updated' if changed else 'already current'} in {time.time() - start_time:.1f}s")
+
+    size = sum(os.path.getsize(os.path.join(segment.path, "vectors.npy")) for segment in snapshot.segments)
+    print(f"Documents: {snapshot.document_count():,} in {len(snapshot.segments)} segments "
+          f"(dim {snapshot.dimension}, {size / 1024 / 1024:.1f} MB of vectors)")
+    print(f"Index version: {snapshot.index_version}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ from dotenv import load_dotenv
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from utils.connection_pool import get_connection_pool
+
 # Load environment variables
 load_dotenv()
 
@@ -32,7 +34,8 @@ def get_db_connection():
         return None
     
     try:
-        conn = psycopg2.connect(connection_string)
+        # Pooled: repeated lookups reuse one connection; conn.close() returns it to the pool
+        conn = get_connection_pool(connection_string, min_size=0, max_size=2).getconn()
         return conn
     except Exception as e:
         print(f"? Database connection failed: {e}")
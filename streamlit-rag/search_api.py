@@ -0,0 +1,192 @@
+# search_api.py
+# Headless search service: the production search pipeline behind an asyncio HTTP API
+#
+# Run from the streamlit-rag directory (one process per instance; scale horizontally behind a load balancer):
+#     python search_api.py
+#
+# Endpoints:
+#     POST /search   {"question": "..."}  -> search result (retrieval results as previews)
+#                    {"question": "...", "stream": true} -> NDJSON events as they happen:
+#                        {"event": "progress", "percent": .., "message": ..}, {"event": "token", "text": ..},
+#                        then {"event": "result", "result": ..} or {"event": "error", "error": .., "status": ..}
+#     POST /chunks   {"ids": [...]}       -> {id: full chunk text}
+#     GET  /health                        -> liveness and retriever availability
+#     GET  /status                        -> database, embedding and component status
+#     GET  /stats                         -> pool, cache and local index counters
+#
+# Streamlit becomes a thin client of it with SEARCH_API_URL=http://host:port
+
+import sys
+import json
+import time
+import asyncio
+import logging
+from pathlib import Path
+from typing import Any
+
+from aiohttp import web
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config.settings import config
+from retrieval.multi_retriever import run_blocking
+from search_pipeline import SearchPipeline, serialize_search_result
+
+logger = logging.getLogger(__name__)
+
+class SearchSlots:
+    """Concurrency limit for searches and the number running (the app's only mutable state)"""
+    
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+
+PIPELINE_KEY = web.AppKey("pipeline", SearchPipeline)
+SLOTS_KEY = web.AppKey("search_slots", SearchSlots)
+
+def _json_default(value: Any) -> Any:
+    """NumPy scalars and other stragglers in result metadata"""
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+def json_response(data: Any, status: int = 200) -> web.Response:
+    return web.json_response(data, status=status, dumps=lambda obj: json.dumps(obj, default=_json_default))
+
+async def _read_json(request: web.Request) -> dict:
+    try:
+        payload = await request.json()
+    except (ValueError, UnicodeDecodeError):
+        raise web.HTTPBadRequest(text=json.dumps({"error": "Request body must be JSON"}), content_type="application/json")
+    if not isinstance(payload, dict):
+        raise web.HTTPBadRequest(text=json.dumps({"error": "Request body must be a JSON object"}), content_type="application/json")
+    return payload
+
+async def _run_search(request: web.Request, question: str, progress=None, on_token=None):
+    """
+    Run one search in a concurrency slot
+    
+    Returns:
+        (serialized result, None) or (None, (error message, HTTP status))
+    """
+    pipeline = request.app[PIPELINE_KEY]
+    slots = request.app[SLOTS_KEY]
+    queued_at = time.time()
+    async with slots.semaphore:
+        queue_time = time.time() - queued_at
+        slots.active += 1
+        try:
+            result = await asyncio.wait_for(
+                pipeline.search(question, progress=progress, on_token=on_token),
+                timeout=config.api.search_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Search timed out after {config.api.search_timeout:.0f}s: '{question}'")
+            return None, (f"Search timed out after {config.api.search_timeout:.0f}s", 504)
+        except Exception as e:
+            return None, (f"Search failed: {e}", 500)
+        finally:
+            slots.active -= 1
+    
+    data = serialize_search_result(result)
+    data["performance_metrics"] = dict(data["performance_metrics"], api_queue_time=queue_time)
+    return data, None
+
+async def search(request: web.Request) -> web.StreamResponse:
+    """Run one search; concurrent searches beyond the limit wait for a slot"""
+    payload = await _read_json(request)
+    question = str(payload.get("question") or "").strip()
+    if not question:
+        return json_response({"error": "'question' is required"}, status=400)
+    
+    if not payload.get("stream"):
+        data, error = await _run_search(request, question)
+        if error:
+            return json_response({"error": error[0]}, status=error[1])
+        return json_response(data)
+    
+    # Streaming: progress and answer tokens are written as they happen, one JSON object per line
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def send(event: dict):
+        events.put_nowait(json.dumps(event, default=_json_default).encode("utf-8") + b"\n")
+    
+    async def run():
+        data, error = await _run_search(
+            request, question,
+            progress=lambda percent, message: send({"event": "progress", "percent": percent, "message": message}),
+            on_token=lambda text: send({"event": "token", "text": text})
+        )
+        if error:
+            send({"event": "error", "error": error[0], "status": error[1]})
+        else:
+            send({"event": "result", "result": data})
+        events.put_nowait(None)
+    
+    task = asyncio.ensure_future(run())
+    try:
+        while True:
+            line = await events.get()
+            if line is None:
+                break
+            await response.write(line)
+    finally:
+        # Client gone: cancel the search (and its speculative retrieval)
+        task.cancel()
+    await response.write_eof()
+    return response
+
+async def chunks(request: web.Request) -> web.Response:
+    """Full text of compacted results, by document id"""
+    payload = await _read_json(request)
+    ids = payload.get("ids")
+    if not isinstance(ids, list):
+        return json_response({"error": "'ids' must be a list"}, status=400)
+    texts = await run_blocking(request.app[PIPELINE_KEY].fetch_chunk_texts, [str(doc_id) for doc_id in ids])
+    return json_response(texts)
+
+async def health(request: web.Request) -> web.Response:
+    """Cheap liveness check for load balancers: 503 only when no retriever can serve"""
+    health_status = await request.app[PIPELINE_KEY].retriever.health_check()
+    available = any(status.get("available") for status in health_status["retrievers"].values())
+    health_status["status"] = "ok" if health_status["overall_healthy"] else ("degraded" if available else "unavailable")
+    health_status["searches_in_progress"] = request.app[SLOTS_KEY].active
+    return json_response(health_status, status=200 if available else 503)
+
+async def status(request: web.Request) -> web.Response:
+    """Database counts, embedding check and component status (what the Streamlit sidebar shows)"""
+    return json_response(await run_blocking(request.app[PIPELINE_KEY].get_status))
+
+async def stats(request: web.Request) -> web.Response:
+    return json_response(request.app[PIPELINE_KEY].get_stats())
+
+def create_app(pipeline: SearchPipeline) -> web.Application:
+    """Application around one long-lived pipeline (its pools and caches live as long as the process)"""
+    app = web.Application(client_max_size=1024 * 1024)
+    app[PIPELINE_KEY] = pipeline
+    app[SLOTS_KEY] = SearchSlots(config.api.max_concurrent_searches)
+    app.router.add_post("/search", search)
+    app.router.add_post("/chunks", chunks)
+    app.router.add_get("/health", health)
+    app.router.add_get("/status", status)
+    app.router.add_get("/stats", stats)
+    return app
+
+def main():
+    """Start the search API on SEARCH_API_HOST:SEARCH_API_PORT"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+    )
+    pipeline = SearchPipeline(config)
+    logger.info(f"Search API listening on {config.api.host}:{config.api.port} "
+                f"(max {config.api.max_concurrent_searches} concurrent searches)")
+    web.run_app(create_app(pipeline), host=config.api.host, port=config.api.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+# search_pipeline.py
+# Production search pipeline (entity extraction -> rewriting -> hybrid retrieval -> fusion -> answer)
+# shared by the Streamlit app and the headless search API, independent of any UI
+
+import time
+import logging
+import traceback
+from dataclasses import fields, replace
+from typing import Dict, List, Optional, Any, Callable
+
+from query_processing.entity_extractor import ProductionEntityExtractor, EntityExtractionResult
+from query_processing.query_rewriter import ProductionQueryRewriter, QueryRewriteResult
+from generation.answer_generator import ProductionAnswerGenerator, TokenCallback
+from retrieval.multi_retriever import MultiStrategyRetriever, MultiRetrievalResult, RetrievalResult, run_blocking
+from retrieval.results_fusion import ResultsFusionEngine, FusionResult
+from utils.connection_pool import get_connection_pool
+from utils.result_cache import get_result_cache
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# progress(percent, message): stage updates for a UI (ignored by the API)
+ProgressCallback = Callable[[int, str], None]
+
+class SearchPipeline:
+    """Long-lived search components plus the end-to-end search coroutine"""
+    
+    def __init__(self, config):
+        """Validate the configuration and initialize all components (blocking)"""
+        logger.info("Initializing Production RAG System...")
+        self.config = config
+        tracer.configure(config.tracing)
+        
+        # Validate configuration
+        validation_results = config.validate_config()
+        invalid_configs = [k for k, v in validation_results.items() if not v]
+        
+        if invalid_configs:
+            error_msg = f"Invalid configuration: {', '.join(invalid_configs)}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        # Initialize components
+        self.entity_extractor = ProductionEntityExtractor(config)
+        self.query_rewriter = ProductionQueryRewriter(config)
+        self.retriever = MultiStrategyRetriever(config)
+        self.fusion_engine = ResultsFusionEngine(config)
+        self.answer_generator = ProductionAnswerGenerator(config)
+        
+        # Check component status
+        self.component_status = {
+            "entity_extractor": len(self.entity_extractor.get_available_extractors()) > 0,
+            "query_rewriter": len(self.query_rewriter.get_rewriter_status()) > 0,
+            "retriever": len(self.retriever.get_retriever_status()) > 0,
+            "fusion_engine": True,
+            "answer_generator": True  # Falls back to the templated answer without the LLM
+        }
+        
+        failed_components = [k for k, v in self.component_status.items() if not v]
+        if failed_components:
+            logger.warning(f"Some components failed to initialize: {failed_components}")
+        
+        logger.info("Production RAG System initialized successfully")
+    
+    async def search(self, question: str, progress: Optional[ProgressCallback] = None,
+                     on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """
+        Run the full pipeline for one question
+        
+        Answer tokens are passed to on_token as the LLM produces them (cache hits
+        and templated answers arrive only in the result). Each search is one
+        trace; its id is in performance_metrics["trace_id"].
+        
+        Returns:
+            Search result dict (entity_result, rewrite_result, retrieval_result,
+            fusion_result, answer, performance_metrics); results are compacted
+        """
+        with tracer.span("search", question_chars=len(question)) as span:
+            result = await self._search(question, progress, on_token)
+            metrics = result["performance_metrics"]
+            span.set_attributes(
+                cache_hit=bool(metrics.get("cache_hit")),
+                results=result["fusion_result"].final_count,
+                answer_method=metrics.get("answer_method")
+            )
+            return dict(result, performance_metrics=dict(metrics, trace_id=span.trace_id))
+    
+    async def _search(self, question: str, progress: Optional[ProgressCallback],
+                      on_token: Optional[TokenCallback]) -> Dict[str, Any]:
+        progress = progress or (lambda percent, message: None)
+        config = self.config
+        pipeline_start = time.time()
+        speculative = None
+        
+        try:
+            # Shared result cache: same question, same config and unchanged index
+            result_cache = get_result_cache(config) if config.search.enable_result_cache else None
+            cache_key = None
+            if result_cache is not None:
+                cache_key, cached = result_cache.lookup(question)
+                if cached:
+                    cached_result, cache_age = cached
+                    logger.info(f"Result cache hit for '{question}' (age: {cache_age:.0f}s)")
+                    return dict(copy_search_result(cached_result), performance_metrics=dict(
+                        cached_result["performance_metrics"],
+                        cache_hit=True,
+                        cache_age=cache_age,
+                        cache_lookup_time=time.time() - pipeline_start
+                    ))
+            
+            # Speculative retrieval: search the raw question while the LLM stages run
+            if config.search.enable_speculative_retrieval:
+                speculative = self.retriever.start_speculative_retrieval(question)
+            
+            # STAGE 1: Entity Extraction (off the event loop so speculative searches progress)
+            progress(15, "🧠 Smart entity extraction...")
+            
+            extraction_start = time.time()
+            with tracer.span("entity_extraction") as span:
+                entity_result = await run_blocking(self.entity_extractor.extract_entity, question)
+                span.set_attributes(
+                    method=entity_result.method,
+                    confidence=entity_result.confidence,
+                    cache_hit=bool(entity_result.metadata.get("cache_hit"))
+                )
+            extraction_time = time.time() - extraction_start
+            
+            logger.info(f"Entity extraction: '{entity_result.entity}' via {entity_result.method} (confidence: {entity_result.confidence:.2f})")
+            
+            # STAGE 2: Query Rewriting
+            progress(30, "✏️ Query transformation...")
+            
+            rewrite_start = time.time()
+            with tracer.span("query_rewrite") as span:
+                rewrite_result = await run_blocking(self.query_rewriter.rewrite_query, question, entity_result.entity)
+                span.set_attributes(method=rewrite_result.method, variants=len(rewrite_result.rewrites))
+            rewrite_time = time.time() - rewrite_start
+            llm_stages_end = time.time()
+            
+            logger.info(f"Query rewriting: {len(rewrite_result.rewrites)} variants via {rewrite_result.method}")
+            
+            # Classify the query once; retrieval, fusion and the answer share the analysis
+            query_analysis = self.retriever.analyze_query(question, entity_result.entity)
+            
+            # STAGE 3: Hybrid Multi-Strategy Retrieval
+            progress(50, "🔍 Hybrid multi-strategy retrieval...")
+            
+            retrieval_start = time.time()
+            
+            # Get required terms for content filtering
+            required_terms = []
+            if entity_result.entity != question.strip():
+                # Extract words from entity for filtering
+                entity_words = [word.lower() for word in entity_result.entity.split()
+                               if len(word) > 2 and word.lower() not in ['the', 'and', 'or']]
+                required_terms = entity_words
+            
+            with tracer.span("retrieval", queries=len(rewrite_result.rewrites)) as span:
+                multi_retrieval_result = await self.retriever.multi_retrieve(
+                    queries=rewrite_result.rewrites,
+                    extracted_entity=entity_result.entity,
+                    required_terms=required_terms,
+                    speculative=speculative,
+                    query_analysis=query_analysis
+                )
+                span.set_attributes(
+                    methods=",".join(multi_retrieval_result.methods_used),
+                    candidates=multi_retrieval_result.total_candidates,
+                    results=len(multi_retrieval_result.results),
+                    timed_out=",".join(multi_retrieval_result.metadata.get("timed_out_strategies", [])) or None
+                )
+            retrieval_time = time.time() - retrieval_start
+            
+            # Speculative searches that finished under the LLM stages cost no wall-clock time
+            speculative_time = speculative.duration() if speculative else None
+            speculative_overlap = 0.0
+            if speculative:
+                speculative_end = max(speculative.finished_at.values(), default=time.time())
+                speculative_overlap = max(0.0, min(speculative_end, llm_stages_end) - speculative.started_at)
+            
+            logger.info(f"Multi-retrieval: {len(multi_retrieval_result.results)} results via {', '.join(multi_retrieval_result.methods_used)}")
+            
+            # STAGE 4: Hybrid Results Fusion
+            progress(75, "⚖️ Advanced hybrid fusion...")
+            
+            fusion_start = time.time()
+            with tracer.span("fusion", inputs=len(multi_retrieval_result.results)) as span:
+                fusion_result = self.fusion_engine.fuse_results(
+                    all_results=multi_retrieval_result.results,
+                    original_query=question,
+                    extracted_entity=entity_result.entity,
+                    required_terms=required_terms,
+                    query_analysis=query_analysis
+                )
+                span.set_attributes(method=fusion_result.fusion_method, results=fusion_result.final_count)
+            fusion_time = time.time() - fusion_start
+            
+            logger.info(f"Results fusion: {fusion_result.final_count} final results via {fusion_result.fusion_method}")
+            
+            # STAGE 5: Answer Generation
+            progress(90, "📝 Generating intelligent answer...")
+            
+            answer_start = time.time()
+            with tracer.span("answer_generation", sources=len(fusion_result.fused_results)) as span:
+                generation = await self.answer_generator.generate(
+                    question, fusion_result.fused_results, entity_result, rewrite_result, query_analysis, on_token
+                )
+                span.set_attributes(
+                    method=generation.method,
+                    model=generation.model,
+                    context_sources=len(generation.context.sources) if generation.context else 0,
+                    context_tokens=generation.context.tokens if generation.context else 0,
+                    ttft_ms=generation.time_to_first_token * 1000 if generation.time_to_first_token is not None else None,
+                    output_tokens=generation.output_tokens,
+                    tokens_per_sec=generation.tokens_per_sec,
+                    error=generation.error
+                )
+            answer_time = time.time() - answer_start
+            
+            if generation.time_to_first_token is not None:
+                logger.info(f"Answer: first token after {generation.time_to_first_token:.2f}s "
+                            f"({answer_start - pipeline_start + generation.time_to_first_token:.2f}s into the search), "
+                            f"{generation.output_tokens} tokens at {generation.tokens_per_sec or 0:.1f} tok/s")
+            
+            # The result is kept in session state and the shared cache: hold previews only,
+            # full text is reloaded by id when a source is expanded or exported
+            for candidate in multi_retrieval_result.results + fusion_result.fused_results:
+                candidate.compact()
+            
+            # Complete pipeline
+            total_time = time.time() - pipeline_start
+            progress(100, "✅ Hybrid search completed!")
+            
+            result = {
+                "original_question": question,
+                "entity_result": entity_result,
+                "rewrite_result": rewrite_result,
+                "retrieval_result": multi_retrieval_result,
+                "fusion_result": fusion_result,
+                "answer": generation.answer,
+                "performance_metrics": {
+                    "total_time": total_time,
+                    "extraction_time": extraction_time,
+                    "rewrite_time": rewrite_time,
+                    "retrieval_time": retrieval_time,
+                    "fusion_time": fusion_time,
+                    "answer_time": answer_time,
+                    "speculative_time": speculative_time,
+                    "speculative_overlap": speculative_overlap,
+                    "llm_stages_time": extraction_time + rewrite_time,
+                    "answer_method": generation.method,
+                    # Perceived latency: time until the first answer token reached the caller
+                    "time_to_first_token": (answer_start - pipeline_start + generation.time_to_first_token
+                                            if generation.time_to_first_token is not None else None),
+                    "answer_ttft": generation.time_to_first_token,
+                    "answer_tokens": generation.output_tokens,
+                    "tokens_per_sec": generation.tokens_per_sec,
+                    "context_sources": len(generation.context.sources) if generation.context else 0,
+                    "context_tokens": generation.context.tokens if generation.context else 0,
+                    "pipeline_efficiency": {
+                        "extraction_pct": (extraction_time / total_time) * 100,
+                        "rewrite_pct": (rewrite_time / total_time) * 100,
+                        "retrieval_pct": (retrieval_time / total_time) * 100,
+                        "fusion_pct": (fusion_time / total_time) * 100,
+                        "answer_pct": (answer_time / total_time) * 100
+                    }
+                }
+            }
+            
+            # Partial results (a strategy timed out) are not cached. The cache keeps its own
+            # copy: expanding a source reloads text into the result objects of that session only
+            if result_cache is not None and not multi_retrieval_result.metadata.get("timed_out_strategies"):
+                result_cache.put(cache_key, copy_search_result(result))
+            
+            return result
+        
+        except BaseException as e:
+            # Also on cancellation (client gone, API timeout): stop the speculative searches
+            if speculative is not None:
+                speculative.cancel()
+            if isinstance(e, Exception):
+                logger.error(f"Production search failed: {e}")
+                logger.error(traceback.format_exc())
+            raise
+    
+    def fetch_chunk_texts(self, document_ids: List[str]) -> Dict[str, str]:
+        """Full chunk text by document id (for compacted results)"""
+        return self.retriever.fetch_chunk_texts(document_ids)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """System status with hybrid search info: database counts, embedding check, components (blocking)"""
+        config = self.config
+        
+        # Check database
+        try:
+            pool = get_connection_pool(config.database.connection_string, config.database)
+            with pool.connection() as conn:
+                cur = conn.cursor()
+                cur.execute(f"SELECT COUNT(*) FROM {config.database.schema}.{config.database.table_name}")
+                total_docs = cur.fetchone()[0]
+                cur.execute(f"SELECT COUNT(DISTINCT metadata->>'file_name') FROM {config.database.schema}.{config.database.table_name} WHERE metadata->>'file_name' IS NOT NULL")
+                unique_files = cur.fetchone()[0]
+                cur.close()
+            
+            database_status = {
+                "available": True,
+                "total_documents": total_docs,
+                "unique_files": unique_files
+            }
+        except Exception as e:
+            database_status = {"available": False, "error": str(e)}
+        
+        # Check embedding model
+        try:
+            from llama_index.embeddings.ollama import OllamaEmbedding
+            embed_model = OllamaEmbedding(
+                model_name=config.embedding.model_name,
+                base_url=config.embedding.base_url
+            )
+            test_embedding = embed_model.get_text_embedding("test")
+            embedding_status = {
+                "available": len(test_embedding) == config.embedding.dimension,
+                "model": config.embedding.model_name,
+                "dimension": len(test_embedding) if test_embedding else 0
+            }
+        except Exception as e:
+            embedding_status = {"available": False, "error": str(e)}
+        
+        return {
+            "system": self.component_status,
+            "database": database_status,
+            "embedding": embedding_status,
+            "components": {
+                "entity_extractors": self.entity_extractor.get_extractor_status(),
+                "query_rewriters": self.query_rewriter.get_rewriter_status(),
+                "retrievers": self.retriever.get_retriever_status()
+            },
+            "hybrid_enabled": config.search.enable_hybrid_search if hasattr(config.search, 'enable_hybrid_search') else True
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Live counters: connection pool, result cache, embedding cache, BM25 index, vector snapshot, stage latency"""
+        config = self.config
+        return {
+            "pool": get_connection_pool(config.database.connection_string, config.database).get_metrics(),
+            "result_cache": get_result_cache(config).get_stats() if config.search.enable_result_cache else None,
+            "embedding_cache": self.retriever.get_embedding_cache_stats(),
+            "bm25": self.retriever.get_bm25_stats(),
+            "vector_snapshot": self.retriever.get_vector_snapshot_stats(),
+            "tracing": tracer.get_stats()
+        }
+
+def _dataclass_to_dict(obj, **overrides) -> Dict[str, Any]:
+    data = {f.name: getattr(obj, f.name) for f in fields(obj)}
+    data.update(overrides)
+    return data
+
+def copy_search_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Search result with its own RetrievalResult objects (one copy per result shared by both lists)"""
+    copies: Dict[int, RetrievalResult] = {}
+    
+    def copy_results(results: List[RetrievalResult]) -> List[RetrievalResult]:
+        for r in results:
+            if id(r) not in copies:
+                copies[id(r)] = r.copy()
+        return [copies[id(r)] for r in results]
+    
+    retrieval_result = result["retrieval_result"]
+    fusion_result = result["fusion_result"]
+    return dict(
+        result,
+        retrieval_result=replace(retrieval_result, results=copy_results(retrieval_result.results),
+                                 metadata=dict(retrieval_result.metadata)),
+        fusion_result=replace(fusion_result, fused_results=copy_results(fusion_result.fused_results))
+    )
+
+def serialize_search_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-ready form of a search result (retrieval results as previews, see RetrievalResult.to_dict)"""
+    retrieval_result = result["retrieval_result"]
+    fusion_result = result["fusion_result"]
+    return dict(
+        result,
+        entity_result=_dataclass_to_dict(result["entity_result"]),
+        rewrite_result=_dataclass_to_dict(result["rewrite_result"]),
+        retrieval_result=_dataclass_to_dict(
+            retrieval_result, results=[r.to_dict() for r in retrieval_result.results]
+        ),
+        fusion_result=_dataclass_to_dict(
+            fusion_result, fused_results=[r.to_dict() for r in fusion_result.fused_results]
+        )
+    )
+
+def deserialize_search_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the objects of a serialized search result (what the UI and the Excel export read)"""
+    retrieval_result = data["retrieval_result"]
+    fusion_result = data["fusion_result"]
+    return dict(
+        data,
+        entity_result=EntityExtractionResult(**data["entity_result"]),
+        rewrite_result=QueryRewriteResult(**data["rewrite_result"]),
+        retrieval_result=MultiRetrievalResult(**dict(
+            retrieval_result, results=[RetrievalResult.from_dict(r) for r in retrieval_result["results"]]
+        )),
+        fusion_result=FusionResult(**dict(
+            fusion_result, fused_results=[RetrievalResult.from_dict(r) for r in fusion_result["fused_results"]]
+        ))
+    )
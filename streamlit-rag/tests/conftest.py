@@ -0,0 +1,7 @@
+# tests/conftest.py
+# Shared test setup
+
+import os
+
+# config.settings refuses to import without a connection string; no test connects to it
+os.environ.setdefault("SUPABASE_CONNECTION_STRING", "postgresql://tests@localhost:5432/tests")
@@ -0,0 +1,184 @@
+# tests/test_bm25_index.py
+# Segmented BM25 index: build, search, incremental sync, tombstones and compaction
+
+import os
+import sys
+import math
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.bm25_index import BM25Index, tokenize
+
+TABLE = "vecs.chunks"
+VERSION_TABLE = "vecs.chunks_index_version"
+
+DOCUMENTS = {
+    "c1": "Breeda Daly completed fire safety training in March.",
+    "c2": "Manual handling training certificate for John Nolan.",
+    "c3": "Fire safety policy: fire doors must be kept closed.",
+    "c4": "Minutes of the board meeting.",
+}
+
+class FakeCursor:
+    """Answers the statements SegmentedSnapshot.sync() issues against the vecs table"""
+
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.db.statements.append(sql)
+        if "to_regclass" in sql:
+            self.rows = [(VERSION_TABLE,)]
+        elif sql.strip().startswith(f"SELECT version FROM {VERSION_TABLE}"):
+            self.rows = [(self.db.version,)]
+        elif "WHERE id = ANY" in sql:
+            self.rows = [(doc_id, self.db.chunks[doc_id], f"{doc_id}.pdf", "0") for doc_id in params[0]]
+        elif sql.strip() == f"SELECT id FROM {TABLE}":
+            self.rows = [(doc_id,) for doc_id in self.db.chunks]
+        else:
+            raise AssertionError(f"unexpected SQL: {sql}")
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+class FakePool:
+    def __init__(self, chunks, version=1):
+        self.chunks = dict(chunks)
+        self.version = version
+        self.statements = []
+
+    @contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+def reference_bm25(chunks, query, k1=1.2, b=0.75):
+    """Okapi BM25 over the live chunks, computed directly"""
+    tokens = {doc_id: tokenize(text) for doc_id, text in chunks.items()}
+    avgdl = max(1.0, sum(len(t) for t in tokens.values()) / len(tokens))
+    terms = list(dict.fromkeys(tokenize(query)))
+    df = Counter(term for t in tokens.values() for term in set(t) if term in terms)
+    scores = {}
+    for doc_id, doc_tokens in tokens.items():
+        counts = Counter(doc_tokens)
+        score = 0.0
+        for term in terms:
+            if counts[term]:
+                idf = math.log(1 + (len(tokens) - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * counts[term] * (k1 + 1) / (counts[term] + k1 * (1 - b + b * len(doc_tokens) / avgdl))
+        if score:
+            scores[doc_id] = score
+    return scores
+
+def synced_index(tmp_path, pool, **kwargs):
+    index = BM25Index(str(tmp_path / "bm25"), **kwargs)
+    index.sync(pool, TABLE, VERSION_TABLE)
+    return index
+
+def test_search_matches_reference_bm25(tmp_path):
+    index = synced_index(tmp_path, FakePool(DOCUMENTS))
+
+    results = index.search("fire safety training", top_k=10)
+
+    expected = reference_bm25(DOCUMENTS, "fire safety training")
+    assert [r["id"] for r in results] == sorted(expected, key=expected.get, reverse=True)
+    for result in results:
+        assert result["bm25_score"] == pytest.approx(expected[result["id"]], rel=1e-5)
+        assert 0 < result["score"] <= 1
+    assert results[0]["file_name"] == "c1.pdf"
+    assert set(results[0]["matched_terms"]) == {"fire", "safety", "training"}
+
+def test_search_respects_top_k_and_unknown_terms(tmp_path):
+    index = synced_index(tmp_path, FakePool(DOCUMENTS))
+
+    assert len(index.search("training fire", top_k=2)) == 2
+    assert index.search("photosynthesis") == []
+    assert index.search("the and of") == []
+
+def test_unchanged_version_skips_the_diff(tmp_path):
+    pool = FakePool(DOCUMENTS)
+    index = synced_index(tmp_path, pool)
+    pool.statements.clear()
+
+    assert index.sync(pool, TABLE, VERSION_TABLE) is False
+    assert not any(sql.strip() == f"SELECT id FROM {TABLE}" for sql in pool.statements)
+
+def test_new_chunks_become_a_new_segment(tmp_path):
+    pool = FakePool(DOCUMENTS)
+    index = synced_index(tmp_path, pool)
+
+    pool.chunks["c5"] = "Fire warden training for Breeda Daly."
+    pool.version = 2
+    assert index.sync(pool, TABLE, VERSION_TABLE) is True
+
+    assert len(index.segments) == 2
+    assert index.document_count() == 5
+    assert "c5" in [r["id"] for r in index.search("fire warden")]
+
+def test_removed_chunks_are_tombstoned_and_persisted(tmp_path):
+    pool = FakePool(DOCUMENTS)
+    index = synced_index(tmp_path, pool, max_deleted_ratio=0.5)
+
+    del pool.chunks["c3"]
+    pool.version = 2
+    assert index.sync(pool, TABLE, VERSION_TABLE) is True
+
+    assert len(index.segments) == 1
+    assert index.segments[0].live_count == 3
+    assert "c3" not in [r["id"] for r in index.search("fire safety policy")]
+
+    reloaded = BM25Index(str(tmp_path / "bm25"))
+    assert reloaded.load()
+    assert reloaded.document_count() == 3
+    assert reloaded.index_version == 2
+    assert "c3" not in [r["id"] for r in reloaded.search("fire doors")]
+
+def test_tombstones_past_the_ratio_compact_into_one_segment(tmp_path):
+    pool = FakePool(DOCUMENTS)
+    index = synced_index(tmp_path, pool, max_deleted_ratio=0.1)
+    old_path = index.segments[0].path
+
+    del pool.chunks["c3"]
+    pool.chunks["c5"] = "Fire warden training for Breeda Daly."
+    pool.version = 2
+    index.sync(pool, TABLE, VERSION_TABLE)
+
+    assert len(index.segments) == 1
+    assert index.segments[0].live_count == len(index.segments[0].ids) == 4
+    assert not os.path.exists(old_path)
+
+    # Tombstoned postings no longer count towards document frequencies
+    expected = reference_bm25(pool.chunks, "fire safety training")
+    results = index.search("fire safety training", top_k=10)
+    assert {r["id"]: r["bm25_score"] for r in results} == pytest.approx(expected, rel=1e-5)
+
+def test_segment_count_past_the_limit_compacts(tmp_path):
+    pool = FakePool({"c1": DOCUMENTS["c1"]})
+    index = synced_index(tmp_path, pool, max_segments=2)
+
+    for version, doc_id in enumerate(["c2", "c3"], start=2):
+        pool.chunks[doc_id] = DOCUMENTS[doc_id]
+        pool.version = version
+        index.sync(pool, TABLE, VERSION_TABLE)
+
+    assert len(index.segments) == 1
+    assert index.document_count() == 3
+    assert sorted(index.segments[0].ids) == ["c1", "c2", "c3"]
@@ -0,0 +1,102 @@
+# tests/test_embedding_cache.py
+# Query embedding cache: LRU order (in memory and across restarts) and request counters
+
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.multi_retriever import LlamaIndexRetriever
+from utils.embedding_cache import QueryEmbeddingCache
+
+class FakeEmbedModel:
+    def __init__(self, query_instruction=None):
+        self.query_instruction = query_instruction
+        self.calls = []
+
+    def get_text_embedding_batch(self, texts):
+        self.calls.append(("batch", list(texts)))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def get_query_embedding(self, text):
+        self.calls.append(("query", text))
+        return [float(len(text)), 1.0]
+
+def vector_retriever(embed_model, cache):
+    retriever = LlamaIndexRetriever.__new__(LlamaIndexRetriever)
+    retriever.embed_model = embed_model
+    retriever.embedding_cache = cache
+    return retriever
+
+def test_get_many_deduplicates_normalized_queries():
+    cache = QueryEmbeddingCache("model")
+    cache.put_many({"fire safety": [1.0, 2.0]})
+
+    found, missing = cache.get_many(["fire  safety", "manual handling", "manual handling "])
+
+    assert found == {"fire safety": [1.0, 2.0]}
+    assert missing == ["manual handling"]
+    assert cache.get_stats()["hits"] == 1
+    assert cache.get_stats()["misses"] == 1
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryEmbeddingCache("model", max_size=2)
+    cache.put_many({"a": [1.0]})
+    cache.put_many({"b": [2.0]})
+    cache.get_many(["a"])
+
+    cache.put_many({"c": [3.0]})
+
+    found, missing = cache.get_many(["a", "b", "c"])
+    assert set(found) == {"a", "c"}
+    assert missing == ["b"]
+
+def test_restart_reloads_most_recently_used_entries(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    cache = QueryEmbeddingCache("model", max_size=10, persist_path=path)
+    for query in ("old but popular", "newer", "newest"):
+        cache.put_many({query: [1.0, 2.0]})
+        time.sleep(0.01)
+    cache.get_many(["old but popular"])
+
+    reloaded = QueryEmbeddingCache("model", max_size=2, persist_path=path)
+
+    found, missing = reloaded.get_many(["old but popular", "newer", "newest"])
+    assert set(found) == {"old but popular", "newest"}
+    assert missing == ["newer"]
+
+def test_persisted_entries_are_per_model(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    QueryEmbeddingCache("model-a", persist_path=path).put_many({"query": [1.0]})
+
+    found, missing = QueryEmbeddingCache("model-b", persist_path=path).get_many(["query"])
+
+    assert found == {}
+    assert missing == ["query"]
+
+def test_misses_are_embedded_in_one_batched_request():
+    model = FakeEmbedModel()
+    cache = QueryEmbeddingCache("model")
+    retriever = vector_retriever(model, cache)
+
+    embeddings = retriever.embed_queries(["fire safety", "manual handling", "fire safety"])
+
+    assert model.calls == [("batch", ["fire safety", "manual handling"])]
+    assert embeddings[0] == embeddings[2]
+    stats = cache.get_stats()
+    assert (stats["embedding_requests"], stats["batch_requests"], stats["embedded_texts"]) == (1, 1, 2)
+
+def test_one_at_a_time_embedding_is_not_counted_as_batched():
+    model = FakeEmbedModel(query_instruction="Represent the question: ")
+    cache = QueryEmbeddingCache("model")
+    retriever = vector_retriever(model, cache)
+
+    retriever.embed_queries(["fire safety", "manual handling"])
+    retriever.embed_queries(["fire safety", "first aid"])
+
+    assert [kind for kind, _ in model.calls] == ["query", "query", "query"]
+    stats = cache.get_stats()
+    assert (stats["embedding_requests"], stats["batch_requests"], stats["embedded_texts"]) == (3, 0, 3)
+    assert stats["hits"] == 1
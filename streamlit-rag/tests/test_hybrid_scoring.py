@@ -0,0 +1,49 @@
+# tests/test_hybrid_scoring.py
+# Hybrid result scoring in MultiStrategyRetriever
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import config
+from retrieval.multi_retriever import MultiStrategyRetriever, RetrievalResult
+
+CHUNK = "Breeda Daly completed the manual handling course on 3 March. " * 3
+
+def retriever():
+    retriever = MultiStrategyRetriever.__new__(MultiStrategyRetriever)
+    retriever.config = config
+    return retriever
+
+def result(full_content, filename, score=0.5, source_method="database_hybrid"):
+    return RetrievalResult(full_content=full_content, filename=filename, similarity_score=score,
+                           metadata={}, source_method=source_method, document_id=filename)
+
+def test_entity_in_filename_does_not_boost_identical_chunks():
+    results = [result(CHUNK, "notes.pdf"), result(CHUNK, "breeda_daly_notes.pdf")]
+
+    scores = retriever()._calculate_hybrid_scores(results, is_person=True, entity_lower="breeda_daly")
+
+    assert scores[0] == scores[1]
+
+def test_entity_in_content_is_boosted():
+    other = CHUNK.replace("Breeda Daly", "A colleague")
+    results = [result(CHUNK, "a.pdf"), result(other, "b.pdf")]
+
+    scores = retriever()._calculate_hybrid_scores(results, is_person=True, entity_lower="breeda daly")
+
+    assert scores[0] == pytest.approx(min(1.0, scores[1] * config.search.exact_match_boost))
+
+def test_content_lower_excludes_filename_and_is_dropped_on_compact():
+    chunk = result("Fire Safety Briefing", "Breeda_Daly.pdf")
+
+    assert chunk.content_lower == "fire safety briefing"
+    assert chunk.normalized_text == "fire safety briefing breeda_daly.pdf"
+
+    chunk.compact()
+    assert chunk.is_compact
+    assert chunk.content_lower == chunk.content.lower()
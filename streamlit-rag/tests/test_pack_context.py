@@ -0,0 +1,91 @@
+# tests/test_pack_context.py
+# Prompt context packing: score order, duplicate skipping and the token budget
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from generation.answer_generator import estimate_tokens, pack_context
+from retrieval.multi_retriever import RetrievalResult
+
+def result(text, score, document_id="", filename=None):
+    return RetrievalResult(full_content=text, filename=filename or f"{document_id or 'doc'}.pdf",
+                           similarity_score=score, metadata={}, source_method="database_hybrid",
+                           document_id=document_id)
+
+def words(count, word="training"):
+    return " ".join([word] * count)
+
+def test_sources_are_numbered_best_score_first():
+    low = result("Manual handling refresher.", 0.4, "doc-1")
+    high = result("Breeda Daly completed fire safety training.", 0.9, "doc-2")
+
+    packed = pack_context([low, high], token_budget=1000)
+
+    assert packed.sources == [high, low]
+    assert packed.text == (
+        "[1] doc-2.pdf\nBreeda Daly completed fire safety training.\n\n"
+        "[2] doc-1.pdf\nManual handling refresher."
+    )
+    assert (packed.duplicates, packed.omitted, packed.truncated) == (0, 0, False)
+    assert packed.tokens == sum(estimate_tokens(block) for block in packed.text.split("\n\n"))
+
+def test_repeated_document_ids_and_texts_are_skipped():
+    best = result("Fire safety   policy", 0.9, "doc-1")
+    same_id = result("Another chunk text", 0.8, "doc-1")
+    same_text = result("fire SAFETY policy", 0.7, "doc-2")
+    no_id = result("Fire safety policy\n", 0.6)
+    other = result("Manual handling", 0.5, "doc-3")
+
+    packed = pack_context([no_id, same_text, other, same_id, best], token_budget=1000)
+
+    assert packed.sources == [best, other]
+    assert packed.duplicates == 3
+    assert "[1] doc-1.pdf\nFire safety policy" in packed.text
+
+def test_result_over_budget_is_cut_when_enough_remains():
+    first = result(words(40), 0.9, "doc-1")
+    second = result(words(200, "certificate"), 0.8, "doc-2")
+    third = result("Short note.", 0.7, "doc-3")
+
+    packed = pack_context([first, second, third], token_budget=150, min_chunk_tokens=32)
+
+    assert packed.sources == [first, second]
+    assert packed.truncated is True
+    assert packed.text.endswith("certificate ...")
+    assert " certificat ..." not in packed.text
+    # Nothing is added after the cut source, even when it would fit
+    assert packed.omitted == 1
+    assert packed.tokens <= 150
+
+def test_result_over_budget_is_skipped_when_too_little_remains():
+    first = result(words(40), 0.9, "doc-1")
+    second = result(words(200, "certificate"), 0.8, "doc-2")
+    third = result("Short note.", 0.7, "doc-3")
+
+    packed = pack_context([first, second, third], token_budget=110, min_chunk_tokens=64)
+
+    assert packed.sources == [first, third]
+    assert packed.truncated is False
+    assert packed.omitted == 1
+    assert packed.tokens <= 110
+
+@pytest.mark.parametrize("budget", [20, 37, 64, 101, 250])
+def test_packed_context_stays_within_the_budget(budget):
+    results = [result(words(n, f"w{n}"), 1.0 - n / 100, f"doc-{n}") for n in (5, 30, 60, 90)]
+
+    packed = pack_context(results, token_budget=budget, min_chunk_tokens=8)
+
+    assert packed.tokens <= budget
+    assert len(packed.sources) + packed.omitted == len(results)
+
+def test_empty_text_is_omitted():
+    packed = pack_context([result("   ", 0.9, "doc-1"), result("Fire safety", 0.5, "doc-2")], token_budget=100)
+
+    assert [r.document_id for r in packed.sources] == ["doc-2"]
+    assert packed.omitted == 1
+    assert packed.text.startswith("[1] doc-2.pdf\n")
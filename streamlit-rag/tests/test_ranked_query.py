@@ -0,0 +1,61 @@
+# tests/test_ranked_query.py
+# Tiers of the single-statement database search (exact phrase, person name, terms)
+
+import re
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.multi_retriever import DatabaseRetriever
+
+NAME_LOOKUP = "SELECT chunk_id FROM vecs.chunks_person_names"
+
+def database_retriever(use_text_search):
+    retriever = DatabaseRetriever.__new__(DatabaseRetriever)
+    retriever.use_text_search = use_text_search
+    retriever.config = SimpleNamespace(
+        database=SimpleNamespace(schema="vecs", table_name="chunks"),
+        search=SimpleNamespace(database_exact_match_score=1.0, database_base_score=0.5,
+                               database_score_per_occurrence=0.1, database_text_search_config="simple")
+    )
+    return retriever
+
+def tier_conditions(sql):
+    case = re.search(r"CASE (WHEN.*?) END as match_tier", sql, re.S).group(1)
+    return dict((int(tier), condition) for condition, tier in re.findall(r"WHEN (.*?) THEN (\d)", case))
+
+@pytest.mark.parametrize("use_text_search", [True, False])
+def test_person_tier_matches_name_index_or_terms(use_text_search):
+    sql, params = database_retriever(use_text_search)._build_ranked_query(
+        "breeda daly", ["breeda", "daly"], ["breeda", "daly"], 10, "breeda daly"
+    )
+
+    tiers = tier_conditions(sql)
+    assert sorted(tiers) == [1, 2, 3]
+    assert NAME_LOOKUP in tiers[2] and " OR " in tiers[2]
+    assert NAME_LOOKUP not in tiers[1] + tiers[3]
+    assert params["person_name"] == "breeda daly"
+
+@pytest.mark.parametrize("use_text_search", [True, False])
+def test_no_person_tier_without_person_terms(use_text_search):
+    sql, params = database_retriever(use_text_search)._build_ranked_query(
+        "fire safety", [], ["fire", "safety"], 10, "fire safety"
+    )
+
+    assert sorted(tier_conditions(sql)) == [1, 3]
+    assert NAME_LOOKUP not in sql
+    assert "person_name" not in params
+
+@pytest.mark.parametrize("use_text_search", [True, False])
+def test_without_name_index_the_person_tier_uses_terms_only(use_text_search):
+    sql, _ = database_retriever(use_text_search)._build_ranked_query(
+        "breeda daly", ["breeda", "daly"], ["breeda", "daly"], 10
+    )
+
+    assert sorted(tier_conditions(sql)) == [1, 2, 3]
+    assert NAME_LOOKUP not in sql
@@ -0,0 +1,154 @@
+# tests/test_result_cache.py
+# Shared search result cache: expiry, eviction, index versions and per-session copies
+
+import sys
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import search_pipeline
+from config.settings import config
+from retrieval.multi_retriever import MultiRetrievalResult, RetrievalResult, load_full_content, shared_metadata
+from retrieval.results_fusion import FusionResult
+from search_pipeline import SearchPipeline, copy_search_result
+from utils.result_cache import SearchResultCache
+
+TEXTS = {"doc-1": "Breeda Daly completed fire safety training. " * 40, "doc-2": "Manual handling refresher."}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+def make_cache(monkeypatch, versions=None, **kwargs):
+    cache = SearchResultCache(config, **kwargs)
+    versions = versions if versions is not None else [1]
+    monkeypatch.setattr(cache, "get_index_version", lambda: versions[0])
+    return cache
+
+def make_search_result():
+    shared = RetrievalResult(full_content=TEXTS["doc-1"], filename="daly.pdf", similarity_score=0.9,
+                             metadata={}, source_method="database_hybrid", document_id="doc-1")
+    other = RetrievalResult(full_content=TEXTS["doc-2"], filename="manual.pdf", similarity_score=0.5,
+                            metadata=shared_metadata(strategy="vector"), source_method="llamaindex_vector",
+                            document_id="doc-2")
+    for result in (shared, other):
+        result.compact()
+    return {
+        "original_question": "Breeda Daly training",
+        "answer": "Fire safety [1]",
+        "retrieval_result": MultiRetrievalResult(
+            query="Breeda Daly training", results=[shared, other], methods_used=["database_hybrid"],
+            total_candidates=2, retrieval_time=0.1, fusion_method="hybrid"
+        ),
+        "fusion_result": FusionResult(
+            fused_results=[shared], fusion_method="hybrid", original_count=2, final_count=1,
+            fusion_metadata={}, fusion_time=0.01
+        ),
+        "performance_metrics": {"total_time": 1.0}
+    }
+
+@pytest.fixture
+def text_loader(monkeypatch):
+    loaded = []
+
+    def loader(document_ids):
+        loaded.append(sorted(document_ids))
+        return {doc_id: TEXTS[doc_id] for doc_id in document_ids}
+
+    monkeypatch.setattr(RetrievalResult, "text_loader", loader)
+    return loaded
+
+def test_lookup_returns_stored_result_with_age(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("utils.result_cache.time", clock)
+    cache = make_cache(monkeypatch)
+
+    key, cached = cache.lookup("Breeda Daly")
+    assert cached is None
+    cache.put(key, "result")
+
+    clock.now += 30
+    _, cached = cache.lookup("Breeda   Daly")
+    assert cached == ("result", 30.0)
+    assert cache.get_stats()["hits"] == 1
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("utils.result_cache.time", clock)
+    cache = make_cache(monkeypatch, ttl=60)
+
+    key, _ = cache.lookup("question")
+    cache.put(key, "result")
+    clock.now += 61
+
+    assert cache.lookup("question")[1] is None
+    assert cache.get_stats()["expired"] == 1
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    cache = make_cache(monkeypatch, max_size=2)
+    for question in ("a", "b"):
+        key, _ = cache.lookup(question)
+        cache.put(key, question)
+
+    cache.lookup("a")
+    key, _ = cache.lookup("c")
+    cache.put(key, "c")
+
+    assert cache.lookup("b")[1] is None
+    assert cache.lookup("a")[1][0] == "a"
+    assert cache.get_stats()["evictions"] == 1
+
+def test_new_index_version_misses(monkeypatch):
+    versions = [1]
+    cache = make_cache(monkeypatch, versions)
+    key, _ = cache.lookup("question")
+    cache.put(key, "result")
+
+    versions[0] = 2
+
+    assert cache.lookup("question")[1] is None
+
+def test_copy_keeps_shared_results_shared_within_the_copy():
+    original = make_search_result()
+
+    copied = copy_search_result(original)
+
+    copied_shared = copied["retrieval_result"].results[0]
+    assert copied["fusion_result"].fused_results[0] is copied_shared
+    assert copied_shared is not original["retrieval_result"].results[0]
+    assert copied["retrieval_result"].results[1].metadata["strategy"] == "vector"
+
+def test_copy_has_its_own_annotations():
+    original = make_search_result()
+
+    copied = copy_search_result(original)
+    copied["fusion_result"].fused_results[0].metadata["expanded"] = True
+
+    assert "expanded" not in original["fusion_result"].fused_results[0].metadata
+
+def test_loading_full_text_in_one_session_leaves_the_cache_compact(monkeypatch, text_loader):
+    cache = make_cache(monkeypatch)
+    monkeypatch.setattr(search_pipeline, "get_result_cache", lambda config: cache)
+    key, _ = cache.lookup("Breeda Daly training")
+    cache.put(key, make_search_result())
+
+    pipeline = SearchPipeline.__new__(SearchPipeline)
+    pipeline.config = SimpleNamespace(search=SimpleNamespace(enable_result_cache=True))
+
+    first = asyncio.run(pipeline.search("Breeda Daly training"))
+    first_results = first["fusion_result"].fused_results
+    assert first["performance_metrics"]["cache_hit"] is True
+    assert load_full_content(first_results) == 1
+    assert first_results[0].full_content == TEXTS["doc-1"]
+
+    second = asyncio.run(pipeline.search("Breeda Daly training"))
+    assert second["fusion_result"].fused_results[0].is_compact
+    assert cache.lookup("Breeda Daly training")[1][0]["fusion_result"].fused_results[0].is_compact
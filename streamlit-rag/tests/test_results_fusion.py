@@ -0,0 +1,222 @@
+# tests/test_results_fusion.py
+# Results fusion: RRF rank maps and the NumPy scoring passes against the original per-result loops
+
+import sys
+import random
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import config
+from retrieval.multi_retriever import RetrievalResult
+from retrieval.results_fusion import HybridResultsFusionEngine
+
+WORDS = ["breeda", "daly", "fire", "safety", "training", "certificate", "course", "completed", "achieved",
+         "signature", "signed", "form", "date:", "location:", "manual", "handling", "policy", "the", "was"]
+METHODS = ["database_hybrid", "database_exact", "llamaindex_vector", "vector", "bm25"]
+STRATEGIES = [None, "exact_phrase", "person_name_match", "database_only", "unknown_strategy"]
+MATCH_TYPES = [None, "exact_match", "found_by_both", "vector_better", "database_better"]
+
+def make_results(count, seed):
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        words = rng.choices(WORDS, k=rng.choice([3, 12, 40, 400]))
+        if rng.random() < 0.3:
+            words[rng.randrange(len(words)):0] = ["breeda", "daly"]
+        if rng.random() < 0.3:
+            words[rng.randrange(len(words)):0] = ["fire", "safety"]
+        filename = rng.choice(["daly_training.pdf", "fire_safety.pdf", "policy.docx", f"doc{i}.pdf"])
+        metadata = {
+            "database_strategy": rng.choice(STRATEGIES),
+            "match_type": rng.choice(MATCH_TYPES),
+            "query_occurrences": rng.randint(0, 4),
+        }
+        results.append(RetrievalResult(
+            full_content=" ".join(words), filename=filename, similarity_score=round(rng.random(), 6),
+            metadata=metadata, source_method=rng.choice(METHODS), document_id=f"doc-{i}"
+        ))
+    # The same chunk found by several methods, and twice by one method
+    for source in rng.sample(results, count // 4):
+        for method in rng.sample(METHODS, 2):
+            results.append(RetrievalResult(
+                full_content=source.full_content, filename=source.filename, similarity_score=round(rng.random(), 6),
+                metadata={}, source_method=method, document_id=source.document_id
+            ))
+    return results
+
+def reference_rrf(engine, results):
+    """The original RRF loop: linear rank lookup in each sorted method group"""
+    method_groups = {}
+    for result in results:
+        method_groups.setdefault(result.source_method, []).append(result)
+    for method in method_groups:
+        method_groups[method].sort(key=lambda x: x.similarity_score, reverse=True)
+
+    rrf_scores = {}
+    for result in results:
+        result_id = engine._create_result_id(result)
+        if result_id not in rrf_scores:
+            rrf_scores[result_id] = {"result": result, "rrf_score": 0, "ranks": {}, "methods": set(),
+                                     "hybrid_boost": engine.method_weights.get(result.source_method, 1.0)}
+        method_list = method_groups[result.source_method]
+        rank = next(i for i, r in enumerate(method_list) if engine._create_result_id(r) == result_id) + 1
+        rrf_scores[result_id]["rrf_score"] += (1.0 / (60 + rank)) * rrf_scores[result_id]["hybrid_boost"]
+        rrf_scores[result_id]["ranks"][result.source_method] = rank
+        rrf_scores[result_id]["methods"].add(result.source_method)
+
+    for item in rrf_scores.values():
+        methods = item["methods"]
+        if len(methods) > 1:
+            has_database = any("database" in method for method in methods)
+            has_vector = any("vector" in method or "llamaindex" in method for method in methods)
+            item["rrf_score"] *= 1.4 if has_database and has_vector else 1.0 + (len(methods) - 1) * 0.2
+
+    items = sorted(rrf_scores.values(), key=lambda x: x["rrf_score"], reverse=True)
+    return [(item["result"], item["rrf_score"], item["ranks"], len(item["methods"])) for item in items]
+
+def reference_context_quality(engine, content_lower, entity_lower, is_person_query):
+    if not is_person_query or not entity_lower:
+        return 1.0
+    quality = 1.0
+    training = sum(1 for keyword in ['training', 'certificate', 'certification', 'course', 'completed', 'achieved']
+                   if keyword in content_lower)
+    if training > 0:
+        quality *= engine.quality_indicators["training_context"]
+    signature = sum(1 for keyword in ['signature', 'signed', 'form', 'date:', 'location:'] if keyword in content_lower)
+    if signature >= 2 and training == 0:
+        quality *= engine.quality_indicators["signature_context"]
+    return quality
+
+def reference_weighted_score(engine, result, query, entity, required_terms, is_person_query):
+    """The original per-result weighted fusion loop"""
+    query_lower = query.lower()
+    entity_lower = entity.lower() if entity else ""
+    required_terms_lower = [term.lower() for term in required_terms]
+    content_lower = f"{result.content} {result.full_content} {result.filename}".lower()
+
+    quality = 1.0
+    if result.metadata.get('database_strategy'):
+        quality *= engine.strategy_boosts.get(result.metadata['database_strategy'], 1.0)
+    if result.metadata.get('match_type'):
+        quality *= engine.strategy_boosts.get(result.metadata['match_type'], 1.0)
+    if query_lower in content_lower:
+        # The loop looked up quality_indicators["exact_match"] here, which does not exist
+        quality *= engine.quality_indicators["person_name_exact"] if is_person_query else engine.strategy_boosts["exact_match"]
+    if entity_lower and entity_lower in content_lower:
+        quality *= engine.quality_indicators["person_name_exact"] if is_person_query else 1.2
+    if required_terms_lower:
+        coverage = sum(1 for term in required_terms_lower if term in content_lower) / len(required_terms_lower)
+        if coverage > 0.5:
+            quality *= 1.0 + coverage * 0.3
+    if result.metadata.get('query_occurrences', 0) > 1:
+        quality *= min(engine.quality_indicators["high_query_frequency"], 1.0 + result.metadata['query_occurrences'] * 0.1)
+    length = len(result.full_content)
+    if 100 <= length <= 2000:
+        quality *= engine.quality_indicators["optimal_content_length"]
+    elif length < 50:
+        quality *= 0.8
+    quality *= reference_context_quality(engine, content_lower, entity_lower, is_person_query)
+    return result.similarity_score * engine.method_weights.get(result.source_method, 1.0) * quality
+
+def reference_person_priority_score(result, query, entity):
+    """The original database-result scoring: matches the chunk text only"""
+    content_lower = result.full_content.lower()
+    score = result.similarity_score
+    if (entity or query).lower() in content_lower:
+        score *= 1.4
+    matches = sum(1 for keyword in ['training', 'certificate', 'certification', 'course', 'completed']
+                  if keyword in content_lower)
+    if matches > 0:
+        score *= 1.0 + matches * 0.1
+    if result.metadata.get('query_occurrences', 0) > 1:
+        score *= min(1.3, 1.0 + result.metadata['query_occurrences'] * 0.1)
+    return min(1.0, score)
+
+@pytest.fixture
+def engine():
+    return HybridResultsFusionEngine(config)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rrf_matches_the_original_loop(engine, seed):
+    results = make_results(40, seed)
+    expected = reference_rrf(engine, results)
+
+    fused = engine._reciprocal_rank_fusion(results, "Breeda Daly training")
+
+    assert [id(r) for r in fused] == [id(r) for r, _, _, _ in expected]
+    for result, score, ranks, methods_count in expected:
+        assert result.metadata["hybrid_rrf_score"] == pytest.approx(score)
+        assert result.metadata["method_ranks"] == ranks
+        assert result.metadata["methods_count"] == methods_count
+
+def test_rrf_rank_is_the_first_position_of_the_chunk_in_its_method(engine):
+    def result(text, score, method):
+        return RetrievalResult(full_content=text, filename="a.pdf", similarity_score=score,
+                               metadata={}, source_method=method)
+
+    top = result("Breeda Daly fire safety", 0.9, "database_hybrid")
+    repeat = result("Breeda Daly fire safety", 0.2, "database_hybrid")
+    middle = result("Manual handling", 0.5, "database_hybrid")
+    vector = result("Breeda Daly fire safety", 0.8, "llamaindex_vector")
+
+    fused = engine._reciprocal_rank_fusion([repeat, middle, top, vector], "Breeda Daly")
+
+    assert fused == [repeat, middle]
+    assert repeat.metadata["method_ranks"] == {"database_hybrid": 1, "llamaindex_vector": 1}
+    assert repeat.metadata["methods_count"] == 2
+    database_weight = engine.method_weights.get("database_hybrid", 1.0)
+    # Both database hits count at rank 1; the boost is the first-seen method's weight
+    assert repeat.metadata["hybrid_rrf_score"] == pytest.approx(3 * database_weight / 61 * 1.4)
+    assert middle.metadata["method_ranks"] == {"database_hybrid": 2}
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("query, entity, required_terms", [
+    ("Breeda Daly", "Breeda Daly", ["training", "fire", "course"]),
+    ("tell me about Breeda Daly", "Breeda Daly", []),
+    ("fire safety", None, ["fire", "safety", "policy"]),
+])
+def test_weighted_fusion_matches_the_original_loop(engine, seed, query, entity, required_terms):
+    results = make_results(40, seed)
+
+    fused = engine._hybrid_weighted_fusion(results, query, entity, required_terms)
+
+    is_person_query = fused[0].metadata["is_person_query"]
+    expected = {
+        id(r): reference_weighted_score(engine, r, query, entity, required_terms, is_person_query) for r in results
+    }
+    for result in results:
+        assert result.metadata["hybrid_weighted_score"] == pytest.approx(expected[id(result)])
+    assert [id(r) for r in fused] == sorted(expected, key=expected.get, reverse=True)
+
+def test_weighted_fusion_covers_person_and_other_queries(engine):
+    results = make_results(10, 0)
+
+    person = engine._hybrid_weighted_fusion(results, "Breeda Daly", "Breeda Daly")[0].metadata["is_person_query"]
+    other = engine._hybrid_weighted_fusion(results, "fire safety", None)[0].metadata["is_person_query"]
+
+    assert (person, other) == (True, False)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_person_priority_fusion_matches_the_original_loop(engine, seed):
+    results = make_results(40, seed)
+
+    fused = engine._hybrid_person_priority_fusion(results, "Breeda Daly", "Breeda Daly")
+
+    database = [r for r in results if "database" in r.source_method]
+    expected = {id(r): reference_person_priority_score(r, "Breeda Daly", "Breeda Daly") for r in database}
+    for result in database:
+        assert result.metadata["person_priority_score"] == pytest.approx(expected[id(result)])
+    assert [id(r) for r in fused[:len(database)]] == sorted(expected, key=expected.get, reverse=True)
+    assert len(fused) == len(results)
+
+def test_person_priority_ignores_the_filename(engine):
+    plain = RetrievalResult(full_content="Minutes of the meeting.", filename="breeda_daly_training.pdf",
+                            similarity_score=0.5, metadata={}, source_method="database_hybrid")
+
+    engine._hybrid_person_priority_fusion([plain], "breeda_daly", "breeda_daly")
+
+    assert plain.metadata["person_priority_score"] == pytest.approx(0.5)
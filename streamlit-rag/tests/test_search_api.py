@@ -0,0 +1,180 @@
+# tests/test_search_api.py
+# Search API: JSON and NDJSON streaming responses, errors, timeouts and the thin client
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import config
+from query_processing.entity_extractor import EntityExtractionResult
+from query_processing.query_rewriter import QueryRewriteResult
+from retrieval.multi_retriever import MultiRetrievalResult, RetrievalResult
+from retrieval.results_fusion import FusionResult
+from search_api import create_app
+from utils.search_client import SearchAPIClient, SearchAPIError
+
+QUESTION = "Breeda Daly training"
+
+def make_search_result(question):
+    result = RetrievalResult(full_content="Breeda Daly completed fire safety training.", filename="daly.pdf",
+                             similarity_score=0.9, metadata={"database_strategy": "exact_phrase"},
+                             source_method="database_hybrid", document_id="doc-1")
+    return {
+        "original_question": question,
+        "entity_result": EntityExtractionResult(entity="Breeda Daly", confidence=0.9, method="gazetteer"),
+        "rewrite_result": QueryRewriteResult(original_query=question, rewrites=[question], method="none", confidence=1.0),
+        "retrieval_result": MultiRetrievalResult(
+            query=question, results=[result], methods_used=["database_hybrid"],
+            total_candidates=1, retrieval_time=0.1, fusion_method="hybrid"
+        ),
+        "fusion_result": FusionResult(
+            fused_results=[result], fusion_method="hybrid_rrf", original_count=1, final_count=1,
+            fusion_metadata={}, fusion_time=0.01
+        ),
+        "answer": "Fire safety [1]",
+        "performance_metrics": {"total_time": 0.2}
+    }
+
+class FakePipeline:
+    """Reports progress, streams the answer in two tokens and returns a fixed result"""
+
+    def __init__(self, error=None, delay=0.0, endless=False):
+        self.error = error
+        self.delay = delay
+        self.endless = endless
+        self.cancelled = asyncio.Event()
+
+    async def search(self, question, progress=None, on_token=None):
+        try:
+            if progress:
+                progress(10, "Searching")
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            while self.endless:
+                if on_token:
+                    on_token("more ")
+                await asyncio.sleep(0.01)
+            for text in ("Fire safety ", "[1]"):
+                if on_token:
+                    on_token(text)
+            if progress:
+                progress(100, "Done")
+            return make_search_result(question)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+def run_with_client(pipeline, check):
+    async def run():
+        async with TestClient(TestServer(create_app(pipeline))) as client:
+            await check(client)
+
+    asyncio.run(run())
+
+def test_search_returns_the_serialized_result():
+    async def check(client):
+        response = await client.post("/search", json={"question": QUESTION})
+        assert response.status == 200
+        data = await response.json()
+        assert data["answer"] == "Fire safety [1]"
+        assert data["fusion_result"]["fused_results"][0]["filename"] == "daly.pdf"
+        assert "api_queue_time" in data["performance_metrics"]
+
+    run_with_client(FakePipeline(), check)
+
+def test_stream_sends_progress_and_tokens_then_the_result():
+    async def check(client):
+        response = await client.post("/search", json={"question": QUESTION, "stream": True})
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in (await response.text()).splitlines()]
+
+        assert [event["event"] for event in events] == ["progress", "token", "token", "progress", "result"]
+        assert events[0] == {"event": "progress", "percent": 10, "message": "Searching"}
+        assert "".join(event["text"] for event in events if event["event"] == "token") == "Fire safety [1]"
+        assert events[-1]["result"]["answer"] == "Fire safety [1]"
+
+    run_with_client(FakePipeline(), check)
+
+def test_failed_search_ends_the_stream_with_an_error_event():
+    async def check(client):
+        response = await client.post("/search", json={"question": QUESTION, "stream": True})
+        events = [json.loads(line) for line in (await response.text()).splitlines()]
+        assert events[-1] == {"event": "error", "error": "Search failed: database down", "status": 500}
+
+        response = await client.post("/search", json={"question": QUESTION})
+        assert response.status == 500
+        assert (await response.json()) == {"error": "Search failed: database down"}
+
+    run_with_client(FakePipeline(error=RuntimeError("database down")), check)
+
+def test_slow_search_times_out(monkeypatch):
+    monkeypatch.setattr(config.api, "search_timeout", 0.05)
+
+    async def check(client):
+        response = await client.post("/search", json={"question": QUESTION})
+        assert response.status == 504
+
+        response = await client.post("/search", json={"question": QUESTION, "stream": True})
+        events = [json.loads(line) for line in (await response.text()).splitlines()]
+        assert events[-1]["event"] == "error"
+        assert events[-1]["status"] == 504
+
+    run_with_client(FakePipeline(delay=1.0), check)
+
+@pytest.mark.parametrize("body, message", [
+    ({"question": "  "}, "'question' is required"),
+    ([QUESTION], "Request body must be a JSON object"),
+])
+def test_bad_requests_are_rejected(body, message):
+    async def check(client):
+        response = await client.post("/search", json=body)
+        assert response.status == 400
+        assert (await response.json())["error"] == message
+
+        response = await client.post("/search", data=b"not json")
+        assert response.status == 400
+
+    run_with_client(FakePipeline(), check)
+
+def test_client_disconnect_cancels_the_search():
+    pipeline = FakePipeline(endless=True)
+
+    async def check(client):
+        response = await client.post("/search", json={"question": QUESTION, "stream": True})
+        assert json.loads(await response.content.readline())["event"] == "progress"
+        response.close()
+        await asyncio.wait_for(pipeline.cancelled.wait(), timeout=5)
+
+    run_with_client(pipeline, check)
+
+def test_search_client_relays_the_stream():
+    async def check(client):
+        api = SearchAPIClient(str(client.make_url("")), timeout=10)
+        progress, tokens = [], []
+
+        result = await api.search(QUESTION, progress=lambda percent, message: progress.append(percent),
+                                  on_token=tokens.append)
+
+        assert progress == [10, 100]
+        assert "".join(tokens) == "Fire safety [1]"
+        assert result["fusion_result"].fused_results[0].filename == "daly.pdf"
+        assert result["entity_result"].entity == "Breeda Daly"
+
+    run_with_client(FakePipeline(), check)
+
+def test_search_client_raises_the_streamed_error():
+    async def check(client):
+        api = SearchAPIClient(str(client.make_url("")), timeout=10)
+        with pytest.raises(SearchAPIError, match="database down"):
+            await api.search(QUESTION, on_token=lambda text: None)
+
+    run_with_client(FakePipeline(error=RuntimeError("database down")), check)
@@ -0,0 +1,61 @@
+# tests/test_snapshot_vector_filtering.py
+# The snapshot vector backend must keep the same hits as the direct pgvector backend
+
+import sys
+import math
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retrieval.multi_retriever import SnapshotVectorRetriever
+from retrieval.vector_snapshot import similarity_to_score
+
+# Nearest first, as VectorSnapshot.search returns them
+SIMILARITIES = [0.98, 0.9, 0.75, 0.61, 0.4]
+
+class FakeSnapshot:
+    dimension = 3
+
+    def document_count(self):
+        return len(SIMILARITIES)
+
+    def search(self, embeddings, top_k):
+        return [[
+            {
+                "id": i,
+                "file_name": f"doc_{i}.pdf",
+                "chunk_index": i,
+                "text": f"chunk {i}",
+                "similarity": similarity,
+                "score": float(similarity_to_score(np.float32(similarity)))
+            }
+            for i, similarity in enumerate(SIMILARITIES[:top_k])
+        ]]
+
+def direct_backend_filter(similarities, threshold):
+    """_direct_search's WHERE 1 - exp(-distance) >= threshold, distance being the cosine distance"""
+    return [i for i, similarity in enumerate(similarities) if 1 - math.exp(-(1 - similarity)) >= threshold]
+
+def snapshot_retriever():
+    retriever = SnapshotVectorRetriever.__new__(SnapshotVectorRetriever)
+    retriever.config = SimpleNamespace(search=SimpleNamespace())
+    retriever.snapshot = FakeSnapshot()
+    return retriever
+
+@pytest.mark.parametrize("threshold", [0.0, 0.1, 0.3, 0.4, 0.5])
+def test_snapshot_filtering_matches_direct_backend(threshold):
+    candidates, backend = snapshot_retriever()._search_candidates("query", 5, threshold, query_embedding=[1.0, 0.0, 0.0])
+
+    assert backend == "snapshot"
+    assert [int(c["document_id"]) for c in candidates] == direct_backend_filter(SIMILARITIES, threshold)
+
+def test_close_nearest_hit_does_not_end_the_scan():
+    # The nearest chunk has the lowest score; hits after it can still pass
+    candidates, _ = snapshot_retriever()._search_candidates("query", 5, 0.30, query_embedding=[1.0, 0.0, 0.0])
+
+    assert [int(c["document_id"]) for c in candidates] == [3, 4]
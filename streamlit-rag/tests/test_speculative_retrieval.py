@@ -0,0 +1,73 @@
+# tests/test_speculative_retrieval.py
+# Speculative vector retrieval asks for the same number of rows as the variant it stands in for
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import config
+from query_processing.query_analysis import QueryAnalyzer
+from retrieval.multi_retriever import MultiStrategyRetriever
+
+class RecordingVectorRetriever:
+    def __init__(self):
+        self.calls = []
+
+    def is_available(self):
+        return True
+
+    def embed_queries(self, queries):
+        return [[1.0, 0.0] for _ in queries]
+
+    async def retrieve(self, query, top_k, **kwargs):
+        self.calls.append((query, top_k))
+        return []
+
+def multi_retriever():
+    retriever = MultiStrategyRetriever.__new__(MultiStrategyRetriever)
+    retriever.config = config
+    retriever.query_analyzer = QueryAnalyzer(config)
+    retriever.retrievers = {"vector": RecordingVectorRetriever()}
+    return retriever
+
+def test_speculative_search_uses_the_per_variant_budget():
+    retriever = multi_retriever()
+    question = "fire safety training records"
+    top_k = retriever.analyze_query(question).search_params["top_k"]
+
+    async def run():
+        speculative = retriever.start_speculative_retrieval(question)
+        await asyncio.gather(*speculative.tasks.values())
+        await retriever._retrieve_with_vector_variants([question, "fire safety certificates"], top_k, 0.3)
+
+    asyncio.run(run())
+
+    calls = retriever.retrievers["vector"].calls
+    assert calls[0] == (question, top_k // 2 + 2)
+    assert calls[1:] == [(question, top_k // 2 + 2), ("fire safety certificates", top_k // 2 + 2)]
+
+def test_prefetched_variant_is_not_searched_again():
+    retriever = multi_retriever()
+    question = "fire safety training records"
+    top_k = retriever.analyze_query(question).search_params["top_k"]
+
+    async def run():
+        speculative = retriever.start_speculative_retrieval(question)
+        prefetched = {question: speculative.take("vector", question)}
+        await retriever._retrieve_with_vector_variants(
+            [question, "fire safety certificates"], top_k, 0.3, prefetched=prefetched
+        )
+
+    asyncio.run(run())
+
+    assert retriever.retrievers["vector"].calls == [
+        (question, top_k // 2 + 2), ("fire safety certificates", top_k // 2 + 2)
+    ]
+
+def test_variant_budget_splits_top_k():
+    assert MultiStrategyRetriever._vector_variant_top_k(20, 2) == 12
+    assert MultiStrategyRetriever._vector_variant_top_k(20, 1) == 22
+    assert MultiStrategyRetriever._vector_variant_top_k(20, 0) == 22
@@ -0,0 +1,71 @@
+# tests/test_tracing.py
+# Span tracing: opt-in exports, span nesting and latency stats
+
+import sys
+import json
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import ProductionRAGConfig, TracingConfig
+from utils.tracing import JSONLSpanExporter, Span, Tracer
+
+def test_span_exports_are_off_by_default(monkeypatch, tmp_path):
+    monkeypatch.delenv("TRACE_JSONL_PATH", raising=False)
+    monkeypatch.delenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    tracing_config = ProductionRAGConfig().tracing
+    tracer = Tracer()
+    tracer.configure(tracing_config)
+
+    assert tracing_config.jsonl_path is None
+    assert tracer.exporters == []
+    assert list(tmp_path.iterdir()) == []
+
+def test_jsonl_export_when_a_path_is_set(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACE_JSONL_PATH", str(tmp_path / "spans.jsonl"))
+
+    tracer = Tracer()
+    tracer.configure(ProductionRAGConfig().tracing)
+
+    assert [type(exporter) for exporter in tracer.exporters] == [JSONLSpanExporter]
+
+def test_nested_spans_share_the_trace():
+    tracer = Tracer()
+    with tracer.span("search") as parent:
+        with tracer.span("retrieval", queries=3) as child:
+            pass
+
+    assert child.trace_id == parent.trace_id
+    assert child.parent_id == parent.span_id
+    assert child.attributes == {"queries": 3}
+    stats = tracer.get_latency_stats()
+    assert list(stats) == ["retrieval", "search"]
+    assert stats["search"]["count"] == 1
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    tracer.configure(TracingConfig(enabled=False))
+    with tracer.span("search") as span:
+        span.set_attribute("results", 3)
+
+    assert tracer.get_latency_stats() == {}
+
+def test_jsonl_exporter_rotates_by_size(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = JSONLSpanExporter(str(path), max_bytes=200, backup_count=2)
+    spans = []
+    for i in range(6):
+        span = Span(f"stage-{i}")
+        span.end_time = span.start_time
+        spans.append(span)
+
+    exporter.export(spans)
+    exporter.close()
+
+    names = [json.loads(line)["name"] for line in path.read_text().splitlines()]
+    assert names and names[-1] == "stage-5"
+    assert (tmp_path / "spans.jsonl.1").exists()
+    assert not (tmp_path / "spans.jsonl.3").exists()
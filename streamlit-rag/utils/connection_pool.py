@@ -0,0 +1,337 @@
+# utils/connection_pool.py
+# Shared PostgreSQL connection pool with health checks, max-lifetime and metrics
+
+import time
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Any
+
+import psycopg2
+
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the pool timeout"""
+    pass
+
+class TracedCursor:
+    """Cursor proxy recording each query as an "sql" span when it runs inside a traced operation"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        self._cursor.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._cursor.__exit__(exc_type, exc_value, traceback)
+
+    def execute(self, query, vars=None):
+        # Background work (index syncs, warm-up) runs outside any trace and is not recorded
+        if not tracer.active():
+            return self._cursor.execute(query, vars)
+        with tracer.span("sql", statement=" ".join(str(query).split())[:200]) as span:
+            self._cursor.execute(query, vars)
+            span.set_attribute("rows", self._cursor.rowcount)
+
+class PooledConnection:
+    """Proxy for a pooled connection: close() returns it to the pool instead of closing it"""
+
+    def __init__(self, pool: "ConnectionPool", conn, checkout_started: float):
+        self._pool = pool
+        self._conn = conn
+        self._checkout_started = checkout_started
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs) -> TracedCursor:
+        return TracedCursor(self._conn.cursor(*args, **kwargs))
+
+    def close(self):
+        """Return the connection to the pool (rolling back any open transaction)"""
+        if not self._released:
+            self._released = True
+            self._pool._release(self._conn, self._checkout_started)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self._released:
+            if exc_type is None:
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        self.close()
+
+class ConnectionPool:
+    """Thread-safe pool of psycopg2 connections that blocks for a free connection instead of failing"""
+
+    def __init__(self,
+                 connection_string: str,
+                 min_size: int = 1,
+                 max_size: int = 10,
+                 max_lifetime: float = 1800.0,
+                 timeout: float = 10.0,
+                 health_check_idle: float = 30.0):
+        """
+        Args:
+            connection_string: PostgreSQL connection string
+            min_size: Connections opened up front (best effort)
+            max_size: Maximum simultaneous connections
+            max_lifetime: Seconds after which a connection is closed and replaced
+            timeout: Seconds to wait for a free connection before raising PoolTimeoutError
+            health_check_idle: Connections idle longer than this are checked with SELECT 1
+        """
+        self.connection_string = connection_string
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.health_check_idle = health_check_idle
+
+        # psycopg2's ThreadedConnectionPool closes every connection returned above
+        # minconn and raises when exhausted, so idle connections are kept here
+        # (LIFO) and the semaphore makes callers wait for a free slot
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._created_at: Dict[int, float] = {}
+        self._last_used: Dict[int, float] = {}
+        self._open_connections = 0
+        self._closed = False
+
+        self._metrics = {
+            "checkouts": 0,
+            "active": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "checkout_time_total": 0.0,
+            "checkout_time_max": 0.0,
+            "connections_created": 0,
+            "connections_recycled": 0,
+            "health_check_failures": 0,
+            "timeouts": 0
+        }
+
+        self._warm_up()
+
+    def _warm_up(self):
+        """Open min_size connections; failures are logged, not raised"""
+        try:
+            for _ in range(self.min_size):
+                conn = self._connect()
+                self._last_used[id(conn)] = time.time()
+                self._idle.append(conn)
+        except psycopg2.Error as e:
+            logger.warning(f"Connection pool warm-up failed: {e}")
+
+    def _connect(self):
+        """Open a new connection"""
+        conn = psycopg2.connect(self.connection_string)
+        with self._lock:
+            self._created_at[id(conn)] = time.time()
+            self._open_connections += 1
+            self._metrics["connections_created"] += 1
+        return conn
+
+    def _needs_replacement(self, conn, now: float) -> bool:
+        """Check whether an idle connection is closed, too old or fails its health check"""
+        if conn.closed:
+            return True
+
+        conn_id = id(conn)
+        if self.max_lifetime and now - self._created_at.get(conn_id, now) > self.max_lifetime:
+            return True
+
+        if now - self._last_used.get(conn_id, now) > self.health_check_idle:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                conn.rollback()
+            except psycopg2.Error:
+                with self._lock:
+                    self._metrics["health_check_failures"] += 1
+                return True
+
+        return False
+
+    def getconn(self) -> PooledConnection:
+        """
+        Check out a healthy connection, waiting up to the pool timeout
+
+        Call close() on the returned connection (or use it as a context manager)
+        to give it back to the pool.
+        """
+        if self._closed:
+            raise PoolTimeoutError("Connection pool is closed")
+
+        wait_start = time.time()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._metrics["timeouts"] += 1
+            raise PoolTimeoutError(f"No database connection available within {self.timeout}s")
+
+        try:
+            conn = None
+            while conn is None:
+                with self._lock:
+                    candidate = self._idle.pop() if self._idle else None
+
+                if candidate is None:
+                    conn = self._connect()
+                elif self._needs_replacement(candidate, time.time()):
+                    self._discard(candidate)
+                else:
+                    conn = candidate
+        except Exception:
+            self._slots.release()
+            raise
+
+        checkout_started = time.time()
+        wait_time = checkout_started - wait_start
+        with self._lock:
+            self._metrics["checkouts"] += 1
+            self._metrics["active"] += 1
+            self._metrics["wait_time_total"] += wait_time
+            self._metrics["wait_time_max"] = max(self._metrics["wait_time_max"], wait_time)
+
+        return PooledConnection(self, conn, checkout_started)
+
+    @contextmanager
+    def connection(self):
+        """Context manager: commit on success, roll back on error, always return the connection"""
+        conn = self.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _discard(self, conn):
+        """Close a connection and forget it"""
+        conn_id = id(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass  # Server may already have dropped it
+        with self._lock:
+            self._created_at.pop(conn_id, None)
+            self._last_used.pop(conn_id, None)
+            self._open_connections -= 1
+            self._metrics["connections_recycled"] += 1
+
+    def _release(self, conn, checkout_started: float):
+        """Return a checked-out connection to the pool"""
+        checkout_time = time.time() - checkout_started
+        with self._lock:
+            self._metrics["active"] -= 1
+            self._metrics["checkout_time_total"] += checkout_time
+            self._metrics["checkout_time_max"] = max(self._metrics["checkout_time_max"], checkout_time)
+
+        try:
+            if self._closed or conn.closed:
+                self._discard(conn)
+                return
+
+            # Never hand out a connection with an open transaction
+            status = conn.get_transaction_status()
+            if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                self._discard(conn)
+                return
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+
+            with self._lock:
+                self._last_used[id(conn)] = time.time()
+                self._idle.append(conn)
+        except psycopg2.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get pool wait and checkout time metrics"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["open_connections"] = self._open_connections
+            metrics["idle_connections"] = len(self._idle)
+
+        checkouts = metrics["checkouts"]
+        metrics.update({
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "avg_wait_ms": (metrics["wait_time_total"] / checkouts * 1000) if checkouts else 0.0,
+            "avg_checkout_ms": (metrics["checkout_time_total"] / checkouts * 1000) if checkouts else 0.0,
+            "max_wait_ms": metrics["wait_time_max"] * 1000,
+            "max_checkout_ms": metrics["checkout_time_max"] * 1000
+        })
+        return metrics
+
+    def close(self):
+        """Close idle connections; checked-out connections are closed when returned"""
+        self._closed = True
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._discard(conn)
+
+# Pools are shared per connection string so every component reuses the same connections
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(connection_string: str, database_config: Optional[Any] = None, **pool_kwargs) -> ConnectionPool:
+    """
+    Get the shared pool for a connection string, creating it on first use
+
+    Args:
+        connection_string: PostgreSQL connection string
+        database_config: Optional DatabaseConfig providing pool_* settings
+        **pool_kwargs: Explicit ConnectionPool arguments (override database_config)
+    """
+    with _pools_lock:
+        pool = _pools.get(connection_string)
+        if pool is None or pool._closed:
+            settings = {}
+            if database_config is not None:
+                settings = {
+                    "min_size": database_config.pool_min_size,
+                    "max_size": database_config.pool_max_size,
+                    "max_lifetime": database_config.pool_max_lifetime,
+                    "timeout": database_config.pool_timeout,
+                    "health_check_idle": database_config.pool_health_check_idle
+                }
+            settings.update(pool_kwargs)
+
+            pool = ConnectionPool(connection_string, **settings)
+            _pools[connection_string] = pool
+            logger.info(f"Database connection pool created ({pool.min_size}-{pool.max_size} connections)")
+
+        return pool
+
+def get_all_pool_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get metrics for every shared pool (keyed by pool index, never by connection string)"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {f"pool_{i}": pool.get_metrics() for i, pool in enumerate(pools)}
+
+@atexit.register
+def close_all_pools():
+    """Close every shared pool (registered to run at interpreter exit)"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,151 @@
+# utils/embedding_cache.py
+# Bounded LRU cache for query embeddings, optionally persisted to SQLite
+
+import array
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+def normalize_query(text: str) -> str:
+    """Collapse whitespace so trivially different spellings share an entry"""
+    return " ".join(text.split())
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query embeddings keyed by (model, normalized query text)"""
+
+    def __init__(self, model_name: str, max_size: int = 1024, persist_path: Optional[str] = None):
+        """
+        Args:
+            model_name: Embedding model name (part of every key, so switching models never reuses vectors)
+            max_size: Maximum number of cached embeddings
+            persist_path: Optional SQLite file that keeps the cache across restarts
+        """
+        self.model_name = model_name
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "embedding_requests": 0,
+            "batch_requests": 0,
+            "embedded_texts": 0
+        }
+
+        if persist_path:
+            self._open_store(persist_path)
+
+    def _open_store(self, persist_path: str):
+        """Open the SQLite store and load the most recently used entries; failures disable persistence"""
+        try:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS query_embeddings (
+                    model TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    last_used REAL NOT NULL DEFAULT (julianday('now')),
+                    PRIMARY KEY (model, query)
+                )
+            """)
+            rows = self._db.execute(
+                "SELECT query, embedding FROM query_embeddings WHERE model = ? ORDER BY last_used DESC LIMIT ?",
+                (self.model_name, self.max_size)
+            ).fetchall()
+            for query, blob in reversed(rows):  # Oldest first so LRU order is preserved
+                self._entries[query] = array.array("f", blob).tolist()
+            logger.info(f"Query embedding cache loaded {len(rows)} entries from {persist_path}")
+        except sqlite3.Error as e:
+            logger.warning(f"Query embedding cache persistence disabled: {e}")
+            self._db = None
+
+    def get_many(self, queries: List[str]) -> Tuple[Dict[str, List[float]], List[str]]:
+        """
+        Look up several queries at once
+
+        Hits are marked as used in the SQLite store as well, so the entries
+        reloaded after a restart are the most recently used, not the newest.
+
+        Returns:
+            (embeddings found keyed by normalized query, normalized queries still to embed - deduplicated)
+        """
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for query in queries:
+                key = normalize_query(query)
+                if key in found or key in missing:
+                    continue
+                embedding = self._entries.get(key)
+                if embedding is None:
+                    missing.append(key)
+                    self._metrics["misses"] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = embedding
+                    self._metrics["hits"] += 1
+
+            if found and self._db is not None:
+                try:
+                    self._db.executemany(
+                        "UPDATE query_embeddings SET last_used = julianday('now') WHERE model = ? AND query = ?",
+                        [(self.model_name, key) for key in found]
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist query embedding use: {e}")
+        return found, missing
+
+    def put_many(self, embeddings: Dict[str, List[float]], batched: bool = True):
+        """
+        Store embeddings for normalized queries, evicting the least recently used
+
+        Args:
+            embeddings: Embeddings keyed by normalized query
+            batched: Whether they came from one batched model call (else one call per query)
+        """
+        with self._lock:
+            self._metrics["embedding_requests"] += 1 if batched else len(embeddings)
+            self._metrics["batch_requests"] += 1 if batched else 0
+            self._metrics["embedded_texts"] += len(embeddings)
+            for key, embedding in embeddings.items():
+                self._entries[key] = embedding
+                self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_size:
+                evicted.append(self._entries.popitem(last=False)[0])
+
+            if self._db is not None:
+                try:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO query_embeddings (model, query, embedding, last_used) "
+                        "VALUES (?, ?, ?, julianday('now'))",
+                        [(self.model_name, key, array.array("f", embedding).tobytes()) for key, embedding in embeddings.items()]
+                    )
+                    if evicted:
+                        self._db.executemany(
+                            "DELETE FROM query_embeddings WHERE model = ? AND query = ?",
+                            [(self.model_name, key) for key in evicted]
+                        )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not persist query embeddings: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "max_size": self.max_size,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "persistent": self._db is not None
+        })
+        return stats
@@ -8,6 +8,8 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+from retrieval.multi_retriever import load_full_content
+
 logger = logging.getLogger(__name__)
 
 class RAGExcelExporter:
@@ -16,23 +18,28 @@ class RAGExcelExporter:
     def __init__(self):
         self.default_sheets = ["Search Results", "Search Summary", "Quality Analysis"]
     
-    def create_results_dataframe(self, search_results: Dict) -> Optional[pd.DataFrame]:
-        """Create DataFrame from search results for Excel export"""
+    def create_results_dataframe(self, search_results: Dict, include_full_content: bool = False) -> Optional[pd.DataFrame]:
+        """Create DataFrame from search results for Excel export (full text is reloaded in one batch if requested)"""
         if not search_results or not search_results.get("fusion_result") or not search_results["fusion_result"].fused_results:
             return None
         
         results = search_results["fusion_result"].fused_results
+        if include_full_content:
+            load_full_content(results)
         
         # Prepare data for DataFrame
         data = []
         for i, result in enumerate(results, 1):
-            data.append({
+            row = {
                 "?": i,
                 "Filename": result.filename,
                 "Similarity Score": round(result.similarity_score, 4),
                 "Source Method": result.source_method,
                 "Content Preview": result.content[:200] + "..." if len(result.content) > 200 else result.content,
-                "Full Content": result.full_content,
+            }
+            if include_full_content:
+                row["Full Content"] = result.full_content
+            row.update({
                 "Document ID": result.document_id,
                 "Chunk Index": result.chunk_index,
                 # Metadata fields
@@ -43,6 +50,7 @@ class RAGExcelExporter:
                 "Person Detected": result.metadata.get("universal_person_detected", False),
                 "Smart Threshold": result.metadata.get("smart_threshold_used", 0)
             })
+            data.append(row)
         
         return pd.DataFrame(data)
     
@@ -250,13 +258,11 @@ def render_excel_export_section(search_results: Dict):
     # Prepare DataFrames for export
     export_dataframes = {}
     
-    # Results sheet (main data)
+    # Results sheet (main data); results hold previews only, so full text is fetched on request
     if include_full_content:
-        export_dataframes["Search Results"] = results_df
+        export_dataframes["Search Results"] = exporter.create_results_dataframe(search_results, include_full_content=True)
     else:
-        # Exclude full content column to save space
-        export_df = results_df.drop(columns=["Full Content"], errors='ignore')
-        export_dataframes["Search Results"] = export_df
+        export_dataframes["Search Results"] = results_df
     
     # Optional sheets
     if include_summary and summary_df is not None:
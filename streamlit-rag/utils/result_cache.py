@@ -0,0 +1,169 @@
+# utils/result_cache.py
+# Shared end-to-end search result cache invalidated by the indexer's version stamp
+
+import time
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Dict, Optional, Any, Tuple
+
+from utils.connection_pool import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+def normalize_question(question: str) -> str:
+    """Collapse whitespace (case is kept: entity extraction depends on capitalization)"""
+    return " ".join(question.split())
+
+def config_fingerprint(config) -> str:
+    """Hash every setting that influences search results, so config changes never serve stale results"""
+    sections = {}
+    for name in ("embedding", "llm", "search", "entity_extraction", "query_rewrite"):
+        section = getattr(config, name, None)
+        if is_dataclass(section):
+            sections[name] = asdict(section)
+    sections["table"] = f"{config.database.schema}.{config.database.table_name}"
+    payload = json.dumps(sections, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+class SearchResultCache:
+    """Thread-safe TTL + LRU cache of complete search results, shared by all sessions"""
+
+    def __init__(self, config, max_size: int = 256, ttl: float = 3600.0, version_check_interval: float = 5.0):
+        """
+        Args:
+            config: ProductionRAGConfig (database settings and fingerprint source)
+            max_size: Maximum number of cached results
+            ttl: Seconds a result stays valid (even if the index does not change)
+            version_check_interval: Seconds between reads of the index version stamp
+        """
+        self.config = config
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.fingerprint = config_fingerprint(config)
+
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._index_version: Optional[int] = None
+        self._version_checked_at = 0.0
+
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "invalidations": 0,
+            "evictions": 0
+        }
+
+    def get_index_version(self) -> Optional[int]:
+        """
+        Read the version stamp maintained by rag_indexer/index_version.py (at most every few seconds)
+
+        When the stamp changes, every cached result is dropped.
+        """
+        now = time.time()
+        if now - self._version_checked_at < self.version_check_interval:
+            return self._index_version
+
+        version = self._index_version
+        try:
+            table = f"{self.config.database.schema}.{self.config.database.table_name}_index_version"
+            pool = get_connection_pool(self.config.database.connection_string, self.config.database)
+            with pool.connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT to_regclass(%s)", (table,))
+                    if cur.fetchone()[0] is not None:
+                        cur.execute(f"SELECT version FROM {table} WHERE id = 1")
+                        row = cur.fetchone()
+                        version = row[0] if row else None
+        except Exception as e:
+            logger.warning(f"Could not read index version: {e}")
+
+        with self._lock:
+            if version != self._index_version and self._entries:
+                logger.info(f"Index version changed ({self._index_version} -> {version}), clearing {len(self._entries)} cached results")
+                self._entries.clear()
+                self._metrics["invalidations"] += 1
+            self._index_version = version
+            self._version_checked_at = now
+
+        return version
+
+    def _key(self, question: str, index_version: Optional[int]) -> str:
+        return f"{self.fingerprint}:{index_version}:{normalize_question(question)}"
+
+    def lookup(self, question: str) -> Tuple[str, Optional[Tuple[Any, float]]]:
+        """
+        Look up a cached result
+
+        Returns:
+            (cache key, (result, age in seconds) or None). Pass the key to put() so a
+            result computed while the index changed is stored under the old version.
+        """
+        key = self._key(question, self.get_index_version())
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return key, None
+
+            stored_at, result = entry
+            if now - stored_at > self.ttl:
+                del self._entries[key]
+                self._metrics["expired"] += 1
+                self._metrics["misses"] += 1
+                return key, None
+
+            self._entries.move_to_end(key)
+            self._metrics["hits"] += 1
+            return key, (result, now - stored_at)
+
+    def put(self, key: str, result: Any):
+        """Store a result under the key from lookup(), evicting the least recently used"""
+        with self._lock:
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._metrics["evictions"] += 1
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters, size and the current index version"""
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "index_version": self._index_version
+        })
+        return stats
+
+# One cache per process so every Streamlit session shares it
+_cache: Optional[SearchResultCache] = None
+_cache_lock = threading.Lock()
+
+def get_result_cache(config) -> SearchResultCache:
+    """Get the shared result cache, creating it on first use"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchResultCache(
+                config,
+                max_size=config.search.result_cache_size,
+                ttl=config.search.result_cache_ttl,
+                version_check_interval=config.search.result_cache_version_check_interval
+            )
+        return _cache
@@ -0,0 +1,104 @@
+# utils/search_client.py
+# Thin client of the headless search API (search_api.py), used by Streamlit when SEARCH_API_URL is set
+
+import json
+import asyncio
+import logging
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional, Any, Callable
+
+from retrieval.multi_retriever import run_blocking
+from search_pipeline import ProgressCallback, deserialize_search_result
+from generation.answer_generator import TokenCallback
+
+logger = logging.getLogger(__name__)
+
+class SearchAPIError(RuntimeError):
+    """The search API returned an error or could not be reached"""
+
+class SearchAPIClient:
+    """Same interface as SearchPipeline (search, status, stats, chunk text), served over HTTP"""
+    
+    def __init__(self, base_url: str, timeout: float = 180.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+    
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None,
+                 on_event: Optional[Callable[[Dict[str, Any]], None]] = None) -> Any:
+        """JSON request; with on_event the NDJSON response is passed on line by line and the last event returned"""
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json", "Accept": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                if on_event is None:
+                    return json.loads(response.read().decode("utf-8"))
+                event = None
+                for line in response:
+                    if line.strip():
+                        event = json.loads(line.decode("utf-8"))
+                        on_event(event)
+                return event
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error", e.reason)
+            except (ValueError, AttributeError):
+                message = e.reason
+            raise SearchAPIError(f"Search API {path} failed ({e.code}): {message}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise SearchAPIError(f"Search API unreachable at {self.base_url}: {e}") from e
+    
+    async def search(self, question: str, progress: Optional[ProgressCallback] = None,
+                     on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """
+        Run a search on the service and rebuild the result objects
+        
+        With callbacks the service streams its progress and answer tokens; the
+        callbacks run on the calling event loop, not on the reading thread.
+        """
+        if progress is None and on_token is None:
+            data = await run_blocking(self._request, "POST", "/search", {"question": question})
+            return deserialize_search_result(data)
+        
+        loop = asyncio.get_running_loop()
+        
+        def dispatch(event: Dict[str, Any]):
+            if event["event"] == "progress" and progress:
+                progress(event["percent"], event["message"])
+            elif event["event"] == "token" and on_token:
+                on_token(event["text"])
+        
+        def on_event(event: Dict[str, Any]):
+            if event["event"] in ("progress", "token"):
+                loop.call_soon_threadsafe(dispatch, event)
+        
+        last_event = await run_blocking(self._request, "POST", "/search", {"question": question, "stream": True}, on_event)
+        if not last_event or last_event["event"] == "error":
+            error = last_event or {"error": "stream ended without a result", "status": None}
+            raise SearchAPIError(f"Search API /search failed ({error['status']}): {error['error']}")
+        
+        # Callbacks queued by the reading thread have run by now (call_soon_threadsafe is FIFO)
+        return deserialize_search_result(last_event["result"])
+    
+    def fetch_chunk_texts(self, document_ids: List[str]) -> Dict[str, str]:
+        """Full chunk text by document id (installed as RetrievalResult.text_loader)"""
+        if not document_ids:
+            return {}
+        return self._request("POST", "/chunks", {"ids": list(document_ids)})
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Service's system status (database, embeddings, components)"""
+        return self._request("GET", "/status")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Service's live counters (pool, caches, local indexes)"""
+        return self._request("GET", "/stats")
+    
+    def health(self) -> Dict[str, Any]:
+        """Service liveness and retriever availability"""
+        return self._request("GET", "/health")
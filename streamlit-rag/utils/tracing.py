@@ -0,0 +1,306 @@
+# utils/tracing.py
+# Span tracing of the search pipeline: rolling per-stage latency percentiles, JSONL and OTLP export
+
+import os
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import contextvars
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Any, Iterator
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Span of the running operation; asyncio tasks and run_blocking() calls inherit it
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    """One timed operation; the span active when it starts becomes its parent"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_time", "end_time", "attributes", "error")
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_time or time.time()) - self.start_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": self.duration * 1000,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+class _NoopSpan:
+    """Stand-in yielded while tracing is disabled"""
+
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+class JSONLSpanExporter:
+    """Appends finished spans to a JSONL file, rotated by size (spans.jsonl.1, .2, ...)"""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            if self.max_bytes and self._file.tell() >= self.max_bytes:
+                self._rotate()
+            self._file.write(json.dumps(span.to_dict(), default=str) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+class OTLPSpanExporter:
+    """Posts spans to an OTLP/HTTP collector in its JSON encoding (e.g. http://localhost:4318/v1/traces)"""
+
+    def __init__(self, endpoint: str, service_name: str = "streamlit-rag", timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def _span_payload(self, span: Span) -> Dict[str, Any]:
+        payload = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(int(span.start_time * 1e9)),
+            "endTimeUnixNano": str(int(span.end_time * 1e9)),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+        }
+        if span.parent_id:
+            payload["parentSpanId"] = span.parent_id
+        return payload
+
+    def export(self, spans: List[Span]):
+        body = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": __name__},
+                    "spans": [self._span_payload(span) for span in spans]
+                }]
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(body, default=str).encode("utf-8"),
+            method="POST",
+            headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def close(self):
+        pass
+
+class Tracer:
+    """
+    Records spans, keeps a rolling latency window per span name and hands
+    finished spans to the exporters on a background thread
+
+    Spans nest through a context variable, so stages started inside a span
+    (including in asyncio tasks and run_blocking() calls) become its children.
+    """
+
+    def __init__(self, latency_window: int = 1000):
+        self.enabled = True
+        self.latency_window = max(1, latency_window)
+        self.exporters: List[Any] = []
+        self._latencies: Dict[str, deque] = {}
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10000)
+        self._export_thread: Optional[threading.Thread] = None
+        self._dropped = 0
+
+    def configure(self, tracing_config):
+        """Apply TracingConfig: on/off, window size and exporters (replacing any previous ones)"""
+        self.enabled = tracing_config.enabled
+        with self._lock:
+            self.latency_window = max(1, tracing_config.latency_window)
+            self._latencies = {name: deque(values, maxlen=self.latency_window) for name, values in self._latencies.items()}
+
+        exporters = []
+        if tracing_config.enabled and tracing_config.jsonl_path:
+            try:
+                exporters.append(JSONLSpanExporter(
+                    tracing_config.jsonl_path,
+                    max_bytes=tracing_config.jsonl_max_bytes,
+                    backup_count=tracing_config.jsonl_backup_count
+                ))
+            except OSError as e:
+                logger.warning(f"Span file {tracing_config.jsonl_path} unavailable: {e}")
+        if tracing_config.enabled and tracing_config.otlp_endpoint:
+            exporters.append(OTLPSpanExporter(tracing_config.otlp_endpoint, tracing_config.service_name))
+
+        previous, self.exporters = self.exporters, exporters
+        for exporter in previous:
+            exporter.close()
+
+        if exporters and self._export_thread is None:
+            self._export_thread = threading.Thread(target=self._export_loop, name="span-export", daemon=True)
+            self._export_thread.start()
+        logger.info(f"Tracing {'enabled' if self.enabled else 'disabled'} "
+                    f"({', '.join(type(e).__name__ for e in exporters) or 'no exporters'})")
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Time a block as a child of the current span (a new trace when there is none)"""
+        if not self.enabled:
+            yield _NoopSpan()
+            return
+
+        span = Span(name, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time = time.time()
+            self._record(span)
+
+    def active(self) -> bool:
+        """Whether a traced operation is running in this context"""
+        return self.enabled and _current_span.get() is not None
+
+    def current_trace_id(self) -> Optional[str]:
+        span = _current_span.get()
+        return span.trace_id if span else None
+
+    def _record(self, span: Span):
+        with self._lock:
+            window = self._latencies.get(span.name)
+            if window is None:
+                window = self._latencies[span.name] = deque(maxlen=self.latency_window)
+            window.append(span.duration * 1000)
+            self._counts[span.name] = self._counts.get(span.name, 0) + 1
+            if span.error:
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+
+        if self.exporters:
+            try:
+                self._queue.put_nowait(span)
+            except queue.Full:
+                self._dropped += 1
+
+    def _export_loop(self):
+        """Export in batches: whatever arrived within a second, up to 512 spans"""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.time() + 1.0
+            while len(batch) < 512:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.time())))
+                except queue.Empty:
+                    break
+
+            for exporter in list(self.exporters):
+                try:
+                    exporter.export(batch)
+                except Exception as e:
+                    logger.warning(f"Span export via {type(exporter).__name__} failed: {e}")
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Rolling p50/p95/p99 (ms) per span name over the last latency_window spans, in first-seen order"""
+        with self._lock:
+            windows = {name: list(values) for name, values in self._latencies.items()}
+            counts = dict(self._counts)
+            errors = dict(self._errors)
+
+        stats = {}
+        for name, values in windows.items():
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            stats[name] = {
+                "count": counts[name],
+                "errors": errors.get(name, 0),
+                "window": len(values),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(max(values))
+            }
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Latency percentiles plus exporter state"""
+        return {
+            "enabled": self.enabled,
+            "exporters": [type(exporter).__name__ for exporter in self.exporters],
+            "queued": self._queue.qsize(),
+            "dropped": self._dropped,
+            "stages": self.get_latency_stats()
+        }
+
+# One tracer per process; SearchPipeline applies config.tracing to it
+tracer = Tracer()